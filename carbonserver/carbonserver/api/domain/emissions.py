@@ -1,5 +1,5 @@
 import abc
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from carbonserver.api import schemas
@@ -10,10 +10,20 @@ class Emissions(abc.ABC):
     def add_emission(self, emission: schemas.EmissionCreate) -> UUID:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def add_emissions(self, emissions: List[schemas.EmissionCreate]) -> List[UUID]:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_one_emission(self, emission_id) -> schemas.Emission:
         raise NotImplementedError
 
     @abc.abstractmethod
-    def get_emissions_from_run(self, run_id) -> List[schemas.Emission]:
+    def get_emissions_from_run(
+        self, run_id, limit: Optional[int] = None, offset: int = 0
+    ) -> List[schemas.Emission]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def count_emissions_from_run(self, run_id) -> int:
         raise NotImplementedError
@@ -1,8 +1,11 @@
+import threading
 from contextlib import AbstractContextManager, contextmanager
-from typing import Callable
+from typing import Callable, Dict
 
-from sqlalchemy import create_engine, exc, orm
+from sqlalchemy import create_engine, event, exc, orm
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import QueuePool
 
 from carbonserver.api.errors import DBError, DBErrorEnum, DBException
 from carbonserver.logger import logger
@@ -10,9 +13,62 @@ from carbonserver.logger import logger
 Base = declarative_base()
 
 
+def create_db_engine(
+    db_url: str,
+    echo: bool = False,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_recycle: int = 1800,
+    pool_timeout: int = 30,
+    statement_timeout: int = 0,
+) -> Engine:
+    """Create the engine of the database, with a pool of connections.
+
+    :db_url: The database URL, a PostgreSQL or SQLite one.
+    :echo: Log every SQL statement.
+    :pool_size: Number of connections kept open.
+    :max_overflow: Number of connections opened beyond pool_size under load,
+        closed when they are given back.
+    :pool_recycle: Seconds after which a connection is replaced, before the
+        server or a proxy closes it.
+    :pool_timeout: Seconds to wait for a connection when all of them are used.
+    :statement_timeout: Milliseconds after which PostgreSQL cancels a
+        statement, 0 to never cancel them.
+    """
+    url = make_url(db_url)
+    engine_kwargs = dict(echo=echo, pool_pre_ping=True)
+    if url.get_backend_name() == "sqlite":
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # An in-memory database lives in its connection, it is not pooled
+            return create_engine(url, **engine_kwargs)
+        # SQLite files are not pooled by default
+        engine_kwargs["poolclass"] = QueuePool
+    elif statement_timeout:
+        engine_kwargs["connect_args"] = {
+            "options": f"-c statement_timeout={statement_timeout}"
+        }
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        **engine_kwargs,
+    )
+
+
 class Database:
-    def __init__(self, db_url: str) -> None:
-        self._engine = create_engine(db_url, echo=True, pool_pre_ping=True)
+    def __init__(self, db_url: str, **engine_options) -> None:
+        """
+        :db_url: The database URL.
+        :engine_options: The options of `create_db_engine`.
+        """
+        self._engine = create_db_engine(db_url, **engine_options)
+        self._counters = {"connections": 0, "checkouts": 0, "timeouts": 0}
+        self._counters_lock = threading.Lock()
+        event.listen(self._engine, "connect", self._on_connect)
+        event.listen(self._engine, "checkout", self._on_checkout)
         self._session_factory = orm.scoped_session(
             orm.sessionmaker(
                 autocommit=False,
@@ -21,9 +77,40 @@ class Database:
             ),
         )
 
+    @property
+    def engine(self) -> Engine:
+        return self._engine
+
     def create_database(self) -> None:
         Base.metadata.create_all(self._engine)
 
+    def pool_stats(self) -> Dict[str, int]:
+        """Use of the connection pool: connections in use and idle, and the
+        numbers of connections opened, of checkouts and of timeouts waiting
+        for a connection since the start."""
+        pool = self._engine.pool
+        stats = {}
+        if isinstance(pool, QueuePool):
+            stats = {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        with self._counters_lock:
+            stats.update(self._counters)
+        return stats
+
+    def _count(self, counter: str) -> None:
+        with self._counters_lock:
+            self._counters[counter] += 1
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self._count("connections")
+
+    def _on_checkout(self, dbapi_connection, connection_record, proxy) -> None:
+        self._count("checkouts")
+
     @contextmanager
     def session(self) -> Callable[..., AbstractContextManager]:
         session: Session = self._session_factory()
@@ -45,6 +132,14 @@ class Database:
             raise DBException(
                 error=DBError(code=DBErrorEnum.DATA_ERROR, message="Invalid data")
             )
+        except exc.TimeoutError:
+            session.rollback()
+            self._count("timeouts")
+            logger.error(
+                f"No database connection available: {self.pool_stats()}",
+                exc_info=True,
+            )
+            raise
         except exc.ProgrammingError as e:
             session.rollback()
             logger.error(e.orig.args[0], exc_info=True)
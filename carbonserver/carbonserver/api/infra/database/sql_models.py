@@ -1,6 +1,16 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -28,6 +38,8 @@ class Emission(Base):
     run_id = Column(UUID(as_uuid=True), ForeignKey("runs.id", ondelete="CASCADE"))
     run = relationship("Run", back_populates="emissions")
 
+    __table_args__ = (Index("ix_emissions_run_id_timestamp", "run_id", "timestamp"),)
+
     def __repr__(self):
         return (
             f'<Emission(id="{self.id}", '
@@ -37,6 +49,52 @@ class Emission(Base):
         )
 
 
+class EmissionHourly(Base):
+    """
+    Emissions of a run summed by hour, kept up to date when emissions are
+    saved, so that the reports do not read every emission. The averaged
+    measures are stored as a sum and a count of their non-null values.
+    """
+
+    __tablename__ = "emissions_hourly"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(
+        UUID(as_uuid=True), ForeignKey("runs.id", ondelete="CASCADE"), nullable=False
+    )
+    hour = Column(DateTime, nullable=False)
+    emissions_sum = Column(Float, nullable=False, default=0)
+    cpu_energy = Column(Float, nullable=False, default=0)
+    gpu_energy = Column(Float, nullable=False, default=0)
+    ram_energy = Column(Float, nullable=False, default=0)
+    energy_consumed = Column(Float, nullable=False, default=0)
+    duration = Column(Float, nullable=False, default=0)
+    cpu_power_sum = Column(Float, nullable=False, default=0)
+    cpu_power_count = Column(Integer, nullable=False, default=0)
+    gpu_power_sum = Column(Float, nullable=False, default=0)
+    gpu_power_count = Column(Integer, nullable=False, default=0)
+    ram_power_sum = Column(Float, nullable=False, default=0)
+    ram_power_count = Column(Integer, nullable=False, default=0)
+    emissions_rate_sum = Column(Float, nullable=False, default=0)
+    emissions_rate_count = Column(Integer, nullable=False, default=0)
+    cpu_utilization_percent_sum = Column(Float, nullable=False, default=0)
+    cpu_utilization_percent_count = Column(Integer, nullable=False, default=0)
+    gpu_utilization_percent_sum = Column(Float, nullable=False, default=0)
+    gpu_utilization_percent_count = Column(Integer, nullable=False, default=0)
+    ram_utilization_percent_sum = Column(Float, nullable=False, default=0)
+    ram_utilization_percent_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "hour", name="uq_emissions_hourly_run_id_hour"),
+    )
+
+    def __repr__(self):
+        return (
+            f'<EmissionHourly(run_id="{self.run_id}", '
+            f'hour="{self.hour}", '
+            f'emissions_sum="{self.emissions_sum}")>'
+        )
+
+
 class Run(Base):
     __tablename__ = "runs"
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
@@ -0,0 +1,81 @@
+"""
+In-memory cache of read permissions.
+
+The dashboard checks that the user can read the organization, project,
+experiment or run of every report it loads, and loads several of them on each
+refresh. Once resolved, a permission is kept for a short time, keyed by user and
+entity.
+
+Only read permissions are cached. A user's permissions are forgotten when they
+join an organization, and all of them when a project is changed or deleted,
+since that may change who can read it and everything under it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# (user id or "" for anonymous users, entity, entity id)
+PermissionKey = Tuple[str, str, str]
+
+
+class PermissionCache:
+    def __init__(self, ttl: float = 30, max_size: int = 10000):
+        """
+        :param ttl: Seconds a permission stays valid, 0 disables the cache.
+        :param max_size: Maximum number of cached permissions, least recently
+            used ones are evicted first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        # key -> (allowed, expiry)
+        self._entries: "OrderedDict[PermissionKey, Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(user_id, entity: str, entity_id) -> PermissionKey:
+        return ("" if user_id is None else str(user_id), entity, str(entity_id))
+
+    def get(self, user_id, entity: str, entity_id) -> Optional[bool]:
+        """
+        Return whether the user can read the entity, or None if unknown.
+
+        :param user_id: The id of the user, None for anonymous users.
+        :param entity: "organization", "project", "experiment", "run" or
+            "emission".
+        """
+        if self.ttl <= 0:
+            return None
+        key = self._key(user_id, entity, entity_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, user_id, entity: str, entity_id, allowed: bool) -> None:
+        if self.ttl <= 0:
+            return
+        key = self._key(user_id, entity, entity_id)
+        with self._lock:
+            self._entries[key] = (allowed, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id) -> None:
+        """Forget the permissions of a user whose memberships changed"""
+        user_id = str(user_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,118 @@
+"""
+In-memory cache of verified project tokens.
+
+Project tokens are stored as bcrypt hashes, which are deliberately slow to check.
+The trackers send the same token with every emission, so once a token has been
+verified against a stored hash, the result is kept for a short time. Entries are
+keyed by an HMAC of the raw token with a per-process secret, so the plain tokens
+are never kept in memory.
+
+The candidate tokens are still read from the database on each request: a
+cached verification only skips bcrypt, it never grants access to a token that
+was deleted, whose hash changed, or that now belongs to another project.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_size: int = 10000,
+        last_used_interval: float = 60,
+    ):
+        """
+        :param ttl: Seconds a verification stays valid, 0 disables the cache.
+        :param max_size: Maximum number of cached tokens, least recently used
+            ones are evicted first.
+        :param last_used_interval: Minimum number of seconds between two writes
+            of the `last_used` date of the same token.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.last_used_interval = last_used_interval
+        self._key = secrets.token_bytes(32)
+        # token digest -> (token id, hashed token, expiry)
+        self._entries: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._last_used_writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, token: str) -> str:
+        return hmac.new(self._key, token.encode(), hashlib.sha256).hexdigest()
+
+    def is_verified(self, token: str, token_id, hashed_token: str) -> bool:
+        """
+        Check if `token` was recently verified against this stored hash.
+        """
+        if self.ttl <= 0:
+            return False
+        digest = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if (
+                entry is None
+                or entry[0] != str(token_id)
+                or entry[1] != hashed_token
+                or entry[2] < time.monotonic()
+            ):
+                self.misses += 1
+                return False
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return True
+
+    def add(self, token: str, token_id, hashed_token: str) -> None:
+        if self.ttl <= 0:
+            return
+        digest = self.digest(token)
+        with self._lock:
+            self._entries[digest] = (
+                str(token_id),
+                hashed_token,
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token_id) -> None:
+        """Forget every verification of a deleted or revoked token"""
+        token_id = str(token_id)
+        with self._lock:
+            for digest in [
+                digest
+                for digest, entry in self._entries.items()
+                if entry[0] == token_id
+            ]:
+                del self._entries[digest]
+            self._last_used_writes.pop(token_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._last_used_writes.clear()
+
+    def should_write_last_used(self, token_id) -> bool:
+        """
+        Coalesce the `last_used` updates: return True at most once every
+        `last_used_interval` seconds for a given token.
+        """
+        token_id = str(token_id)
+        now = time.monotonic()
+        with self._lock:
+            last_write: Optional[float] = self._last_used_writes.get(token_id)
+            if last_write is not None and now - last_write < self.last_used_interval:
+                return False
+            self._last_used_writes[token_id] = now
+            if len(self._last_used_writes) > self.max_size:
+                self._last_used_writes.pop(next(iter(self._last_used_writes)))
+            return True
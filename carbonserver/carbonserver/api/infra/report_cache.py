@@ -0,0 +1,209 @@
+"""
+Cache of the sum reports shown by the dashboard.
+
+The organization, project and experiment reports aggregate all the emissions of
+their runs, and the dashboard asks for them again on every refresh. A report is
+kept for a short time, keyed by entity and date range. The dates of the keys
+are truncated to the minute: the routers default the range to dates relative to
+now, which would otherwise make a new key for every request.
+
+Each entity has a generation, part of the keys of its reports, that is replaced
+when emissions are added to one of its runs: the reports computed before are
+then never read again, and age out of the store. A generation is a random token
+rather than a counter, so that losing it, when the store evicts it, can never
+bring old reports back.
+
+The reports and generations live in a `ReportStore`, an in-process LRU by
+default. A store shared by several server processes, Redis for instance, can be
+plugged in by implementing its two methods.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# The entities owning a run: (experiment id, project id, organization id)
+RunOwners = Tuple[str, str, str]
+
+
+class ReportStore:
+    """Key-value store of the report cache"""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """
+        :param ttl: Seconds the value is kept, None to keep it until evicted.
+        """
+        raise NotImplementedError
+
+
+class InMemoryReportStore(ReportStore):
+    def __init__(self, max_size: int = 1000):
+        """
+        :param max_size: Maximum number of entries, least recently used ones
+            are evicted first.
+        """
+        self.max_size = max_size
+        # key -> (value, expiry)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expiry = entry
+            if expiry is not None and expiry < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expiry = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expiry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReportCache:
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_size: int = 1000,
+        store: Optional[ReportStore] = None,
+    ):
+        """
+        :param ttl: Seconds a report stays valid, 0 disables the cache.
+        :param max_size: Maximum number of entries of the default store, and of
+            runs whose owners are remembered.
+        :param store: Where the reports are kept, an in-process LRU by default.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.store = store if store is not None else InMemoryReportStore(max_size)
+        # Runs never move to another experiment, their owners are kept for good
+        self._run_owners: "OrderedDict[str, RunOwners]" = OrderedDict()
+        self._lock = threading.Lock()
+        # report name -> {"hits": int, "misses": int}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def get_or_compute(
+        self,
+        report: str,
+        entity: str,
+        entity_id,
+        start_date,
+        end_date,
+        compute: Callable[[], T],
+    ) -> T:
+        """
+        Return the cached report, or compute and cache it.
+
+        :param report: Name of the report, for instance "project_sums".
+        :param entity: Kind of the entity the report is about: "organization",
+            "project" or "experiment".
+        """
+        if self.ttl <= 0:
+            return compute()
+        key = (
+            f"report:{report}:{entity_id}:{self._generation(entity, entity_id)}"
+            + f":{_key_date(start_date)}:{_key_date(end_date)}"
+        )
+        value = self.store.get(key)
+        if value is not None:
+            self._count(report, "hits")
+            return value
+        self._count(report, "misses")
+        value = compute()
+        if value is not None:
+            self.store.set(key, value, self.ttl)
+        return value
+
+    def invalidate(self, entity: str, entity_id) -> None:
+        """Forget the reports of an entity"""
+        if self.ttl <= 0:
+            return
+        self.store.set(self._generation_key(entity, entity_id), _new_generation(), None)
+
+    def invalidate_runs(
+        self,
+        run_ids: Iterable,
+        get_run_owners: Callable[[list], Dict[str, RunOwners]],
+    ) -> None:
+        """
+        Forget the reports of the experiments, projects and organizations of
+        runs that received emissions.
+
+        :param get_run_owners: Called with the runs whose owners are unknown,
+            returns their owners by run id.
+        """
+        if self.ttl <= 0:
+            return
+        run_ids = [str(run_id) for run_id in dict.fromkeys(run_ids)]
+        with self._lock:
+            owners = {
+                run_id: self._run_owners[run_id]
+                for run_id in run_ids
+                if run_id in self._run_owners
+            }
+        unknown = [run_id for run_id in run_ids if run_id not in owners]
+        if unknown:
+            found = {
+                str(run_id): tuple(str(owner) for owner in run_owners)
+                for run_id, run_owners in get_run_owners(unknown).items()
+            }
+            owners.update(found)
+            with self._lock:
+                self._run_owners.update(found)
+                while len(self._run_owners) > self.max_size:
+                    self._run_owners.popitem(last=False)
+        for experiment_id, project_id, organization_id in set(owners.values()):
+            self.invalidate("experiment", experiment_id)
+            self.invalidate("project", project_id)
+            self.invalidate("organization", organization_id)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Number of hits and misses, by report"""
+        with self._lock:
+            return {report: dict(counts) for report, counts in self._stats.items()}
+
+    def _generation(self, entity: str, entity_id) -> str:
+        key = self._generation_key(entity, entity_id)
+        generation = self.store.get(key)
+        if generation is None:
+            generation = _new_generation()
+            self.store.set(key, generation, None)
+        return generation
+
+    @staticmethod
+    def _generation_key(entity: str, entity_id) -> str:
+        return f"generation:{entity}:{entity_id}"
+
+    def _count(self, report: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._stats.setdefault(report, {"hits": 0, "misses": 0})
+            counts[outcome] += 1
+
+
+def _new_generation() -> str:
+    return uuid.uuid4().hex
+
+
+def _key_date(value) -> str:
+    if isinstance(value, datetime):
+        value = value.replace(second=0, microsecond=0)
+    return str(value)
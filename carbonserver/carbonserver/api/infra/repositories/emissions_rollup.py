@@ -0,0 +1,206 @@
+"""
+Hourly rollup of the emissions, used by the sum reports.
+
+A run sends an emission every few seconds, so summing the raw emissions of an
+organization over months reads millions of rows. The emissions of each run are
+also summed by hour in the `emissions_hourly` table, updated in the transaction
+that saves them. A report then reads the rollup for the whole hours of its date
+range, and the raw emissions only for the partial hours at both ends.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import Float, Integer, and_, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+
+from carbonserver.api.infra.database.sql_models import Emission as SqlModelEmission
+from carbonserver.api.infra.database.sql_models import (
+    EmissionHourly as SqlModelEmissionHourly,
+)
+
+# Measures summed by the reports
+SUMMED_COLUMNS = (
+    "emissions_sum",
+    "cpu_energy",
+    "gpu_energy",
+    "ram_energy",
+    "energy_consumed",
+    "duration",
+)
+# Measures averaged by the reports, rolled up as a sum and a count
+AVERAGED_COLUMNS = (
+    "cpu_power",
+    "gpu_power",
+    "ram_power",
+    "emissions_rate",
+    "cpu_utilization_percent",
+    "gpu_utilization_percent",
+    "ram_utilization_percent",
+)
+# Columns of the rollup table holding the measures
+ROLLUP_COLUMNS = SUMMED_COLUMNS + tuple(
+    f"{name}_{part}" for name in AVERAGED_COLUMNS for part in ("sum", "count")
+)
+
+
+def _rolled_up_columns(source) -> List:
+    """Sums and counts of the emissions of `source` (a table or a subquery),
+    named like the columns of the rollup table."""
+    columns = [
+        func.coalesce(func.sum(getattr(source.c, name)), 0).label(name)
+        for name in SUMMED_COLUMNS
+    ]
+    for name in AVERAGED_COLUMNS:
+        column = getattr(source.c, name)
+        columns.append(func.coalesce(func.sum(column), 0).label(f"{name}_sum"))
+        columns.append(func.count(column).label(f"{name}_count"))
+    return columns
+
+
+def upsert_hourly_rollup(session, emission_ids: List) -> None:
+    """Add emissions just inserted, in the same transaction, to the hourly
+    rollup of their runs.
+
+    :emission_ids: The ids of the inserted emissions, they must not be rolled
+        up already.
+    """
+    if not emission_ids:
+        return
+    emissions = SqlModelEmission.__table__
+    hour = func.date_trunc("hour", emissions.c.timestamp)
+    new_buckets = (
+        select(emissions.c.run_id, hour.label("hour"), *_rolled_up_columns(emissions))
+        .where(
+            emissions.c.id.in_(emission_ids),
+            emissions.c.run_id.isnot(None),
+            emissions.c.timestamp.isnot(None),
+        )
+        .group_by(emissions.c.run_id, hour)
+    )
+    hourly = SqlModelEmissionHourly.__table__
+    statement = insert(hourly).from_select(
+        ["run_id", "hour", *ROLLUP_COLUMNS], new_buckets
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[hourly.c.run_id, hourly.c.hour],
+        set_={
+            name: getattr(hourly.c, name) + getattr(statement.excluded, name)
+            for name in ROLLUP_COLUMNS
+        },
+    )
+    session.execute(statement)
+
+
+def _as_utc(value) -> datetime:
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def hour_bounds(start_date, end_date) -> Tuple[datetime, datetime]:
+    """The whole hours [first, last) inside [start_date, end_date], read from
+    the rollup. Aware dates are converted to UTC; first >= last when the range
+    contains no whole hour."""
+    start, end = _as_utc(start_date), _as_utc(end_date)
+    first = _floor_hour(start)
+    if first < start:
+        first += timedelta(hours=1)
+    return first, _floor_hour(end)
+
+
+def emissions_by_run(run_ids, start_date, end_date):
+    """Subquery of the sums and counts of the emissions of each run between two
+    dates, to be grouped again with `report_columns`: one row for the whole
+    hours, read from the rollup, and one for the remaining raw emissions.
+
+    :run_ids: A select of the ids of the runs of the report. Both tables are
+        filtered on it, so that their (run_id, ...) indexes are used instead of
+        scanning the emissions of every run in the range.
+    """
+    emissions = SqlModelEmission.__table__
+    first_hour, last_hour = hour_bounds(start_date, end_date)
+    in_range = and_(
+        emissions.c.run_id.in_(run_ids),
+        emissions.c.timestamp >= start_date,
+        emissions.c.timestamp <= end_date,
+    )
+    if first_hour >= last_hour:
+        return (
+            select(emissions.c.run_id, *_rolled_up_columns(emissions))
+            .where(in_range)
+            .group_by(emissions.c.run_id)
+            .subquery("emissions_by_run")
+        )
+
+    raw_tail = (
+        select(emissions.c.run_id, *_rolled_up_columns(emissions))
+        .where(
+            in_range,
+            or_(
+                emissions.c.timestamp < first_hour,
+                emissions.c.timestamp >= last_hour,
+            ),
+        )
+        .group_by(emissions.c.run_id)
+    )
+    hourly = SqlModelEmissionHourly.__table__
+    whole_hours = (
+        select(
+            hourly.c.run_id,
+            *(func.sum(getattr(hourly.c, name)).label(name) for name in ROLLUP_COLUMNS),
+        )
+        .where(
+            hourly.c.run_id.in_(run_ids),
+            hourly.c.hour >= first_hour,
+            hourly.c.hour < last_hour,
+        )
+        .group_by(hourly.c.run_id)
+    )
+    return raw_tail.union_all(whole_hours).subquery("emissions_by_run")
+
+
+def report_columns(parts) -> List:
+    """The aggregated columns of a report, computed from `emissions_by_run`,
+    with the labels of the report schemas."""
+    return [
+        func.sum(parts.c.emissions_sum).label("emissions"),
+        *(
+            _average(parts, name).label(name)
+            for name in ("cpu_power", "gpu_power", "ram_power")
+        ),
+        *(
+            func.sum(getattr(parts.c, name)).label(name)
+            for name in (
+                "cpu_energy",
+                "gpu_energy",
+                "ram_energy",
+                "energy_consumed",
+                "duration",
+            )
+        ),
+        *(
+            _average(parts, name).label(name)
+            for name in (
+                "emissions_rate",
+                "cpu_utilization_percent",
+                "gpu_utilization_percent",
+                "ram_utilization_percent",
+            )
+        ),
+        cast(func.coalesce(func.sum(parts.c.emissions_rate_count), 0), Integer).label(
+            "emissions_count"
+        ),
+    ]
+
+
+def _average(parts, name: str):
+    return func.sum(getattr(parts.c, f"{name}_sum")) / func.nullif(
+        cast(func.sum(getattr(parts.c, f"{name}_count")), Float), 0
+    )
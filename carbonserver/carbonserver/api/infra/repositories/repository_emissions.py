@@ -1,13 +1,15 @@
 from contextlib import AbstractContextManager
-from typing import List
+from typing import List, Optional
 from uuid import uuid4
 
 from click import UUID
 from dependency_injector.providers import Callable
 from fastapi import HTTPException
+from sqlalchemy import func, insert
 
 from carbonserver.api.domain.emissions import Emissions
 from carbonserver.api.infra.database import sql_models
+from carbonserver.api.infra.repositories.emissions_rollup import upsert_hourly_rollup
 from carbonserver.api.schemas import Emission, EmissionCreate
 
 """
@@ -23,34 +25,56 @@ class SqlAlchemyRepository(Emissions):
         self.session_factory = session_factory
 
     def add_emission(self, emission: EmissionCreate) -> UUID:
-        """Save an emission to the database.
+        """Save an emission to the database, unless an emission with the id
+        chosen by the client is already saved. The hourly rollup of its run is
+        updated in the same transaction.
 
         :emission: An Emission in pyDantic BaseModel format.
         """
         with self.session_factory() as session:
-            db_emission = sql_models.Emission(
-                id=uuid4(),
-                timestamp=emission.timestamp,
-                duration=emission.duration,
-                emissions_sum=emission.emissions_sum,
-                emissions_rate=emission.emissions_rate,
-                cpu_power=emission.cpu_power,
-                gpu_power=emission.gpu_power,
-                ram_power=emission.ram_power,
-                cpu_energy=emission.cpu_energy,
-                gpu_energy=emission.gpu_energy,
-                ram_energy=emission.ram_energy,
-                energy_consumed=emission.energy_consumed,
-                cpu_utilization_percent=emission.cpu_utilization_percent,
-                gpu_utilization_percent=emission.gpu_utilization_percent,
-                ram_utilization_percent=emission.ram_utilization_percent,
-                wue=emission.wue,
-                run_id=emission.run_id,
-            )
+            if emission.id is not None and self._saved_ids(session, [emission.id]):
+                return emission.id
+            db_emission = sql_models.Emission(**self.map_schema_to_row(emission))
             session.add(db_emission)
+            session.flush()
+            upsert_hourly_rollup(session, [db_emission.id])
             session.commit()
             return db_emission.id
 
+    def add_emissions(self, emissions: List[EmissionCreate]) -> List[UUID]:
+        """Save several emissions to the database with a single INSERT statement
+        executed for all the rows, in one transaction. The emissions whose id,
+        chosen by the client, is already saved are skipped: a batch sent again
+        is not saved twice. The hourly rollup of their runs is updated in the
+        same transaction, with the new emissions only.
+
+        :emissions: A list of Emission in pyDantic BaseModel format.
+        :returns: The ids of the saved emissions, in the same order.
+        """
+        rows = [self.map_schema_to_row(emission) for emission in emissions]
+        client_ids = [emission.id for emission in emissions if emission.id is not None]
+        with self.session_factory() as session:
+            saved_ids = self._saved_ids(session, client_ids) if client_ids else set()
+            new_rows = {}
+            for row in rows:
+                if row["id"] not in saved_ids:
+                    new_rows.setdefault(row["id"], row)
+            if new_rows:
+                session.execute(insert(sql_models.Emission), list(new_rows.values()))
+                upsert_hourly_rollup(session, list(new_rows))
+            session.commit()
+        return [row["id"] for row in rows]
+
+    @staticmethod
+    def _saved_ids(session, emission_ids: List[UUID]) -> set:
+        """The ids among emission_ids that are already in the database."""
+        return {
+            emission_id
+            for (emission_id,) in session.query(sql_models.Emission.id)
+            .filter(sql_models.Emission.id.in_(emission_ids))
+            .all()
+        }
+
     def get_one_emission(self, emission_id) -> Emission:
         """Find the emission in database and return it
 
@@ -70,22 +94,74 @@ class SqlAlchemyRepository(Emissions):
                 )
             return self.map_sql_to_schema(e)
 
-    def get_emissions_from_run(self, run_id) -> List[Emission]:
-        """Find the emissions from an run in database and return it
+    def get_emissions_from_run(
+        self, run_id, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Emission]:
+        """Find the emissions from an run in database and return them, most
+        recent first. Only the requested page is read, through the
+        (run_id, timestamp) index.
 
         :run_id: The id of the run to retreive emissions from.
+        :limit: Maximum number of emissions to return, all of them if None.
+        :offset: Number of emissions to skip.
         :returns: An Emission in pyDantic BaseModel format.
         :rtype: List[schemas.Emission]
         """
         with self.session_factory() as session:
-            res = (
+            query = (
                 session.query(sql_models.Emission)
                 .filter(sql_models.Emission.run_id == run_id)
-                .order_by(sql_models.Emission.timestamp.desc())
+                .order_by(
+                    sql_models.Emission.timestamp.desc(),
+                    sql_models.Emission.id.desc(),
+                )
+                .offset(offset)
             )
-            if res.first() is None:
-                return []
-            return [self.map_sql_to_schema(e) for e in res]
+            if limit is not None:
+                query = query.limit(limit)
+            return [self.map_sql_to_schema(e) for e in query]
+
+    def count_emissions_from_run(self, run_id) -> int:
+        """Count the emissions of a run
+
+        :run_id: The id of the run.
+        :returns: The number of emissions.
+        """
+        with self.session_factory() as session:
+            return (
+                session.query(func.count(sql_models.Emission.id))
+                .filter(sql_models.Emission.run_id == run_id)
+                .scalar()
+            )
+
+    @staticmethod
+    def map_schema_to_row(emission: EmissionCreate) -> dict:
+        """Convert a schemas.EmissionCreate to the column values of a new row
+
+        :emission: An Emission in pyDantic BaseModel format.
+        :returns: The values of the emissions table columns, with the id chosen
+            by the client or a new one.
+        :rtype: dict
+        """
+        return dict(
+            id=emission.id or uuid4(),
+            timestamp=emission.timestamp,
+            duration=emission.duration,
+            emissions_sum=emission.emissions_sum,
+            emissions_rate=emission.emissions_rate,
+            cpu_power=emission.cpu_power,
+            gpu_power=emission.gpu_power,
+            ram_power=emission.ram_power,
+            cpu_energy=emission.cpu_energy,
+            gpu_energy=emission.gpu_energy,
+            ram_energy=emission.ram_energy,
+            energy_consumed=emission.energy_consumed,
+            cpu_utilization_percent=emission.cpu_utilization_percent,
+            gpu_utilization_percent=emission.gpu_utilization_percent,
+            ram_utilization_percent=emission.ram_utilization_percent,
+            wue=emission.wue,
+            run_id=emission.run_id,
+        )
 
     @staticmethod
     def map_sql_to_schema(emission: sql_models.Emission) -> Emission:
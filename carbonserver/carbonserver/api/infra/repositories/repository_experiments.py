@@ -3,12 +3,16 @@ from typing import List
 
 from dependency_injector.providers import Callable
 from fastapi import HTTPException
-from sqlalchemy import and_, func
+from sqlalchemy import func, select
 
 from carbonserver.api.domain.experiments import Experiments
 from carbonserver.api.infra.database.sql_models import Emission as SqlModelEmission
 from carbonserver.api.infra.database.sql_models import Experiment as SqlModelExperiment
 from carbonserver.api.infra.database.sql_models import Run as SqlModelRun
+from carbonserver.api.infra.repositories.emissions_rollup import (
+    emissions_by_run,
+    report_columns,
+)
 from carbonserver.api.schemas import Experiment, ExperimentCreate, ExperimentReport
 
 
@@ -111,6 +115,14 @@ class SqlAlchemyRepository(Experiments):
     def get_project_detailed_sums_by_experiment(
         self, project_id, start_date, end_date
     ) -> List[ExperimentReport]:
+        run_ids = (
+            select(SqlModelRun.id)
+            .join(
+                SqlModelExperiment, SqlModelExperiment.id == SqlModelRun.experiment_id
+            )
+            .where(SqlModelExperiment.project_id == project_id)
+        )
+        parts = emissions_by_run(run_ids, start_date, end_date)
         with self.session_factory() as session:
             res = (
                 session.query(
@@ -125,43 +137,14 @@ class SqlAlchemyRepository(Experiments):
                     SqlModelExperiment.cloud_provider,
                     SqlModelExperiment.cloud_region,
                     SqlModelExperiment.project_id,
-                    func.sum(SqlModelEmission.emissions_sum).label("emissions"),
-                    func.avg(SqlModelEmission.cpu_power).label("cpu_power"),
-                    func.avg(SqlModelEmission.gpu_power).label("gpu_power"),
-                    func.avg(SqlModelEmission.ram_power).label("ram_power"),
-                    func.sum(SqlModelEmission.cpu_energy).label("cpu_energy"),
-                    func.sum(SqlModelEmission.gpu_energy).label("gpu_energy"),
-                    func.sum(SqlModelEmission.ram_energy).label("ram_energy"),
-                    func.sum(SqlModelEmission.energy_consumed).label("energy_consumed"),
-                    func.sum(SqlModelEmission.duration).label("duration"),
-                    func.avg(SqlModelEmission.emissions_rate).label("emissions_rate"),
-                    func.avg(SqlModelEmission.cpu_utilization_percent).label(
-                        "cpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.gpu_utilization_percent).label(
-                        "gpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.ram_utilization_percent).label(
-                        "ram_utilization_percent"
-                    ),
-                    func.count(SqlModelEmission.emissions_rate).label(
-                        "emissions_count"
-                    ),
+                    *report_columns(parts),
                 )
                 .join(
                     SqlModelRun,
                     SqlModelExperiment.id == SqlModelRun.experiment_id,
                     isouter=True,
                 )
-                .join(
-                    SqlModelEmission,
-                    and_(
-                        SqlModelRun.id == SqlModelEmission.run_id,
-                        SqlModelEmission.timestamp >= start_date,
-                        SqlModelEmission.timestamp <= end_date,
-                    ),
-                    isouter=True,
-                )
+                .join(parts, SqlModelRun.id == parts.c.run_id, isouter=True)
                 .filter(SqlModelExperiment.project_id == project_id)
                 .group_by(
                     SqlModelExperiment.id,
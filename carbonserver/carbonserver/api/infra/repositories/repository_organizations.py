@@ -5,10 +5,9 @@ from uuid import UUID, uuid4
 import sqlalchemy
 from dependency_injector.providers import Callable
 from fastapi import HTTPException
-from sqlalchemy import and_, func
+from sqlalchemy import select
 
 from carbonserver.api.domain.organizations import Organizations
-from carbonserver.api.infra.database.sql_models import Emission as SqlModelEmission
 from carbonserver.api.infra.database.sql_models import Experiment as SqlModelExperiment
 from carbonserver.api.infra.database.sql_models import Membership as SqlModelMembership
 from carbonserver.api.infra.database.sql_models import (
@@ -17,6 +16,10 @@ from carbonserver.api.infra.database.sql_models import (
 from carbonserver.api.infra.database.sql_models import Project as SqlModelProject
 from carbonserver.api.infra.database.sql_models import Run as SqlModelRun
 from carbonserver.api.infra.database.sql_models import User as SqlModelUser
+from carbonserver.api.infra.repositories.emissions_rollup import (
+    emissions_by_run,
+    report_columns,
+)
 from carbonserver.api.schemas import (
     Organization,
     OrganizationCreate,
@@ -100,34 +103,22 @@ class SqlAlchemyRepository(Organizations):
         :returns: A report containing the sums of emissions
         :rtype: schemas.ProjectReport
         """
+        run_ids = (
+            select(SqlModelRun.id)
+            .join(
+                SqlModelExperiment, SqlModelExperiment.id == SqlModelRun.experiment_id
+            )
+            .join(SqlModelProject, SqlModelProject.id == SqlModelExperiment.project_id)
+            .where(SqlModelProject.organization_id == organization_id)
+        )
+        parts = emissions_by_run(run_ids, start_date, end_date)
         with self.session_factory() as session:
             res = (
                 session.query(
                     SqlModelOrganization.id.label("organization_id"),
                     SqlModelOrganization.name,
                     SqlModelOrganization.description,
-                    func.sum(SqlModelEmission.emissions_sum).label("emissions"),
-                    func.avg(SqlModelEmission.cpu_power).label("cpu_power"),
-                    func.avg(SqlModelEmission.gpu_power).label("gpu_power"),
-                    func.avg(SqlModelEmission.ram_power).label("ram_power"),
-                    func.sum(SqlModelEmission.cpu_energy).label("cpu_energy"),
-                    func.sum(SqlModelEmission.gpu_energy).label("gpu_energy"),
-                    func.sum(SqlModelEmission.ram_energy).label("ram_energy"),
-                    func.sum(SqlModelEmission.energy_consumed).label("energy_consumed"),
-                    func.sum(SqlModelEmission.duration).label("duration"),
-                    func.avg(SqlModelEmission.emissions_rate).label("emissions_rate"),
-                    func.avg(SqlModelEmission.cpu_utilization_percent).label(
-                        "cpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.gpu_utilization_percent).label(
-                        "gpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.ram_utilization_percent).label(
-                        "ram_utilization_percent"
-                    ),
-                    func.count(SqlModelEmission.emissions_rate).label(
-                        "emissions_count"
-                    ),
+                    *report_columns(parts),
                 )
                 .join(
                     SqlModelProject,
@@ -144,16 +135,8 @@ class SqlAlchemyRepository(Organizations):
                     SqlModelExperiment.id == SqlModelRun.experiment_id,
                     isouter=True,
                 )
-                .join(
-                    SqlModelEmission,
-                    SqlModelRun.id == SqlModelEmission.run_id,
-                    isouter=True,
-                )
+                .join(parts, SqlModelRun.id == parts.c.run_id)
                 .filter(SqlModelOrganization.id == organization_id)
-                .filter(
-                    and_(SqlModelEmission.timestamp >= start_date),
-                    (SqlModelEmission.timestamp <= end_date),
-                )
                 .group_by(
                     SqlModelOrganization.id,
                     SqlModelOrganization.name,
@@ -1,21 +1,56 @@
 from contextlib import AbstractContextManager
-from typing import List
+from typing import List, Optional, Tuple
+from uuid import UUID
 
 from dependency_injector.providers import Callable
-from sqlalchemy import Text, and_, cast, func
+from sqlalchemy import Text, and_, cast, false, select
 
 from carbonserver.api.domain.projects import Projects
 from carbonserver.api.errors import NotFoundError, NotFoundErrorEnum, UserException
 from carbonserver.api.infra.database.sql_models import Emission as SqlModelEmission
 from carbonserver.api.infra.database.sql_models import Experiment as SqlModelExperiment
+from carbonserver.api.infra.database.sql_models import Membership as SqlModelMembership
 from carbonserver.api.infra.database.sql_models import Project as SqlModelProject
 from carbonserver.api.infra.database.sql_models import Run as SqlModelRun
+from carbonserver.api.infra.permission_cache import PermissionCache
+from carbonserver.api.infra.repositories.emissions_rollup import (
+    emissions_by_run,
+    report_columns,
+)
 from carbonserver.api.schemas import Project, ProjectCreate, ProjectReport
 
+# Entities readable through their project, and the path up to it
+PROJECT_PATHS = {
+    "project": (SqlModelProject, ()),
+    "experiment": (
+        SqlModelExperiment,
+        ((SqlModelProject, SqlModelProject.id == SqlModelExperiment.project_id),),
+    ),
+    "run": (
+        SqlModelRun,
+        (
+            (SqlModelExperiment, SqlModelExperiment.id == SqlModelRun.experiment_id),
+            (SqlModelProject, SqlModelProject.id == SqlModelExperiment.project_id),
+        ),
+    ),
+    "emission": (
+        SqlModelEmission,
+        (
+            (SqlModelRun, SqlModelRun.id == SqlModelEmission.run_id),
+            (SqlModelExperiment, SqlModelExperiment.id == SqlModelRun.experiment_id),
+            (SqlModelProject, SqlModelProject.id == SqlModelExperiment.project_id),
+        ),
+    ),
+}
+
 
 class SqlAlchemyRepository(Projects):
-    def __init__(self, session_factory) -> Callable[..., AbstractContextManager]:
+    def __init__(
+        self, session_factory, permission_cache: Optional[PermissionCache] = None
+    ) -> Callable[..., AbstractContextManager]:
         self.session_factory = session_factory
+        # Shared across requests, cleared when a project changes
+        self.permission_cache = permission_cache
 
     def add_project(self, project: ProjectCreate):
         with self.session_factory() as session:
@@ -46,6 +81,7 @@ class SqlAlchemyRepository(Projects):
                 )
             session.delete(db_project)
             session.commit()
+        self._forget_permissions()
 
     def get_one_project(self, project_id) -> Project:
         with self.session_factory() as session:
@@ -113,6 +149,14 @@ class SqlAlchemyRepository(Projects):
         :returns: A report containing the sums of emissions
         :rtype: schemas.ProjectReport
         """
+        run_ids = (
+            select(SqlModelRun.id)
+            .join(
+                SqlModelExperiment, SqlModelExperiment.id == SqlModelRun.experiment_id
+            )
+            .where(SqlModelExperiment.project_id == project_id)
+        )
+        parts = emissions_by_run(run_ids, start_date, end_date)
         with self.session_factory() as session:
             res = (
                 session.query(
@@ -120,28 +164,7 @@ class SqlAlchemyRepository(Projects):
                     SqlModelProject.name,
                     SqlModelProject.description,
                     SqlModelProject.organization_id,
-                    func.sum(SqlModelEmission.emissions_sum).label("emissions"),
-                    func.avg(SqlModelEmission.cpu_power).label("cpu_power"),
-                    func.avg(SqlModelEmission.gpu_power).label("gpu_power"),
-                    func.avg(SqlModelEmission.ram_power).label("ram_power"),
-                    func.sum(SqlModelEmission.cpu_energy).label("cpu_energy"),
-                    func.sum(SqlModelEmission.gpu_energy).label("gpu_energy"),
-                    func.sum(SqlModelEmission.ram_energy).label("ram_energy"),
-                    func.sum(SqlModelEmission.energy_consumed).label("energy_consumed"),
-                    func.sum(SqlModelEmission.duration).label("duration"),
-                    func.avg(SqlModelEmission.emissions_rate).label("emissions_rate"),
-                    func.avg(SqlModelEmission.cpu_utilization_percent).label(
-                        "cpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.gpu_utilization_percent).label(
-                        "gpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.ram_utilization_percent).label(
-                        "ram_utilization_percent"
-                    ),
-                    func.count(SqlModelEmission.emissions_rate).label(
-                        "emissions_count"
-                    ),
+                    *report_columns(parts),
                 )
                 .join(
                     SqlModelExperiment,
@@ -153,16 +176,8 @@ class SqlAlchemyRepository(Projects):
                     SqlModelExperiment.id == SqlModelRun.experiment_id,
                     isouter=True,
                 )
-                .join(
-                    SqlModelEmission,
-                    SqlModelRun.id == SqlModelEmission.run_id,
-                    isouter=True,
-                )
+                .join(parts, SqlModelRun.id == parts.c.run_id)
                 .filter(SqlModelProject.id == project_id)
-                .filter(
-                    and_(SqlModelEmission.timestamp >= start_date),
-                    (SqlModelEmission.timestamp <= end_date),
-                )
                 .group_by(
                     SqlModelProject.id,
                     SqlModelProject.name,
@@ -172,6 +187,40 @@ class SqlAlchemyRepository(Projects):
             )
             return res
 
+    def get_project_access(
+        self, entity: str, entity_id, user_id: Optional[UUID]
+    ) -> Optional[Tuple[bool, bool]]:
+        """Find, with a single query, whether the project owning an entity is
+        public and whether the user is a member of its organization.
+
+        :entity: "project", "experiment", "run" or "emission".
+        :user_id: The id of the user, None for anonymous users.
+        :returns: (public, member), or None if the entity does not exist.
+        """
+        model, path = PROJECT_PATHS[entity]
+        if user_id is None:
+            member = false()
+        else:
+            member = SqlModelMembership.user_id.isnot(None)
+        with self.session_factory() as session:
+            query = session.query(SqlModelProject.public, member).select_from(model)
+            for parent, on in path:
+                query = query.join(parent, on)
+            if user_id is not None:
+                query = query.outerjoin(
+                    SqlModelMembership,
+                    and_(
+                        SqlModelMembership.organization_id
+                        == SqlModelProject.organization_id,
+                        SqlModelMembership.user_id == user_id,
+                    ),
+                )
+            row = query.filter(model.id == entity_id).first()
+            if row is None:
+                return None
+            public, is_member = row
+            return bool(public), bool(is_member)
+
     def patch_project(self, project_id, project) -> Project:
         with self.session_factory() as session:
             db_project = (
@@ -191,7 +240,15 @@ class SqlAlchemyRepository(Projects):
                     setattr(db_project, attr, value)
             session.commit()
             session.refresh(db_project)
-            return self.map_sql_to_schema(db_project)
+            patched = self.map_sql_to_schema(db_project)
+        self._forget_permissions()
+        return patched
+
+    def _forget_permissions(self) -> None:
+        """Who can read a changed project, and everything under it, may have
+        changed"""
+        if self.permission_cache is not None:
+            self.permission_cache.clear()
 
     @staticmethod
     def map_sql_to_schema(project: SqlModelProject) -> Project:
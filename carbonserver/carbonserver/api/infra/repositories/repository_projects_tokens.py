@@ -13,12 +13,17 @@ from carbonserver.api.infra.database.sql_models import (
     ProjectToken as SqlModelProjectToken,
 )
 from carbonserver.api.infra.database.sql_models import Run as SqlModelRun
+from carbonserver.api.infra.project_token_cache import VerifiedTokenCache
 from carbonserver.api.schemas import ProjectToken, ProjectTokenInternal
 
 
 class SqlAlchemyRepository(ProjectTokens):
-    def __init__(self, session_factory) -> Callable[..., AbstractContextManager]:
+    def __init__(
+        self, session_factory, token_cache: Optional[VerifiedTokenCache] = None
+    ) -> Callable[..., AbstractContextManager]:
         self.session_factory = session_factory
+        # Shared across requests, None to verify every token with bcrypt
+        self.token_cache = token_cache
 
     def add_project_token(self, project_token: ProjectTokenInternal):
         lookup_value = generate_lookup_value(project_token.token)
@@ -49,6 +54,8 @@ class SqlAlchemyRepository(ProjectTokens):
                 )
             session.delete(db_project_token)
             session.commit()
+        if self.token_cache is not None:
+            self.token_cache.invalidate(token_id)
 
     def list_project_tokens(self, project_id: str):
         with self.session_factory() as session:
@@ -143,25 +150,49 @@ class SqlAlchemyRepository(ProjectTokens):
         Returns:
             ProjectToken: The correct token if found, None otherwise
         """
-        if db_project_tokens != []:
-            for db_project_token in db_project_tokens:
-                verification_response = verify_api_key(
-                    target_token, db_project_token.hashed_token
-                )
-                if verification_response:
-                    self._set_last_used(db_project_token)
-                    return self.map_sql_to_schema(db_project_token)
+        for db_project_token in db_project_tokens:
+            if self._is_token_valid(db_project_token, target_token):
+                self._set_last_used(db_project_token)
+                return self.map_sql_to_schema(db_project_token)
         return None
 
-    def _set_last_used(
-        self, project_token: SqlModelProjectToken
-    ) -> SqlModelProjectToken:
-        """Update the last_used field of the project token"""
+    def _is_token_valid(
+        self, db_project_token: SqlModelProjectToken, target_token: str
+    ) -> bool:
+        """Check the token against its bcrypt hash, unless recently verified"""
+        cache = self.token_cache
+        if cache is None:
+            return verify_api_key(target_token, db_project_token.hashed_token)
+        if db_project_token.revoked:
+            cache.invalidate(db_project_token.id)
+            return verify_api_key(target_token, db_project_token.hashed_token)
+        if cache.is_verified(
+            target_token, db_project_token.id, db_project_token.hashed_token
+        ):
+            return True
+        if verify_api_key(target_token, db_project_token.hashed_token):
+            cache.add(target_token, db_project_token.id, db_project_token.hashed_token)
+            return True
+        return False
+
+    def _set_last_used(self, project_token: SqlModelProjectToken) -> None:
+        """Update the last_used field of the project token
+
+        With a token cache, the update is written at most once per
+        `last_used_interval` for each token.
+        """
+        if (
+            self.token_cache is not None
+            and not self.token_cache.should_write_last_used(project_token.id)
+        ):
+            return
+        last_used = datetime.datetime.now()
         with self.session_factory() as session:
-            project_token.last_used = datetime.datetime.now()
+            session.query(SqlModelProjectToken).filter(
+                SqlModelProjectToken.id == project_token.id
+            ).update({SqlModelProjectToken.last_used: last_used})
             session.commit()
-            session.refresh(project_token)
-            return project_token
+        project_token.last_used = last_used
 
     @staticmethod
     def map_sql_to_schema(project_token: SqlModelProjectToken) -> ProjectToken:
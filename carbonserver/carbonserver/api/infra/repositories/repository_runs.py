@@ -1,18 +1,21 @@
 import uuid
 from contextlib import AbstractContextManager
-from typing import List, Union
+from typing import Dict, List, Tuple, Union
 
 from dependency_injector.providers import Callable
 from fastapi import HTTPException
-from sqlalchemy import and_, func
+from sqlalchemy import and_, select
 
 from carbonserver.api.domain.runs import Runs
 from carbonserver.api.errors import EmptyResultException
-from carbonserver.api.infra.database.sql_models import Emission as SqlModelEmission
 from carbonserver.api.infra.database.sql_models import Experiment as SqlModelExperiment
 from carbonserver.api.infra.database.sql_models import Membership as SqlModelMembership
 from carbonserver.api.infra.database.sql_models import Project as SqlModelProject
 from carbonserver.api.infra.database.sql_models import Run as SqlModelRun
+from carbonserver.api.infra.repositories.emissions_rollup import (
+    emissions_by_run,
+    report_columns,
+)
 from carbonserver.api.schemas import Run, RunCreate, RunReport
 from carbonserver.logger import logger
 
@@ -117,6 +120,36 @@ class SqlAlchemyRepository(Runs):
                 raise EmptyResultException(f"No runs for experiment {experiment_id}")
             return [self.map_sql_to_schema(e) for e in res]
 
+    def get_run_owners(self, run_ids) -> Dict[str, Tuple[str, str, str]]:
+        """Find the experiment, project and organization of runs, in a single
+        query. Unknown runs are left out.
+
+        :run_ids: The ids of the runs.
+        :returns: (experiment id, project id, organization id) by run id.
+        """
+        with self.session_factory() as session:
+            res = (
+                session.query(
+                    SqlModelRun.id,
+                    SqlModelRun.experiment_id,
+                    SqlModelExperiment.project_id,
+                    SqlModelProject.organization_id,
+                )
+                .join(
+                    SqlModelExperiment,
+                    SqlModelRun.experiment_id == SqlModelExperiment.id,
+                )
+                .join(
+                    SqlModelProject, SqlModelExperiment.project_id == SqlModelProject.id
+                )
+                .filter(SqlModelRun.id.in_(run_ids))
+                .all()
+            )
+            return {
+                str(run_id): (str(experiment_id), str(project_id), str(organization_id))
+                for run_id, experiment_id, project_id, organization_id in res
+            }
+
     @staticmethod
     def map_sql_to_schema(run: SqlModelRun) -> Run:
         """Convert a models.Run to a schemas.Run
@@ -156,43 +189,19 @@ class SqlAlchemyRepository(Runs):
         :returns: A report containing the sums of emissions
         :rtype: schemas.RunReport
         """
+        run_ids = select(SqlModelRun.id).where(
+            SqlModelRun.experiment_id == experiment_id
+        )
+        parts = emissions_by_run(run_ids, start_date, end_date)
         with self.session_factory() as session:
             res = (
                 session.query(
                     SqlModelRun.id.label("run_id"),
                     SqlModelRun.timestamp,
                     SqlModelRun.experiment_id,
-                    func.sum(SqlModelEmission.emissions_sum).label("emissions"),
-                    func.avg(SqlModelEmission.cpu_power).label("cpu_power"),
-                    func.avg(SqlModelEmission.gpu_power).label("gpu_power"),
-                    func.avg(SqlModelEmission.ram_power).label("ram_power"),
-                    func.sum(SqlModelEmission.cpu_energy).label("cpu_energy"),
-                    func.sum(SqlModelEmission.gpu_energy).label("gpu_energy"),
-                    func.sum(SqlModelEmission.ram_energy).label("ram_energy"),
-                    func.sum(SqlModelEmission.energy_consumed).label("energy_consumed"),
-                    func.sum(SqlModelEmission.duration).label("duration"),
-                    func.avg(SqlModelEmission.emissions_rate).label("emissions_rate"),
-                    func.avg(SqlModelEmission.cpu_utilization_percent).label(
-                        "cpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.gpu_utilization_percent).label(
-                        "gpu_utilization_percent"
-                    ),
-                    func.avg(SqlModelEmission.ram_utilization_percent).label(
-                        "ram_utilization_percent"
-                    ),
-                    func.count(SqlModelEmission.emissions_rate).label(
-                        "emissions_count"
-                    ),
-                )
-                .join(
-                    SqlModelEmission,
-                    and_(
-                        SqlModelRun.id == SqlModelEmission.run_id,
-                        SqlModelEmission.timestamp >= start_date,
-                        SqlModelEmission.timestamp <= end_date,
-                    ),
+                    *report_columns(parts),
                 )
+                .join(parts, SqlModelRun.id == parts.c.run_id)
                 .filter(SqlModelRun.experiment_id == experiment_id)
                 .group_by(
                     SqlModelRun.id,
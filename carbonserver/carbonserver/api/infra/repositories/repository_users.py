@@ -1,5 +1,5 @@
 from contextlib import AbstractContextManager
-from typing import Callable, List
+from typing import Callable, List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException
@@ -9,12 +9,17 @@ from carbonserver.api.infra.database.sql_models import Experiment as SqlModelExp
 from carbonserver.api.infra.database.sql_models import Membership as SqlModelMembership
 from carbonserver.api.infra.database.sql_models import Project as SqlModelProject
 from carbonserver.api.infra.database.sql_models import User as SqlModelUser
+from carbonserver.api.infra.permission_cache import PermissionCache
 from carbonserver.api.schemas import User, UserAutoCreate
 
 
 class SqlAlchemyRepository(Users):
-    def __init__(self, session_factory) -> Callable[..., AbstractContextManager]:
+    def __init__(
+        self, session_factory, permission_cache: Optional[PermissionCache] = None
+    ) -> Callable[..., AbstractContextManager]:
         self.session_factory = session_factory
+        # Shared across requests, told when memberships change
+        self.permission_cache = permission_cache
 
     def create_user(self, user: UserAutoCreate) -> User:
         """Creates a user in the database
@@ -89,7 +94,9 @@ class SqlAlchemyRepository(Users):
             )
             session.add(db_membership)
             session.commit()
-            return user
+        if self.permission_cache is not None:
+            self.permission_cache.invalidate_user(user.id)
+        return user
 
     def is_user_in_organization(
         self, organization_id: UUID, user: User, *, is_admin: bool | None = None
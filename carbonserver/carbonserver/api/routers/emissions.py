@@ -1,14 +1,18 @@
-from typing import Generic, TypeVar
+from typing import Generic, List, TypeVar
 from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Header, Query
-from fastapi_pagination import Page, paginate
 from fastapi_pagination.default import Page as BasePage
 from fastapi_pagination.default import Params as BaseParams
 from starlette import status
 
-from carbonserver.api.schemas import AccessLevel, Emission, EmissionCreate
+from carbonserver.api.schemas import (
+    AccessLevel,
+    Emission,
+    EmissionBatchCreate,
+    EmissionCreate,
+)
 from carbonserver.api.services.auth_service import (
     OptionalUserWithAuthDependency,
     UserWithAuthDependency,
@@ -26,7 +30,7 @@ class Params(BaseParams):
     size: int = Query(100, ge=1, le=10_000, description="Page size")
 
 
-class Page(BasePage[T], Generic[T]):  # noqa: F811
+class Page(BasePage[T], Generic[T]):
     __params_type__ = Params
 
 
@@ -60,6 +64,33 @@ def add_emission(
     return emission_service.add_emission(emission)
 
 
+@router.post(
+    "/emissions/batch",
+    tags=EMISSIONS_ROUTER_TAGS,
+    status_code=status.HTTP_201_CREATED,
+    response_model=List[UUID],
+)
+@inject
+def add_emissions(
+    batch: EmissionBatchCreate,
+    emission_service: EmissionService = Depends(
+        Provide[ServerContainer.emission_service]
+    ),
+    project_token_service: ProjectTokenService = Depends(
+        Provide[ServerContainer.project_token_service]
+    ),
+    x_api_token: str = Header(None),  # Capture the x-api-token from the headers
+) -> List[UUID]:
+    # The token is checked once per run, not once per emission
+    for run_id in dict.fromkeys(emission.run_id for emission in batch.emissions):
+        project_token_service.project_token_has_access(
+            AccessLevel.WRITE.value,
+            run_id=run_id,
+            project_token=x_api_token,
+        )
+    return emission_service.add_emissions(batch.emissions)
+
+
 @router.get(
     "/emissions/{emission_id}",
     tags=EMISSIONS_ROUTER_TAGS,
@@ -91,6 +122,12 @@ def get_emissions_from_run(
     ),
     params: Params = Depends(),
 ) -> Page[Emission]:
-    return paginate(
-        emission_service.get_emissions_from_run(run_id, user=auth_user.db_user), params
+    # Only the requested page is read from the database
+    raw_params = params.to_raw_params().as_limit_offset()
+    emissions, total = emission_service.get_emissions_page_from_run(
+        run_id,
+        limit=raw_params.limit,
+        offset=raw_params.offset,
+        user=auth_user.db_user,
     )
+    return Page[Emission].create(emissions, params, total=total)
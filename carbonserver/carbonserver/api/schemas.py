@@ -123,7 +123,20 @@ class EmissionBase(BaseModel):
 
 
 class EmissionCreate(EmissionBase):
-    pass
+    id: Optional[UUID] = Field(
+        None,
+        description="Idempotency key chosen by the client, an emission already "
+        "saved with this id is not saved again",
+    )
+
+
+class EmissionBatchCreate(BaseModel):
+    emissions: List[EmissionCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="The emissions to save, they can belong to several runs",
+    )
 
 
 class Emission(EmissionBase):
@@ -1,7 +1,15 @@
 from typing import Optional
 from uuid import UUID
 
-from carbonserver.api.errors import AuthenticationError
+from fastapi import HTTPException
+
+from carbonserver.api.errors import (
+    AuthenticationError,
+    NotFoundError,
+    NotFoundErrorEnum,
+    UserException,
+)
+from carbonserver.api.infra.permission_cache import PermissionCache
 from carbonserver.api.infra.repositories.repository_emissions import (
     SqlAlchemyRepository as EmissionRepository,
 )
@@ -32,6 +40,7 @@ class AuthContext:
         experiment_repository: ExperimentRepository,
         run_repository: RunRepository,
         emission_repository: EmissionRepository,
+        permission_cache: Optional[PermissionCache] = None,
     ):
         self._user_repository: UserRepository = user_repository
         self._token_repository: ProjectTokensRepository = token_repository
@@ -39,6 +48,12 @@ class AuthContext:
         self._experiment_repository: ExperimentRepository = experiment_repository
         self._run_repository: RunRepository = run_repository
         self._emission_repository: EmissionRepository = emission_repository
+        # Shared across requests, a new one keeps the permissions of a request
+        self._permission_cache: PermissionCache = (
+            permission_cache
+            if permission_cache is not None
+            else PermissionCache(ttl=float("inf"))
+        )
 
     def isOperationAuthorizedOnOrg(self, organization_id, user: User):
         return self._user_repository.is_user_in_organization(
@@ -49,31 +64,52 @@ class AuthContext:
         return self._user_repository.is_user_authorized_on_project(project_id, user.id)
 
     def can_read_project(self, project_id: UUID, user: Optional[User]):
-        if self._project_repository.is_project_public(project_id):
-            return True
-        if user is None:
-            raise AuthenticationError(detail="Not authenticated")
-        return self._user_repository.is_user_authorized_on_project(project_id, user.id)
+        return self._can_read("project", project_id, user)
 
     def can_read_experiment(self, experiment_id: UUID | str, user: Optional[User]):
         """An experiment is readable iff its owning project is readable."""
-        experiment = self._experiment_repository.get_one_experiment(experiment_id)
-        return self.can_read_project(experiment.project_id, user)
+        return self._can_read("experiment", experiment_id, user)
 
     def can_read_run(self, run_id: UUID | str, user: Optional[User]):
         """A run is readable iff its owning experiment is readable."""
-        run = self._run_repository.get_one_run(run_id)
-        return self.can_read_experiment(run.experiment_id, user)
+        return self._can_read("run", run_id, user)
 
     def can_read_emission(self, emission_id: UUID | str, user: Optional[User]):
         """An emission is readable iff its owning run is readable."""
-        emission = self._emission_repository.get_one_emission(emission_id)
-        return self.can_read_run(emission.run_id, user)
+        return self._can_read("emission", emission_id, user)
 
     def can_read_organization(self, organization_id: UUID, user: User):
-        return self._user_repository.is_user_in_organization(
-            organization_id=organization_id, user=user
-        )
+        user_id = None if user is None else user.id
+        allowed = self._permission_cache.get(user_id, "organization", organization_id)
+        if allowed is None:
+            allowed = self._user_repository.is_user_in_organization(
+                organization_id=organization_id, user=user
+            )
+            self._permission_cache.set(
+                user_id, "organization", organization_id, allowed
+            )
+        return allowed
+
+    def _can_read(self, entity: str, entity_id, user: Optional[User]) -> bool:
+        """
+        An entity is readable if its project is public, or if the user is a
+        member of the organization of its project. Resolved with one query up
+        the hierarchy, unless recently resolved.
+        """
+        user_id = None if user is None else user.id
+        allowed = self._permission_cache.get(user_id, entity, entity_id)
+        if allowed is None:
+            access = self._project_repository.get_project_access(
+                entity, entity_id, user_id
+            )
+            if access is None:
+                raise _not_found(entity, entity_id)
+            public, member = access
+            allowed = public or member
+            self._permission_cache.set(user_id, entity, entity_id, allowed)
+        if not allowed and user is None:
+            raise AuthenticationError(detail="Not authenticated")
+        return allowed
 
     def can_write_organization(self, organization_id: UUID, user: User):
         return self._user_repository.is_admin_in_organization(
@@ -84,3 +120,17 @@ class AuthContext:
         return self._user_repository.is_user_authorized_on_experiment(
             experiment_id, user.id
         )
+
+
+def _not_found(entity: str, entity_id) -> Exception:
+    """The error raised by the repositories when the entity does not exist"""
+    if entity == "project":
+        return UserException(
+            NotFoundError(
+                code=NotFoundErrorEnum.NOT_FOUND,
+                message=f"Project not found: {entity_id}",
+            )
+        )
+    return HTTPException(
+        status_code=404, detail=f"{entity.capitalize()} {entity_id} not found"
+    )
@@ -5,17 +5,28 @@ This module provides a generic OIDC authentication provider implementation.
 It can work with any OIDC-compliant provider (Keycloak, Auth0, etc.).
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from authlib.integrations.starlette_client import OAuth
 from fastapi import Response
+from joserfc import jws
 from joserfc import jwt as jose_jwt
+from joserfc.errors import InvalidKeyIdError
 from joserfc.jwk import KeySet
 
 from carbonserver.config import settings
 
 DEFAULT_SIGNATURE_CACHE_TTL = 3600  # seconds
+# Minimum time between two fetches of the key set for unknown key ids, so that
+# tokens with made-up key ids cannot make us hammer the provider
+KEY_SET_MIN_REFRESH_INTERVAL = 60  # seconds
+DEFAULT_CLAIMS_CACHE_SIZE = 1000
 OAUTH_SCOPES = ["openid", "email", "profile"]
 LOGGER = logging.getLogger(__name__)
 
@@ -38,8 +49,24 @@ class OIDCAuthProvider:
         *,
         signature_cache_ttl: int = DEFAULT_SIGNATURE_CACHE_TTL,
         openid_configuration: Optional[Dict[str, Any]] = None,
+        claims_cache_size: int = DEFAULT_CLAIMS_CACHE_SIZE,
     ):
+        """
+        :param signature_cache_ttl: Seconds the signing keys of the provider are
+            kept before being fetched again. They are fetched earlier when a
+            token is signed with an unknown key.
+        :param claims_cache_size: Maximum number of validated tokens whose
+            claims are kept until they expire, 0 to validate every token.
+        """
         self.client = oauth._clients["client"]
+        self.signature_cache_ttl = signature_cache_ttl
+        self.claims_cache_size = claims_cache_size
+        self._key_set: Optional[KeySet] = None
+        self._key_set_loaded_at = 0.0
+        self._key_set_lock = asyncio.Lock()
+        # sha256 of the token -> (claims, expiry timestamp)
+        self._claims: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._claims_lock = threading.Lock()
 
     async def get_authorize_url(self, request, login_url):
         return await self.client.authorize_redirect(
@@ -47,11 +74,74 @@ class OIDCAuthProvider:
         )
 
     async def _decode_token(self, token: str) -> Dict[str, Any]:
-        jwks_data = await self.client.fetch_jwk_set()
-        keyset = KeySet.import_key_set(jwks_data)
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._get_cached_claims(digest)
+        if claims is not None:
+            return claims
+        keyset = await self._get_key_set(_key_id(token))
         decoded = jose_jwt.decode(token, keyset)
         jose_jwt.JWTClaimsRegistry().validate(decoded.claims)
-        return dict(decoded.claims)
+        claims = dict(decoded.claims)
+        self._cache_claims(digest, claims)
+        return dict(claims)
+
+    async def _get_key_set(self, kid: Optional[str]) -> KeySet:
+        """The imported signing keys of the provider, fetched again once
+        expired, or when the token is signed with a key they do not have."""
+        async with self._key_set_lock:
+            age = time.monotonic() - self._key_set_loaded_at
+            if self._key_set is None or age >= self.signature_cache_ttl:
+                await self._load_key_set()
+            elif (
+                not _has_key(self._key_set, kid) and age >= KEY_SET_MIN_REFRESH_INTERVAL
+            ):
+                LOGGER.info("Unknown signing key %s, fetching the key set", kid)
+                await self._load_key_set()
+            return self._key_set
+
+    async def _load_key_set(self) -> None:
+        try:
+            jwks_data = await self.client.fetch_jwk_set(force=True)
+            self._key_set = KeySet.import_key_set(jwks_data)
+        except Exception:
+            if self._key_set is None:
+                raise
+            # Keep the known keys while the provider is unreachable
+            LOGGER.warning("Could not fetch the OIDC key set", exc_info=True)
+            self._key_set_loaded_at = (
+                time.monotonic()
+                - self.signature_cache_ttl
+                + KEY_SET_MIN_REFRESH_INTERVAL
+            )
+            return
+        self._key_set_loaded_at = time.monotonic()
+
+    def _get_cached_claims(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._claims_lock:
+            entry = self._claims.get(digest)
+            if entry is None:
+                return None
+            claims, expiry = entry
+            if expiry <= time.time():
+                del self._claims[digest]
+                return None
+            self._claims.move_to_end(digest)
+            return dict(claims)
+
+    def _cache_claims(self, digest: str, claims: Dict[str, Any]) -> None:
+        expiry = claims.get("exp")
+        if self.claims_cache_size <= 0 or not isinstance(expiry, (int, float)):
+            return
+        with self._claims_lock:
+            self._claims[digest] = (claims, float(expiry))
+            self._claims.move_to_end(digest)
+            while len(self._claims) > self.claims_cache_size:
+                self._claims.popitem(last=False)
+
+    def _forget_claims(self, token: str) -> None:
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        with self._claims_lock:
+            self._claims.pop(digest, None)
 
     async def validate_access_token(self, token: str) -> bool:
         await self._decode_token(token)
@@ -65,6 +155,7 @@ class OIDCAuthProvider:
         """Revoke an access token at the OIDC provider (RFC 7009).
         Best-effort — logs and swallows errors so logout always succeeds.
         """
+        self._forget_claims(token)
         try:
             metadata = await self.client.load_server_metadata()
             revocation_endpoint = metadata.get("revocation_endpoint")
@@ -112,3 +203,20 @@ class OIDCAuthProvider:
             """
         response = Response(content=content)
         return response
+
+
+def _key_id(token: str) -> Optional[str]:
+    """The id of the key that signed the token, read from its header"""
+    try:
+        return jws.extract_compact(token.encode()).protected.get("kid")
+    except Exception:
+        # Malformed tokens are rejected by the decoding
+        return None
+
+
+def _has_key(key_set: KeySet, kid: Optional[str]) -> bool:
+    try:
+        key_set.get_by_kid(kid)
+    except InvalidKeyIdError:
+        return False
+    return True
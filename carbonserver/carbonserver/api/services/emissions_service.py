@@ -1,12 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from carbonserver.api.errors import NotAllowedError, NotAllowedErrorEnum, UserException
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories.repository_emissions import (
     SqlAlchemyRepository as EmissionSqlRepository,
 )
+from carbonserver.api.infra.repositories.repository_runs import (
+    SqlAlchemyRepository as RunSqlRepository,
+)
 from carbonserver.api.schemas import Emission, EmissionCreate, User
 from carbonserver.api.services.auth_context import AuthContext
+from carbonserver.logger import logger
 
 
 def _not_allowed() -> UserException:
@@ -23,14 +28,41 @@ class EmissionService:
         self,
         emission_repository: EmissionSqlRepository,
         auth_context: AuthContext,
+        run_repository: Optional[RunSqlRepository] = None,
+        report_cache: Optional[ReportCache] = None,
     ):
+        """
+        :report_cache: The cached reports of the runs that receive emissions
+            are invalidated, the owners of the runs are read with
+            run_repository.
+        """
         self._repository = emission_repository
         self._auth_context = auth_context
+        self._run_repository = run_repository
+        self._report_cache = report_cache
 
     def add_emission(self, emission: EmissionCreate) -> UUID:
         emission_id = self._repository.add_emission(emission)
+        self._invalidate_reports([emission])
         return emission_id
 
+    def add_emissions(self, emissions: List[EmissionCreate]) -> List[UUID]:
+        emission_ids = self._repository.add_emissions(emissions)
+        self._invalidate_reports(emissions)
+        return emission_ids
+
+    def _invalidate_reports(self, emissions: List[EmissionCreate]) -> None:
+        if self._report_cache is None or self._run_repository is None:
+            return
+        try:
+            self._report_cache.invalidate_runs(
+                [emission.run_id for emission in emissions],
+                self._run_repository.get_run_owners,
+            )
+        except Exception as e:
+            # The emissions are saved, the reports are only stale until they expire
+            logger.warning(f"Reports not invalidated after new emissions: {e}")
+
     def get_one_emission(self, emission_id, user: Optional[User] = None) -> Emission:
         emission = self._repository.get_one_emission(emission_id)
         if not self._auth_context.can_read_run(emission.run_id, user):
@@ -44,3 +76,17 @@ class EmissionService:
             raise _not_allowed()
         emissions = self._repository.get_emissions_from_run(run_id)
         return emissions
+
+    def get_emissions_page_from_run(
+        self, run_id, limit: int, offset: int, user: Optional[User] = None
+    ) -> Tuple[List[Emission], int]:
+        """
+        Return a page of the emissions of a run, and the total number of
+        emissions of the run.
+        """
+        if not self._auth_context.can_read_run(run_id, user):
+            raise _not_allowed()
+        emissions = self._repository.get_emissions_from_run(
+            run_id, limit=limit, offset=offset
+        )
+        return emissions, self._repository.count_emissions_from_run(run_id)
@@ -1,6 +1,7 @@
-from typing import List
+from typing import List, Optional
 
 from carbonserver.api.errors import NotAllowedError, NotAllowedErrorEnum, UserException
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories.repository_experiments import (
     SqlAlchemyRepository,
 )
@@ -10,10 +11,14 @@ from carbonserver.api.services.auth_context import AuthContext
 
 class ProjectSumsByExperimentUsecase:
     def __init__(
-        self, experiment_repository: SqlAlchemyRepository, auth_context: AuthContext
+        self,
+        experiment_repository: SqlAlchemyRepository,
+        auth_context: AuthContext,
+        report_cache: Optional[ReportCache] = None,
     ) -> None:
         self._experiment_repository = experiment_repository
         self._auth_context = auth_context
+        self._report_cache = report_cache or ReportCache(ttl=0)
 
     def compute_detailed_sum(
         self, project_id: str, start_date, end_date, user=None
@@ -25,8 +30,15 @@ class ProjectSumsByExperimentUsecase:
                     message="Operation not authorized",
                 )
             )
-        return self._experiment_repository.get_project_detailed_sums_by_experiment(
+        return self._report_cache.get_or_compute(
+            "project_sums_by_experiment",
+            "project",
             project_id,
             start_date,
             end_date,
+            lambda: self._experiment_repository.get_project_detailed_sums_by_experiment(
+                project_id,
+                start_date,
+                end_date,
+            ),
         )
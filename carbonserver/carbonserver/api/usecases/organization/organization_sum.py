@@ -1,4 +1,7 @@
+from typing import Optional
+
 from carbonserver.api.errors import NotAllowedError, NotAllowedErrorEnum, UserException
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories.repository_organizations import (
     SqlAlchemyRepository,
 )
@@ -8,10 +11,14 @@ from carbonserver.api.services.auth_context import AuthContext
 
 class OrganizationSumsUsecase:
     def __init__(
-        self, organization_repository: SqlAlchemyRepository, auth_context: AuthContext
+        self,
+        organization_repository: SqlAlchemyRepository,
+        auth_context: AuthContext,
+        report_cache: Optional[ReportCache] = None,
     ) -> None:
         self._organization_repository = organization_repository
         self._auth_context = auth_context
+        self._report_cache = report_cache or ReportCache(ttl=0)
 
     def compute_detailed_sum(
         self, organization_id: str, start_date, end_date, user=None
@@ -23,10 +30,17 @@ class OrganizationSumsUsecase:
                     message="Operation not authorized",
                 )
             )
-        sums = self._organization_repository.get_organization_detailed_sums(
+        sums = self._report_cache.get_or_compute(
+            "organization_sums",
+            "organization",
             organization_id,
             start_date,
             end_date,
+            lambda: self._organization_repository.get_organization_detailed_sums(
+                organization_id,
+                start_date,
+                end_date,
+            ),
         )
         if sums is not None:
             return sums
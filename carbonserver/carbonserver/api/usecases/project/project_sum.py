@@ -1,4 +1,7 @@
+from typing import Optional
+
 from carbonserver.api.errors import NotAllowedError, NotAllowedErrorEnum, UserException
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories.repository_projects import SqlAlchemyRepository
 from carbonserver.api.schemas import ProjectReport
 from carbonserver.api.services.auth_context import AuthContext
@@ -6,10 +9,14 @@ from carbonserver.api.services.auth_context import AuthContext
 
 class ProjectSumsUsecase:
     def __init__(
-        self, project_repository: SqlAlchemyRepository, auth_context: AuthContext
+        self,
+        project_repository: SqlAlchemyRepository,
+        auth_context: AuthContext,
+        report_cache: Optional[ReportCache] = None,
     ) -> None:
         self._project_repository = project_repository
         self._auth_context = auth_context
+        self._report_cache = report_cache or ReportCache(ttl=0)
 
     def compute_detailed_sum(
         self, project_id: str, start_date, end_date, user=None
@@ -21,9 +28,16 @@ class ProjectSumsUsecase:
                     message="Operation not authorized",
                 )
             )
-        sums = self._project_repository.get_project_detailed_sums(
+        sums = self._report_cache.get_or_compute(
+            "project_sums",
+            "project",
             project_id,
             start_date,
             end_date,
+            lambda: self._project_repository.get_project_detailed_sums(
+                project_id,
+                start_date,
+                end_date,
+            ),
         )
         return sums
@@ -1,6 +1,7 @@
-from typing import List
+from typing import List, Optional
 
 from carbonserver.api.errors import NotAllowedError, NotAllowedErrorEnum, UserException
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories.repository_runs import SqlAlchemyRepository
 from carbonserver.api.schemas import RunReport
 from carbonserver.api.services.auth_context import AuthContext
@@ -8,10 +9,14 @@ from carbonserver.api.services.auth_context import AuthContext
 
 class ExperimentSumsByRunUsecase:
     def __init__(
-        self, run_repository: SqlAlchemyRepository, auth_context: AuthContext
+        self,
+        run_repository: SqlAlchemyRepository,
+        auth_context: AuthContext,
+        report_cache: Optional[ReportCache] = None,
     ) -> None:
         self._run_repository = run_repository
         self._auth_context = auth_context
+        self._report_cache = report_cache or ReportCache(ttl=0)
 
     def compute_detailed_sum(
         self, experiment_id: str, start_date, end_date, user=None
@@ -23,9 +28,16 @@ class ExperimentSumsByRunUsecase:
                     message="Operation not authorized",
                 )
             )
-        sums = self._run_repository.get_experiment_detailed_sums_by_run(
+        sums = self._report_cache.get_or_compute(
+            "experiment_sums_by_run",
+            "experiment",
             experiment_id,
             start_date,
             end_date,
+            lambda: self._run_repository.get_experiment_detailed_sums_by_run(
+                experiment_id,
+                start_date,
+                end_date,
+            ),
         )
         return sums
@@ -1,6 +1,9 @@
 from dependency_injector import containers, providers
 
 from carbonserver.api.infra.database.database_manager import Database
+from carbonserver.api.infra.permission_cache import PermissionCache
+from carbonserver.api.infra.project_token_cache import VerifiedTokenCache
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories import (
     repository_emissions,
     repository_experiments,
@@ -43,12 +46,19 @@ class ServerContainer(containers.DeclarativeContainer):
     db = providers.Singleton(
         Database,
         db_url=db_url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        statement_timeout=settings.db_statement_timeout,
     )
 
     # Authentication provider (configurable via AUTH_PROVIDER env var)
     # Options: 'oidc' (default) or 'none' (dev/testing only)
     # Returns OIDCAuthProvider or None based on settings
-    auth_provider = providers.Callable(
+    # A singleton, to share the cached signing keys and validated tokens
+    auth_provider = providers.Singleton(
         lambda: (
             OIDCAuthProvider(
                 base_url=settings.oidc_issuer_url,
@@ -75,18 +85,33 @@ class ServerContainer(containers.DeclarativeContainer):
         session_factory=db.provided.session,
     )
 
+    permission_cache = providers.Singleton(
+        PermissionCache,
+        ttl=settings.permission_cache_ttl,
+        max_size=settings.permission_cache_size,
+    )
+
     project_repository = providers.Factory(
         repository_projects.SqlAlchemyRepository,
         session_factory=db.provided.session,
+        permission_cache=permission_cache,
+    )
+    project_token_cache = providers.Singleton(
+        VerifiedTokenCache,
+        ttl=settings.project_token_cache_ttl,
+        max_size=settings.project_token_cache_size,
+        last_used_interval=settings.project_token_last_used_interval,
     )
     project_token_repository = providers.Factory(
         repository_projects_tokens.SqlAlchemyRepository,
         session_factory=db.provided.session,
+        token_cache=project_token_cache,
     )
 
     user_repository = providers.Factory(
         repository_users.SqlAlchemyRepository,
         session_factory=db.provided.session,
+        permission_cache=permission_cache,
     )
 
     organization_repository = providers.Factory(
@@ -99,6 +124,12 @@ class ServerContainer(containers.DeclarativeContainer):
         session_factory=db.provided.session,
     )
 
+    report_cache = providers.Singleton(
+        ReportCache,
+        ttl=settings.report_cache_ttl,
+        max_size=settings.report_cache_size,
+    )
+
     auth_context = providers.Factory(
         AuthContext,
         user_repository=user_repository,
@@ -107,12 +138,15 @@ class ServerContainer(containers.DeclarativeContainer):
         experiment_repository=experiment_repository,
         run_repository=run_repository,
         emission_repository=emission_repository,
+        permission_cache=permission_cache,
     )
 
     emission_service = providers.Factory(
         EmissionService,
         emission_repository=emission_repository,
         auth_context=auth_context,
+        run_repository=run_repository,
+        report_cache=report_cache,
     )
 
     telemetry_service = providers.Factory(
@@ -130,12 +164,14 @@ class ServerContainer(containers.DeclarativeContainer):
         ProjectSumsByExperimentUsecase,
         experiment_repository=experiment_repository,
         auth_context=auth_context,
+        report_cache=report_cache,
     )
 
     project_sums_usecase = providers.Factory(
         ProjectSumsUsecase,
         project_repository=project_repository,
         auth_context=auth_context,
+        report_cache=report_cache,
     )
 
     project_service = providers.Factory(
@@ -154,6 +190,7 @@ class ServerContainer(containers.DeclarativeContainer):
         ExperimentSumsByRunUsecase,
         run_repository=run_repository,
         auth_context=auth_context,
+        report_cache=report_cache,
     )
 
     user_service = providers.Factory(
@@ -172,6 +209,7 @@ class ServerContainer(containers.DeclarativeContainer):
         OrganizationSumsUsecase,
         organization_repository=organization_repository,
         auth_context=auth_context,
+        report_cache=report_cache,
     )
 
     run_service = providers.Factory(
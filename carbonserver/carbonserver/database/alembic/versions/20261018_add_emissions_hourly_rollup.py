@@ -0,0 +1,86 @@
+"""add_emissions_hourly_rollup
+
+Revision ID: 20261018_emissions_hourly
+Revises: 20261018_emissions_run_ts
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = "20261018_emissions_hourly"
+down_revision = "20261018_emissions_run_ts"
+branch_labels = None
+depends_on = None
+
+SUMMED_COLUMNS = (
+    "emissions_sum",
+    "cpu_energy",
+    "gpu_energy",
+    "ram_energy",
+    "energy_consumed",
+    "duration",
+)
+AVERAGED_COLUMNS = (
+    "cpu_power",
+    "gpu_power",
+    "ram_power",
+    "emissions_rate",
+    "cpu_utilization_percent",
+    "gpu_utilization_percent",
+    "ram_utilization_percent",
+)
+
+
+def upgrade():
+    """
+    Create the hourly rollup of the emissions of each run, read by the sum
+    reports, and fill it with the emissions already saved.
+    """
+    columns = [
+        sa.Column(name, sa.Float, nullable=False, server_default="0")
+        for name in SUMMED_COLUMNS
+    ]
+    for name in AVERAGED_COLUMNS:
+        columns.append(
+            sa.Column(f"{name}_sum", sa.Float, nullable=False, server_default="0")
+        )
+        columns.append(
+            sa.Column(f"{name}_count", sa.Integer, nullable=False, server_default="0")
+        )
+    op.create_table(
+        "emissions_hourly",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column(
+            "run_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("runs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("hour", sa.DateTime, nullable=False),
+        *columns,
+        sa.UniqueConstraint("run_id", "hour", name="uq_emissions_hourly_run_id_hour"),
+    )
+
+    targets = list(SUMMED_COLUMNS)
+    aggregates = [f"COALESCE(SUM({name}), 0)" for name in SUMMED_COLUMNS]
+    for name in AVERAGED_COLUMNS:
+        targets += [f"{name}_sum", f"{name}_count"]
+        aggregates += [f"COALESCE(SUM({name}), 0)", f"COUNT({name})"]
+    op.execute(f"""
+        INSERT INTO emissions_hourly (run_id, hour, {", ".join(targets)})
+        SELECT run_id, date_trunc('hour', timestamp), {", ".join(aggregates)}
+        FROM emissions
+        WHERE run_id IS NOT NULL AND timestamp IS NOT NULL
+        GROUP BY run_id, date_trunc('hour', timestamp)
+        """)
+
+
+def downgrade():
+    """
+    Remove the hourly rollup of the emissions.
+    """
+    op.drop_table("emissions_hourly")
@@ -0,0 +1,46 @@
+"""add_emissions_run_timestamp_index
+
+Revision ID: 20261018_emissions_run_ts
+Revises: 20251119_add_utilization
+Create Date: 2026-10-18 09:12:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_emissions_run_ts"
+down_revision = "20251119_add_utilization"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_emissions_run_id_timestamp"
+
+
+def upgrade():
+    """
+    Index the emissions by run and timestamp, to read the emissions of a run
+    page by page in timestamp order.
+    The index is built concurrently so that the emissions table stays writable.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "emissions",
+            ["run_id", "timestamp"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    """
+    Remove the (run_id, timestamp) index of the emissions table.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name="emissions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
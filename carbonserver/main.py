@@ -23,7 +23,6 @@ from carbonserver.api.routers import (
 from carbonserver.api.services import auth_service
 from carbonserver.config import settings
 from carbonserver.container import ServerContainer
-from carbonserver.database.database import engine
 from carbonserver.logger import logger
 
 
@@ -80,8 +79,8 @@ def init_container():
 def init_db(container):
     db = container.db()
     db.create_database()
-    sql_models.Base.metadata.create_all(bind=engine)
-    telemetry_sql_models.Base.metadata.create_all(bind=engine)
+    sql_models.Base.metadata.create_all(bind=db.engine)
+    telemetry_sql_models.Base.metadata.create_all(bind=db.engine)
 
 
 def init_server(container):
@@ -142,6 +141,16 @@ def default():
     return {"status": "OK"}
 
 
+@app.get("/metrics/database")
+def database_metrics():
+    return app.container.db().pool_stats()
+
+
+@app.get("/metrics/report_cache")
+def report_cache_metrics():
+    return app.container.report_cache().stats()
+
+
 @app.exception_handler(UserException)
 async def custom_exception_handler(request: Request, exc: UserException):
     raise get_http_exception(exc)
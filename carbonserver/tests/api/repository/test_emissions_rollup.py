@@ -0,0 +1,187 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from carbonserver.api.infra.database.sql_models import Run as SqlModelRun
+from carbonserver.api.infra.repositories.emissions_rollup import (
+    emissions_by_run,
+    hour_bounds,
+    upsert_hourly_rollup,
+)
+from carbonserver.api.infra.repositories.repository_emissions import (
+    SqlAlchemyRepository as EmissionsRepository,
+)
+from carbonserver.api.infra.repositories.repository_projects import (
+    SqlAlchemyRepository as ProjectsRepository,
+)
+from carbonserver.api.schemas import EmissionCreate
+
+PROJECT_ID = UUID("f52fe339-164d-4c2b-a8c0-f562dfce066d")
+EXPERIMENT_ID = UUID("943b2aa5-9e21-41a9-8a38-562505b4b2aa")
+RUN_ID = "40088f1a-d28e-4980-8d80-bf5600056a14"
+RUN_IDS = select(SqlModelRun.id).where(SqlModelRun.experiment_id == EXPERIMENT_ID)
+
+
+class SessionContextMock:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, *args):
+        return None
+
+
+def to_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_hour_bounds_are_the_whole_hours_of_the_range():
+    assert hour_bounds(datetime(2024, 5, 1, 10, 15), datetime(2024, 5, 1, 14, 40)) == (
+        datetime(2024, 5, 1, 11),
+        datetime(2024, 5, 1, 14),
+    )
+    assert hour_bounds(datetime(2024, 5, 1, 10), datetime(2024, 5, 1, 11)) == (
+        datetime(2024, 5, 1, 10),
+        datetime(2024, 5, 1, 11),
+    )
+
+
+def test_hour_bounds_of_aware_dates_are_in_utc():
+    paris = timezone(timedelta(hours=2))
+
+    first, last = hour_bounds(
+        datetime(2024, 5, 1, 10, 15, tzinfo=paris), "2024-05-01T14:00:00+00:00"
+    )
+
+    assert first == datetime(2024, 5, 1, 9, tzinfo=timezone.utc)
+    assert last == datetime(2024, 5, 1, 14, tzinfo=timezone.utc)
+
+
+def test_upsert_adds_new_emissions_to_their_hour():
+    session_mock = mock.Mock()
+
+    upsert_hourly_rollup(session_mock, [uuid4()])
+
+    sql = to_sql(session_mock.execute.call_args.args[0])
+    assert sql.startswith("INSERT INTO emissions_hourly")
+    assert "date_trunc(%(date_trunc_1)s, emissions.timestamp)" in sql
+    assert "ON CONFLICT (run_id, hour) DO UPDATE" in sql
+    assert (
+        "emissions_sum = (emissions_hourly.emissions_sum + excluded.emissions_sum)"
+        in sql
+    )
+
+
+def test_upsert_without_emissions_does_nothing():
+    session_mock = mock.Mock()
+
+    upsert_hourly_rollup(session_mock, [])
+
+    session_mock.execute.assert_not_called()
+
+
+def test_saved_emission_is_rolled_up_in_the_same_transaction():
+    session_mock = mock.Mock()
+    repository = EmissionsRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock))
+    )
+
+    emission_id = repository.add_emission(
+        EmissionCreate(
+            timestamp="2021-04-04T08:43:00+02:00",
+            run_id=RUN_ID,
+            duration=98745,
+            emissions_sum=433.6544,
+            emissions_rate=1.548444,
+            cpu_power=0.3,
+            gpu_power=0.0,
+            ram_power=0.15,
+            cpu_energy=55.21874,
+            gpu_energy=0.0,
+            ram_energy=2.0,
+            energy_consumed=57.21874,
+        )
+    )
+
+    session_mock.flush.assert_called_once()
+    (rollup,) = session_mock.execute.call_args.args
+    assert rollup.table.name == "emissions_hourly"
+    assert [emission_id] in rollup.compile().params.values()
+    session_mock.commit.assert_called_once()
+
+
+def test_range_with_whole_hours_reads_the_rollup_and_the_raw_tail():
+    sql = to_sql(
+        emissions_by_run(
+            RUN_IDS, datetime(2024, 5, 1, 10, 15), datetime(2024, 5, 3, 14, 40)
+        )
+    )
+
+    assert "FROM emissions_hourly" in sql
+    assert "emissions_hourly.hour >= %(hour_1)s" in sql
+    assert "emissions.timestamp < %(timestamp_3)s" in sql
+    assert "UNION ALL" in sql
+
+
+def test_range_within_an_hour_reads_the_raw_emissions_only():
+    sql = to_sql(
+        emissions_by_run(
+            RUN_IDS, datetime(2024, 5, 1, 10, 15), datetime(2024, 5, 1, 10, 40)
+        )
+    )
+
+    assert "emissions_hourly" not in sql
+    assert "UNION ALL" not in sql
+    assert "emissions.run_id IN (SELECT runs.id" in sql
+
+
+def test_both_branches_only_read_the_runs_of_the_report():
+    sql = to_sql(
+        emissions_by_run(
+            RUN_IDS, datetime(2024, 5, 1, 10, 15), datetime(2024, 5, 3, 14, 40)
+        )
+    )
+
+    assert "emissions.run_id IN (SELECT runs.id" in sql
+    assert "emissions_hourly.run_id IN (SELECT runs.id" in sql
+    assert sql.count("WHERE runs.experiment_id = %(experiment_id_1)s") == 2
+
+
+def test_project_report_averages_rolled_up_measures():
+    session_mock = mock.Mock()
+    query = session_mock.query.return_value
+    query.join.return_value = query
+    query.filter.return_value = query
+    query.group_by.return_value = query
+    query.first.return_value = None
+    repository = ProjectsRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock))
+    )
+
+    assert (
+        repository.get_project_detailed_sums(
+            PROJECT_ID, datetime(2024, 5, 1), datetime(2024, 6, 1)
+        )
+        is None
+    )
+
+    columns = {
+        column.name: to_sql(column) for column in session_mock.query.call_args.args
+    }
+    assert columns["cpu_power"] == (
+        "sum(emissions_by_run.cpu_power_sum) / "
+        "nullif(CAST(sum(emissions_by_run.cpu_power_count) AS FLOAT), %(nullif_1)s)"
+    )
+    # Projects without emissions in the range have no report
+    parts_join = query.join.call_args_list[-1]
+    assert parts_join.args[0].name == "emissions_by_run"
+    assert parts_join.kwargs.get("isouter", False) is False
+    # Only the emissions of the runs of the project are summed
+    parts_sql = to_sql(parts_join.args[0])
+    assert "JOIN experiments ON experiments.id = runs.experiment_id" in parts_sql
+    assert "WHERE experiments.project_id = %(project_id_1)s" in parts_sql
@@ -0,0 +1,122 @@
+from unittest import mock
+from uuid import uuid4
+
+from carbonserver.api.infra.database import sql_models
+from carbonserver.api.infra.repositories.repository_emissions import (
+    SqlAlchemyRepository,
+)
+from carbonserver.api.schemas import EmissionCreate
+
+RUN_1_ID = "40088f1a-d28e-4980-8d80-bf5600056a14"
+RUN_2_ID = "07614c15-c5b0-4c9a-8101-6b6ad3733543"
+
+
+class SessionContextMock:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, *args):
+        return None
+
+
+def make_emission(run_id: str) -> EmissionCreate:
+    return EmissionCreate(
+        timestamp="2021-04-04T08:43:00+02:00",
+        run_id=run_id,
+        duration=98745,
+        emissions_sum=433.6544,
+        emissions_rate=1.548444,
+        cpu_power=0.3,
+        gpu_power=0.0,
+        ram_power=0.15,
+        cpu_energy=55.21874,
+        gpu_energy=0.0,
+        ram_energy=2.0,
+        energy_consumed=57.21874,
+    )
+
+
+def test_add_emissions_inserts_all_rows_in_one_statement():
+    session_mock = mock.Mock()
+    session_factory_mock = mock.Mock(return_value=SessionContextMock(session_mock))
+    repository = SqlAlchemyRepository(session_factory_mock)
+
+    ids = repository.add_emissions(
+        [make_emission(RUN_1_ID), make_emission(RUN_1_ID), make_emission(RUN_2_ID)]
+    )
+
+    session_factory_mock.assert_called_once()
+    session_mock.commit.assert_called_once()
+    insert_call, rollup_call = session_mock.execute.call_args_list
+    statement, rows = insert_call.args
+    assert statement.table.name == "emissions"
+    assert rollup_call.args[0].table.name == "emissions_hourly"
+    assert [row["id"] for row in rows] == ids
+    assert len(set(ids)) == 3
+    assert [str(row["run_id"]) for row in rows] == [RUN_1_ID, RUN_1_ID, RUN_2_ID]
+
+
+def test_add_emissions_skips_the_ids_already_saved():
+    saved, new = uuid4(), uuid4()
+    session_mock = mock.Mock()
+    session_mock.query.return_value.filter.return_value.all.return_value = [(saved,)]
+    repository = SqlAlchemyRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock))
+    )
+    emissions = [make_emission(RUN_1_ID) for _ in range(3)]
+    for emission, emission_id in zip(emissions, (saved, new, new)):
+        emission.id = emission_id
+
+    ids = repository.add_emissions(emissions)
+
+    assert ids == [saved, new, new]
+    _, rows = session_mock.execute.call_args_list[0].args
+    assert [row["id"] for row in rows] == [new]
+    (rollup,) = session_mock.execute.call_args_list[1].args
+    assert [new] in rollup.compile().params.values()
+
+
+def test_add_emission_sent_twice_is_saved_once():
+    emission = make_emission(RUN_1_ID)
+    emission.id = uuid4()
+    session_mock = mock.Mock()
+    session_mock.query.return_value.filter.return_value.all.return_value = [
+        (emission.id,)
+    ]
+    repository = SqlAlchemyRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock))
+    )
+
+    assert repository.add_emission(emission) == emission.id
+    session_mock.add.assert_not_called()
+
+
+def test_get_emissions_from_run_reads_only_the_requested_page():
+    session_mock = mock.Mock()
+    query = session_mock.query.return_value.filter.return_value.order_by.return_value
+    query.offset.return_value.limit.return_value = []
+    repository = SqlAlchemyRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock))
+    )
+
+    assert repository.get_emissions_from_run(RUN_1_ID, limit=10, offset=20) == []
+
+    query.offset.assert_called_once_with(20)
+    query.offset.return_value.limit.assert_called_once_with(10)
+    order_by = session_mock.query.return_value.filter.return_value.order_by
+    assert [str(column) for column in order_by.call_args.args] == [
+        "emissions.timestamp DESC",
+        "emissions.id DESC",
+    ]
+
+
+def test_emissions_are_indexed_by_run_and_timestamp():
+    indexes = {
+        index.name: [column.name for column in index.columns]
+        for index in sql_models.Emission.__table__.indexes
+    }
+
+    assert indexes["ix_emissions_run_id_timestamp"] == ["run_id", "timestamp"]
@@ -0,0 +1,97 @@
+from unittest import mock
+from uuid import UUID
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+
+from carbonserver.api.infra.permission_cache import PermissionCache
+from carbonserver.api.infra.repositories.repository_projects import (
+    SqlAlchemyRepository,
+)
+from carbonserver.api.schemas import ProjectPatch
+
+PROJECT_ID = UUID("f52fe339-164d-4c2b-a8c0-f562dfce066d")
+EMISSION_ID = UUID("6e014a9a-53f7-4f22-9b2b-58d06fb5194b")
+USER_ID = UUID("550e8400-e29b-41d4-a716-446655440000")
+
+
+class SessionContextMock:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, *args):
+        return None
+
+
+def resolve_project_access(row, *args):
+    """Run get_project_access, return its result and the SQL it ran"""
+    statements = []
+
+    class CapturedQuery(Query):
+        def first(self):
+            statements.append(str(self.statement.compile(dialect=postgresql.dialect())))
+            return row
+
+    session_mock = mock.Mock()
+    session_mock.query.side_effect = lambda *entities: CapturedQuery(entities)
+    repository = SqlAlchemyRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock))
+    )
+    access = repository.get_project_access(*args)
+    return access, statements
+
+
+def test_emission_access_is_resolved_with_one_query():
+    access, statements = resolve_project_access(
+        (False, True), "emission", EMISSION_ID, USER_ID
+    )
+
+    assert access == (False, True)
+    (sql,) = statements
+    for join in (
+        "JOIN runs ON runs.id = emissions.run_id",
+        "JOIN experiments ON experiments.id = runs.experiment_id",
+        "JOIN projects ON projects.id = experiments.project_id",
+        "LEFT OUTER JOIN memberships ON memberships.organization_id = "
+        "projects.organization_id AND memberships.user_id = %(user_id_1)s",
+    ):
+        assert join in sql
+    assert "WHERE emissions.id = %(id_1)s" in sql
+
+
+def test_anonymous_access_does_not_read_the_memberships():
+    access, statements = resolve_project_access(
+        (True, False), "project", PROJECT_ID, None
+    )
+
+    assert access == (True, False)
+    assert "memberships" not in statements[0]
+
+
+def test_access_to_missing_entity_is_none():
+    access, _ = resolve_project_access(None, "project", PROJECT_ID, USER_ID)
+
+    assert access is None
+
+
+def test_patched_project_clears_the_permissions():
+    cache = PermissionCache()
+    cache.set(USER_ID, "project", PROJECT_ID, True)
+    session_mock = mock.Mock()
+    db_project = session_mock.query.return_value.filter.return_value.first.return_value
+    db_project.id = PROJECT_ID
+    db_project.organization_id = USER_ID
+    db_project.name = "project"
+    db_project.description = ""
+    db_project.public = True
+    repository = SqlAlchemyRepository(
+        mock.Mock(return_value=SessionContextMock(session_mock)),
+        permission_cache=cache,
+    )
+
+    repository.patch_project(PROJECT_ID, ProjectPatch(public=True))
+
+    assert cache.get(USER_ID, "project", PROJECT_ID) is None
@@ -0,0 +1,164 @@
+import uuid
+from unittest import mock
+
+import pytest
+
+from carbonserver.api.infra import api_key_utils
+from carbonserver.api.infra.database.sql_models import ProjectToken
+from carbonserver.api.infra.project_token_cache import VerifiedTokenCache
+from carbonserver.api.infra.repositories.repository_projects_tokens import (
+    SqlAlchemyRepository,
+)
+
+PROJECT_ID = uuid.UUID("f52fe339-164d-4c2b-a8c0-f562dfce066d")
+TOKEN_ID = uuid.UUID("e60afb92-17b7-4720-91a0-1ae91e409ba7")
+TOKEN = "cpt_test-token"
+HASHED_TOKEN = api_key_utils.get_api_key_hash(TOKEN).decode()
+
+
+class SessionContextMock:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, *args):
+        return None
+
+
+def make_db_token(**kwargs) -> ProjectToken:
+    values = dict(
+        id=TOKEN_ID,
+        project_id=PROJECT_ID,
+        name="Token",
+        hashed_token=HASHED_TOKEN,
+        lookup_value=api_key_utils.generate_lookup_value(TOKEN),
+        revoked=False,
+        access=2,
+    )
+    values.update(kwargs)
+    return ProjectToken(**values)
+
+
+@pytest.fixture
+def session_mock():
+    session = mock.Mock()
+    session.query.return_value.filter.return_value.filter.return_value.all.return_value = [
+        make_db_token()
+    ]
+    return session
+
+
+@pytest.fixture
+def verify_mock():
+    with mock.patch(
+        "carbonserver.api.infra.repositories.repository_projects_tokens.verify_api_key",
+        wraps=api_key_utils.verify_api_key,
+    ) as verify:
+        yield verify
+
+
+def make_repository(session, cache=None) -> SqlAlchemyRepository:
+    return SqlAlchemyRepository(
+        mock.Mock(return_value=SessionContextMock(session)), token_cache=cache
+    )
+
+
+def test_get_project_token_verifies_with_bcrypt_without_cache(
+    session_mock, verify_mock
+):
+    repository = make_repository(session_mock)
+
+    for _ in range(2):
+        token = repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+        assert token.id == TOKEN_ID
+
+    assert verify_mock.call_count == 2
+
+
+def test_get_project_token_reuses_cached_verification(session_mock, verify_mock):
+    cache = VerifiedTokenCache()
+    repository = make_repository(session_mock, cache)
+
+    for _ in range(3):
+        token = repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+        assert token.id == TOKEN_ID
+
+    assert verify_mock.call_count == 1
+    assert cache.hits == 2
+    assert TOKEN not in str(cache._entries)
+
+
+def test_get_project_token_rejects_wrong_token_even_if_cached(
+    session_mock, verify_mock
+):
+    repository = make_repository(session_mock, VerifiedTokenCache())
+    repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+
+    assert (
+        repository.get_project_token_by_project_id_and_token(PROJECT_ID, "cpt_other")
+        is None
+    )
+    assert verify_mock.call_count == 2
+
+
+def test_get_project_token_verifies_again_when_hash_changes(session_mock, verify_mock):
+    repository = make_repository(session_mock, VerifiedTokenCache())
+    repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+    session_mock.query.return_value.filter.return_value.filter.return_value.all.return_value = [
+        make_db_token(hashed_token=api_key_utils.get_api_key_hash("cpt_new").decode())
+    ]
+
+    assert (
+        repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN) is None
+    )
+    assert verify_mock.call_count == 2
+
+
+def test_delete_project_token_invalidates_cache(session_mock, verify_mock):
+    cache = VerifiedTokenCache()
+    repository = make_repository(session_mock, cache)
+    repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+
+    repository.delete_project_token(PROJECT_ID, TOKEN_ID)
+
+    assert cache._entries == {}
+    repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+    assert verify_mock.call_count == 2
+
+
+def test_revoked_token_is_not_served_from_cache(session_mock, verify_mock):
+    cache = VerifiedTokenCache()
+    repository = make_repository(session_mock, cache)
+    repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+    session_mock.query.return_value.filter.return_value.filter.return_value.all.return_value = [
+        make_db_token(revoked=True)
+    ]
+
+    repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+
+    assert verify_mock.call_count == 2
+    assert cache._entries == {}
+
+
+def test_last_used_writes_are_coalesced(session_mock, verify_mock):
+    repository = make_repository(
+        session_mock, VerifiedTokenCache(last_used_interval=60)
+    )
+
+    for _ in range(3):
+        repository.get_project_token_by_project_id_and_token(PROJECT_ID, TOKEN)
+
+    session_mock.query.return_value.filter.return_value.update.assert_called_once()
+
+
+def test_cache_expires_and_evicts():
+    cache = VerifiedTokenCache(ttl=10, max_size=1)
+    with mock.patch("time.monotonic", return_value=100):
+        cache.add("token_1", "id_1", "hash_1")
+        assert cache.is_verified("token_1", "id_1", "hash_1")
+        cache.add("token_2", "id_2", "hash_2")
+        assert not cache.is_verified("token_1", "id_1", "hash_1")
+    with mock.patch("time.monotonic", return_value=111):
+        assert not cache.is_verified("token_2", "id_2", "hash_2")
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import FastAPI, Response
@@ -107,8 +107,11 @@ def mock_oidc_client():
 @pytest.fixture
 def oidc_provider(mock_oidc_client):
     """Create an OIDCAuthProvider with a mocked client."""
-    with patch.object(OIDCAuthProvider, "__init__", lambda self, **kw: None):
-        provider = OIDCAuthProvider()
+    provider = OIDCAuthProvider(
+        base_url="https://auth.example.com",
+        client_id="test_client",
+        client_secret="test_secret",
+    )
     provider.client = mock_oidc_client
     return provider
 
@@ -201,6 +201,7 @@ def test_get_emissions_from_run_retreives_all_emissions_from_run(
         Emission(**EMISSION_1),
         Emission(**EMISSION_2),
     ]
+    repository_mock.count_emissions_from_run.return_value = 2
 
     with custom_test_server.container.emission_repository.override(repository_mock):
         response = client.get(f"/runs/{RUN_1_ID}/emissions")
@@ -211,6 +212,28 @@ def test_get_emissions_from_run_retreives_all_emissions_from_run(
     assert not diff
     assert len(actual_emission_ids_list) == len(set(actual_emission_ids_list))
     assert EMISSION_3["id"] not in actual_emission_ids_list
+    repository_mock.get_emissions_from_run.assert_called_once_with(
+        RUN_1_ID, limit=100, offset=0
+    )
+
+
+def test_get_emissions_from_run_reads_only_the_requested_page(
+    client, custom_test_server
+):
+    repository_mock = mock.Mock(spec=EmissionRepository)
+    repository_mock.get_emissions_from_run.return_value = [Emission(**EMISSION_2)]
+    repository_mock.count_emissions_from_run.return_value = 3
+
+    with custom_test_server.container.emission_repository.override(repository_mock):
+        response = client.get(f"/runs/{RUN_1_ID}/emissions?page=2&size=1")
+
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert [emission["id"] for emission in page["items"]] == [EMISSION_ID_2]
+    assert (page["total"], page["page"], page["size"], page["pages"]) == (3, 2, 1, 3)
+    repository_mock.get_emissions_from_run.assert_called_once_with(
+        RUN_1_ID, limit=1, offset=1
+    )
 
 
 def test_add_emission_with_default_wue_value(client, custom_test_server):
@@ -321,3 +344,65 @@ def test_add_emission_with_custom_wue_value(client, custom_test_server):
     # Verify that the repository was called with the correct WUE value
     called_emission = repository_mock.add_emission.call_args[0][0]
     assert called_emission.wue == 1.5, "WUE should be set to the provided value"
+
+
+def test_add_emissions_batch_checks_token_once_per_run(client, custom_test_server):
+    repository_mock = mock.Mock(spec=EmissionRepository)
+    repository_mock.add_emissions.return_value = [
+        UUID(EMISSION_ID),
+        UUID(EMISSION_ID_2),
+        UUID(EMISSION_ID_3),
+    ]
+    project_tokens_repository_mock = mock.Mock(spec=ProjectTokenRepository)
+    project_tokens_repository_mock.get_project_token_by_run_id_and_token.return_value = ProjectToken(
+        id=UUID("e60afb92-17b7-4720-91a0-1ae91e409ba7"),
+        project_id=UUID("f52fe339-164d-4c2b-a8c0-f562dfce066d"),
+        name="Project",
+        token="token",
+        access=AccessLevel.WRITE.value,
+    )
+    batch = {
+        "emissions": [
+            EMISSION_TO_CREATE,
+            EMISSION_TO_CREATE,
+            {**EMISSION_TO_CREATE, "run_id": RUN_2_ID},
+        ]
+    }
+
+    with custom_test_server.container.emission_repository.override(
+        repository_mock
+    ) and custom_test_server.container.project_token_repository.override(
+        project_tokens_repository_mock
+    ):
+        response = client.post(
+            "/emissions/batch", json=batch, headers={"x-api-token": "token"}
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == [EMISSION_ID, EMISSION_ID_2, EMISSION_ID_3]
+    assert len(repository_mock.add_emissions.call_args.args[0]) == 3
+    assert (
+        project_tokens_repository_mock.get_project_token_by_run_id_and_token.call_args_list
+        == [
+            mock.call(UUID(RUN_1_ID), "token"),
+            mock.call(UUID(RUN_2_ID), "token"),
+        ]
+    )
+
+
+def test_add_emissions_batch_rejects_empty_batch_and_missing_token(
+    client, custom_test_server
+):
+    repository_mock = mock.Mock(spec=EmissionRepository)
+
+    with custom_test_server.container.emission_repository.override(repository_mock):
+        response_empty = client.post(
+            "/emissions/batch", json={"emissions": []}, headers={"x-api-token": "token"}
+        )
+        response_no_token = client.post(
+            "/emissions/batch", json={"emissions": [EMISSION_TO_CREATE]}
+        )
+
+    assert response_empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response_no_token.status_code == status.HTTP_403_FORBIDDEN
+    repository_mock.add_emissions.assert_not_called()
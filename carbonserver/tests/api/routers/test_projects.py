@@ -1,3 +1,4 @@
+from datetime import datetime
 from unittest import mock
 
 import pytest
@@ -7,9 +8,10 @@ from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
 
 from carbonserver.api.errors import UserException, get_http_exception
+from carbonserver.api.infra.report_cache import ReportCache
 from carbonserver.api.infra.repositories.repository_projects import SqlAlchemyRepository
 from carbonserver.api.routers import projects
-from carbonserver.api.schemas import Project
+from carbonserver.api.schemas import Project, ProjectReport
 from carbonserver.api.services.auth_service import MandatoryUserWithAuthDependency
 from carbonserver.container import ServerContainer
 
@@ -99,6 +101,24 @@ PROJECT_3 = {
     "public": True,
 }
 
+PROJECT_REPORT = {
+    "project_id": PROJECT_ID,
+    "name": "API Code Carbon",
+    "description": "API for Code Carbon",
+    "organization_id": ORGANIZATION_ID,
+    "emissions": 433.6544,
+    "cpu_power": 0.3,
+    "gpu_power": 0.0,
+    "ram_power": 0.15,
+    "cpu_energy": 55.21874,
+    "gpu_energy": 0.0,
+    "ram_energy": 2.0,
+    "energy_consumed": 57.21874,
+    "duration": 98745,
+    "emissions_rate": 1.548444,
+    "emissions_count": 1,
+}
+
 
 def test_add_project(client, custom_test_server):
     project_repository_mock = mock.Mock(spec=SqlAlchemyRepository)
@@ -224,7 +244,7 @@ def test_get_public_project_no_auth(client_with_auth, custom_test_server_with_au
     repository_mock = mock.Mock(spec=SqlAlchemyRepository)
     expected_project = PROJECT_3
     repository_mock.get_one_project.return_value = Project(**expected_project)
-    repository_mock.is_project_public.return_value = True
+    repository_mock.get_project_access.return_value = (True, False)
 
     with custom_test_server_with_auth.container.project_repository.override(
         repository_mock
@@ -234,3 +254,38 @@ def test_get_public_project_no_auth(client_with_auth, custom_test_server_with_au
 
     assert response.status_code == status.HTTP_200_OK
     assert actual_project == expected_project
+
+
+def test_default_range_project_sums_are_cached(client, custom_test_server):
+    repository_mock = mock.Mock(spec=SqlAlchemyRepository)
+    repository_mock.get_project_detailed_sums.return_value = ProjectReport(
+        **PROJECT_REPORT
+    )
+    report_cache = ReportCache()
+    # The default range is relative to now, which moves between the requests
+    nows = iter(
+        [
+            datetime(2024, 5, 1, 10, 15, 1, 123456),
+            datetime(2024, 5, 1, 10, 15, 1, 123789),
+            datetime(2024, 5, 1, 10, 15, 42, 987654),
+            datetime(2024, 5, 1, 10, 15, 42, 988001),
+        ]
+    )
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(nows)
+
+    with (
+        custom_test_server.container.project_repository.override(repository_mock),
+        custom_test_server.container.report_cache.override(report_cache),
+        mock.patch.object(projects, "datetime", FrozenDatetime),
+    ):
+        first = client.get(f"/projects/{PROJECT_ID}/sums")
+        second = client.get(f"/projects/{PROJECT_ID}/sums")
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.json() == second.json()
+    repository_mock.get_project_detailed_sums.assert_called_once()
+    assert report_cache.stats() == {"project_sums": {"hits": 1, "misses": 1}}
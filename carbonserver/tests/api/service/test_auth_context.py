@@ -1,8 +1,12 @@
+import time
 from unittest import mock
 from uuid import UUID
 
 import pytest
+from fastapi import HTTPException
 
+from carbonserver.api.errors import UserException
+from carbonserver.api.infra.permission_cache import PermissionCache
 from carbonserver.api.infra.repositories.repository_emissions import (
     SqlAlchemyRepository as EmissionRepository,
 )
@@ -89,30 +93,31 @@ def test_is_operation_authorized_on_project(auth_context):
 
 def test_can_read_public_project(auth_context):
     context, _, project_repo_mock, *_ = auth_context
-    project_repo_mock.is_project_public.return_value = True
+    project_repo_mock.get_project_access.return_value = (True, False)
 
     result = context.can_read_project(TEST_PROJECT_ID, None)
 
     assert result is True
-    project_repo_mock.is_project_public.assert_called_once_with(TEST_PROJECT_ID)
+    project_repo_mock.get_project_access.assert_called_once_with(
+        "project", TEST_PROJECT_ID, None
+    )
 
 
 def test_can_read_private_project_with_auth(auth_context):
-    context, user_repo_mock, project_repo_mock, *_ = auth_context
-    project_repo_mock.is_project_public.return_value = False
-    user_repo_mock.is_user_authorized_on_project.return_value = True
+    context, _, project_repo_mock, *_ = auth_context
+    project_repo_mock.get_project_access.return_value = (False, True)
 
     result = context.can_read_project(TEST_PROJECT_ID, TEST_USER)
 
     assert result is True
-    user_repo_mock.is_user_authorized_on_project.assert_called_once_with(
-        TEST_PROJECT_ID, TEST_USER.id
+    project_repo_mock.get_project_access.assert_called_once_with(
+        "project", TEST_PROJECT_ID, TEST_USER.id
     )
 
 
 def test_can_read_private_project_without_auth(auth_context):
     context, _, project_repo_mock, *_ = auth_context
-    project_repo_mock.is_project_public.return_value = False
+    project_repo_mock.get_project_access.return_value = (False, False)
 
     with pytest.raises(Exception) as exc:
         context.can_read_project(TEST_PROJECT_ID, None)
@@ -120,6 +125,14 @@ def test_can_read_private_project_without_auth(auth_context):
     assert exc.value.detail == "Not authenticated"
 
 
+def test_can_read_missing_project(auth_context):
+    context, _, project_repo_mock, *_ = auth_context
+    project_repo_mock.get_project_access.return_value = None
+
+    with pytest.raises(UserException):
+        context.can_read_project(TEST_PROJECT_ID, TEST_USER)
+
+
 def test_can_read_organization(auth_context):
     context, user_repo_mock, *_ = auth_context
     user_repo_mock.is_user_in_organization.return_value = True
@@ -145,65 +158,101 @@ def test_can_write_organization(auth_context):
 
 
 def test_can_read_experiment_resolves_to_owning_project(auth_context):
-    context, user_repo_mock, project_repo_mock, experiment_repo_mock, *_ = auth_context
-    experiment_repo_mock.get_one_experiment.return_value = mock.Mock(
-        project_id=TEST_PROJECT_ID
-    )
-    project_repo_mock.is_project_public.return_value = False
-    user_repo_mock.is_user_authorized_on_project.return_value = True
+    context, _, project_repo_mock, experiment_repo_mock, *_ = auth_context
+    project_repo_mock.get_project_access.return_value = (False, True)
 
     result = context.can_read_experiment(TEST_EXPERIMENT_ID, TEST_USER)
 
     assert result is True
-    experiment_repo_mock.get_one_experiment.assert_called_once_with(TEST_EXPERIMENT_ID)
-    user_repo_mock.is_user_authorized_on_project.assert_called_once_with(
-        TEST_PROJECT_ID, TEST_USER.id
+    project_repo_mock.get_project_access.assert_called_once_with(
+        "experiment", TEST_EXPERIMENT_ID, TEST_USER.id
     )
+    experiment_repo_mock.get_one_experiment.assert_not_called()
 
 
-def test_can_read_run_resolves_through_experiment_to_project(auth_context):
-    (
-        context,
-        _,
-        project_repo_mock,
-        experiment_repo_mock,
-        run_repo_mock,
-        _,
-    ) = auth_context
-    run_repo_mock.get_one_run.return_value = mock.Mock(experiment_id=TEST_EXPERIMENT_ID)
-    experiment_repo_mock.get_one_experiment.return_value = mock.Mock(
-        project_id=TEST_PROJECT_ID
-    )
+def test_can_read_run_of_public_project_anonymously(auth_context):
+    context, _, project_repo_mock, _, run_repo_mock, _ = auth_context
     # A public owning project makes the run readable even for an anonymous user.
-    project_repo_mock.is_project_public.return_value = True
+    project_repo_mock.get_project_access.return_value = (True, False)
 
     result = context.can_read_run(TEST_RUN_ID, None)
 
     assert result is True
-    run_repo_mock.get_one_run.assert_called_once_with(TEST_RUN_ID)
+    run_repo_mock.get_one_run.assert_not_called()
 
 
-def test_can_read_emission_resolves_through_run_to_project(auth_context):
-    (
-        context,
-        user_repo_mock,
-        project_repo_mock,
-        experiment_repo_mock,
-        run_repo_mock,
-        emission_repo_mock,
-    ) = auth_context
-    emission_repo_mock.get_one_emission.return_value = mock.Mock(run_id=TEST_RUN_ID)
-    run_repo_mock.get_one_run.return_value = mock.Mock(experiment_id=TEST_EXPERIMENT_ID)
-    experiment_repo_mock.get_one_experiment.return_value = mock.Mock(
-        project_id=TEST_PROJECT_ID
-    )
-    project_repo_mock.is_project_public.return_value = False
-    user_repo_mock.is_user_authorized_on_project.return_value = False
+def test_can_read_emission_resolves_with_one_query(auth_context):
+    context, _, project_repo_mock, *_, emission_repo_mock = auth_context
+    project_repo_mock.get_project_access.return_value = (False, False)
 
     result = context.can_read_emission(TEST_EMISSION_ID, TEST_USER)
 
     assert result is False
-    emission_repo_mock.get_one_emission.assert_called_once_with(TEST_EMISSION_ID)
+    project_repo_mock.get_project_access.assert_called_once_with(
+        "emission", TEST_EMISSION_ID, TEST_USER.id
+    )
+    emission_repo_mock.get_one_emission.assert_not_called()
+
+
+def test_can_read_missing_run(auth_context):
+    context, _, project_repo_mock, *_ = auth_context
+    project_repo_mock.get_project_access.return_value = None
+
+    with pytest.raises(HTTPException) as exc:
+        context.can_read_run(TEST_RUN_ID, TEST_USER)
+
+    assert exc.value.status_code == 404
+
+
+def test_permissions_are_resolved_once_per_request(auth_context):
+    context, user_repo_mock, project_repo_mock, *_ = auth_context
+    project_repo_mock.get_project_access.return_value = (False, True)
+    user_repo_mock.is_user_in_organization.return_value = True
+
+    for _ in range(3):
+        assert context.can_read_run(TEST_RUN_ID, TEST_USER) is True
+        assert context.can_read_organization(TEST_ORG_ID, TEST_USER) is True
+
+    project_repo_mock.get_project_access.assert_called_once()
+    user_repo_mock.is_user_in_organization.assert_called_once()
+
+
+def test_permissions_are_shared_by_user_and_entity():
+    cache = PermissionCache(ttl=30)
+    project_repo_mock = mock.Mock(spec=ProjectRepository)
+    project_repo_mock.get_project_access.return_value = (False, True)
+
+    def make_context():
+        return AuthContext(
+            user_repository=mock.Mock(spec=UserRepository),
+            token_repository=mock.Mock(spec=ProjectTokensRepository),
+            project_repository=project_repo_mock,
+            experiment_repository=mock.Mock(spec=ExperimentRepository),
+            run_repository=mock.Mock(spec=RunRepository),
+            emission_repository=mock.Mock(spec=EmissionRepository),
+            permission_cache=cache,
+        )
+
+    other_user = User(
+        id=TEST_ORG_ID, email="other@test.com", name="Other User", is_active=True
+    )
+    make_context().can_read_project(TEST_PROJECT_ID, TEST_USER)
+    make_context().can_read_project(TEST_PROJECT_ID, TEST_USER)
+    make_context().can_read_project(TEST_PROJECT_ID, other_user)
+    cache.invalidate_user(TEST_USER.id)
+    make_context().can_read_project(TEST_PROJECT_ID, TEST_USER)
+
+    assert project_repo_mock.get_project_access.call_count == 3
+    assert cache.hits == 1
+
+
+def test_expired_permissions_are_resolved_again():
+    cache = PermissionCache(ttl=30)
+    cache.set(TEST_USER_ID, "project", TEST_PROJECT_ID, True)
+
+    with mock.patch("time.monotonic", return_value=time.monotonic() + 31):
+        assert cache.get(TEST_USER_ID, "project", TEST_PROJECT_ID) is None
+    assert PermissionCache(ttl=0).get(TEST_USER_ID, "project", TEST_PROJECT_ID) is None
 
 
 def test_can_create_run(auth_context):
@@ -2,6 +2,17 @@
 Unit tests for OIDC authentication provider.
 """
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from authlib.integrations.starlette_client import OAuth
+from joserfc import jwt as jose_jwt
+from joserfc.jwk import ECKey, KeySet
+
 from carbonserver.api.services.auth_providers.oidc_auth_provider import OIDCAuthProvider
 
 
@@ -18,3 +29,133 @@ class TestOIDCAuthProvider:
 
         assert hasattr(provider, "get_authorize_url")
         assert hasattr(provider, "get_user_info")
+
+
+class StubOIDCServer:
+    """Local OIDC provider serving its metadata and signing keys"""
+
+    def __init__(self):
+        self.keys = [ECKey.generate_key("P-256", parameters={"kid": "key-1"})]
+        self.jwks_requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/.well-known/openid-configuration":
+                    body = {"issuer": stub.url, "jwks_uri": f"{stub.url}/jwks"}
+                else:
+                    stub.jwks_requests += 1
+                    body = KeySet(stub.keys).as_dict(private=False)
+                content = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def rotate_key(self, kid: str):
+        self.keys.append(ECKey.generate_key("P-256", parameters={"kid": kid}))
+
+    def token(self, kid: str = "key-1", expires_in: int = 300) -> str:
+        key = next(key for key in self.keys if key.kid == kid)
+        claims = {"sub": "user-1", "exp": int(time.time()) + expires_in}
+        return jose_jwt.encode({"alg": "ES256", "kid": kid}, claims, key)
+
+    def provider(self, **kwargs) -> OIDCAuthProvider:
+        provider = OIDCAuthProvider(
+            base_url=self.url, client_id="client", client_secret="secret", **kwargs
+        )
+        stub_oauth = OAuth()
+        stub_oauth.register(
+            "stub",
+            client_id="client",
+            client_secret="secret",
+            server_metadata_url=f"{self.url}/.well-known/openid-configuration",
+        )
+        provider.client = stub_oauth.create_client("stub")
+        return provider
+
+
+@pytest.fixture
+def oidc_server():
+    server = StubOIDCServer()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_key_set_is_fetched_once(oidc_server):
+    provider = oidc_server.provider()
+
+    for _ in range(3):
+        claims = await provider.get_user_info(oidc_server.token(expires_in=300))
+        assert claims["sub"] == "user-1"
+
+    assert oidc_server.jwks_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_key_set_is_fetched_again_for_an_unknown_key(oidc_server, monkeypatch):
+    provider = oidc_server.provider()
+    await provider.get_user_info(oidc_server.token())
+    oidc_server.rotate_key("key-2")
+
+    # Unknown keys do not trigger a fetch right after the previous one
+    with pytest.raises(Exception):
+        await provider.get_user_info(oidc_server.token("key-2"))
+    assert oidc_server.jwks_requests == 1
+
+    monkeypatch.setattr(provider, "_key_set_loaded_at", time.monotonic() - 61)
+    claims = await provider.get_user_info(oidc_server.token("key-2"))
+
+    assert claims["sub"] == "user-1"
+    assert oidc_server.jwks_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_key_set_is_fetched_again_once_expired(oidc_server):
+    provider = oidc_server.provider(signature_cache_ttl=0)
+
+    await provider.get_user_info(oidc_server.token())
+    await provider.get_user_info(oidc_server.token(expires_in=60))
+
+    assert oidc_server.jwks_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_validated_token_claims_are_kept_until_expiry(oidc_server):
+    provider = oidc_server.provider()
+    token = oidc_server.token()
+    claims = await provider.get_user_info(token)
+
+    with mock.patch.object(jose_jwt, "decode") as decode:
+        claims["sub"] = "changed by the caller"
+        assert (await provider.get_user_info(token))["sub"] == "user-1"
+    decode.assert_not_called()
+
+    # Once expired, the token is validated again, and rejected
+    with mock.patch("time.time", return_value=time.time() + 301):
+        with pytest.raises(Exception):
+            await provider.get_user_info(token)
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_claims_are_forgotten(oidc_server):
+    provider = oidc_server.provider()
+    token = oidc_server.token()
+    await provider.get_user_info(token)
+
+    await provider.revoke_token(token)
+
+    with mock.patch.object(jose_jwt, "decode", side_effect=ValueError) as decode:
+        with pytest.raises(ValueError):
+            await provider.get_user_info(token)
+    decode.assert_called_once()
@@ -120,6 +120,25 @@ def test_emission_service_retrieves_all_existing_emissions_for_one_run():
     assert len(list(actual_emissions_ids_list)) == len(set(actual_emissions_ids_list))
 
 
+def test_emission_service_retrieves_one_page_of_emissions_for_one_run():
+    repository_mock: SqlAlchemyRepository = mock.Mock(spec=SqlAlchemyRepository)
+    emission_service: EmissionService = EmissionService(
+        repository_mock, auth_context=FakeAuthContext()
+    )
+    repository_mock.get_emissions_from_run.return_value = [EMISSION_2]
+    repository_mock.count_emissions_from_run.return_value = 2
+
+    emissions, total = emission_service.get_emissions_page_from_run(
+        RUN_1_ID, limit=1, offset=1
+    )
+
+    assert [emission.id for emission in emissions] == [EMISSION_2.id]
+    assert total == 2
+    repository_mock.get_emissions_from_run.assert_called_once_with(
+        RUN_1_ID, limit=1, offset=1
+    )
+
+
 def test_emission_service_retrives_correct_emission_by_id():
     repository_mock: SqlAlchemyRepository = mock.Mock(spec=SqlAlchemyRepository)
     expected_emission_id = EMISSION_1.id
@@ -152,4 +171,26 @@ def test_emission_service_denies_get_emissions_from_run_when_not_authorized():
 
     with pytest.raises(UserException):
         emission_service.get_emissions_from_run(RUN_1_ID, user=None)
+    with pytest.raises(UserException):
+        emission_service.get_emissions_page_from_run(
+            RUN_1_ID, limit=10, offset=0, user=None
+        )
     repository_mock.get_emissions_from_run.assert_not_called()
+    repository_mock.count_emissions_from_run.assert_not_called()
+
+
+def test_emission_service_creates_emissions_in_one_repository_call():
+    repository_mock: SqlAlchemyRepository = mock.Mock(spec=SqlAlchemyRepository)
+    emission_service: EmissionService = EmissionService(
+        repository_mock, auth_context=FakeAuthContext()
+    )
+    repository_mock.add_emissions.return_value = [EMISSION_ID, EMISSION_ID_2]
+    emissions_to_create = [
+        EmissionCreate(**EMISSION_1.model_dump(exclude={"id"})),
+        EmissionCreate(**EMISSION_2.model_dump(exclude={"id"})),
+    ]
+
+    actual_ids = emission_service.add_emissions(emissions_to_create)
+
+    assert actual_ids == [EMISSION_ID, EMISSION_ID_2]
+    repository_mock.add_emissions.assert_called_once_with(emissions_to_create)
@@ -0,0 +1,154 @@
+from datetime import datetime
+from unittest import mock
+
+from api.mocks import FakeAuthContext
+
+from carbonserver.api.infra.report_cache import InMemoryReportStore, ReportCache
+from carbonserver.api.schemas import EmissionCreate
+from carbonserver.api.services.emissions_service import EmissionService
+from carbonserver.api.usecases.organization.organization_sum import (
+    OrganizationSumsUsecase,
+)
+from carbonserver.api.usecases.project.project_sum import ProjectSumsUsecase
+
+RUN_ID = "40088f1a-d28e-4980-8d80-bf5600056a14"
+EXPERIMENT_ID = "943b2aa5-9e21-41a9-8a38-562505b4b2aa"
+PROJECT_ID = "f52fe339-164d-4c2b-a8c0-f562dfce066d"
+ORGANIZATION_ID = "e52fe339-164d-4c2b-a8c0-f562dfce066d"
+OWNERS = {RUN_ID: (EXPERIMENT_ID, PROJECT_ID, ORGANIZATION_ID)}
+
+START_DATE = "2021-04-01"
+END_DATE = "2021-05-01"
+
+
+def make_emission() -> EmissionCreate:
+    return EmissionCreate(
+        timestamp="2021-04-04T08:43:00+02:00",
+        run_id=RUN_ID,
+        duration=98745,
+        emissions_sum=433.6544,
+        emissions_rate=1.548444,
+        cpu_power=0.3,
+        gpu_power=0.0,
+        ram_power=0.15,
+        cpu_energy=55.21874,
+        gpu_energy=0.0,
+        ram_energy=2.0,
+        energy_consumed=57.21874,
+    )
+
+
+def test_reports_are_cached_by_entity_and_date_range():
+    cache = ReportCache()
+    compute = mock.Mock(side_effect=["report 1", "report 2"])
+
+    def get(end_date=END_DATE):
+        return cache.get_or_compute(
+            "project_sums", "project", PROJECT_ID, START_DATE, end_date, compute
+        )
+
+    assert get() == "report 1"
+    assert get() == "report 1"
+    assert get(end_date="2021-06-01") == "report 2"
+    assert compute.call_count == 2
+    assert cache.stats() == {"project_sums": {"hits": 1, "misses": 2}}
+
+
+def test_dates_of_the_keys_are_truncated_to_the_minute():
+    cache = ReportCache()
+    compute = mock.Mock(side_effect=["report 1", "report 2"])
+
+    def get(end_date):
+        return cache.get_or_compute(
+            "project_sums", "project", PROJECT_ID, START_DATE, end_date, compute
+        )
+
+    assert get(datetime(2024, 5, 2, 10, 15, 1, 123456)) == "report 1"
+    assert get(datetime(2024, 5, 2, 10, 15, 59, 999999)) == "report 1"
+    assert get(datetime(2024, 5, 2, 10, 16)) == "report 2"
+
+
+def test_new_emissions_invalidate_the_reports_of_their_owners():
+    cache = ReportCache()
+    get_run_owners = mock.Mock(return_value=OWNERS)
+    reports = [
+        ("project_sums", "project", PROJECT_ID),
+        ("organization_sums", "organization", ORGANIZATION_ID),
+        ("experiment_sums_by_run", "experiment", EXPERIMENT_ID),
+    ]
+    compute = mock.Mock(return_value="report")
+    for report in reports:
+        cache.get_or_compute(*report, START_DATE, END_DATE, compute)
+
+    cache.invalidate_runs([RUN_ID, RUN_ID], get_run_owners)
+    cache.invalidate_runs([RUN_ID], get_run_owners)
+    for report in reports:
+        cache.get_or_compute(*report, START_DATE, END_DATE, compute)
+
+    assert compute.call_count == 6
+    get_run_owners.assert_called_once_with([RUN_ID])
+
+
+def test_evicted_generation_does_not_bring_back_old_reports():
+    cache = ReportCache(store=InMemoryReportStore(max_size=2))
+    compute = mock.Mock(side_effect=["old", "new"])
+
+    cache.get_or_compute("project_sums", "project", PROJECT_ID, 1, 2, compute)
+    cache.invalidate("project", PROJECT_ID)
+    # Evict the generation of the project
+    cache.store.set("a", 1, None)
+    cache.store.set("b", 2, None)
+
+    assert (
+        cache.get_or_compute("project_sums", "project", PROJECT_ID, 1, 2, compute)
+        == "new"
+    )
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = ReportCache(ttl=0)
+    compute = mock.Mock(return_value="report")
+
+    for _ in range(2):
+        cache.get_or_compute("project_sums", "project", PROJECT_ID, 1, 2, compute)
+    cache.invalidate_runs([RUN_ID], mock.Mock(side_effect=AssertionError))
+
+    assert compute.call_count == 2
+    assert len(cache.store) == 0
+
+
+def test_project_sums_are_read_once_until_new_emissions():
+    cache = ReportCache()
+    project_repository = mock.Mock()
+    project_repository.get_project_detailed_sums.return_value = "report"
+    usecase = ProjectSumsUsecase(project_repository, FakeAuthContext(), cache)
+    run_repository = mock.Mock()
+    run_repository.get_run_owners.return_value = OWNERS
+    emission_service = EmissionService(
+        mock.Mock(), FakeAuthContext(), run_repository, cache
+    )
+
+    usecase.compute_detailed_sum(PROJECT_ID, START_DATE, END_DATE)
+    usecase.compute_detailed_sum(PROJECT_ID, START_DATE, END_DATE)
+    emission_service.add_emissions([make_emission()])
+    usecase.compute_detailed_sum(PROJECT_ID, START_DATE, END_DATE)
+
+    assert project_repository.get_project_detailed_sums.call_count == 2
+
+
+def test_empty_organization_report_is_not_cached():
+    organization_repository = mock.Mock()
+    organization_repository.get_organization_detailed_sums.return_value = None
+    organization = mock.Mock(id=ORGANIZATION_ID, description="")
+    # "name" is a Mock constructor argument, it has to be set afterwards
+    organization.name = "org"
+    organization_repository.get_one_organization.return_value = organization
+    usecase = OrganizationSumsUsecase(
+        organization_repository, FakeAuthContext(), ReportCache()
+    )
+
+    for _ in range(2):
+        report = usecase.compute_detailed_sum(ORGANIZATION_ID, START_DATE, END_DATE)
+
+    assert report.emissions == 0.0
+    assert organization_repository.get_organization_detailed_sums.call_count == 2
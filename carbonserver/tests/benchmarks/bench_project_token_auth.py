@@ -0,0 +1,117 @@
+"""
+Benchmark of the emission ingestion with and without the project token cache.
+
+POST /emissions goes through the real router, service and project token
+repository, with the database replaced by an in-memory session returning one
+bcrypt-hashed token, so the figures show the cost of the token verification.
+
+Run from the carbonserver directory:
+
+    python tests/benchmarks/bench_project_token_auth.py --requests 50
+"""
+
+import argparse
+import time
+import uuid
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from carbonserver.api.infra import api_key_utils
+from carbonserver.api.infra.database.sql_models import ProjectToken
+from carbonserver.api.infra.project_token_cache import VerifiedTokenCache
+from carbonserver.api.infra.repositories.repository_emissions import (
+    SqlAlchemyRepository as EmissionRepository,
+)
+from carbonserver.api.infra.repositories.repository_projects_tokens import (
+    SqlAlchemyRepository as ProjectTokenRepository,
+)
+from carbonserver.api.routers import emissions
+from carbonserver.api.schemas import AccessLevel
+from carbonserver.container import ServerContainer
+
+TOKEN = api_key_utils.generate_api_key()
+RUN_ID = str(uuid.uuid4())
+EMISSION = {
+    "timestamp": "2021-04-04T08:43:00+02:00",
+    "run_id": RUN_ID,
+    "duration": 98745,
+    "emissions_sum": 206.548444,
+    "emissions_rate": 89.548444,
+    "cpu_power": 0.3,
+    "gpu_power": 0.0,
+    "ram_power": 0.15,
+    "cpu_energy": 55.21874,
+    "gpu_energy": 0.0,
+    "ram_energy": 2.0,
+    "energy_consumed": 57.21874,
+    "wue": 0,
+}
+
+
+class SessionContext:
+    def __init__(self, session):
+        self.session = session
+
+    def __enter__(self):
+        return self.session
+
+    def __exit__(self, *args):
+        return None
+
+
+def make_client(token_cache) -> TestClient:
+    db_token = ProjectToken(
+        id=uuid.uuid4(),
+        project_id=uuid.uuid4(),
+        name="benchmark",
+        hashed_token=api_key_utils.get_api_key_hash(TOKEN).decode(),
+        lookup_value=api_key_utils.generate_lookup_value(TOKEN),
+        revoked=False,
+        access=AccessLevel.READ_WRITE.value,
+    )
+    session = mock.Mock()
+    query = session.query.return_value.filter.return_value
+    query.join.return_value.join.return_value.filter.return_value.all.return_value = [
+        db_token
+    ]
+    emission_repository = mock.Mock(spec=EmissionRepository)
+    emission_repository.add_emission.return_value = uuid.uuid4()
+
+    container = ServerContainer()
+    container.wire(modules=[emissions])
+    container.emission_repository.override(emission_repository)
+    container.project_token_repository.override(
+        ProjectTokenRepository(lambda: SessionContext(session), token_cache=token_cache)
+    )
+    app = FastAPI()
+    app.container = container
+    app.include_router(emissions.router)
+    return TestClient(app)
+
+
+def run(label: str, token_cache, requests: int) -> float:
+    client = make_client(token_cache)
+    headers = {"x-api-token": TOKEN}
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.post("/emissions", json=EMISSION, headers=headers)
+        assert response.status_code == 201, response.text
+    rate = requests / (time.perf_counter() - start)
+    print(f"{label:<20} {rate:10.1f} req/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    before = run("bcrypt every time", None, args.requests)
+    after = run("token cache", VerifiedTokenCache(), args.requests)
+    print(f"speedup: x{after / before:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,16 @@ TODO : use async call to API
 # from httpx import AsyncClient
 import dataclasses
 import json
+import threading
+import time
 from datetime import timedelta, tzinfo
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
 
 import requests
 
+from codecarbon.core.emissions_spool import EmissionsSpool
+from codecarbon.core.http_client import encode_json_body, get_session
 from codecarbon.core.schemas import (
     EmissionCreate,
     ExperimentCreate,
@@ -43,6 +49,12 @@ class ApiClient:  # (AsyncClient)
         access_token=None,
         conf=None,
         create_run_automatically=True,
+        emissions_batch_size=1,
+        emissions_batch_max_delay=60,
+        session: Optional[requests.Session] = None,
+        compress=False,
+        spool: Optional[EmissionsSpool] = None,
+        spool_batch_size=100,
     ):
         """
         :endpoint_url: URL of the API endpoint
@@ -51,6 +63,15 @@ class ApiClient:  # (AsyncClient)
         :access_token: Code Carbon API access token
         :conf: Metadata of the experiment
         :create_run_automatically: If False, do not create a run. To use API in read only mode.
+        :emissions_batch_size: Number of queued emissions that triggers an upload.
+        :emissions_batch_max_delay: Age in seconds of the oldest queued emission that
+            triggers an upload, None to only upload on size.
+        :session: HTTP session to use, defaults to the one shared by the process.
+        :compress: Compress the large request bodies with gzip, the server must
+            accept the gzip Content-Encoding.
+        :spool: Where to keep the emissions while the API cannot be reached,
+            they are lost if None.
+        :spool_batch_size: Number of spooled emissions sent in each API call.
         """
         # super().__init__(base_url=endpoint_url) # (AsyncClient)
         self.url = endpoint_url
@@ -58,6 +79,16 @@ class ApiClient:  # (AsyncClient)
         self.api_key = api_key
         self.conf = conf
         self.access_token = access_token
+        self.emissions_batch_size = emissions_batch_size
+        self.emissions_batch_max_delay = emissions_batch_max_delay
+        self._session = session or get_session()
+        self.compress = compress
+        self._pending_emissions: List[EmissionCreate] = []
+        self._pending_since: Optional[float] = None
+        self._batch_endpoint_available = True
+        self.spool = spool
+        self.spool_batch_size = spool_batch_size
+        self._replay_lock = threading.Lock()
         if self.experiment_id is not None and create_run_automatically:
             self._create_run(self.experiment_id)
 
@@ -70,17 +101,30 @@ class ApiClient:  # (AsyncClient)
             headers["Authorization"] = f"Bearer {self.access_token}"
         return headers
 
+    def _send(self, method, url, payload=None):
+        """
+        Call the API and return the response, whatever its status code.
+
+        :method: the HTTP method, for example "GET"
+        :payload: the JSON body to send, if any
+        """
+        headers = self._get_headers()
+        body = None
+        if payload is not None:
+            body, body_headers = encode_json_body(payload, self.compress)
+            headers.update(body_headers)
+        return self._session.request(method, url, data=body, timeout=2, headers=headers)
+
     def _request(self, method, url, payload=None, expected_status=200):
         """
         Call the API and return the response, raising on anything that is not
         the status code the API answers on success.
 
-        :method: the requests function to call, for example requests.get
+        :method: the HTTP method, for example "GET"
         :payload: the JSON body to send, if any
         :expected_status: the http code the API returns when the call succeeds
         """
-        headers = self._get_headers()
-        response = method(url=url, json=payload, timeout=2, headers=headers)
+        response = self._send(method, url, payload)
         if response.status_code != expected_status:
             self._raise_api_error(url, payload or {}, response)
         return response
@@ -97,14 +141,14 @@ class ApiClient:  # (AsyncClient)
         Check API access to user account
         """
         url = self.url + "/auth/check"
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
     def get_list_organizations(self):
         """
         List all organizations
         """
         url = self.url + "/organizations"
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
     def check_organization_exists(self, organization_name: str):
         """
@@ -129,7 +173,7 @@ class ApiClient:  # (AsyncClient)
             return organization
         else:
             return self._request(
-                requests.post, url, payload=payload, expected_status=201
+                "POST", url, payload=payload, expected_status=201
             ).json()
 
     def get_organization(self, organization_id):
@@ -137,7 +181,7 @@ class ApiClient:  # (AsyncClient)
         Get an organization
         """
         url = self.url + "/organizations/" + organization_id
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
     def update_organization(self, organization: OrganizationCreate):
         """
@@ -145,14 +189,14 @@ class ApiClient:  # (AsyncClient)
         """
         payload = dataclasses.asdict(organization)
         url = self.url + "/organizations/" + organization.id
-        return self._request(requests.patch, url, payload=payload).json()
+        return self._request("PATCH", url, payload=payload).json()
 
     def list_projects_from_organization(self, organization_id):
         """
         List all projects
         """
         url = self.url + "/organizations/" + organization_id + "/projects"
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
     def create_project(self, project: ProjectCreate):
         """
@@ -160,18 +204,20 @@ class ApiClient:  # (AsyncClient)
         """
         payload = dataclasses.asdict(project)
         url = self.url + "/projects"
-        return self._request(
-            requests.post, url, payload=payload, expected_status=201
-        ).json()
+        return self._request("POST", url, payload=payload, expected_status=201).json()
 
     def get_project(self, project_id):
         """
         Get a project
         """
         url = self.url + "/projects/" + project_id
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
-    def add_emission(self, carbon_emission: dict):
+    def _build_emission(self, carbon_emission: dict) -> Optional[EmissionCreate]:
+        """
+        Convert tracker emissions data to the API schema, or return None if it
+        cannot be sent.
+        """
         assert self.experiment_id is not None
         if self.run_id is None:
             logger.warning(
@@ -183,13 +229,15 @@ class ApiClient:  # (AsyncClient)
                 logger.error(
                     "ApiClient.add_emission still no run_id, aborting for this time !"
                 )
-            return False
+            return None
         if carbon_emission["duration"] < 1:
             logger.warning(
                 "ApiClient : emissions not sent because of a duration smaller than 1."
             )
-            return False
-        emission = EmissionCreate(
+            return None
+        return EmissionCreate(
+            # Idempotency key, the server does not save an emission twice
+            id=str(uuid4()),
             timestamp=get_datetime_with_timezone(),
             run_id=self.run_id,
             duration=int(carbon_emission["duration"]),
@@ -207,17 +255,179 @@ class ApiClient:  # (AsyncClient)
             ram_utilization_percent=carbon_emission.get("ram_utilization_percent"),
             wue=carbon_emission.get("wue", 0),
         )
+
+    def add_emission(self, carbon_emission: dict):
+        emission = self._build_emission(carbon_emission)
+        if emission is None:
+            return False
+        self._post_emissions([emission])
+        return True
+
+    def queue_emission(self, carbon_emission: dict) -> bool:
+        """
+        Add an emission to the upload queue, without sending it.
+        Call flush_emissions() when emissions_batch_due() says so.
+        """
+        emission = self._build_emission(carbon_emission)
+        if emission is None:
+            return False
+        if not self._pending_emissions:
+            self._pending_since = time.monotonic()
+        self._pending_emissions.append(emission)
+        return True
+
+    def emissions_batch_due(self) -> bool:
+        """
+        Whether the queued emissions reached the batch size or the batch max delay.
+        """
+        if not self._pending_emissions:
+            return False
+        if len(self._pending_emissions) >= self.emissions_batch_size:
+            return True
+        return (
+            self.emissions_batch_max_delay is not None
+            and time.monotonic() - self._pending_since >= self.emissions_batch_max_delay
+        )
+
+    def emissions_batch_delay(self) -> Optional[float]:
+        """
+        Seconds until the queued emissions reach the batch max delay, None if
+        no emission is queued or there is no max delay.
+        """
+        if not self._pending_emissions or self.emissions_batch_max_delay is None:
+            return None
+        return max(
+            self.emissions_batch_max_delay - (time.monotonic() - self._pending_since),
+            0.0,
+        )
+
+    def flush_emissions(self) -> bool:
+        """
+        Upload all the queued emissions. They are dropped from the queue even if
+        the upload fails.
+        """
+        if not self._pending_emissions:
+            return False
+        emissions = self._pending_emissions
+        self._pending_emissions = []
+        self._pending_since = None
+        self._post_emissions(emissions)
+        return True
+
+    def _post_emissions(self, emissions: List[EmissionCreate]):
+        """
+        Send emissions, or keep them in the spool if the API cannot be reached.
+        """
+        payloads = [dataclasses.asdict(emission) for emission in emissions]
+        if self.spool is not None:
+            self._send_or_spool(payloads)
+            return
         try:
-            payload = dataclasses.asdict(emission)
-            url = self.url + "/emissions"
-            self._request(requests.post, url, payload=payload, expected_status=201)
-            logger.debug(f"ApiClient - Successful upload emission {payload} to {url}")
+            self._send_emissions(payloads)
         except requests.exceptions.HTTPError:
             # Already logged by _raise_api_error, do not log it twice.
             raise
         except Exception as e:
             logger.error(e, exc_info=True)
             raise
+
+    def _send_emissions(self, payloads: List[Dict[str, Any]]):
+        """
+        Send emissions in a single call to the batch endpoint, falling back to
+        one call per emission on servers that do not provide it.
+        """
+        if len(payloads) > 1 and self._batch_endpoint_available:
+            payload = {"emissions": payloads}
+            url = self.url + "/emissions/batch"
+            response = self._send("POST", url, payload)
+            if _route_missing(response):
+                logger.warning(
+                    "ApiClient : the API does not support batch upload, "
+                    + "sending emissions one by one."
+                )
+                self._batch_endpoint_available = False
+            else:
+                if response.status_code != 201:
+                    self._raise_api_error(url, payload, response)
+                logger.debug(
+                    f"ApiClient - Successful upload of {len(payloads)} emissions to {url}"
+                )
+                return
+        for payload in payloads:
+            url = self.url + "/emissions"
+            self._request("POST", url, payload=payload, expected_status=201)
+            logger.debug(f"ApiClient - Successful upload emission {payload} to {url}")
+
+    def _send_or_spool(self, payloads: List[Dict[str, Any]]):
+        if len(self.spool) > 0:
+            # Send the new emissions after the ones already waiting
+            self.spool.append(payloads)
+            self.replay_spool()
+            return
+        try:
+            self._send_emissions(payloads)
+            return
+        except Exception as e:
+            if not _api_unreachable(e):
+                raise
+            logger.warning(
+                f"ApiClient : the API cannot be reached ({e}), {len(payloads)} "
+                + f"emissions kept in {self.spool.path} to be sent later."
+            )
+        self.spool.append(payloads)
+
+    def replay_spool(self) -> bool:
+        """
+        Send the spooled emissions in batches, oldest first. A rejected batch
+        is sent again one emission at a time, and only the emissions the API
+        rejects on their own are dropped, as sending them again would not help.
+        The emissions are kept while the API key is refused.
+
+        :return: False if the API could not be reached, True once the spool
+            is empty.
+        """
+        if self.spool is None:
+            return True
+        with self._replay_lock:
+            while True:
+                batch = self.spool.peek(self.spool_batch_size)
+                if not batch:
+                    return True
+                try:
+                    self._send_emissions([payload for _, payload in batch])
+                except Exception as e:
+                    if _api_unreachable(e) or _api_key_refused(e):
+                        logger.debug(f"ApiClient : spool not replayed, {e}")
+                        return False
+                    if len(batch) > 1:
+                        if not self._replay_one_by_one(batch):
+                            return False
+                        continue
+                    logger.error(
+                        "ApiClient : spooled emission rejected by the API and "
+                        + f"dropped. {e}"
+                    )
+                self.spool.remove(batch[-1][0])
+
+    def _replay_one_by_one(self, batch: List[Tuple[int, Dict[str, Any]]]) -> bool:
+        """
+        Send the emissions of a rejected batch one at a time, dropping the
+        ones the API rejects.
+
+        :return: False if the API could not be reached or refused the key.
+        """
+        for seq, payload in batch:
+            try:
+                self._send_emissions([payload])
+            except Exception as e:
+                if _api_unreachable(e) or _api_key_refused(e):
+                    logger.debug(f"ApiClient : spool not replayed, {e}")
+                    return False
+                logger.error(
+                    f"ApiClient : spooled emission {payload.get('id')} rejected "
+                    + f"by the API and dropped. {e}"
+                )
+            self.spool.remove(seq)
         return True
 
     def _create_run(self, experiment_id: str):
@@ -251,7 +461,7 @@ class ApiClient:  # (AsyncClient)
             )
             payload = dataclasses.asdict(run)
             url = self.url + "/runs"
-            r = self._request(requests.post, url, payload=payload, expected_status=201)
+            r = self._request("POST", url, payload=payload, expected_status=201)
             self.run_id = r.json()["id"]
             logger.info(
                 "ApiClient Successfully registered your run on the API.\n\n"
@@ -277,7 +487,7 @@ class ApiClient:  # (AsyncClient)
         List all experiments for a project
         """
         url = self.url + "/projects/" + project_id + "/experiments"
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
     def set_experiment(self, experiment_id: str):
         """
@@ -292,16 +502,14 @@ class ApiClient:  # (AsyncClient)
         """
         payload = dataclasses.asdict(experiment)
         url = self.url + "/experiments"
-        return self._request(
-            requests.post, url, payload=payload, expected_status=201
-        ).json()
+        return self._request("POST", url, payload=payload, expected_status=201).json()
 
     def get_experiment(self, experiment_id):
         """
         Get an experiment by id
         """
         url = self.url + "/experiments/" + experiment_id
-        return self._request(requests.get, url).json()
+        return self._request("GET", url).json()
 
     def _raise_api_error(self, url, payload, response):
         """
@@ -328,6 +536,51 @@ class ApiClient:  # (AsyncClient)
         """
 
 
+def _api_unreachable(error: Exception) -> bool:
+    """
+    Whether a failed call may succeed later: no connection, a timeout, an
+    overloaded or failing server.
+    """
+    if isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ):
+        return True
+    response = getattr(error, "response", None)
+    return isinstance(error, requests.exceptions.HTTPError) and (
+        response is None or response.status_code >= 500 or response.status_code == 429
+    )
+
+
+def _route_missing(response: requests.Response) -> bool:
+    """
+    Whether the server does not provide the route called, rather than a 404
+    about a resource, like an unknown run, which has a detail of its own.
+    """
+    if response.status_code == 405:
+        return True
+    if response.status_code != 404:
+        return False
+    try:
+        detail = response.json().get("detail")
+    except (ValueError, AttributeError):
+        # Not a JSON object, not an answer of the API itself
+        return True
+    # The answer of FastAPI when no route matches
+    return detail in (None, "Not Found")
+
+
+def _api_key_refused(error: Exception) -> bool:
+    """
+    Whether the API refused the credentials rather than the emissions.
+    """
+    response = getattr(error, "response", None)
+    return (
+        isinstance(error, requests.exceptions.HTTPError)
+        and response is not None
+        and response.status_code == 401
+    )
+
+
 class simple_utc(tzinfo):
     def tzname(self, **kwargs):
         return "UTC"
@@ -0,0 +1,134 @@
+"""
+Time series of the energy consumed and of the grid carbon intensity.
+
+The tracker records the energy of each measurement interval in an
+`EnergySeries`. At the end of the run, it is joined with a
+`CarbonIntensitySeries`, from the Electricity Maps history or from a file, so
+that each interval is attributed the carbon intensity of its time instead of
+the one at the time of the last update.
+"""
+
+import csv
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+TIMESTAMP_COLUMNS = ("datetime", "timestamp")
+CARBON_INTENSITY_COLUMNS = ("carbon_intensity", "carbonIntensity")
+
+
+class EnergySeries:
+    """
+    Energy consumed in each measurement interval, stored in two arrays of
+    doubles: the Unix time of the end of the interval and the energy in kWh.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self, start: Optional[float] = None) -> None:
+        """
+        :param start: Unix time of the start of the first interval, the first
+                      interval is empty if unknown.
+        """
+        self.start = start
+        self.timestamps = array("d")
+        self.energies = array("d")
+
+    def add(self, timestamp: float, kWh: float) -> None:
+        self.timestamps.append(timestamp)
+        self.energies.append(kWh)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class CarbonIntensitySeries:
+    """
+    Carbon intensity of the grid, in g CO2eq/kWh, at given Unix times.
+    Between two points the carbon intensity is interpolated linearly, before
+    the first point and after the last one it is constant.
+    """
+
+    def __init__(self, points: Iterable[Tuple[float, float]]):
+        points = sorted(points)
+        if not points:
+            raise ValueError("A carbon intensity series needs at least one point")
+        self.timestamps = array("d", (timestamp for timestamp, _ in points))
+        self.carbon_intensities = array("d", (intensity for _, intensity in points))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def get_emissions(self, energy_series: EnergySeries) -> float:
+        """
+        CO2 emissions, in kg, of the energy series. Each interval is attributed
+        the carbon intensity at its middle.
+        """
+        if not energy_series:
+            return 0.0
+        import numpy as np
+
+        ends = np.frombuffer(energy_series.timestamps, dtype=np.float64)
+        starts = np.empty_like(ends)
+        starts[0] = ends[0] if energy_series.start is None else energy_series.start
+        starts[1:] = ends[:-1]
+        carbon_intensities = np.interp(
+            (starts + ends) / 2,
+            np.frombuffer(self.timestamps, dtype=np.float64),
+            np.frombuffer(self.carbon_intensities, dtype=np.float64),
+        )
+        energies = np.frombuffer(energy_series.energies, dtype=np.float64)
+        return float(np.dot(energies, carbon_intensities)) / 1000
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "CarbonIntensitySeries":
+        """
+        Read a CSV or Parquet file with a `datetime` (or `timestamp`) column,
+        as ISO 8601 dates or Unix times, and a `carbon_intensity` (or
+        `carbonIntensity`) column in g CO2eq/kWh. Dates without a time zone
+        are in UTC.
+        """
+        path = Path(path).expanduser()
+        if path.suffix.lower() == ".parquet":
+            import pandas as pd
+
+            rows = pd.read_parquet(path).to_dict("records")
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        if not rows:
+            raise ValueError(f"No carbon intensity in {path}")
+        timestamp_column = _find_column(rows[0], TIMESTAMP_COLUMNS, path)
+        intensity_column = _find_column(rows[0], CARBON_INTENSITY_COLUMNS, path)
+        return cls(
+            (parse_timestamp(row[timestamp_column]), float(row[intensity_column]))
+            for row in rows
+        )
+
+
+def _find_column(row: dict, names: Tuple[str, ...], path: Path) -> str:
+    for name in names:
+        if name in row:
+            return name
+    raise ValueError(f"{path} has none of the columns {', '.join(names)}")
+
+
+def parse_timestamp(value) -> float:
+    """
+    Unix time of an ISO 8601 date, a datetime or a number of seconds.
+    Dates without a time zone are in UTC.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            value = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if hasattr(value, "to_pydatetime"):
+        value = value.to_pydatetime()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
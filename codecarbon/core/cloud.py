@@ -1,9 +1,18 @@
-from typing import Any, Dict, Optional
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
 
 import requests
 
+from codecarbon.core.util import read_json_cache, write_json_cache
 from codecarbon.external.logger import logger
 
+CLOUD_CACHE_FILE = "cloud.json"
+# Seconds before the persisted cloud provider and region are probed again
+CLOUD_CACHE_TTL = 24 * 3600
+
 
 def postprocess_gcp_cloud_metadata(cloud_metadata: Dict[str, Any]) -> Dict[str, Any]:
     # Attributes contains custom metadata and also contains Kubernetes config,
@@ -50,22 +59,78 @@ def get_env_cloud_details(timeout: int = 1) -> Optional[Any]:
         'ramdiskId': None,
         'region': 'us-east-1',
         'version': '2017-09-30'}}
+
+    The metadata endpoints of all the providers are probed concurrently, the
+    first positive answer is returned.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=len(CLOUD_METADATA_MAPPING),
+        thread_name_prefix="codecarbon-cloud",
+    )
+    futures = {
+        executor.submit(_get_provider_cloud_details, provider, timeout): provider
+        for provider in CLOUD_METADATA_MAPPING
+    }
+    try:
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except requests.exceptions.RequestException:
+                logger.debug("Not running on %s", futures[future])
+        return None
+    finally:
+        # Do not wait for the other providers, which will time out
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_provider_cloud_details(provider: str, timeout: int) -> Dict[str, Any]:
+    params = CLOUD_METADATA_MAPPING[provider]
+    response = requests.get(params["url"], headers=params["headers"], timeout=timeout)
+    response.raise_for_status()
+    response_data = response.json()
+
+    postprocess_function = params.get("postprocess_function")
+    if postprocess_function is not None:
+        response_data = postprocess_function(response_data)
+
+    return {"provider": provider, "metadata": response_data}
+
+
+def read_cached_cloud(
+    cache_dir: Union[str, Path],
+) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    Cloud provider and region persisted by a previous process on this host,
+    None if there are none or if they are expired.
+    """
+    content = read_json_cache(Path(cache_dir) / CLOUD_CACHE_FILE)
+    if (
+        not isinstance(content, dict)
+        or content.get("host") != platform.node()
+        or not isinstance(content.get("expires"), (int, float))
+        or content["expires"] < time.time()
+    ):
+        return None
+    return content.get("provider"), content.get("region")
+
+
+def write_cached_cloud(
+    cache_dir: Union[str, Path],
+    provider: Optional[str],
+    region: Optional[str],
+    ttl: float = CLOUD_CACHE_TTL,
+) -> None:
+    """
+    Persist the cloud provider and region of this host. The full metadata is
+    not kept, as it holds account ids and IP addresses.
     """
-    for provider in CLOUD_METADATA_MAPPING.keys():
-        try:
-            params = CLOUD_METADATA_MAPPING[provider]
-            response = requests.get(
-                params["url"], headers=params["headers"], timeout=timeout
-            )
-            response.raise_for_status()
-            response_data = response.json()
-
-            postprocess_function = params.get("postprocess_function")
-            if postprocess_function is not None:
-                response_data = postprocess_function(response_data)
-
-            return {"provider": provider, "metadata": response_data}
-        except requests.exceptions.RequestException:
-            logger.debug("Not running on %s", provider)
-
-    return None
+    content = {
+        "host": platform.node(),
+        "expires": time.time() + ttl,
+        "provider": provider,
+        "region": region,
+    }
+    try:
+        write_json_cache(Path(cache_dir) / CLOUD_CACHE_FILE, content)
+    except OSError as e:
+        logger.warning(f"Unable to write the cloud cache in {cache_dir}: {e}")
@@ -12,19 +12,16 @@ import shutil
 import subprocess
 import sys
 from functools import lru_cache
-from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import psutil
 from rapidfuzz import fuzz, process, utils
 
-from codecarbon.core.rapl import RAPLFile
+from codecarbon.core.rapl import RAPLFile, RAPLReading, readings_to_details
 from codecarbon.core.units import Time
 from codecarbon.core.util import count_cpus, detect_cpu_model
 from codecarbon.external.logger import logger
 
-if TYPE_CHECKING:
-    import pandas as pd
-
 # default W value per core for a CPU if no model is found in the ref csv
 DEFAULT_POWER_PER_CORE = 4
 
@@ -414,7 +411,7 @@ class IntelRAPL:
         _lin_rapl_dir (str): The directory path where Intel RAPL files are located.
         _system (str): The platform of the running system, typically used to ensure compatibility.
         _rapl_files (List[RAPLFile]): A list of RAPLFile objects representing the files to read energy data from.
-        _cpu_details (Dict): A dictionary storing the latest CPU energy details.
+        _readings (List[RAPLReading]): The latest energy and power of each domain.
         _last_mesure (int): Placeholder for storing the last measurement time.
         rapl_include_dram (bool): Whether to include DRAM power in measurements (default: False for complete hardware measurement).
         rapl_prefer_psys (bool): Whether to prefer psys domain over package domains (default: False).
@@ -433,8 +430,14 @@ class IntelRAPL:
         start():
             Starts monitoring CPU energy consumption.
 
+        get_cpu_readings(duration: Time) -> List[RAPLReading]:
+            Fetches the energy and power of each domain over a specified duration by reading values from RAPL files.
+
+        get_static_cpu_readings() -> List[RAPLReading]:
+            Returns the last readings without recalculating them.
+
         get_cpu_details(duration: Time) -> Dict:
-            Fetches the CPU energy deltas over a specified duration by reading values from RAPL files.
+            Same as get_cpu_readings, with the metric names of Intel Power Gadget.
 
         get_static_cpu_details() -> Dict:
             Returns the CPU details without recalculating them.
@@ -453,7 +456,7 @@ class IntelRAPL:
         self.rapl_include_dram = rapl_include_dram
         self.rapl_prefer_psys = rapl_prefer_psys
         self._setup_rapl()
-        self._cpu_details: Dict = {}
+        self._readings: List[RAPLReading] = []
 
         self._last_mesure = 0
 
@@ -770,9 +773,10 @@ class IntelRAPL:
             domain_name,
         ) in domain_map.values():
             try:
-                if domain_name and (
+                processor = bool(domain_name) and (
                     "package" in domain_name.lower() or "psys" in domain_name.lower()
-                ):
+                )
+                if processor:
                     display_name = f"Processor Energy Delta_{domain_index}(kWh)"
                     domain_index += 1
                 else:
@@ -780,7 +784,12 @@ class IntelRAPL:
 
                 interface_type = "MMIO" if is_mmio else "MSR"
                 self._rapl_files.append(
-                    RAPLFile(name=display_name, path=rapl_file, max_path=rapl_file_max)
+                    RAPLFile(
+                        name=display_name,
+                        path=rapl_file,
+                        max_path=rapl_file_max,
+                        processor=processor,
+                    )
                 )
                 logger.info(
                     "\tRAPL - Monitoring domain '%s' (displayed as '%s') via %s at %s",
@@ -833,23 +842,15 @@ class IntelRAPL:
         domain_map = self._deduplicate_domains(domains_to_use)
         self._create_rapl_files(domain_map, found_main_readable)
 
-    def get_cpu_details(self, duration: Time) -> Dict:
+    def get_cpu_readings(self, duration: Time) -> List[RAPLReading]:
         """
-        Fetches the CPU Energy Deltas by fetching values from RAPL files
+        Fetches the energy and power of each domain from the RAPL files
         """
-        cpu_details = {}
+        readings = []
         try:
             for rapl_file in self._rapl_files:
                 rapl_file.delta(duration)
-
-            for rapl_file in self._rapl_files:
-                logger.debug(rapl_file)
-                cpu_details[rapl_file.name] = rapl_file.energy_delta.kWh
-                # We fake the name used by Power Gadget when using RAPL
-                if "Energy" in rapl_file.name:
-                    cpu_details[rapl_file.name.replace("Energy", "Power")] = (
-                        rapl_file.power.W
-                    )
+            readings = [rapl_file.reading() for rapl_file in self._rapl_files]
         except Exception as e:
             logger.info(
                 "\tRAPL - Unable to read Intel RAPL files at %s\n \
@@ -858,15 +859,27 @@ class IntelRAPL:
                 e,
                 exc_info=True,
             )
-        self._cpu_details = cpu_details
-        logger.debug("get_cpu_details %s", self._cpu_details)
-        return cpu_details
+        self._readings = readings
+        logger.debug("get_cpu_readings %s", readings)
+        return readings
+
+    def get_static_cpu_readings(self) -> List[RAPLReading]:
+        """
+        Return the last readings without computing them.
+        """
+        return self._readings
+
+    def get_cpu_details(self, duration: Time) -> Dict:
+        """
+        Fetches the CPU Energy Deltas by fetching values from RAPL files
+        """
+        return readings_to_details(self.get_cpu_readings(duration))
 
     def get_static_cpu_details(self) -> Dict:
         """
         Return CPU details without computing them.
         """
-        return self._cpu_details
+        return readings_to_details(self._readings)
 
     def start(self) -> None:
         """
@@ -898,22 +911,22 @@ class TDP:
         self.model, self.tdp = self._main()
 
     @staticmethod
-    def _get_cpu_constant_power(match: str, cpu_power_df: pd.DataFrame) -> int:
+    def _get_cpu_constant_power(match: str, cpu_power_table: Dict[str, str]) -> int:
         """Extract constant power from matched CPU"""
-        return float(cpu_power_df[cpu_power_df["Name"] == match]["TDP"].values[0])
+        return float(cpu_power_table[match])
 
     def _get_cpu_power_from_registry(self, cpu_model_raw: str) -> Optional[int]:
         from codecarbon.input import DataSource
 
-        cpu_power_df = DataSource().get_cpu_power_data()
-        cpu_matching = self._get_matching_cpu(cpu_model_raw, cpu_power_df)
+        cpu_power_table = DataSource().get_cpu_power_table()
+        cpu_matching = self._get_matching_cpu(cpu_model_raw, list(cpu_power_table))
         if cpu_matching:
-            power = self._get_cpu_constant_power(cpu_matching, cpu_power_df)
+            power = self._get_cpu_constant_power(cpu_matching, cpu_power_table)
             return power
         return None
 
     def _get_matching_cpu(
-        self, model_raw: str, cpu_df: pd.DataFrame, greedy=False
+        self, model_raw: str, cpu_names: List[str], greedy=False
     ) -> str:
         """
         Get matching cpu name
@@ -921,7 +934,7 @@ class TDP:
         :args:
             model_raw (str): raw name of the cpu model detected on the machine
 
-            cpu_df (DataFrame): table containing cpu models along their tdp
+            cpu_names (List[str]): names of the cpu models with a known tdp
 
             greedy (default False): if multiple cpu models match with an equal
             ratio of similarity, greedy (True) selects the first model,
@@ -947,7 +960,7 @@ class TDP:
 
         direct_match = process.extractOne(
             model_raw,
-            cpu_df["Name"],
+            cpu_names,
             processor=lambda s: s.lower(),
             scorer=fuzz.ratio,
             score_cutoff=THRESHOLD_DIRECT,
@@ -964,7 +977,7 @@ class TDP:
         model_raw = re.sub(r" @\s*\d+\.\d+GHz", "", model_raw)
         direct_match = process.extractOne(
             model_raw,
-            cpu_df["Name"],
+            cpu_names,
             processor=lambda s: s.lower(),
             scorer=fuzz.ratio,
             score_cutoff=THRESHOLD_DIRECT,
@@ -974,7 +987,7 @@ class TDP:
             return direct_match[0]
         indirect_matches = process.extract(
             model_raw,
-            cpu_df["Name"],
+            cpu_names,
             processor=utils.default_process,
             scorer=fuzz.token_set_ratio,
             score_cutoff=THRESHOLD_TOKEN_SET,
@@ -1,13 +1,36 @@
-from typing import Any, Dict
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
 
 import requests
 
+from codecarbon.core.carbon_intensity_series import (
+    CarbonIntensitySeries,
+    parse_timestamp,
+)
+from codecarbon.core.http_client import get_session
 from codecarbon.core.units import EmissionsPerKWh, Energy
+from codecarbon.core.util import read_json_cache, write_json_cache
 from codecarbon.external.geography import GeoMetadata
+from codecarbon.external.logger import logger
 
 URL: str = "https://api.electricitymaps.com/v3/carbon-intensity/latest"
+HISTORY_URL: str = "https://api.electricitymaps.com/v3/carbon-intensity/history"
 ELECTRICITYMAPS_API_TIMEOUT: int = 30
 
+INTENSITY_CACHE_FILE = "carbon_intensity.json"
+# Carbon intensities fetched in the same time bucket, in seconds, are reused
+INTENSITY_BUCKET_SECONDS = 15 * 60
+# Seconds a carbon intensity is still served after the end of its bucket,
+# while a fresh one is fetched in the background
+INTENSITY_STALE_SECONDS = 60 * 60
+# Seconds without a background refresh of a location after a failed one
+INTENSITY_RETRY_SECONDS = 5 * 60
+# The history only covers the last 24 hours: during a run, it is fetched again
+# in the background after this many seconds, before its oldest points are lost
+INTENSITY_HISTORY_REFRESH_SECONDS = 12 * 60 * 60
+
 
 def get_emissions(
     energy: Energy, geo: GeoMetadata, electricitymaps_api_token: str = ""
@@ -37,13 +60,73 @@ def get_emissions(
         ElectricityMapsAPIError:
             If the Electricity Maps API request fails or returns an error.
     """
+    carbon_intensity_g_per_kWh = get_carbon_intensity(geo, electricitymaps_api_token)
+    emissions_per_kWh: EmissionsPerKWh = EmissionsPerKWh.from_g_per_kWh(
+        carbon_intensity_g_per_kWh
+    )
+    return emissions_per_kWh.kgs_per_kWh * energy.kWh
+
+
+def get_carbon_intensity(
+    geo: GeoMetadata,
+    electricitymaps_api_token: str = "",
+    session: Optional[requests.Session] = None,
+    url: str = URL,
+) -> float:
+    """
+    Latest carbon intensity, in g CO2eq/kWh, of the grid at the given location.
+
+    Raises:
+        ElectricityMapsAPIError:
+            If the Electricity Maps API request fails or returns an error.
+    """
+    # API v3 response structure: carbonIntensity is at the root level
+    response_data = _request(geo, electricitymaps_api_token, session, url)
+    carbon_intensity_g_per_kWh = response_data.get("carbonIntensity")
+
+    if carbon_intensity_g_per_kWh is None:
+        raise ElectricityMapsAPIError("No carbonIntensity data in response")
+    return float(carbon_intensity_g_per_kWh)
+
+
+def get_carbon_intensity_history(
+    geo: GeoMetadata,
+    electricitymaps_api_token: str = "",
+    session: Optional[requests.Session] = None,
+    url: str = HISTORY_URL,
+) -> CarbonIntensitySeries:
+    """
+    Hourly carbon intensity of the grid at the given location over the last
+    24 hours.
+
+    Raises:
+        ElectricityMapsAPIError:
+            If the Electricity Maps API request fails or returns an error.
+    """
+    response_data = _request(geo, electricitymaps_api_token, session, url)
+    points = [
+        (parse_timestamp(point["datetime"]), float(point["carbonIntensity"]))
+        for point in response_data.get("history") or []
+        if point.get("carbonIntensity") is not None
+    ]
+    if not points:
+        raise ElectricityMapsAPIError("No carbonIntensity data in history response")
+    return CarbonIntensitySeries(points)
+
+
+def _request(
+    geo: GeoMetadata,
+    electricitymaps_api_token: str,
+    session: Optional[requests.Session],
+    url: str,
+) -> Dict[str, Any]:
     params: Dict[str, Any]
     if geo.latitude:
         params = {"lat": geo.latitude, "lon": geo.longitude}
     else:
         params = {"countryCode": geo.country_2letter_iso_code}
-    resp = requests.get(
-        URL,
+    resp = (session or requests).get(
+        url,
         params=params,
         headers={"auth-token": electricitymaps_api_token},
         timeout=ELECTRICITYMAPS_API_TIMEOUT,
@@ -51,18 +134,238 @@ def get_emissions(
     if resp.status_code != 200:
         message = resp.json().get("error") or resp.json().get("message")
         raise ElectricityMapsAPIError(message)
+    return resp.json()
 
-    # API v3 response structure: carbonIntensity is at the root level
-    response_data = resp.json()
-    carbon_intensity_g_per_kWh = response_data.get("carbonIntensity")
 
-    if carbon_intensity_g_per_kWh is None:
-        raise ElectricityMapsAPIError("No carbonIntensity data in response")
+class CarbonIntensityCache:
+    """
+    Carbon intensities of the Electricity Maps API, reused within a time bucket.
 
-    emissions_per_kWh: EmissionsPerKWh = EmissionsPerKWh.from_g_per_kWh(
-        carbon_intensity_g_per_kWh
-    )
-    return emissions_per_kWh.kgs_per_kWh * energy.kWh
+    Once its bucket is over, a carbon intensity is still served for
+    `stale_seconds` while a fresh one is fetched in a background thread, so
+    that only the first lookup of a location waits for the API. After a failed
+    refresh, the next one waits `retry_seconds`. With a
+    `cache_dir`, the carbon intensities are shared with the other processes.
+
+    The points of the carbon intensity histories fetched are merged, so that
+    history of a run, refreshed every `history_refresh_seconds`, covers the
+    whole run even past the 24 hours returned by the API.
+    """
+
+    def __init__(
+        self,
+        electricitymaps_api_token: str,
+        cache_dir: Optional[Union[str, Path]] = None,
+        bucket_seconds: float = INTENSITY_BUCKET_SECONDS,
+        stale_seconds: float = INTENSITY_STALE_SECONDS,
+        retry_seconds: float = INTENSITY_RETRY_SECONDS,
+        history_refresh_seconds: float = INTENSITY_HISTORY_REFRESH_SECONDS,
+        url: str = URL,
+        history_url: str = HISTORY_URL,
+    ):
+        self._electricitymaps_api_token = electricitymaps_api_token
+        self._cache_path = (
+            None if cache_dir is None else Path(cache_dir) / INTENSITY_CACHE_FILE
+        )
+        self._bucket_seconds = bucket_seconds
+        self._stale_seconds = stale_seconds
+        self._retry_seconds = retry_seconds
+        self._history_refresh_seconds = history_refresh_seconds
+        self._url = url
+        self._history_url = history_url
+        # Location key -> (carbon intensity in g/kWh, fetch time)
+        self._entries: Dict[str, Tuple[float, float]] = {}
+        self._refreshing: Set[str] = set()
+        # Location key -> time of the last failed refresh
+        self._failed_at: Dict[str, float] = {}
+        # Location key -> {Unix time: carbon intensity} of the histories fetched
+        self._histories: Dict[str, Dict[float, float]] = {}
+        # Location key -> time of the last history fetch
+        self._history_fetched_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def location_key(geo: GeoMetadata) -> str:
+        # Coordinates rounded to ~11 km, like in the emissions data
+        if geo.latitude:
+            return f"{round(geo.latitude, 1)},{round(geo.longitude, 1)}"
+        return str(geo.country_2letter_iso_code)
+
+    def get_emissions(self, energy: Energy, geo: GeoMetadata) -> float:
+        """
+        CO2 emissions, in kg, of the energy consumed at the given location.
+        """
+        emissions_per_kWh = EmissionsPerKWh.from_g_per_kWh(
+            self.get_carbon_intensity(geo)
+        )
+        return emissions_per_kWh.kgs_per_kWh * energy.kWh
+
+    def get_carbon_intensity(self, geo: GeoMetadata) -> float:
+        """
+        Carbon intensity, in g CO2eq/kWh, of the grid at the given location.
+
+        Raises:
+            ElectricityMapsAPIError:
+                If there is no usable cached value and the request fails.
+        """
+        key = self.location_key(geo)
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None or not self._is_fresh(entry, now):
+            entry = self._newest(entry, self._read_persisted_entry(key))
+            if entry is not None:
+                self._entries[key] = entry
+        if entry is not None:
+            if self._is_fresh(entry, now):
+                return entry[0]
+            if self._is_usable(entry, now):
+                self._refresh_in_background(key, lambda: self._fetch(key, geo))
+                return entry[0]
+        return self._fetch(key, geo)
+
+    def get_carbon_intensity_history(self, geo: GeoMetadata) -> CarbonIntensitySeries:
+        """
+        Carbon intensity history of the location, fetched once per time bucket,
+        merged with the histories fetched before and completed with the latest
+        carbon intensity already known.
+
+        Raises:
+            ElectricityMapsAPIError:
+                If the request fails.
+        """
+        key = self.location_key(geo)
+        now = time.time()
+        fetched_at = self._history_fetched_at.get(key)
+        if (
+            fetched_at is None
+            or fetched_at // self._bucket_seconds != now // self._bucket_seconds
+        ):
+            self._fetch_history(key, geo)
+        with self._lock:
+            points = dict(self._histories[key])
+        latest = self._entries.get(key)
+        if latest is not None and latest[1] > max(points):
+            points[latest[1]] = latest[0]
+        return CarbonIntensitySeries(points.items())
+
+    def refresh_carbon_intensity_history(self, geo: GeoMetadata, since: float) -> None:
+        """
+        Fetch the carbon intensity history of the location in a background
+        thread, once `history_refresh_seconds` have passed since the Unix time
+        `since`, the start of the run, or since the last fetch.
+        """
+        key = self.location_key(geo)
+        covered_until = max(since, self._history_fetched_at.get(key, since))
+        if time.time() - covered_until < self._history_refresh_seconds:
+            return
+        self._refresh_in_background(
+            f"{key} history", lambda: self._fetch_history(key, geo)
+        )
+
+    def _is_fresh(self, entry: Tuple[float, float], now: float) -> bool:
+        return entry[1] // self._bucket_seconds == now // self._bucket_seconds
+
+    def _is_usable(self, entry: Tuple[float, float], now: float) -> bool:
+        bucket_end = (entry[1] // self._bucket_seconds + 1) * self._bucket_seconds
+        return now < bucket_end + self._stale_seconds
+
+    @staticmethod
+    def _newest(
+        *entries: Optional[Tuple[float, float]],
+    ) -> Optional[Tuple[float, float]]:
+        entries = [entry for entry in entries if entry is not None]
+        return max(entries, key=lambda entry: entry[1]) if entries else None
+
+    def _fetch(self, key: str, geo: GeoMetadata) -> float:
+        carbon_intensity = get_carbon_intensity(
+            geo,
+            self._electricitymaps_api_token,
+            session=get_session(),
+            url=self._url,
+        )
+        entry = (carbon_intensity, time.time())
+        self._entries[key] = entry
+        self._persist_entry(key, entry)
+        return carbon_intensity
+
+    def _fetch_history(self, key: str, geo: GeoMetadata) -> None:
+        history = get_carbon_intensity_history(
+            geo,
+            self._electricitymaps_api_token,
+            session=get_session(),
+            url=self._history_url,
+        )
+        with self._lock:
+            self._histories.setdefault(key, {}).update(
+                zip(history.timestamps, history.carbon_intensities)
+            )
+            self._history_fetched_at[key] = time.time()
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            failed_at = self._failed_at.get(key)
+            if failed_at is not None and time.time() - failed_at < self._retry_seconds:
+                return
+            self._refreshing.add(key)
+        threading.Thread(
+            target=self._refresh,
+            args=(key, fetch),
+            name="codecarbon-carbon-intensity",
+            daemon=True,
+        ).start()
+
+    def _refresh(self, key: str, fetch: Callable[[], Any]) -> None:
+        try:
+            fetch()
+            self._failed_at.pop(key, None)
+        except Exception as e:
+            self._failed_at[key] = time.time()
+            logger.warning(
+                f"Unable to refresh the carbon intensity of {key}, "
+                + f"using the previous value: {e}"
+            )
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _read_persisted_entries(self) -> Dict[str, Tuple[float, float]]:
+        if self._cache_path is None:
+            return {}
+        content = read_json_cache(self._cache_path)
+        if not isinstance(content, dict):
+            return {}
+        now = time.time()
+        entries = {}
+        for key, value in content.items():
+            try:
+                entry = (float(value["carbon_intensity"]), float(value["fetched_at"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if self._is_usable(entry, now):
+                entries[key] = entry
+        return entries
+
+    def _read_persisted_entry(self, key: str) -> Optional[Tuple[float, float]]:
+        return self._read_persisted_entries().get(key)
+
+    def _persist_entry(self, key: str, entry: Tuple[float, float]) -> None:
+        if self._cache_path is None:
+            return
+        with self._lock:
+            entries = self._read_persisted_entries()
+            entries[key] = entry
+            content = {
+                key: {"carbon_intensity": intensity, "fetched_at": fetched_at}
+                for key, (intensity, fetched_at) in entries.items()
+            }
+            try:
+                write_json_cache(self._cache_path, content)
+            except OSError as e:
+                logger.warning(
+                    f"Unable to write the carbon intensity cache {self._cache_path}: {e}"
+                )
 
 
 class ElectricityMapsAPIError(Exception):
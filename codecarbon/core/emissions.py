@@ -6,23 +6,29 @@ https://github.com/mlco2/impact
 https://github.com/responsibleproblemsolving/energy-usage
 """
 
-from typing import TYPE_CHECKING, Dict, Optional
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
 
 from codecarbon.core import electricitymaps_api
+from codecarbon.core.carbon_intensity_series import CarbonIntensitySeries
 from codecarbon.core.units import EmissionsPerKWh, Energy
 from codecarbon.external.geography import CloudMetadata, GeoMetadata
 from codecarbon.external.logger import logger
 from codecarbon.input import DataSource, DataSourceException
 
-if TYPE_CHECKING:
-    import pandas as pd
-
 _NORDIC_REGIONS_BY_COUNTRY = {
     "SWE": {"SE1", "SE2", "SE3", "SE4"},
     "NOR": {"NO1", "NO2", "NO3", "NO4", "NO5"},
     "FIN": {"FI"},
 }
 
+# Emission factors in kg CO2eq/kWh by country ISO code, and by (country ISO
+# code, region) for the regional data. They only depend on the static data, so
+# they are computed on first use and then shared by all the trackers of the
+# process, each update is then a single multiplication.
+_country_emission_factors: Dict[str, float] = {}
+_region_emission_factors: Dict[Tuple[str, str], float] = {}
+
 
 class Emissions:
     def __init__(
@@ -33,7 +39,12 @@ class Emissions:
             str
         ] = None,  # Deprecated, for backward compatibility
         force_carbon_intensity_g_co2e_kwh: Optional[float] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
     ):
+        """
+        :param cache_dir: Directory where the carbon intensities of the
+                          Electricity Maps API are shared between processes.
+        """
         self._data_source = data_source
 
         # Handle backward compatibility
@@ -47,6 +58,13 @@ class Emissions:
 
         self._electricitymaps_api_token = electricitymaps_api_token
         self._force_carbon_intensity_g_co2e_kwh = force_carbon_intensity_g_co2e_kwh
+        self._carbon_intensity_cache: Optional[
+            electricitymaps_api.CarbonIntensityCache
+        ] = None
+        if electricitymaps_api_token:
+            self._carbon_intensity_cache = electricitymaps_api.CarbonIntensityCache(
+                electricitymaps_api_token, cache_dir=cache_dir
+            )
 
     def get_cloud_emissions(
         self, energy: Energy, cloud: CloudMetadata, geo: GeoMetadata = None
@@ -65,85 +83,85 @@ class Emissions:
             )
             return energy.kWh * (self._force_carbon_intensity_g_co2e_kwh / 1000.0)
 
-        df: pd.DataFrame = self._data_source.get_cloud_emissions_data()
-        try:
+        region_data = self._get_cloud_region_data(cloud)
+        if region_data is not None and region_data["impact"] is not None:
             emissions_per_kWh: EmissionsPerKWh = EmissionsPerKWh.from_g_per_kWh(
-                df.loc[
-                    (df["provider"] == cloud.provider) & (df["region"] == cloud.region)
-                ]["impact"].item()
+                region_data["impact"]
             )
-            emissions = emissions_per_kWh.kgs_per_kWh * energy.kWh  # kgs
-        except Exception as e:
-            logger.warning(
-                f"Cloud electricity carbon intensity for provider '{cloud.provider}' and region '{cloud.region}' not found, using country value instead. Error : {e}"
-            )
-            logger.warning(
-                "AWS and Azure do not provide any carbon intensity data. Only GCP does it."
+            return emissions_per_kWh.kgs_per_kWh * energy.kWh  # kgs
+
+        logger.warning(
+            f"Cloud electricity carbon intensity for provider '{cloud.provider}' and region '{cloud.region}' not found, using country value instead."
+        )
+        logger.warning(
+            "AWS and Azure do not provide any carbon intensity data. Only GCP does it."
+        )
+        if geo:
+            emissions = self.get_private_infra_emissions(
+                energy, geo
+            )  # float: kg co2_eq
+        else:
+            carbon_intensity_per_source = (
+                DataSource().get_carbon_intensity_per_source_data()
             )
-            if geo:
-                emissions = self.get_private_infra_emissions(
-                    energy, geo
-                )  # float: kg co2_eq
-            else:
-                carbon_intensity_per_source = (
-                    DataSource().get_carbon_intensity_per_source_data()
-                )
-                emissions = (
-                    EmissionsPerKWh.from_g_per_kWh(
-                        carbon_intensity_per_source.get("world_average")
-                    ).kgs_per_kWh
-                    * energy.kWh
-                )  # kgs
+            emissions = (
+                EmissionsPerKWh.from_g_per_kWh(
+                    carbon_intensity_per_source.get("world_average")
+                ).kgs_per_kWh
+                * energy.kWh
+            )  # kgs
         return emissions
 
+    def _get_cloud_region_data(self, cloud: CloudMetadata) -> Optional[Dict]:
+        """
+        Returns the impact data row of the cloud region, None if unknown
+        """
+        return self._data_source.get_cloud_emissions_index().get(
+            (cloud.provider, cloud.region)
+        )
+
     def get_cloud_country_name(self, cloud: CloudMetadata) -> str:
         """
         Returns the Country Name where the cloud region is located
         """
-        df: pd.DataFrame = self._data_source.get_cloud_emissions_data()
-        flags = (df["provider"] == cloud.provider) & (df["region"] == cloud.region)
-        selected = df.loc[flags]
-        if not len(selected):
+        region_data = self._get_cloud_region_data(cloud)
+        if region_data is None:
             raise ValueError(
                 "Unable to find country name for "
                 f"cloud_provider={cloud.provider}, "
                 f"cloud_region={cloud.region}"
             )
-        return selected["country_name"].item()
+        return region_data["country_name"]
 
     def get_cloud_country_iso_code(self, cloud: CloudMetadata) -> str:
         """
         Returns the Country ISO Code where the cloud region is located
         """
-        df: pd.DataFrame = self._data_source.get_cloud_emissions_data()
-        flags = (df["provider"] == cloud.provider) & (df["region"] == cloud.region)
-        selected = df.loc[flags]
-        if not len(selected):
+        region_data = self._get_cloud_region_data(cloud)
+        if region_data is None:
             raise ValueError(
                 "Unable to find country ISO Code for "
                 f"cloud_provider={cloud.provider}, "
                 f"cloud_region={cloud.region}"
             )
-        return selected["countryIsoCode"].item()
+        return region_data["countryIsoCode"]
 
     def get_cloud_geo_region(self, cloud: CloudMetadata) -> str:
         """
         Returns the State/City where the cloud region is located
         """
-        df: pd.DataFrame = self._data_source.get_cloud_emissions_data()
-        flags = (df["provider"] == cloud.provider) & (df["region"] == cloud.region)
-        selected = df.loc[flags]
-        if not len(selected):
+        region_data = self._get_cloud_region_data(cloud)
+        if region_data is None:
             raise ValueError(
                 "Unable to find State/City name for "
                 f"cloud_provider={cloud.provider}, "
                 f"cloud_region={cloud.region}"
             )
 
-        state = selected["state"].item()
+        state = region_data["state"]
         if state is not None:
             return state
-        city = selected["city"].item()
+        city = region_data["city"]
         return city
 
     def get_private_infra_emissions(self, energy: Energy, geo: GeoMetadata) -> float:
@@ -159,11 +177,9 @@ class Emissions:
             )
             return energy.kWh * (self._force_carbon_intensity_g_co2e_kwh / 1000.0)
 
-        if self._electricitymaps_api_token:
+        if self._carbon_intensity_cache is not None:
             try:
-                emissions = electricitymaps_api.get_emissions(
-                    energy, geo, self._electricitymaps_api_token
-                )
+                emissions = self._carbon_intensity_cache.get_emissions(energy, geo)
                 logger.debug(
                     "electricitymaps_api.get_emissions: "
                     + f"Retrieved emissions for {geo.country_name} using Electricity Maps API :{emissions * 1000} g CO2eq"
@@ -194,6 +210,26 @@ class Emissions:
                 )
         return self.get_country_emissions(energy, geo)
 
+    def get_carbon_intensity_history(
+        self, geo: GeoMetadata
+    ) -> Optional[CarbonIntensitySeries]:
+        """
+        Recent carbon intensity of the grid at the location, from the
+        Electricity Maps API, None without an API token.
+        """
+        if self._carbon_intensity_cache is None:
+            return None
+        return self._carbon_intensity_cache.get_carbon_intensity_history(geo)
+
+    def refresh_carbon_intensity_history(self, geo: GeoMetadata, since: float) -> None:
+        """
+        Fetch the carbon intensity history of the location in the background,
+        so that the history of a run started at the Unix time `since` is not
+        limited to its last 24 hours.
+        """
+        if self._carbon_intensity_cache is not None:
+            self._carbon_intensity_cache.refresh_carbon_intensity_history(geo, since)
+
     def _try_get_nordic_region_emissions(
         self, energy: Energy, geo: GeoMetadata
     ) -> Optional[float]:
@@ -261,6 +297,18 @@ class Emissions:
             return self.get_country_emissions(energy, geo)
 
         # Handle USA and Canada regional data
+        key = (geo.country_iso_code.upper(), geo.region)
+        kgs_per_kWh = _region_emission_factors.get(key)
+        if kgs_per_kWh is None:
+            kgs_per_kWh = self._get_region_emissions_rate(geo).kgs_per_kWh
+            _region_emission_factors[key] = kgs_per_kWh
+
+        return kgs_per_kWh * energy.kWh  # kgs
+
+    def _get_region_emissions_rate(self, geo: GeoMetadata) -> EmissionsPerKWh:
+        """
+        Emissions per kWh of a region of the USA or Canada, from the static data.
+        """
         try:
             country_emissions_data = self._data_source.get_country_emissions_data(
                 geo.country_iso_code.lower()
@@ -273,7 +321,7 @@ class Emissions:
                     + f" with ISO CODE : {geo.country_iso_code}"
                 )
 
-            emissions_per_kWh: EmissionsPerKWh = EmissionsPerKWh.from_lbs_per_mWh(
+            return EmissionsPerKWh.from_lbs_per_mWh(
                 country_emissions_data[geo.region]["emissions"]
             )
         except DataSourceException:
@@ -283,11 +331,7 @@ class Emissions:
                 geo.country_iso_code.lower()
             )
             region_energy_mix_data = country_energy_mix_data[geo.region]
-            emissions_per_kWh = self._region_energy_mix_to_emissions_rate(
-                region_energy_mix_data
-            )
-
-        return emissions_per_kWh.kgs_per_kWh * energy.kWh  # kgs
+            return self._region_energy_mix_to_emissions_rate(region_energy_mix_data)
 
     def get_country_emissions(self, energy: Energy, geo: GeoMetadata) -> float:
         """
@@ -298,6 +342,10 @@ class Emissions:
         :param geo: Country and region metadata
         :return: CO2 emissions in kg
         """
+        kgs_per_kWh = _country_emission_factors.get(geo.country_iso_code)
+        if kgs_per_kWh is not None:
+            return kgs_per_kWh * energy.kWh  # kgs
+
         energy_mix = self._data_source.get_global_energy_mix_data()
 
         if geo.country_iso_code not in energy_mix:
@@ -322,6 +370,7 @@ class Emissions:
             f"We apply an energy mix of {emissions_per_kWh.kgs_per_kWh * 1000:.0f}"
             + f" g.CO2eq/kWh for {geo.country_name}"
         )
+        _country_emission_factors[geo.country_iso_code] = emissions_per_kWh.kgs_per_kWh
 
         return emissions_per_kWh.kgs_per_kWh * energy.kWh  # kgs
 
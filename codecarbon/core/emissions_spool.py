@@ -0,0 +1,193 @@
+"""
+Durable spool of the emissions that could not be sent to the CodeCarbon API.
+
+When the API cannot be reached, `ApiClient` appends the emissions to a SQLite
+database instead of dropping them, and a `SpoolReplayer` thread sends them in
+batches once the API answers again. Each emission carries an id chosen by the
+client, used by the server as an idempotency key: an emission replayed after
+its response was lost is not saved twice.
+
+Each API endpoint and key has its own spool file, so that the emissions are
+only sent again with the key they were measured with.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from codecarbon.external.logger import logger
+
+SPOOL_FILE_PREFIX = "api_spool"
+# Maximum size of the spooled emissions, the oldest ones are dropped beyond it
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+
+
+def spool_file(endpoint_url: str, api_key: Optional[str]) -> str:
+    """
+    Name of the spool file of the emissions sent to `endpoint_url` with
+    `api_key`.
+    """
+    digest = hashlib.sha256(f"{endpoint_url}\n{api_key or ''}".encode()).hexdigest()
+    return f"{SPOOL_FILE_PREFIX}_{digest[:16]}.sqlite"
+
+
+class EmissionsSpool:
+    """
+    Append-only queue of emission payloads in a SQLite database, shared by
+    the threads of the process. The database is only created on the first
+    append.
+    """
+
+    def __init__(self, path: Union[str, Path], max_size: int = DEFAULT_MAX_SIZE):
+        """
+        :param path: SQLite database of the spool.
+        :param max_size: Maximum size in bytes of the spooled payloads.
+        """
+        self.path = Path(path).expanduser()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        if self._connection is None:
+            if not create and not self.path.exists():
+                return None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS emissions ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "id TEXT NOT NULL UNIQUE, "
+                "payload TEXT NOT NULL, "
+                "size INTEGER NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def append(self, payloads: List[Dict[str, Any]]) -> int:
+        """
+        Persist emission payloads, each with a unique "id". A payload whose id
+        is already in the spool is ignored.
+
+        :return: The number of old emissions dropped to stay under max_size.
+        """
+        rows = []
+        for payload in payloads:
+            serialized = json.dumps(payload)
+            rows.append((payload["id"], serialized, len(serialized)))
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO emissions (id, payload, size) "
+                    "VALUES (?, ?, ?)",
+                    rows,
+                )
+                return self._enforce_max_size(connection)
+
+    def _enforce_max_size(self, connection: sqlite3.Connection) -> int:
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM emissions"
+        ).fetchone()
+        excess = total - self.max_size
+        if excess <= 0:
+            return 0
+        last_dropped = None
+        dropped = 0
+        for seq, size in connection.execute(
+            "SELECT seq, size FROM emissions ORDER BY seq"
+        ):
+            last_dropped = seq
+            dropped += 1
+            excess -= size
+            if excess <= 0:
+                break
+        connection.execute("DELETE FROM emissions WHERE seq <= ?", (last_dropped,))
+        logger.warning(
+            f"CodeCarbon API spool is full, {dropped} oldest emissions dropped."
+        )
+        return dropped
+
+    def peek(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        The oldest spooled emissions, with their sequence number.
+        """
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return []
+            rows = connection.execute(
+                "SELECT seq, payload FROM emissions ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+    def remove(self, last_seq: int) -> None:
+        """
+        Remove the emissions up to the sequence number `last_seq`, once sent.
+        """
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return
+            with connection:
+                connection.execute("DELETE FROM emissions WHERE seq <= ?", (last_seq,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return 0
+            return connection.execute("SELECT COUNT(*) FROM emissions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class SpoolReplayer:
+    """
+    Background thread sending the spooled emissions of an `ApiClient`, trying
+    again less and less often while the API cannot be reached.
+    """
+
+    def __init__(self, api, interval: float = 30, max_interval: float = 600):
+        """
+        :param api: The ApiClient owning the spool.
+        :param interval: Seconds between two replays.
+        :param max_interval: Longest delay between two failed replays.
+        """
+        self.api = api
+        self.interval = interval
+        self.max_interval = max_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="codecarbon-api-spool", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        delay = self.interval
+        while not self._stop_event.wait(delay):
+            if self.api.replay_spool():
+                delay = self.interval
+            else:
+                delay = min(delay * 2, self.max_interval)
@@ -2,6 +2,7 @@ from typing import List
 
 from codecarbon.core import gpu_amd, gpu_nvidia
 from codecarbon.core.gpu_device import GPUDevice
+from codecarbon.core.gpu_sampler import DEFAULT_MAX_AGE, GPUSampler
 from codecarbon.core.units import Time
 from codecarbon.external.logger import logger
 
@@ -21,6 +22,7 @@ pynvml = gpu_nvidia.pynvml
 class AllGPUDevices:
     device_count: int
     devices: List[GPUDevice]
+    sampler: GPUSampler
 
     def __init__(self) -> None:
         gpu_details_available = is_gpu_details_available()
@@ -75,11 +77,14 @@ class AllGPUDevices:
             except gpu_amd.amdsmi.AmdSmiException as e:
                 logger.warning(f"Failed to initialize AMDSMI: {e}", exc_info=True)
         self.device_count = len(self.devices)
+        self.sampler = GPUSampler(self.devices)
 
     def start(self) -> None:
         for device in self.devices:
             if hasattr(device, "start"):
                 device.start()
+        if hasattr(self, "sampler"):
+            self.sampler.invalidate()
 
     def get_gpu_static_info(self) -> List:
         """Get all GPUs static information.
@@ -141,7 +146,11 @@ class AllGPUDevices:
         """Lightweight alternative to :meth:`get_gpu_details` for the 1s
         monitoring hot path. Returns only ``gpu_index`` and
         ``gpu_utilization`` per device, skipping heavyweight queries
-        (memory, temperature, compute mode, process lists).
+        (memory, temperature, compute mode, process lists). Devices whose
+        utilization could not be read are left out.
+
+        The devices are read by the shared sampler, which reuses a pass made
+        less than half a second ago by the energy measurement.
 
         >>> get_gpu_utilization_list()
         [
@@ -149,7 +158,8 @@ class AllGPUDevices:
         ]
         """
         try:
-            return [d.get_gpu_utilization_lightweight() for d in self.devices]
+            self.sampler.sample(max_age=DEFAULT_MAX_AGE, energy=False)
+            return self.sampler.utilization_list()
         except Exception:
             logger.warning("Failed to retrieve gpu utilization", exc_info=True)
             return []
@@ -167,12 +177,12 @@ class AllGPUDevices:
         ]
         """
         try:
-            devices_info = []
-            for i in range(self.device_count):
-                gpu_device = self.devices[i]
-                devices_info.append(gpu_device.delta(last_duration))
-            return devices_info
-
+            # Always a new pass, so that no energy is left out of the interval
+            self.sampler.sample()
+            return [
+                gpu_device.delta(last_duration, self.sampler.energy_reading(i))
+                for i, gpu_device in enumerate(self.devices)
+            ]
         except Exception:
             logger.warning("Failed to retrieve gpu information", exc_info=True)
             return []
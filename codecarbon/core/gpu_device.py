@@ -3,6 +3,9 @@ from typing import Any, Dict
 
 from codecarbon.core.units import Energy, Power, Time
 
+# Default of the energy counter arguments, to read it from the device
+_READ_COUNTER = object()
+
 
 @dataclass
 class GPUDevice:
@@ -38,17 +41,22 @@ class GPUDevice:
         self.last_energy = self._get_energy_kwh()
         self._init_static_details()
 
-    def _get_energy_kwh(self) -> Energy:
-        total_energy_consumption = self._get_total_energy_consumption()
+    def _get_energy_kwh(self, total_energy_consumption=_READ_COUNTER) -> Energy:
+        if total_energy_consumption is _READ_COUNTER:
+            total_energy_consumption = self._get_total_energy_consumption()
         if total_energy_consumption is None:
             return self.last_energy
         return Energy.from_millijoules(total_energy_consumption)
 
-    def delta(self, duration: Time) -> dict:
+    def delta(self, duration: Time, total_energy_consumption=_READ_COUNTER) -> dict:
         """
         Compute the energy/power used since last call.
+
+        :param total_energy_consumption: Energy counter in mJ already read by a
+            `GPUSampler`, None if it was unavailable. Read from the device if
+            not given.
         """
-        new_last_energy = energy = self._get_energy_kwh()
+        new_last_energy = energy = self._get_energy_kwh(total_energy_consumption)
         self.power = self.power.from_energies_and_delay(
             energy, self.last_energy, duration
         )
@@ -0,0 +1,94 @@
+"""
+Sampling of all the GPUs in one pass.
+
+The tracker reads the GPU utilization every second and the energy counters
+every measurement interval, from two timer threads. Both go through a
+`GPUSampler`, which reads the metrics of every device in a single pass and
+keeps them in preallocated arrays, one per metric. A measurement reads the
+energy counters and the utilization together, and the monitoring tick that
+follows within `DEFAULT_MAX_AGE` reuses that pass instead of calling the GPU
+library again.
+
+Power is not read from the library: as before, it is derived from the energy
+counter over the measurement interval.
+"""
+
+import math
+import threading
+import time
+from array import array
+from typing import List, Optional
+
+from codecarbon.core.gpu_device import GPUDevice
+from codecarbon.external.logger import logger
+
+# Age, in seconds, under which a pass is reused by the next reader
+DEFAULT_MAX_AGE = 0.5
+
+
+class GPUSampler:
+    def __init__(self, devices: List[GPUDevice]):
+        self.devices = devices
+        count = len(devices)
+        self.gpu_index = array("q", [device.gpu_index for device in devices])
+        # Last readings, NaN when the device did not return one
+        self.total_energy_consumption = array("d", [math.nan]) * count  # mJ
+        self.gpu_utilization = array("d", [math.nan]) * count  # %
+        # Monotonic time of the last pass, and of the last one reading the
+        # energy counters
+        self.sampled_at: Optional[float] = None
+        self.energy_sampled_at: Optional[float] = None
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def sample(self, max_age: float = 0, energy: bool = True) -> None:
+        """
+        Read every device, unless the last pass is younger than `max_age`
+        seconds.
+
+        :param energy: Whether to read the energy counters, the utilization is
+            always read. A pass reading only the utilization is not reused by
+            a reader of the counters.
+        """
+        with self._lock:
+            now = time.monotonic()
+            last = self.energy_sampled_at if energy else self.sampled_at
+            if last is not None and now - last < max_age:
+                return
+            for i, device in enumerate(self.devices):
+                if energy:
+                    counter = device._get_total_energy_consumption()
+                    self.total_energy_consumption[i] = (
+                        math.nan if counter is None else counter
+                    )
+                try:
+                    self.gpu_utilization[i] = device._get_gpu_utilization()
+                except Exception:
+                    logger.warning(
+                        f"Failed to retrieve utilization of gpu {device.gpu_index}",
+                        exc_info=True,
+                    )
+                    self.gpu_utilization[i] = math.nan
+            self.sampled_at = time.monotonic()
+            if energy:
+                self.energy_sampled_at = self.sampled_at
+            self.samples += 1
+
+    def invalidate(self) -> None:
+        """Make the next reader sample again, after the counters were reset"""
+        with self._lock:
+            self.sampled_at = self.energy_sampled_at = None
+
+    def energy_reading(self, i: int) -> Optional[float]:
+        """Energy counter of the i-th device in mJ, None if unavailable"""
+        energy = self.total_energy_consumption[i]
+        return None if math.isnan(energy) else energy
+
+    def utilization_list(self) -> List:
+        """Utilization of the devices that returned one, in the format of
+        `AllGPUDevices.get_gpu_utilization_list`."""
+        return [
+            {"gpu_index": gpu_index, "gpu_utilization": utilization}
+            for gpu_index, utilization in zip(self.gpu_index, self.gpu_utilization)
+            if not math.isnan(utilization)
+        ]
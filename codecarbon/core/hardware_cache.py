@@ -4,21 +4,39 @@ Process-level cache for hardware detection and setup.
 Reuses the outcome of the first tracker hardware probe so additional runs on
 the same device (same process) skip repeated powermetrics, cpuinfo, and GPU
 detection work.
+
+With the `hardware_cache` option, the plans are also persisted in a JSON file of
+the cache directory, so that later processes on the same machine skip the
+detection too. The file is tied to a fingerprint of the machine (CPU model,
+kernel, memory, powercap and GPU devices, boot id...) and is ignored as soon as
+the fingerprint changes.
 """
 
 from __future__ import annotations
 
+import json
+import os
+import platform
 import threading
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+import psutil
+
+from codecarbon._version import __version__
 from codecarbon.core.config import normalize_gpu_ids
+from codecarbon.core.util import default_cache_dir, read_json_cache, write_json_cache
+from codecarbon.external.logger import logger
 
 if TYPE_CHECKING:
     from codecarbon.core.resource_tracker import ResourceTracker
 
 DEFAULT_RAPL_DIR = "/sys/class/powercap/intel-rapl/subsystem"
+POWERCAP_DIR = "/sys/class/powercap"
+PERSISTENT_CACHE_FILE = "hardware.json"
+PERSISTENT_CACHE_VERSION = 1
 
 CONF_KEYS = (
     "ram_total_size",
@@ -213,19 +231,162 @@ def apply(resource_tracker: "ResourceTracker", plan: _HardwarePlan) -> None:
     ]
 
 
+def _read_first_line(path: str, prefix: str = "") -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith(prefix):
+                    return line.strip()
+    except OSError:
+        pass
+    return None
+
+
+def _list_dir(path: str, prefix: str = "") -> List[str]:
+    try:
+        return sorted(name for name in os.listdir(path) if name.startswith(prefix))
+    except OSError:
+        return []
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def machine_fingerprint(powercap_dir: str = POWERCAP_DIR) -> Dict[str, Any]:
+    """
+    Cheap description of the hardware seen by the detection, a persisted plan is
+    only reused on a machine with the same fingerprint.
+    """
+    uname = platform.uname()
+    return {
+        "codecarbon_version": __version__,
+        "system": uname.system,
+        "release": uname.release,
+        "version": uname.version,
+        "machine": uname.machine,
+        "cpu_model": _read_first_line("/proc/cpuinfo", "model name")
+        or os.environ.get("PROCESSOR_IDENTIFIER"),
+        "cpu_count": os.cpu_count(),
+        "memory": psutil.virtual_memory().total,
+        "boot_id": _read_first_line("/proc/sys/kernel/random/boot_id"),
+        "powercap": _list_dir(powercap_dir),
+        "powercap_mtime": _mtime_ns(powercap_dir),
+        "gpu_devices": _list_dir("/dev", "nvidia") + _list_dir("/dev/dri", "render"),
+        "gpu_visible_devices": [
+            os.environ.get(name)
+            for name in (
+                "CUDA_VISIBLE_DEVICES",
+                "NVIDIA_VISIBLE_DEVICES",
+                "HIP_VISIBLE_DEVICES",
+                "ROCR_VISIBLE_DEVICES",
+            )
+        ],
+    }
+
+
+def _persistent_key(key: _HardwareCacheKey) -> str:
+    return json.dumps(asdict(key), sort_keys=True, default=str)
+
+
+def _read_persistent_plans(path: Path, fingerprint: Dict[str, Any]) -> Dict:
+    """Plans of the cache file, empty if it is missing, invalid or outdated."""
+    content = read_json_cache(path)
+    if content is None:
+        return {}
+    if (
+        not isinstance(content, dict)
+        or content.get("version") != PERSISTENT_CACHE_VERSION
+        or content.get("fingerprint") != fingerprint
+        or not isinstance(content.get("plans"), dict)
+    ):
+        logger.debug(f"Ignoring outdated hardware cache {path}")
+        return {}
+    return content["plans"]
+
+
+def load_persistent_plan(
+    cache_dir, key: _HardwareCacheKey, fingerprint: Dict[str, Any]
+) -> Optional[_HardwarePlan]:
+    path = Path(cache_dir) / PERSISTENT_CACHE_FILE
+    plan = _read_persistent_plans(path, fingerprint).get(_persistent_key(key))
+    if plan is None:
+        return None
+    try:
+        return _HardwarePlan(**plan)
+    except TypeError:
+        return None
+
+
+def save_persistent_plan(
+    cache_dir, key: _HardwareCacheKey, plan: _HardwarePlan, fingerprint
+) -> None:
+    """Add a plan to the cache file"""
+    path = Path(cache_dir) / PERSISTENT_CACHE_FILE
+    try:
+        plans = _read_persistent_plans(path, fingerprint)
+        plans[_persistent_key(key)] = asdict(plan)
+        content = {
+            "version": PERSISTENT_CACHE_VERSION,
+            "fingerprint": fingerprint,
+            "plans": plans,
+        }
+        write_json_cache(path, content)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Unable to write the hardware cache in {cache_dir}: {e}")
+
+
+def clear_persistent_cache(cache_dir=None) -> None:
+    """Delete the persisted hardware plans, to force a new detection."""
+    path = Path(cache_dir or default_cache_dir()) / PERSISTENT_CACHE_FILE
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def persistent_cache_dir(tracker) -> Optional[Path]:
+    """Directory of the persistent caches, None if they are disabled"""
+    if not getattr(tracker, "_hardware_cache", False):
+        return None
+    cache_dir = getattr(tracker, "_cache_dir", None)
+    return Path(cache_dir).expanduser() if cache_dir else default_cache_dir()
+
+
 def get_or_run_setup(
     resource_tracker: "ResourceTracker",
     setup_fn,
 ) -> None:
-    """Apply cached hardware plan or run full setup once per cache key."""
+    """
+    Apply cached hardware plan or run full setup once per cache key. With the
+    persistent cache enabled, the plan may come from a previous process.
+    """
     key = make_key(resource_tracker.tracker)
     with _cache_lock:
         plan = _plans.get(key)
         if plan is not None:
             apply(resource_tracker, plan)
             return
+        cache_dir = persistent_cache_dir(resource_tracker.tracker)
+        if cache_dir is not None:
+            fingerprint = machine_fingerprint()
+            plan = load_persistent_plan(cache_dir, key, fingerprint)
+            if plan is not None:
+                try:
+                    apply(resource_tracker, plan)
+                    logger.info(f"[setup] Using the hardware cached in {cache_dir}")
+                    _plans[key] = plan
+                    return
+                except Exception as e:
+                    logger.warning(f"Ignoring invalid hardware cache: {e}")
         setup_fn()
-        _plans[key] = capture(resource_tracker)
+        plan = capture(resource_tracker)
+        _plans[key] = plan
+        if cache_dir is not None:
+            save_persistent_plan(cache_dir, key, plan, fingerprint)
 
 
 def clear_cache() -> None:
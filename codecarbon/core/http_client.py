@@ -0,0 +1,84 @@
+"""
+HTTP session shared by the clients of the CodeCarbon API and the HTTP outputs.
+
+Reusing a single `requests.Session` keeps the connections to each host open
+between calls, instead of a new TCP and TLS handshake for every emission sent.
+"""
+
+import gzip
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# Statuses retried for idempotent methods. POST requests are only retried when
+# the connection could not be established, so that nothing is sent twice.
+RETRY_STATUSES = (429, 502, 503, 504)
+# Connections kept open per host
+POOL_MAXSIZE = 10
+# Smaller request bodies are sent uncompressed
+GZIP_MIN_SIZE = 1024
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    pool_maxsize: int = POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    HTTP session with a pool of keep-alive connections per host, retrying
+    failed connections and overloaded servers with an exponential backoff.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        # Return the last response to let the caller report the error
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    HTTP session shared by the whole process, created on first use.
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = create_session()
+    return _shared_session
+
+
+def encode_json_body(
+    payload: Any, compress: bool = False
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    JSON request body and its headers, compressed with gzip if `compress` is
+    set and the body is larger than `GZIP_MIN_SIZE`.
+    """
+    body = json.dumps(payload, allow_nan=False).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if compress and len(body) >= GZIP_MIN_SIZE:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
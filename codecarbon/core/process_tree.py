@@ -0,0 +1,180 @@
+"""
+Processes tracked with tracking_mode="process": a process and its descendants.
+
+The CPU load and the RAM of the tracked processes used to be read with
+`psutil.Process.children(recursive=True)`, which walks the whole /proc and
+creates an object per process, then one more call per child, on every sample
+of the CPU and again for the RAM. For a job launcher with hundreds of workers,
+this was the main cost of a tick.
+
+On Linux, `ProcessTree` keeps the parent of every process seen in /proc and
+only reads the processes that appeared since the previous listing. The members
+of the tree are then found in memory, and a single read of
+/proc/<pid>/stat of each member gives both its CPU time and its resident
+memory. Elsewhere, the tree is read with psutil as before.
+
+The CPU and the RAM of a tracker share the `ProcessTree` of their pid, and a
+snapshot younger than `DEFAULT_MAX_AGE` is reused rather than read again.
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple
+
+import psutil
+
+from codecarbon.external.logger import logger
+
+PROC_DIR = "/proc"
+
+# Age, in seconds, under which a snapshot is reused by the next reader
+DEFAULT_MAX_AGE = 0.5
+
+
+@dataclass
+class ProcessTreeSnapshot:
+    # time.monotonic() when the snapshot was taken
+    timestamp: float
+    # pid -> user + system CPU time, in seconds
+    cpu_times: Dict[int, float] = field(default_factory=dict)
+    # pid -> resident set size, in bytes
+    rss: Dict[int, int] = field(default_factory=dict)
+
+
+class ProcessTree:
+    _trees: Dict[int, "ProcessTree"] = {}
+    _trees_lock = threading.Lock()
+
+    def __init__(self, pid: int, proc_dir: str = PROC_DIR):
+        """
+        :param pid: The root of the tree.
+        :param proc_dir: Mount point of procfs, read on Linux only.
+        """
+        self.pid = pid
+        self._proc_dir = proc_dir
+        self._use_proc = sys.platform.startswith("linux") and os.path.isdir(proc_dir)
+        if self._use_proc:
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+        # pid -> (parent pid, start time) of the processes in the last listing
+        self._parents: Dict[int, Tuple[int, int]] = {}
+        self._children: Dict[int, Set[int]] = {}
+        self._snapshot: Optional[ProcessTreeSnapshot] = None
+        self._lock = threading.Lock()
+        # Number of processes read because they were new in the listing
+        self.scanned = 0
+
+    @classmethod
+    def for_pid(cls, pid: int) -> "ProcessTree":
+        """The tree of `pid` shared by the CPU and RAM of this process"""
+        with cls._trees_lock:
+            tree = cls._trees.get(pid)
+            if tree is None:
+                tree = cls._trees[pid] = cls(pid)
+            return tree
+
+    def snapshot(self, max_age: float = DEFAULT_MAX_AGE) -> ProcessTreeSnapshot:
+        """
+        CPU times and memory of the processes of the tree. The last snapshot
+        is returned if it is younger than `max_age` seconds.
+        """
+        with self._lock:
+            if (
+                self._snapshot is not None
+                and time.monotonic() - self._snapshot.timestamp < max_age
+            ):
+                return self._snapshot
+            if self._use_proc:
+                self._snapshot = self._read_proc()
+            else:
+                self._snapshot = self._read_psutil()
+            return self._snapshot
+
+    def _read_stat(self, pid: int) -> Optional[Tuple[int, int, float, int]]:
+        """(parent pid, start time, CPU time in s, RSS in bytes) of a process,
+        None if it exited."""
+        try:
+            with open(f"{self._proc_dir}/{pid}/stat", "rb") as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            return None
+        # The command name, in parentheses, may contain spaces and parentheses
+        fields = stat[stat.rindex(b")") + 2 :].split()
+        return (
+            int(fields[1]),
+            int(fields[19]),
+            (int(fields[11]) + int(fields[12])) / self._clock_ticks,
+            int(fields[21]) * self._page_size,
+        )
+
+    def _add(self, pid: int, parent: int, start_time: int) -> None:
+        self._parents[pid] = (parent, start_time)
+        self._children.setdefault(parent, set()).add(pid)
+
+    def _remove(self, pid: int) -> None:
+        parent, _ = self._parents.pop(pid)
+        siblings = self._children.get(parent)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[parent]
+
+    def _read_proc(self) -> ProcessTreeSnapshot:
+        # Only the processes new in the listing are read. A pid reused between
+        # two listings is noticed when it belonged to the tree, whose members
+        # are all read below, not when an outside process reused it.
+        pids = {int(name) for name in os.listdir(self._proc_dir) if name.isdigit()}
+        for pid in self._parents.keys() - pids:
+            self._remove(pid)
+        for pid in pids - self._parents.keys():
+            stat = self._read_stat(pid)
+            if stat is not None:
+                self._add(pid, stat[0], stat[1])
+            self.scanned += 1
+
+        snapshot = ProcessTreeSnapshot(timestamp=time.monotonic())
+        to_visit = [self.pid]
+        while to_visit:
+            pid = to_visit.pop()
+            stat = self._read_stat(pid)
+            if stat is None:
+                continue
+            parent, start_time, cpu_time, rss = stat
+            if self._parents.get(pid) != (parent, start_time):
+                # Reparented, or a new process reusing the pid
+                if pid in self._parents:
+                    self._remove(pid)
+                self._add(pid, parent, start_time)
+                if pid != self.pid and parent not in snapshot.cpu_times:
+                    continue
+            snapshot.cpu_times[pid] = cpu_time
+            snapshot.rss[pid] = rss
+            to_visit.extend(self._children.get(pid, ()))
+        return snapshot
+
+    def _read_psutil(self) -> ProcessTreeSnapshot:
+        snapshot = ProcessTreeSnapshot(timestamp=time.monotonic())
+        try:
+            root = psutil.Process(self.pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return snapshot
+        try:
+            processes = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            processes = [root]
+        for process in processes:
+            try:
+                with process.oneshot():
+                    cpu_times = process.cpu_times()
+                    rss = process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                logger.debug(
+                    f"Process {process.pid} disappeared or access denied when reading it."
+                )
+                continue
+            snapshot.cpu_times[process.pid] = cpu_times.user + cpu_times.system
+            snapshot.rss[process.pid] = rss
+        return snapshot
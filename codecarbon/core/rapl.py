@@ -1,8 +1,37 @@
+import os
 from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
 
 from codecarbon.core.units import Energy, Power, Time
 from codecarbon.external.logger import logger
 
+# energy_uj holds at most a 20 digits integer and a newline
+_READ_SIZE = 32
+
+
+@dataclass
+class RAPLReading:
+    """Energy and mean power of a RAPL domain since the previous reading"""
+
+    name: str
+    energy: Energy
+    power: Power
+    # True for the package and psys domains, which make the CPU measurement
+    processor: bool = True
+
+
+def readings_to_details(readings: Iterable[RAPLReading]) -> Dict[str, float]:
+    """
+    Convert readings to the metric names of Intel Power Gadget, e.g.
+    "Processor Energy Delta_0(kWh)" and "Processor Power Delta_0(kWh)".
+    """
+    details = {}
+    for reading in readings:
+        details[reading.name] = reading.energy.kWh
+        if "Energy" in reading.name:
+            details[reading.name.replace("Energy", "Power")] = reading.power.W
+    return details
+
 
 @dataclass
 class RAPLFile:
@@ -12,6 +41,8 @@ class RAPLFile:
     path: str
     # Path to corresponding file containing maximum possible RAPL reading
     max_path: str
+    # True for the package and psys domains
+    processor: bool = False
     # Energy consumed in kWh
     energy_delta: Energy = field(default_factory=lambda: Energy(0))
     # Power based on reading
@@ -20,6 +51,15 @@ class RAPLFile:
     last_energy: Energy = field(default_factory=lambda: Energy(0))
     # Max value energy can hold before it wraps
     max_energy_reading: Energy = field(default_factory=lambda: Energy(0))
+    # energy_uj is kept open and read with pread into the same buffer, to
+    # avoid an open and a close per measurement
+    _fd: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _buffer: bytearray = field(
+        default_factory=lambda: bytearray(_READ_SIZE),
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     def __post_init__(self):
         self.last_energy = self._get_value()
@@ -44,14 +84,25 @@ class RAPLFile:
                 )
             self.max_energy_reading = Energy.from_ujoules(0)
 
+    def _read_micro_joules(self) -> float:
+        if not hasattr(os, "preadv"):
+            with open(self.path, "r") as f:
+                return float(f.read())
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        try:
+            size = os.preadv(self._fd, [self._buffer], 0)
+            return float(self._buffer[:size])
+        except Exception:
+            self.close()
+            raise
+
     def _get_value(self) -> Energy:
         """
         Reads the value in the file at the path
         """
         try:
-            with open(self.path, "r") as f:
-                micro_joules = float(f.read())
-                return Energy.from_ujoules(micro_joules)
+            return Energy.from_ujoules(self._read_micro_joules())
         except Exception as e:
             # Be tolerant to transient IO / permission errors while reading energy.
             if isinstance(e, PermissionError):
@@ -64,6 +115,17 @@ class RAPLFile:
                 logger.debug("Unable to read RAPL value from %s: %s", self.path, e)
             return Energy.from_ujoules(0)
 
+    def close(self) -> None:
+        if getattr(self, "_fd", None) is not None:
+            fd, self._fd = self._fd, None
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __del__(self):
+        self.close()
+
     def start(self) -> None:
         self.last_energy = self._get_value()
 
@@ -82,3 +144,6 @@ class RAPLFile:
         )
         self.energy_delta = energy - self.last_energy
         self.last_energy = new_last_energy
+
+    def reading(self) -> RAPLReading:
+        return RAPLReading(self.name, self.energy_delta, self.power, self.processor)
@@ -28,8 +28,10 @@ class EmissionBase:
     wue: Optional[float] = 0
 
 
+@dataclass
 class EmissionCreate(EmissionBase):
-    pass
+    # Chosen by the client, so that the API ignores an emission sent twice
+    id: Optional[str] = None
 
 
 class Emission(EmissionBase):
@@ -0,0 +1,86 @@
+"""
+Constant-memory statistics over a stream of samples.
+
+The tracker samples the CPU, GPU and RAM utilization every second for the
+whole run. Instead of keeping every sample, `StreamingStats` maintains running
+aggregates, a log-bucketed histogram to estimate percentiles with a bounded
+relative error, and a ring buffer of the most recent samples.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional
+
+
+class StreamingStats:
+    def __init__(self, relative_accuracy: float = 0.01, window: int = 3600):
+        """
+        :param relative_accuracy: Maximum relative error of the percentiles.
+        :param window: Number of recent samples kept, 0 to keep none.
+        """
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._window = array("d", [0.0] * window)
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        # Bucket i holds the samples in (gamma^(i-1), gamma^i], samples <= 0
+        # are counted apart
+        self._buckets: Dict[int, int] = {}
+        self._non_positive_count = 0
+        self._window_next = 0
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value > 0:
+            bucket = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        else:
+            self._non_positive_count += 1
+        if self._window:
+            self._window[self._window_next % len(self._window)] = value
+            self._window_next += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th percentile (0 <= q <= 100) of the samples,
+        0 if there are none.
+        """
+        if not self.count:
+            return 0.0
+        if q >= 100:
+            return self.max
+        rank = q / 100 * (self.count - 1)
+        if rank < self._non_positive_count:
+            return self.min if self.min < 0 else 0.0
+        seen = self._non_positive_count
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen > rank:
+                estimate = 2 * self._gamma**bucket / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def recent(self) -> List[float]:
+        """The last samples, oldest first, up to the window size"""
+        size = len(self._window)
+        if self._window_next <= size:
+            return self._window[: self._window_next].tolist()
+        start = self._window_next % size
+        return (self._window[start:] + self._window[:start]).tolist()
@@ -3,6 +3,7 @@ from typing import Optional, Union
 
 import requests
 
+from codecarbon.core.http_client import get_session
 from codecarbon.core.telemetry_schemas import TelemetryCreate
 from codecarbon.external.logger import logger
 
@@ -16,11 +17,17 @@ class TelemetryClient:
         self,
         endpoint_url="https://api.codecarbon.io",
         telemetry: Optional[Union[TelemetryCreate, dict]] = None,
+        session: Optional[requests.Session] = None,
     ):
+        """
+        :param session: HTTP session to use, defaults to the one shared by the
+                        process.
+        """
         self.endpoint_url = endpoint_url.rstrip("/")
         self.telemetry_url = self.endpoint_url + "/telemetry"
         self.headers = {"Content-Type": "application/json"}
         self.telemetry = self._validate_telemetry(telemetry) if telemetry else None
+        self._session = session or get_session()
 
     def add_telemetry(self, telemetry: Optional[Union[TelemetryCreate, dict]] = None):
         telemetry_payload = (
@@ -32,7 +39,7 @@ class TelemetryClient:
         payload = telemetry_payload.model_dump(mode="json", exclude_none=True)
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url=self.telemetry_url,
                 json=payload,
                 timeout=2,
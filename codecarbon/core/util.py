@@ -1,12 +1,14 @@
+import json
 import os
 import re
 import subprocess
 import sys
+import tempfile
 from contextlib import contextmanager
 from functools import lru_cache
 from os.path import expandvars
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 import psutil
 
@@ -73,6 +75,50 @@ def backup(file_path: Union[str, Path], ext: Optional[str] = ".bak") -> None:
     file_path.rename(backup_path)
 
 
+def default_cache_dir() -> Path:
+    """Per-user cache directory of codecarbon, following the XDG convention."""
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        base = Path(os.environ["LOCALAPPDATA"])
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "codecarbon"
+
+
+def read_json_cache(path: Union[str, Path]) -> Optional[Any]:
+    """
+    Content of a JSON cache file, None if it is missing or unreadable.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+
+def write_json_cache(path: Union[str, Path], content: Any) -> None:
+    """
+    Write a JSON cache file. The file is replaced atomically, so that concurrent
+    processes never read a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(content, f, default=str)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 @lru_cache(maxsize=1)
 def detect_cpu_model() -> Optional[str]:
     import cpuinfo
@@ -19,7 +19,8 @@ import sys
 from functools import lru_cache
 from typing import Dict, List, Tuple
 
-from codecarbon.core.units import Time
+from codecarbon.core.rapl import RAPLReading, readings_to_details
+from codecarbon.core.units import Energy, Power, Time
 from codecarbon.external.logger import logger
 
 # From emi.h: CTL_CODE(FILE_DEVICE_UNKNOWN, fn, METHOD_BUFFERED, FILE_READ_ACCESS)
@@ -357,6 +358,12 @@ class WindowsEMI:
         start():
             Takes the initial energy counter snapshot.
 
+        get_cpu_readings(duration: Time) -> List[RAPLReading]:
+            Fetches the energy and power of each channel since the previous call.
+
+        get_static_cpu_readings() -> List[RAPLReading]:
+            Returns the last readings without recalculating them.
+
         get_cpu_details(duration: Time) -> Dict:
             Fetches the CPU energy deltas since the previous call.
 
@@ -375,7 +382,7 @@ class WindowsEMI:
         # deltas have not confirmed it yet. They are left out of the
         # measurement while pending.
         self._mirrored_candidates: Dict[Tuple[str, int], Tuple[str, int]] = {}
-        self._cpu_details: Dict = {}
+        self._readings: List[RAPLReading] = []
         self._setup_emi()
 
     def _setup_emi(self) -> None:
@@ -540,12 +547,12 @@ class WindowsEMI:
         self._mirrored_candidates = self._find_mirrored_candidates(snapshot)
         self._last_measurements = snapshot
 
-    def get_cpu_details(self, duration: Time) -> Dict:
+    def get_cpu_readings(self, duration: Time) -> List[RAPLReading]:
         """
-        Fetches the CPU Energy Deltas by reading the EMI counters and
-        subtracting the previous snapshot.
+        Fetches the energy and power of each channel by reading the EMI
+        counters and subtracting the previous snapshot.
         """
-        cpu_details: Dict = {}
+        readings: List[RAPLReading] = []
         snapshot = self._snapshot()
         self._confirm_mirrored_channels(snapshot)
         channel_index = 0
@@ -578,21 +585,38 @@ class WindowsEMI:
                     device_path,
                     power_w,
                 )
-                name = f"Processor Energy Delta_{channel_index}(kWh)"
-                cpu_details[name] = energy_kwh
                 # We fake the names used by Power Gadget, as IntelRAPL does
-                cpu_details[name.replace("Energy", "Power")] = power_w
+                readings.append(
+                    RAPLReading(
+                        f"Processor Energy Delta_{channel_index}(kWh)",
+                        Energy.from_energy(energy_kwh),
+                        Power.from_watts(power_w),
+                    )
+                )
                 channel_index += 1
         self._last_measurements.update(snapshot)
-        self._cpu_details = cpu_details
-        logger.debug("get_cpu_details %s", self._cpu_details)
-        return cpu_details
+        self._readings = readings
+        logger.debug("get_cpu_readings %s", readings)
+        return readings
+
+    def get_static_cpu_readings(self) -> List[RAPLReading]:
+        """
+        Return the last readings without computing them.
+        """
+        return self._readings
+
+    def get_cpu_details(self, duration: Time) -> Dict:
+        """
+        Fetches the CPU Energy Deltas by reading the EMI counters and
+        subtracting the previous snapshot.
+        """
+        return readings_to_details(self.get_cpu_readings(duration))
 
     def get_static_cpu_details(self) -> Dict:
         """
         Return CPU details without computing them.
         """
-        return self._cpu_details
+        return readings_to_details(self._readings)
 
 
 @lru_cache(maxsize=1)
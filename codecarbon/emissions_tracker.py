@@ -9,6 +9,7 @@ import dataclasses
 import os
 import platform
 import re
+import threading
 import time
 import uuid
 import warnings
@@ -20,20 +21,28 @@ from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 import psutil
 
 from codecarbon._version import __version__
+from codecarbon.core.carbon_intensity_series import EnergySeries
 from codecarbon.core.config import get_hierarchical_config, normalize_gpu_ids
+from codecarbon.core.streaming_stats import StreamingStats
 from codecarbon.core.units import Energy, Power, Time, Water
 from codecarbon.core.util import count_cpus, count_physical_cpus, suppress
 from codecarbon.external.hardware import CPU, GPU, AppleSiliconChip
 from codecarbon.external.logger import logger, set_logger_format, set_logger_level
 from codecarbon.external.ram import RAM
 from codecarbon.external.scheduler import PeriodicScheduler
-from codecarbon.external.task import Task
+from codecarbon.external.task import Task, TaskStart
 from codecarbon.input import DataSource
 from codecarbon.lock import Lock
 from codecarbon.output_methods.base_output import BaseOutput, OutputMethod
+from codecarbon.output_methods.dispatcher import (
+    OutputDispatcher,
+    OutputHandlerStats,
+)
 from codecarbon.output_methods.emissions_data import EmissionsData
 
 if TYPE_CHECKING:
+    from codecarbon.core.carbon_intensity_series import CarbonIntensitySeries
+    from codecarbon.core.emissions_spool import EmissionsSpool
     from codecarbon.external.geography import CloudMetadata, GeoMetadata
     from codecarbon.output_methods.logger import LoggerOutput
 
@@ -55,6 +64,9 @@ if TYPE_CHECKING:
 
 _sentinel = object()
 
+# Maximum time, in seconds, flush() and stop() wait for the output handlers
+OUTPUT_FLUSH_TIMEOUT = 60
+
 
 class BaseEmissionsTracker(ABC):
     """
@@ -273,10 +285,11 @@ class BaseEmissionsTracker(ABC):
         self._total_emissions: float = 0.0
         self._last_energy_covered: Energy = Energy.from_energy(kWh=0)
         self._total_water: Water = Water.from_litres(litres=0)
-        self._cpu_utilization_history: List[float] = []
-        self._gpu_utilization_history: List[float] = []
-        self._ram_utilization_history: List[float] = []
-        self._ram_used_history: List[float] = []
+        self._cpu_utilization_history = StreamingStats()
+        self._gpu_utilization_history = StreamingStats()
+        self._ram_utilization_history = StreamingStats()
+        self._ram_used_history = StreamingStats()
+        self._energy_series = EnergySeries()
         self._total_cpu_energy: Energy = Energy.from_energy(kWh=0)
         self._total_gpu_energy: Energy = Energy.from_energy(kWh=0)
         self._total_ram_energy: Energy = Energy.from_energy(kWh=0)
@@ -295,7 +308,7 @@ class BaseEmissionsTracker(ABC):
         self._task_stop_measurement_values = {}
         self._tasks: Dict[str, Task] = {}
         self._active_task: Optional[str] = None
-        self._active_task_emissions_at_start: Optional[EmissionsData] = None
+        self._active_task_emissions_at_start: Optional[TaskStart] = None
         self._hardware = []
         self._hardware_initialized = False
 
@@ -355,6 +368,8 @@ class BaseEmissionsTracker(ABC):
         self._data_source = DataSource()
         self._geo = None
         self._emissions = None
+        self._location_thread: Optional[threading.Thread] = None
+        self._location_resolved = threading.Event()
 
     def _ensure_cloud_conf(self) -> None:
         if self._conf.get("_cloud_conf_initialized"):
@@ -368,11 +383,13 @@ class BaseEmissionsTracker(ABC):
         if self._emissions is not None:
             return
         from codecarbon.core.emissions import Emissions
+        from codecarbon.core.hardware_cache import persistent_cache_dir
 
         self._emissions = Emissions(
             self._data_source,
             self._electricitymaps_api_token,
             force_carbon_intensity_g_co2e_kwh=self.force_carbon_intensity_g_co2e_kwh,
+            cache_dir=persistent_cache_dir(self),
         )
 
     def _ensure_geo_metadata(self) -> None:
@@ -385,6 +402,37 @@ class BaseEmissionsTracker(ABC):
             self._conf["longitude"] = self._geo.longitude
             self._conf["latitude"] = self._geo.latitude
 
+    def _start_location_resolution(self) -> None:
+        """
+        Resolve the cloud and geo metadata in a background thread, so that
+        starting the tracker never waits on the network. The energy measured
+        in the meantime is converted to emissions once the location is known.
+        """
+        if self._geo is not None or self._location_thread is not None:
+            return
+        self._location_thread = threading.Thread(
+            target=self._resolve_location, name="codecarbon-location", daemon=True
+        )
+        self._location_thread.start()
+
+    def _resolve_location(self) -> None:
+        try:
+            self._ensure_geo_metadata()
+            self._ensure_cloud_conf()
+        except Exception as e:
+            # _wait_for_location() retries in the caller thread
+            logger.debug(f"Unable to resolve the location in the background: {e}")
+        finally:
+            self._location_resolved.set()
+
+    def _is_location_resolved(self) -> bool:
+        return self._location_thread is None or self._location_resolved.is_set()
+
+    def _wait_for_location(self) -> None:
+        if self._location_thread is not None:
+            self._location_resolved.wait()
+        self._ensure_geo_metadata()
+
     def __init__(
         self,
         project_name: Optional[str] = _sentinel,
@@ -424,6 +472,14 @@ class BaseEmissionsTracker(ABC):
         allow_multiple_runs: Optional[bool] = _sentinel,
         rapl_include_dram: Optional[bool] = _sentinel,
         rapl_prefer_psys: Optional[bool] = _sentinel,
+        output_queue_size: Optional[int] = _sentinel,
+        output_drop_policy: Optional[str] = _sentinel,
+        api_batch_size: Optional[int] = _sentinel,
+        api_spool: Optional[bool] = _sentinel,
+        api_spool_max_size: Optional[int] = _sentinel,
+        hardware_cache: Optional[bool] = _sentinel,
+        cache_dir: Optional[str] = _sentinel,
+        carbon_intensity_file: Optional[str] = _sentinel,
     ):
         """
         :param project_name: Project name for current experiment run, default name
@@ -519,6 +575,39 @@ class BaseEmissionsTracker(ABC):
                                  (CPU + chipset + PCIe). When False, uses package domains which
                                  are more reliable. Note: psys can report higher values than
                                  CPU TDP and may be unreliable on older systems.
+        :param output_queue_size: Maximum number of live measurements waiting to be
+                                  sent to each output handler, defaults to 100.
+                                  Handlers run in background threads so that a slow
+                                  output never delays the measurements. Set to 0 to
+                                  call the handlers synchronously.
+        :param output_drop_policy: What to do with a new live measurement when an
+                                   output handler queue is full: "drop_oldest",
+                                   "drop_newest" or "block". Defaults to "drop_oldest".
+        :param api_batch_size: Number of emissions gathered before sending them to the
+                               Code Carbon API in a single call, defaults to 1.
+                               Pending emissions are always sent on flush() and
+                               stop(), and never wait more than 60 seconds.
+        :param api_spool: Keep the emissions in a SQLite database of the cache
+                          directory while the Code Carbon API cannot be
+                          reached, and send them once it answers again.
+                          Defaults to False, the emissions are then lost.
+        :param api_spool_max_size: Maximum size of the API spool in megabytes,
+                                   the oldest emissions are dropped beyond it.
+                                   Defaults to 100.
+        :param hardware_cache: Persist the detected hardware, cloud provider and
+                               location in the cache directory, so that the
+                               next trackers started on the same machine skip
+                               the detection.
+                               Defaults to False.
+        :param cache_dir: Directory of the persistent caches and of the API
+                          spool, defaults to `$XDG_CACHE_HOME/codecarbon`
+                          (`~/.cache/codecarbon`).
+        :param carbon_intensity_file: CSV or Parquet file with the carbon intensity
+                                      of the grid over time, with `datetime` and
+                                      `carbon_intensity` (g CO2eq/kWh) columns.
+                                      The emissions of the run are then computed
+                                      from the carbon intensity at the time of each
+                                      measurement. Defaults to None.
         """
 
         # logger.info("base tracker init")
@@ -554,6 +643,9 @@ class BaseEmissionsTracker(ABC):
         self._set_from_conf(api_call_interval, "api_call_interval", 8, int)
         self._set_from_conf(api_endpoint, "api_endpoint", "https://api.codecarbon.io")
         self._set_from_conf(api_key, "api_key", "api_key")
+        self._set_from_conf(api_batch_size, "api_batch_size", 1, int)
+        self._set_from_conf(api_spool, "api_spool", False, bool)
+        self._set_from_conf(api_spool_max_size, "api_spool_max_size", 100, int)
         self._configure_electricitymaps_token(
             electricitymaps_api_token, co2_signal_api_token
         )
@@ -588,6 +680,13 @@ class BaseEmissionsTracker(ABC):
         self._set_from_conf(force_mode_cpu_load, "force_mode_cpu_load", False, bool)
         self._set_from_conf(rapl_include_dram, "rapl_include_dram", False, bool)
         self._set_from_conf(rapl_prefer_psys, "rapl_prefer_psys", False, bool)
+        self._set_from_conf(hardware_cache, "hardware_cache", False, bool)
+        self._set_from_conf(cache_dir, "cache_dir")
+        self._set_from_conf(carbon_intensity_file, "carbon_intensity_file")
+        self._set_from_conf(output_queue_size, "output_queue_size", 100, int)
+        self._set_from_conf(
+            output_drop_policy, "output_drop_policy", "drop_oldest", str
+        )
         self._set_from_conf(
             experiment_id, "experiment_id", "5b0fa12a-3dd7-45bb-9766-cc326314d9f1"
         )
@@ -604,6 +703,11 @@ class BaseEmissionsTracker(ABC):
         self._initialize_scheduler_state()
         self._initialize_emissions_context()
         self._init_output_methods(api_key=self._api_key)
+        self._output_dispatcher = OutputDispatcher(
+            self._output_handlers,
+            max_queue_size=self._output_queue_size,
+            drop_policy=self._output_drop_policy,
+        )
 
     def _init_output_methods(self, *, api_key: str = None):
         """
@@ -644,6 +748,8 @@ class BaseEmissionsTracker(ABC):
                 experiment_id=self._experiment_id,
                 api_key=api_key,
                 conf=self._conf,
+                batch_size=self._api_batch_size,
+                spool=self._get_api_spool(api_key),
             )
             self.run_id = cc_api__out.run_id
             self._output_handlers.append(cc_api__out)
@@ -668,6 +774,37 @@ class BaseEmissionsTracker(ABC):
         if OutputMethod.BOAMPS in methods:
             self._output_handlers.append(BoAmpsOutput(output_dir=self._output_dir))
 
+    def _get_api_spool(self, api_key: Optional[str]) -> Optional[EmissionsSpool]:
+        """
+        :param api_key: The key the spooled emissions are sent with.
+        :return: The spool of the emissions the API could not receive, None if
+                 the api_spool option is disabled.
+        """
+        if not self._api_spool:
+            return None
+        from pathlib import Path
+
+        from codecarbon.core.emissions_spool import EmissionsSpool, spool_file
+        from codecarbon.core.util import default_cache_dir
+
+        cache_dir = (
+            Path(self._cache_dir).expanduser()
+            if self._cache_dir
+            else default_cache_dir()
+        )
+        return EmissionsSpool(
+            cache_dir / spool_file(self._api_endpoint, api_key),
+            max_size=self._api_spool_max_size * 1024 * 1024,
+        )
+
+    def get_output_stats(self) -> List[OutputHandlerStats]:
+        """
+        Get the delivery statistics of the output handlers: queue depth, number of
+        delivered, dropped and failed events, and handler call latencies.
+        :return: A list with one OutputHandlerStats per output handler.
+        """
+        return self._output_dispatcher.stats()
+
     def get_detected_hardware(self) -> Dict[str, Any]:
         """
         Get the detected hardware.
@@ -709,8 +846,12 @@ class BaseEmissionsTracker(ABC):
             logger.warning("Already started tracking")
             return
 
+        self._start_location_resolution()
         self._ensure_hardware_ready()
+        # Closed by a previous stop()
+        self._output_dispatcher.open()
         self._last_measured_time = self._start_time = time.perf_counter()
+        self._energy_series.clear(start=time.time())
 
         # Clear utilization history for fresh measurements
         self._cpu_utilization_history.clear()
@@ -748,7 +889,9 @@ class BaseEmissionsTracker(ABC):
             logger.error("Tracker not initialized. Please check the logs.")
             return
 
+        self._start_location_resolution()
         self._ensure_hardware_ready()
+        self._output_dispatcher.open()
 
         # Stop scheduler as we do not want it to interfere with the task measurement
         if self._scheduler:
@@ -775,13 +918,20 @@ class BaseEmissionsTracker(ABC):
         # Read initial energy for hardware
         for hardware in self._hardware:
             hardware.start()
-        prepared_data_for_task_start = self._prepare_emissions_data()
-        self._active_task_emissions_at_start = dataclasses.replace(
-            prepared_data_for_task_start
+        # Do not wait for the location: the emissions of the energy not
+        # covered yet are added to the task start in stop_task
+        if self._is_location_resolved():
+            self._compute_emissions_delta(self._prepare_emissions_data())
+        self._active_task_emissions_at_start = TaskStart(
+            duration=time.perf_counter() - self._start_time,
+            emissions=self._total_emissions,
+            cpu_energy=self._total_cpu_energy.kWh,
+            gpu_energy=self._total_gpu_energy.kWh,
+            ram_energy=self._total_ram_energy.kWh,
+            energy_consumed=self._total_energy.kWh,
+            water_consumed=self._total_water.litres,
+            uncovered_kWh=(self._total_energy - self._last_energy_covered).kWh,
         )
-        # The existing call to _compute_emissions_delta uses the result of _prepare_emissions_data.
-        # Let's make sure it uses the same one we captured.
-        self._compute_emissions_delta(prepared_data_for_task_start)
 
         self._tasks.update(
             {
@@ -825,10 +975,14 @@ class BaseEmissionsTracker(ABC):
             emissions_data_delta.ram_energy = 0.0
             emissions_data_delta.energy_consumed = 0.0
         else:
+            task_start = self._active_task_emissions_at_start
+            if task_start.uncovered_kWh > 0:
+                task_start.emissions += self._get_emissions_of(
+                    Energy.from_energy(kWh=task_start.uncovered_kWh)
+                )
+                task_start.uncovered_kWh = 0.0
             emissions_data_delta = dataclasses.replace(emissions_data)
-            emissions_data_delta.compute_delta_emission(
-                self._active_task_emissions_at_start
-            )
+            emissions_data_delta.compute_delta_emission(task_start)
 
         # Update global _previous_emissions state using the current totals at task stop.
         self._compute_emissions_delta(emissions_data)
@@ -880,6 +1034,11 @@ class BaseEmissionsTracker(ABC):
         self._persist_data(
             total_emissions=emissions_data, delta_emissions=emissions_data_delta
         )
+        if not self._output_dispatcher.flush(timeout=OUTPUT_FLUSH_TIMEOUT):
+            logger.warning(
+                f"Output handlers did not complete within {OUTPUT_FLUSH_TIMEOUT}s,"
+                + " emissions data will be written in the background."
+            )
 
         return emissions_data.emissions
 
@@ -908,9 +1067,13 @@ class BaseEmissionsTracker(ABC):
 
         if self._scheduler:
             self._scheduler.stop()
+            logger.debug(f"Measurement schedule: {self._scheduler.stats()}")
             self._scheduler = None
         if self._scheduler_monitor_power:
             self._scheduler_monitor_power.stop()
+            logger.debug(
+                f"Power monitoring schedule: {self._scheduler_monitor_power.stats()}"
+            )
             self._scheduler_monitor_power = None
         else:
             logger.warning("Tracker already stopped !")
@@ -921,6 +1084,7 @@ class BaseEmissionsTracker(ABC):
         # scheduled measurement to shutdown
         # or if scheduler interval was longer than the run
         self._measure_power_and_energy_if_stale()
+        self._apply_carbon_intensity_series()
 
         emissions_data = self._prepare_emissions_data()
         emissions_data_delta = self._compute_emissions_delta(emissions_data)
@@ -934,6 +1098,11 @@ class BaseEmissionsTracker(ABC):
         self.final_emissions_data = emissions_data
         self.final_emissions = emissions_data.emissions
 
+        if not self._output_dispatcher.close(timeout=OUTPUT_FLUSH_TIMEOUT):
+            logger.warning(
+                f"Output handlers did not complete within {OUTPUT_FLUSH_TIMEOUT}s,"
+                + " some emissions data may not have been written."
+            )
         for handler in self._output_handlers:
             handler.exit()
 
@@ -949,31 +1118,99 @@ class BaseEmissionsTracker(ABC):
         for task in self._tasks:
             task_emissions_data.append(self._tasks[task].out())
 
-        for handler in self._output_handlers:
-            handler.out(total_emissions, delta_emissions)
-            if len(task_emissions_data) > 0:
-                handler.task_out(task_emissions_data, experiment_name)
+        self._output_dispatcher.out(total_emissions, delta_emissions)
+        if len(task_emissions_data) > 0:
+            self._output_dispatcher.task_out(task_emissions_data, experiment_name)
 
     def _update_emissions(self) -> None:
         """
         Compute emissions for the energy consumed since the last update
         and add them to the total emissions.
         """
-        self._ensure_geo_metadata()
+        self._wait_for_location()
         self._ensure_emissions_engine()
         delta_energy = self._total_energy - self._last_energy_covered
         if delta_energy.kWh > 0:
-            cloud: CloudMetadata = self._get_cloud_metadata()
-            if cloud.is_on_private_infra:
-                delta_emissions = self._emissions.get_private_infra_emissions(
-                    delta_energy, self._geo
-                )
-            else:
-                delta_emissions = self._emissions.get_cloud_emissions(
-                    delta_energy, cloud, self._geo
+            self._total_emissions += self._get_emissions_of(delta_energy)
+            self._last_energy_covered = self._total_energy
+
+    def _get_emissions_of(self, energy: Energy) -> float:
+        """
+        Emissions, in kg, of the energy consumed at the tracker location.
+        """
+        self._wait_for_location()
+        self._ensure_emissions_engine()
+        cloud: CloudMetadata = self._get_cloud_metadata()
+        if cloud.is_on_private_infra:
+            return self._emissions.get_private_infra_emissions(energy, self._geo)
+        return self._emissions.get_cloud_emissions(energy, cloud, self._geo)
+
+    def _apply_carbon_intensity_series(self) -> None:
+        """
+        Recompute the emissions of the run from the energy of each measurement
+        interval and the carbon intensity of the grid at that time, when its
+        history is known.
+        """
+        if self._force_carbon_intensity_g_co2e_kwh is not None or not len(
+            self._energy_series
+        ):
+            return
+        try:
+            carbon_intensity_series = self._get_carbon_intensity_series()
+            if carbon_intensity_series is None:
+                return
+            total_emissions = carbon_intensity_series.get_emissions(self._energy_series)
+            # The emissions already sent to the outputs cannot be taken back,
+            # the final delta would be negative
+            reported = (
+                self._previous_emissions.emissions
+                if self._previous_emissions is not None
+                else 0.0
+            )
+            if total_emissions < reported:
+                logger.info(
+                    f"The carbon intensity history gives {total_emissions:.6f} kg"
+                    + f" of CO2eq, less than the {reported:.6f} kg already"
+                    + " reported, which are kept."
                 )
-            self._total_emissions += delta_emissions
+                total_emissions = reported
+            self._total_emissions = total_emissions
             self._last_energy_covered = self._total_energy
+        except Exception as e:
+            logger.warning(
+                "Unable to compute the emissions from the carbon intensity history,"
+                + f" using the carbon intensity at each update instead: {e}"
+            )
+
+    def _refresh_carbon_intensity_history(self) -> None:
+        """
+        Fetch the Electricity Maps history in the background during the run,
+        as the API only returns the last 24 hours.
+        """
+        if (
+            self._force_carbon_intensity_g_co2e_kwh is not None
+            or self._carbon_intensity_file
+            or self._emissions is None
+            or self._geo is None
+            or self._energy_series.start is None
+            or not self._is_location_resolved()
+        ):
+            return
+        if self._get_cloud_metadata().is_on_private_infra:
+            self._emissions.refresh_carbon_intensity_history(
+                self._geo, self._energy_series.start
+            )
+
+    def _get_carbon_intensity_series(self) -> Optional[CarbonIntensitySeries]:
+        from codecarbon.core.carbon_intensity_series import CarbonIntensitySeries
+
+        if self._carbon_intensity_file:
+            return CarbonIntensitySeries.from_file(self._carbon_intensity_file)
+        self._wait_for_location()
+        self._ensure_emissions_engine()
+        if not self._get_cloud_metadata().is_on_private_infra:
+            return None
+        return self._emissions.get_carbon_intensity_history(self._geo)
 
     def _prepare_emissions_data(self) -> EmissionsData:
         """
@@ -1051,26 +1288,10 @@ class BaseEmissionsTracker(ABC):
             duration=duration.seconds,
             emissions=emissions,  # kg
             emissions_rate=emissions / duration.seconds,  # kg/s
-            cpu_utilization_percent=(
-                sum(self._cpu_utilization_history) / len(self._cpu_utilization_history)
-                if self._cpu_utilization_history
-                else 0
-            ),
-            gpu_utilization_percent=(
-                sum(self._gpu_utilization_history) / len(self._gpu_utilization_history)
-                if self._gpu_utilization_history
-                else 0
-            ),
-            ram_utilization_percent=(
-                sum(self._ram_utilization_history) / len(self._ram_utilization_history)
-                if self._ram_utilization_history
-                else 0
-            ),
-            ram_used_gb=(
-                sum(self._ram_used_history) / len(self._ram_used_history)
-                if self._ram_used_history
-                else 0
-            ),
+            cpu_utilization_percent=self._cpu_utilization_history.mean,
+            gpu_utilization_percent=self._gpu_utilization_history.mean,
+            ram_utilization_percent=self._ram_utilization_history.mean,
+            ram_used_gb=self._ram_used_history.mean,
             cpu_power=avg_cpu_power,
             gpu_power=avg_gpu_power,
             ram_power=avg_ram_power,
@@ -1098,6 +1319,15 @@ class BaseEmissionsTracker(ABC):
             tracking_mode=self._conf.get("tracking_mode"),
             pue=self._pue,
             wue=self._wue,
+            cpu_utilization_p50=self._cpu_utilization_history.percentile(50),
+            cpu_utilization_p95=self._cpu_utilization_history.percentile(95),
+            cpu_utilization_max=self._cpu_utilization_history.max or 0.0,
+            gpu_utilization_p50=self._gpu_utilization_history.percentile(50),
+            gpu_utilization_p95=self._gpu_utilization_history.percentile(95),
+            gpu_utilization_max=self._gpu_utilization_history.max or 0.0,
+            ram_utilization_p50=self._ram_utilization_history.percentile(50),
+            ram_utilization_p95=self._ram_utilization_history.percentile(95),
+            ram_utilization_max=self._ram_utilization_history.max or 0.0,
         )
         logger.debug(total_emissions)
         return total_emissions
@@ -1116,8 +1346,8 @@ class BaseEmissionsTracker(ABC):
             delta_emissions = dataclasses.replace(total_emissions)
             # Compute emissions rate from delta
             delta_emissions.compute_delta_emission(self._previous_emissions)
-            # TODO : find a way to store _previous_emissions only when
-            # TODO : the API call succeeded
+            # The delta is not sent again if its API call fails: with the
+            # api_spool option, it is kept on disk until the API receives it.
             self._previous_emissions = total_emissions
         return delta_emissions
 
@@ -1145,9 +1375,9 @@ class BaseEmissionsTracker(ABC):
                 hardware.monitor_power()
 
         # Collect CPU and RAM utilization metrics
-        self._cpu_utilization_history.append(psutil.cpu_percent())
-        self._ram_utilization_history.append(psutil.virtual_memory().percent)
-        self._ram_used_history.append(psutil.virtual_memory().used / (1024**3))
+        self._cpu_utilization_history.add(psutil.cpu_percent())
+        self._ram_utilization_history.add(psutil.virtual_memory().percent)
+        self._ram_used_history.add(psutil.virtual_memory().used / (1024**3))
 
         # Collect GPU utilization metrics (lightweight path — skips
         # heavyweight calls like process lists, memory, temperature).
@@ -1161,11 +1391,10 @@ class BaseEmissionsTracker(ABC):
                         and resolved_gpu_index in gpu_ids_to_monitor
                         and "gpu_utilization" in gpu_detail
                     ):
-                        self._gpu_utilization_history.append(
-                            gpu_detail["gpu_utilization"]
-                        )
+                        self._gpu_utilization_history.add(gpu_detail["gpu_utilization"])
 
     def _do_measurements(self) -> None:
+        energy_before = self._total_energy.kWh
         for hardware in self._hardware:
             h_time = time.perf_counter()
             # Compute last_duration again for more accuracy
@@ -1235,6 +1464,7 @@ class BaseEmissionsTracker(ABC):
             logger.debug(
                 f"Done measure for {hardware.__class__.__name__} - measurement time: {h_time:,.4f} s - last call {last_duration:,.2f} s"
             )
+        self._energy_series.add(time.time(), self._total_energy.kWh - energy_before)
         # Increment measurement count for power averaging
         self._power_measurement_count += 1
         logger.info(
@@ -1274,12 +1504,15 @@ class BaseEmissionsTracker(ABC):
 
         self._do_measurements()
         self._last_measured_time = time.perf_counter()
+        self._refresh_carbon_intensity_history()
         self._measure_occurrence += 1
-        # Special case: metrics and api calls are sent every `api_call_interval` measures
+        # Special case: metrics and api calls are sent every `api_call_interval` measures,
+        # postponed while the location is resolved to not block the measurements
         if (
             self._api_call_interval != -1
             and len(self._output_handlers) > 0
             and self._measure_occurrence >= self._api_call_interval
+            and self._is_location_resolved()
         ):
             emissions = self._prepare_emissions_data()
             emissions_delta = self._compute_emissions_delta(emissions)
@@ -1287,8 +1520,7 @@ class BaseEmissionsTracker(ABC):
                 f"{emissions_delta.emissions_rate * 1000:.6f} g.CO2eq/s mean an estimation of "
                 + f"{emissions_delta.emissions_rate * 3600 * 24 * 365:,} kg.CO2eq/year"
             )
-            for handler in self._output_handlers:
-                handler.live_out(emissions, emissions_delta)
+            self._output_dispatcher.live_out(emissions, emissions_delta)
             self._measure_occurrence = 0
         logger.debug(f"last_duration={last_duration}\n------------------------")
 
@@ -1381,16 +1613,10 @@ class OfflineEmissionsTracker(BaseEmissionsTracker):
     def _validate_offline_cloud_provider(self) -> None:
         if not self._cloud_provider:
             return
-        df = DataSource().get_cloud_emissions_data()
         if (
-            len(
-                df.loc[
-                    (df["provider"] == self._cloud_provider)
-                    & (df["region"] == self._cloud_region)
-                ]
-            )
-            == 0
-        ):
+            self._cloud_provider,
+            self._cloud_region,
+        ) not in DataSource().get_cloud_emissions_index():
             logger.error(
                 "Cloud Provider/Region "
                 f"{self._cloud_provider} {self._cloud_region} "
@@ -1426,15 +1652,19 @@ class EmissionsTracker(BaseEmissionsTracker):
     """
 
     def _get_geo_metadata(self) -> GeoMetadata:
+        from codecarbon.core.hardware_cache import persistent_cache_dir
         from codecarbon.external.geography import GeoMetadata
 
-        return GeoMetadata.from_geo_js(self._data_source.geo_js_url)
+        return GeoMetadata.from_geo_js(
+            self._data_source.geo_js_url, cache_dir=persistent_cache_dir(self)
+        )
 
     def _get_cloud_metadata(self) -> CloudMetadata:
+        from codecarbon.core.hardware_cache import persistent_cache_dir
         from codecarbon.external.geography import CloudMetadata
 
         if self._cloud is None:
-            self._cloud = CloudMetadata.from_utils()
+            self._cloud = CloudMetadata.from_utils(cache_dir=persistent_cache_dir(self))
         return self._cloud
 
 
@@ -1512,6 +1742,14 @@ def track_emissions(
     allow_multiple_runs: Optional[bool] = _sentinel,
     rapl_include_dram: Optional[bool] = _sentinel,
     rapl_prefer_psys: Optional[bool] = _sentinel,
+    output_queue_size: Optional[int] = _sentinel,
+    output_drop_policy: Optional[str] = _sentinel,
+    api_batch_size: Optional[int] = _sentinel,
+    api_spool: Optional[bool] = _sentinel,
+    api_spool_max_size: Optional[int] = _sentinel,
+    hardware_cache: Optional[bool] = _sentinel,
+    cache_dir: Optional[str] = _sentinel,
+    carbon_intensity_file: Optional[str] = _sentinel,
 ):
     """
     Decorator that supports both `EmissionsTracker` and `OfflineEmissionsTracker`
@@ -1594,6 +1832,27 @@ def track_emissions(
                               When True, measures CPU package + DRAM.
     :param rapl_prefer_psys: Prefer psys over package domains for RAPL on Linux
                              (default: False). When True, uses total platform power.
+    :param output_queue_size: Maximum number of live measurements waiting for each
+                              output handler, defaults to 100. 0 calls the handlers
+                              synchronously.
+    :param output_drop_policy: "drop_oldest", "drop_newest" or "block" when an output
+                               handler queue is full. Defaults to "drop_oldest".
+    :param api_batch_size: Number of emissions sent to the Code Carbon API in a
+                           single call, defaults to 1.
+    :param api_spool: Keep the emissions on disk while the Code Carbon API cannot
+                      be reached and send them later, defaults to False.
+    :param api_spool_max_size: Maximum size of the API spool in megabytes,
+                               defaults to 100.
+    :param hardware_cache: Persist the detected hardware, cloud provider and
+                           location so that the next runs on the same machine
+                           skip the detection,
+                           defaults to False.
+    :param cache_dir: Directory of the persistent caches and of the API spool,
+                      defaults to `~/.cache/codecarbon`.
+    :param carbon_intensity_file: CSV or Parquet file with the carbon intensity of
+                                  the grid over time, to compute the emissions from
+                                  the carbon intensity at the time of each
+                                  measurement. Defaults to None.
 
     :return: The decorated function
     """
@@ -1650,6 +1909,11 @@ def track_emissions(
                     allow_multiple_runs=allow_multiple_runs,
                     rapl_include_dram=rapl_include_dram,
                     rapl_prefer_psys=rapl_prefer_psys,
+                    output_queue_size=output_queue_size,
+                    output_drop_policy=output_drop_policy,
+                    hardware_cache=hardware_cache,
+                    cache_dir=cache_dir,
+                    carbon_intensity_file=carbon_intensity_file,
                 )
             else:
                 tracker = EmissionsTracker(
@@ -1686,6 +1950,14 @@ def track_emissions(
                     allow_multiple_runs=allow_multiple_runs,
                     rapl_include_dram=rapl_include_dram,
                     rapl_prefer_psys=rapl_prefer_psys,
+                    output_queue_size=output_queue_size,
+                    output_drop_policy=output_drop_policy,
+                    api_batch_size=api_batch_size,
+                    api_spool=api_spool,
+                    api_spool_max_size=api_spool_max_size,
+                    hardware_cache=hardware_cache,
+                    cache_dir=cache_dir,
+                    carbon_intensity_file=carbon_intensity_file,
                 )
             tracker.start()
             try:
@@ -2,16 +2,33 @@
 Encapsulates external dependencies to retrieve cloud and geographical metadata
 """
 
+import hashlib
+import platform
 import re
+import socket
+import time
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
 
+import psutil
 import pycountry
 import requests
 
-from codecarbon.core.cloud import get_env_cloud_details
+from codecarbon.core.cloud import (
+    get_env_cloud_details,
+    read_cached_cloud,
+    write_cached_cloud,
+)
+from codecarbon.core.util import read_json_cache, write_json_cache
 from codecarbon.external.logger import logger
 
+GEO_CACHE_FILE = "geo.json"
+# Seconds before the persisted location of a network is looked up again
+GEO_CACHE_TTL = 24 * 3600
+# Number of networks whose location is persisted
+GEO_CACHE_MAX_ENTRIES = 16
+
 
 @dataclass
 class CloudMetadata:
@@ -23,7 +40,25 @@ class CloudMetadata:
         return self.provider is None and self.region is None
 
     @classmethod
-    def from_utils(cls) -> "CloudMetadata":
+    def from_utils(
+        cls, cache_dir: Optional[Union[str, Path]] = None
+    ) -> "CloudMetadata":
+        """
+        :param cache_dir: Directory where the result is persisted, so that the
+                          next processes on this host skip the probing.
+        """
+        if cache_dir is not None:
+            cached = read_cached_cloud(cache_dir)
+            if cached is not None:
+                provider, region = cached
+                return cls(provider=provider, region=region)
+        cloud = cls._from_env_cloud_details()
+        if cache_dir is not None:
+            write_cached_cloud(cache_dir, cloud.provider, cloud.region)
+        return cloud
+
+    @classmethod
+    def _from_env_cloud_details(cls) -> "CloudMetadata":
         def extract_gcp_region(zone: str) -> str:
             """
             projects/705208488469/zones/us-central1-a -> us-central1
@@ -88,8 +123,46 @@ class GeoMetadata:
             self.region,
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "country_iso_code": self.country_iso_code,
+            "country_name": self.country_name,
+            "region": self.region,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "country_2letter_iso_code": self.country_2letter_iso_code,
+        }
+
+    @classmethod
+    def from_geo_js(
+        cls, url: str, cache_dir: Optional[Union[str, Path]] = None
+    ) -> "GeoMetadata":
+        """
+        Locate the host from its IP address, defaulting to Canada if both the
+        primary and the backup API fail.
+        :param cache_dir: Directory where the location is persisted, per network,
+                          so that the next processes skip the lookup.
+        """
+        if cache_dir is not None:
+            cached = read_cached_geo(cache_dir)
+            if cached is not None:
+                return cached
+        geo = cls._from_ip_apis(url)
+        if geo is None:
+            return cls(
+                country_iso_code="CAN",
+                country_name="Canada",
+                region="Quebec",
+                latitude=46.8,
+                longitude=-71.2,
+                country_2letter_iso_code="CA",
+            )
+        if cache_dir is not None:
+            write_cached_geo(cache_dir, geo)
+        return geo
+
     @classmethod
-    def from_geo_js(cls, url: str) -> "GeoMetadata":
+    def _from_ip_apis(cls, url: str) -> Optional["GeoMetadata"]:
         try:
             response: Dict = requests.get(url, timeout=0.5).json()
 
@@ -142,12 +215,70 @@ class GeoMetadata:
             logger.warning(
                 f"Unable to access geographical location through fallback API. Using 'Canada' as the default value - Exception : {e} - url={geo_url_backup}"
             )
+            return None
 
-            return cls(
-                country_iso_code="CAN",
-                country_name="Canada",
-                region="Quebec",
-                latitude=46.8,
-                longitude=-71.2,
-                country_2letter_iso_code="CA",
-            )
+
+def network_fingerprint() -> str:
+    """
+    Identify the network the host is connected to from its addresses, as the
+    location is deduced from the public IP address, which changes with them.
+    """
+    addresses = sorted(
+        address.address
+        for interface_addresses in psutil.net_if_addrs().values()
+        for address in interface_addresses
+        if address.family in (socket.AF_INET, socket.AF_INET6)
+        and not address.address.startswith(("127.", "::1", "fe80:"))
+    )
+    content = "\n".join([platform.node(), *addresses])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _read_geo_entries(cache_dir: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    content = read_json_cache(Path(cache_dir) / GEO_CACHE_FILE)
+    if not isinstance(content, dict):
+        return {}
+    now = time.time()
+    return {
+        key: entry
+        for key, entry in content.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get("expires"), (int, float))
+        and entry["expires"] >= now
+    }
+
+
+def read_cached_geo(cache_dir: Union[str, Path]) -> Optional[GeoMetadata]:
+    """
+    Location persisted by a previous process on the current network,
+    None if there is none or if it is expired.
+    """
+    entry = _read_geo_entries(cache_dir).get(network_fingerprint())
+    if entry is None:
+        return None
+    try:
+        return GeoMetadata(**entry["geo"])
+    except (KeyError, TypeError, AttributeError):
+        return None
+
+
+def write_cached_geo(
+    cache_dir: Union[str, Path], geo: GeoMetadata, ttl: float = GEO_CACHE_TTL
+) -> None:
+    """
+    Persist the location of the current network, keeping the most recent
+    networks only.
+    """
+    entries = _read_geo_entries(cache_dir)
+    entries[network_fingerprint()] = {
+        "expires": time.time() + ttl,
+        "geo": geo.to_dict(),
+    }
+    recent = sorted(entries.items(), key=lambda item: item[1]["expires"])
+    try:
+        write_json_cache(
+            Path(cache_dir) / GEO_CACHE_FILE,
+            dict(recent[-GEO_CACHE_MAX_ENTRIES:]),
+        )
+    except OSError as e:
+        logger.warning(f"Unable to write the geo cache in {cache_dir}: {e}")
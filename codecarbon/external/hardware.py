@@ -4,7 +4,6 @@ Encapsulates external dependencies to retrieve hardware metadata
 
 import math
 import re
-import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
@@ -14,6 +13,7 @@ import psutil
 from codecarbon.core.cpu import IntelPowerGadget, IntelRAPL
 from codecarbon.core.gpu import AllGPUDevices
 from codecarbon.core.powermetrics import ApplePowermetrics
+from codecarbon.core.process_tree import ProcessTree
 from codecarbon.core.units import Energy, Power, Time
 from codecarbon.core.util import count_cpus, detect_cpu_model
 from codecarbon.core.windows_emi import WindowsEMI
@@ -217,8 +217,10 @@ class CPU(BaseHardware):
         self._cpu_count = count_cpus()
         self._process = psutil.Process(self._pid)
         # For process tracking: store last measurement time and CPU times
+        self._process_tree = ProcessTree.for_pid(self._pid)
         self._last_measurement_time: Optional[float] = None
         self._last_cpu_times: Dict[int, float] = {}  # pid -> total cpu time
+        self._last_process_cpu_load = 0.0
         # First cpu_percent sample blocks briefly; later calls use interval=None.
         self._cpu_percent_interval: Optional[float] = 0.05
 
@@ -290,29 +292,17 @@ class CPU(BaseHardware):
                 f"CPU load {self._tdp} W and {cpu_load:.1f}% {load_factor=} => estimation of {power} W for whole machine."
             )
         elif self._tracking_mode == "process":
-            # Use CPU times for accurate process tracking
-            current_time = time.time()
-            current_cpu_times: Dict[int, float] = {}
-
-            # Get CPU time for main process and all children
-            try:
-                processes = [self._process] + self._process.children(recursive=True)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                processes = [self._process]
-
-            for proc in processes:
-                try:
-                    cpu_times = proc.cpu_times()
-                    # Total CPU time = user + system time
-                    total_cpu_time = cpu_times.user + cpu_times.system
-                    current_cpu_times[proc.pid] = total_cpu_time
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    logger.debug(
-                        f"Process {proc.pid} disappeared or access denied when getting CPU times."
-                    )
+            # CPU time (user + system) of the main process and all children,
+            # in a snapshot shared with the RAM
+            snapshot = self._process_tree.snapshot()
+            current_time = snapshot.timestamp
+            current_cpu_times: Dict[int, float] = snapshot.cpu_times
 
             # Calculate CPU usage based on delta
-            if self._last_measurement_time is not None:
+            if current_time == self._last_measurement_time:
+                # Same snapshot as the last sample
+                cpu_load = self._last_process_cpu_load
+            elif self._last_measurement_time is not None:
                 time_delta = current_time - self._last_measurement_time
                 if time_delta > 0:
                     total_cpu_delta = 0.0
@@ -340,6 +330,7 @@ class CPU(BaseHardware):
             # Store for next measurement
             self._last_measurement_time = current_time
             self._last_cpu_times = current_cpu_times
+            self._last_process_cpu_load = cpu_load
 
             # Normalize to percentage of total CPU capacity
             cpu_load_normalized = cpu_load / self._cpu_count
@@ -363,15 +354,17 @@ class CPU(BaseHardware):
             power = self._tdp * CONSUMPTION_PERCENTAGE_CONSTANT
             return Power.from_watts(power)
         if self._mode in ("intel_rapl", "windows_emi"):
-            # Don't call get_cpu_details to avoid computing energy twice and losing data.
-            all_cpu_details: Dict = self._intel_interface.get_static_cpu_details()
-        else:
-            all_cpu_details: Dict = self._intel_interface.get_cpu_details()
+            # Don't call get_cpu_readings to avoid computing energy twice and losing data.
+            readings = self._intel_interface.get_static_cpu_readings()
+            return Power.from_watts(
+                sum(reading.power.W for reading in readings if reading.processor)
+            )
+        all_cpu_details: Dict = self._intel_interface.get_cpu_details()
 
         power = 0
         for metric, value in all_cpu_details.items():
             # "^Processor Power_\d+\(Watt\)$" for Intel Power Gadget
-            if re.match(r"^Processor Power", metric):
+            if metric.startswith("Processor Power"):
                 power += value
                 logger.debug(f"_get_power_from_cpus - MATCH {metric} : {value}")
             else:
@@ -383,14 +376,10 @@ class CPU(BaseHardware):
         Get CPU energy deltas from RAPL files
         :return: energy in kWh
         """
-        all_cpu_details: Dict = self._intel_interface.get_cpu_details(delay)
-
-        energy = 0
-        for metric, value in all_cpu_details.items():
-            if re.match(r"^Processor Energy Delta_\d", metric):
-                energy += value
-                # logger.debug(f"_get_energy_from_cpus - MATCH {metric} : {value}")
-        return Energy.from_energy(energy)
+        readings = self._intel_interface.get_cpu_readings(delay)
+        return Energy.from_energy(
+            sum(reading.energy.kWh for reading in readings if reading.processor)
+        )
 
     def total_power(self) -> Power:
         self._power_history.append(self._get_power_from_cpus())
@@ -423,6 +412,7 @@ class CPU(BaseHardware):
         # Reset process tracking state for fresh measurements
         self._last_measurement_time = None
         self._last_cpu_times = {}
+        self._last_process_cpu_load = 0.0
         if self._mode == MODE_CPU_LOAD:
             if not _cpu_load_percent_primed:
                 _ = self._get_power_from_cpu_load()
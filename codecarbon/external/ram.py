@@ -6,6 +6,7 @@ from typing import Optional
 
 import psutil
 
+from codecarbon.core.process_tree import ProcessTree
 from codecarbon.core.units import Power
 from codecarbon.core.util import SLURM_JOB_ID
 from codecarbon.external.hardware import B_TO_GB, BaseHardware
@@ -192,17 +193,6 @@ class RAM(BaseHardware):
         # Apply minimum power constraint
         return max(min_power, total_power)
 
-    def _get_children_memories(self):
-        """
-        Compute the used RAM by the process's children
-
-        Returns:
-            list(int): The list of RAM values
-        """
-        current_process = psutil.Process(self._pid)
-        children = current_process.children(recursive=True)
-        return [child.memory_info().rss for child in children]
-
     def _read_slurm_scontrol(self):
         try:
             logger.debug(
@@ -290,9 +280,11 @@ class RAM(BaseHardware):
         Returns:
             float: RAM usage (GB)
         """
-        children_memories = self._get_children_memories() if self._children else []
-        main_memory = psutil.Process(self._pid).memory_info().rss
-        memories = children_memories + [main_memory]
+        if self._children:
+            # Shared with the CPU load of the processes
+            memories = list(ProcessTree.for_pid(self._pid).snapshot().rss.values())
+        else:
+            memories = [psutil.Process(self._pid).memory_info().rss]
         return sum([m for m in memories if m] + [0]) / B_TO_GB
 
     @property
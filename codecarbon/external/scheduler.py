@@ -1,10 +1,139 @@
-from threading import Lock, Timer
+"""
+Periodic jobs of the trackers.
+
+All the `PeriodicScheduler` of the process share one long-lived daemon thread,
+which keeps their next deadlines in a heap and hands each job to a worker thread
+when its deadline is reached. Deadlines are computed on the monotonic clock from
+the previous deadline rather than from the end of the run, so the job's run time
+does not make the schedule drift. A run that lasts longer than the interval
+skips the ticks it overlapped instead of running late ones back to back.
+
+A job may block, for instance on the network: the workers are reused from one
+run to the next, and another worker is only started when a job is due while
+all of them are busy, so a slow job only delays its own scheduler. A scheduler
+never has two runs at the same time, its next deadline is only set once its
+run is over.
+"""
+
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from codecarbon.external.logger import logger
+
+# Seconds after which a worker without a job exits
+WORKER_IDLE_SECONDS = 60
+
+
+class _SchedulerThread:
+    """The thread timing the jobs of all the schedulers, started on the
+    first `PeriodicScheduler.start`, and its workers running the jobs."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # (deadline, insertion order, scheduler, generation of the scheduler)
+        self._heap: List[Tuple[float, int, "PeriodicScheduler", int]] = []
+        self._order = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._jobs: "queue.SimpleQueue[Tuple[float, PeriodicScheduler, int]]" = (
+            queue.SimpleQueue()
+        )
+        self._workers_lock = threading.Lock()
+        # Workers waiting for a job that is not already handed to them
+        self._idle_workers = 0
+
+    def schedule(
+        self, scheduler: "PeriodicScheduler", deadline: float, generation: int
+    ) -> None:
+        with self._condition:
+            heapq.heappush(
+                self._heap, (deadline, next(self._order), scheduler, generation)
+            )
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name="codecarbon-scheduler", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def wake_up(self) -> None:
+        """Let the thread drop the entries of a stopped scheduler"""
+        with self._condition:
+            self._condition.notify()
+
+    def _next_due(self) -> Tuple[float, "PeriodicScheduler", int]:
+        with self._condition:
+            while True:
+                while self._heap and not self._heap[0][2]._is_current(self._heap[0][3]):
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                deadline = self._heap[0][0]
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    _, _, scheduler, generation = heapq.heappop(self._heap)
+                    return deadline, scheduler, generation
+                self._condition.wait(timeout)
+
+    def _loop(self) -> None:
+        while True:
+            self._dispatch(*self._next_due())
+
+    def _dispatch(
+        self, deadline: float, scheduler: "PeriodicScheduler", generation: int
+    ) -> None:
+        with self._workers_lock:
+            if self._idle_workers > 0:
+                self._idle_workers -= 1
+            else:
+                threading.Thread(
+                    target=self._work, name="codecarbon-scheduler-worker", daemon=True
+                ).start()
+        self._jobs.put((deadline, scheduler, generation))
+
+    def _work(self) -> None:
+        while True:
+            try:
+                deadline, scheduler, generation = self._jobs.get(
+                    timeout=WORKER_IDLE_SECONDS
+                )
+            except queue.Empty:
+                with self._workers_lock:
+                    # Otherwise a job was just handed to this worker
+                    if self._idle_workers > 0:
+                        self._idle_workers -= 1
+                        return
+                continue
+            next_deadline = scheduler._run(deadline)
+            with self._condition:
+                if scheduler._is_current(generation):
+                    self.schedule(scheduler, next_deadline, generation)
+            with self._workers_lock:
+                self._idle_workers += 1
+
+    def _reset(self) -> None:
+        # The threads do not survive a fork, the child starts new ones
+        self._condition = threading.Condition()
+        self._heap = []
+        self._thread = None
+        self._jobs = queue.SimpleQueue()
+        self._workers_lock = threading.Lock()
+        self._idle_workers = 0
+
+
+_scheduler_thread = _SchedulerThread()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_scheduler_thread._reset)
 
 
 class PeriodicScheduler:
     """
-    A periodic task running in threading.Timers
-    From https://stackoverflow.com/a/18906292/14541668
+    A periodic task, timed by the scheduler thread shared by the process.
     """
 
     def __init__(self, interval, function, *args, **kwargs):
@@ -15,38 +144,82 @@ class PeriodicScheduler:
         ::args:: args to pass to the function.
         ::kwargs:: kwargs to pass to the function.
         """
-        self._lock = Lock()
-        self._timer = None
+        self._lock = threading.Lock()
         self.function = function
         self.interval = interval
         self.args = args
         self.kwargs = kwargs
         self._stopped = True
+        # Incremented on each start, to ignore the deadlines of a former start
+        self._generation = 0
+        self.runs = 0
+        self.overruns = 0
+        self.max_jitter = 0.0
+        self._total_jitter = 0.0
+        self.max_run_time = 0.0
 
     def start(self, from_run=False):
         """
-        Start the scheduler.
-        ::from_run:: For internal purposes to allow re-scheduling
-        Please do not use from_run=True until you know what you do !
+        Start the scheduler, the function first runs after one interval.
+        Starting a running scheduler does nothing.
+        ::from_run:: Ignored, kept for backward compatibility.
         """
-        self._lock.acquire()
-        if from_run or self._stopped:
+        with self._lock:
+            if not self._stopped:
+                return
             self._stopped = False
-            self._timer = Timer(self.interval, self._run)
-            self._timer.daemon = True
-            self._timer.start()
-        self._lock.release()
-
-    def _run(self):
-        self.start(from_run=True)
-        self.function(*self.args, **self.kwargs)
+            self._generation += 1
+            generation = self._generation
+        _scheduler_thread.schedule(self, time.monotonic() + self.interval, generation)
 
     def stop(self):
         """
-        Stop the scheduler.
+        Stop the scheduler. A run in progress is not interrupted.
         """
-        if not self._stopped:
-            self._lock.acquire()
+        with self._lock:
+            if self._stopped:
+                return
             self._stopped = True
-            self._timer.cancel()
-            self._lock.release()
+        _scheduler_thread.wake_up()
+
+    def _is_current(self, generation: int) -> bool:
+        return not self._stopped and generation == self._generation
+
+    def _run(self, deadline: float) -> float:
+        """Run the function due at `deadline` and return the next deadline"""
+        started = time.monotonic()
+        jitter = started - deadline
+        try:
+            self.function(*self.args, **self.kwargs)
+        except Exception:
+            logger.error(
+                f"Periodic job {getattr(self.function, '__name__', self.function)} failed",
+                exc_info=True,
+            )
+        finished = time.monotonic()
+        self.runs += 1
+        self._total_jitter += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.max_run_time = max(self.max_run_time, finished - started)
+
+        next_deadline = deadline + self.interval
+        if next_deadline <= finished and self.interval > 0:
+            skipped = int((finished - deadline) // self.interval)
+            self.overruns += skipped
+            next_deadline = deadline + (skipped + 1) * self.interval
+        return next_deadline
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Timing of the runs so far, in seconds: jitter is the delay between
+        the deadline and the start of a run, overruns the number of ticks
+        skipped because a run lasted longer than the interval.
+        """
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "mean_jitter": self._total_jitter / self.runs if self.runs else 0.0,
+            "max_jitter": self.max_jitter,
+            "max_run_time": self.max_run_time,
+        }
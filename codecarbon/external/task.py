@@ -1,9 +1,28 @@
 import time
+from dataclasses import dataclass
 from uuid import uuid4
 
 from codecarbon.output_methods.emissions_data import EmissionsData, TaskEmissionsData
 
 
+@dataclass
+class TaskStart:
+    """
+    Totals of the tracker when a task starts, subtracted from the totals when
+    it stops. `uncovered_kWh` is the energy whose emissions were not computed
+    yet, because the location was still being resolved.
+    """
+
+    duration: float
+    emissions: float
+    cpu_energy: float
+    gpu_energy: float
+    ram_energy: float
+    energy_consumed: float
+    water_consumed: float
+    uncovered_kWh: float = 0.0
+
+
 class Task:
     """
     A task, used to segregate electrical consumption when executing a treatment.
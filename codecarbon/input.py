@@ -8,11 +8,12 @@ to keep `import codecarbon` fast for measurement startup.
 from __future__ import annotations
 
 import atexit
+import csv
 import json
 from contextlib import ExitStack
 from importlib.resources import as_file as importlib_resources_as_file
 from importlib.resources import files as importlib_resources_files
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
 
 if TYPE_CHECKING:
     import pandas as pd
@@ -30,32 +31,61 @@ def _get_resource_path(filepath: str):
     return path
 
 
+def _read_csv_records(
+    path, numeric_columns: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Read a reference CSV file with the csv module, so that the tracker does
+    not need to import pandas. Empty values are None.
+    """
+    records = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            record = {}
+            for key, value in row.items():
+                if value == "" or value is None:
+                    record[key] = None
+                elif key in numeric_columns:
+                    record[key] = float(value)
+                else:
+                    record[key] = value
+            records.append(record)
+    return records
+
+
 def _load_static_data() -> None:
     """
     Load all static reference data at module import.
 
     Called once when codecarbon is imported. All data loaded here
     is immutable and shared across all tracker instances.
+    The CSV files are loaded into dicts, the DataFrames are only built on
+    request, see `DataSource.get_cloud_emissions_data`.
     """
-    import pandas as pd
-
     # Global energy mix - used for emissions calculations
     path = _get_resource_path("data/private_infra/global_energy_mix.json")
     with open(path) as f:
         _CACHE["global_energy_mix"] = json.load(f)
 
-    # Cloud emissions data
+    # Cloud emissions data, indexed by (provider, region)
     path = _get_resource_path("data/cloud/impact.csv")
-    _CACHE["cloud_emissions"] = pd.read_csv(path)
+    cloud_emissions_index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for row in _read_csv_records(path, numeric_columns=("offsetRatio", "impact")):
+        cloud_emissions_index.setdefault((row["provider"], row["region"]), row)
+    _CACHE["cloud_emissions_index"] = cloud_emissions_index
 
     # Carbon intensity per source
     path = _get_resource_path("data/private_infra/carbon_intensity_per_source.json")
     with open(path) as f:
         _CACHE["carbon_intensity_per_source"] = json.load(f)
 
-    # CPU power data
+    # CPU power data, TDP by CPU model name
     path = _get_resource_path("data/hardware/cpu_power.csv")
-    _CACHE["cpu_power"] = pd.read_csv(path)
+    cpu_power_table: Dict[str, str] = {}
+    for row in _read_csv_records(path):
+        if row["Name"] is not None:
+            cpu_power_table.setdefault(row["Name"], row["TDP"])
+    _CACHE["cpu_power_table"] = cpu_power_table
 
     # Nordic country energy mix - used for emissions calculations
     path = _get_resource_path("data/private_infra/nordic_emissions.json")
@@ -150,10 +180,25 @@ class DataSource:
     def get_cloud_emissions_data(self) -> pd.DataFrame:
         """
         Returns Cloud Regions Impact Data.
+        Data is loaded with pandas on first access and cached for all tracker
+        instances. The tracker itself uses `get_cloud_emissions_index`.
+        """
+        if "cloud_emissions" not in _CACHE:
+            import pandas as pd
+
+            _CACHE["cloud_emissions"] = pd.read_csv(
+                _get_resource_path("data/cloud/impact.csv")
+            )
+        return _CACHE["cloud_emissions"]
+
+    def get_cloud_emissions_index(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Returns Cloud Regions Impact Data as a dict keyed by (provider, region).
         Data is loaded on first access and cached for all tracker instances.
+        Missing values are None.
         """
         _ensure_static_data_loaded()
-        return _CACHE["cloud_emissions"]
+        return _CACHE["cloud_emissions_index"]
 
     def get_country_emissions_data(self, country_iso_code: str) -> Dict:
         """
@@ -198,10 +243,25 @@ class DataSource:
     def get_cpu_power_data(self) -> pd.DataFrame:
         """
         Returns CPU power Data.
+        Data is loaded with pandas on first access and cached for all tracker
+        instances. The tracker itself uses `get_cpu_power_table`.
+        """
+        if "cpu_power" not in _CACHE:
+            import pandas as pd
+
+            _CACHE["cpu_power"] = pd.read_csv(
+                _get_resource_path("data/hardware/cpu_power.csv")
+            )
+        return _CACHE["cpu_power"]
+
+    def get_cpu_power_table(self) -> Dict[str, str]:
+        """
+        Returns the TDP in W of the known CPU models, by model name, as written
+        in the CSV file.
         Data is loaded on first access and cached for all tracker instances.
         """
         _ensure_static_data_loaded()
-        return _CACHE["cpu_power"]
+        return _CACHE["cpu_power_table"]
 
     def get_nordic_country_energy_mix_data(self) -> Dict:
         """
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List
+from typing import List, Tuple
 
 from codecarbon.output_methods.emissions_data import EmissionsData, TaskEmissionsData
 
@@ -37,6 +37,8 @@ class BaseOutput:
     Each method is responsible for a different part of the EmissionsData lifecycle:
         - `out` is used by termination calls such as emissions_tracker.flush and emissions_tracker.stop
         - `live_out` is used by live measurement events, e.g. the iterative update of prometheus metrics
+        - `live_out_batch` receives the live measurement events queued while the handler was busy, override it
+          to send them at once
         - `task_out` is used by terminate calls such as emissions_tracker.flush and emissions_tracker.stop, but uses
           emissions segregated by task
     """
@@ -47,6 +49,10 @@ class BaseOutput:
     def live_out(self, total: EmissionsData, delta: EmissionsData):
         pass
 
+    def live_out_batch(self, batch: List[Tuple[EmissionsData, EmissionsData]]):
+        for total, delta in batch:
+            self.live_out(total, delta)
+
     def task_out(self, data: List[TaskEmissionsData], experiment_name: str):
         pass
 
@@ -0,0 +1,289 @@
+"""
+Asynchronous dispatch of emissions data to the output handlers.
+
+Every handler gets its own bounded queue and worker thread, so a slow handler
+(an API call, a Prometheus push, a CSV rewrite...) never delays the power
+measurements nor the other handlers. Consecutive live measurements waiting in
+a queue are handed to the handler as one batch through
+`BaseOutput.live_out_batch`.
+"""
+
+import dataclasses
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
+
+from codecarbon.external.logger import logger
+from codecarbon.output_methods.base_output import BaseOutput
+from codecarbon.output_methods.emissions_data import EmissionsData, TaskEmissionsData
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+LIVE_OUT = "live_out"
+OUT = "out"
+TASK_OUT = "task_out"
+
+
+@dataclass
+class OutputHandlerStats:
+    """
+    Delivery counters of one output handler.
+    Latencies are measured per handler call, in seconds.
+    """
+
+    handler: str
+    queue_depth: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    errors: int = 0
+    calls: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+
+class _HandlerWorker:
+    """
+    Bounded queue and worker thread feeding a single output handler.
+
+    Only live measurements are subject to the queue bound and the drop policy:
+    `out` and `task_out` events come from `flush()` and `stop()` and are
+    always kept. Once closed, events are dropped until the worker is opened
+    again.
+    """
+
+    def __init__(
+        self,
+        handler: BaseOutput,
+        max_queue_size: int,
+        drop_policy: str,
+        max_batch_size: int,
+    ):
+        self.handler = handler
+        self.max_queue_size = max_queue_size
+        self.drop_policy = drop_policy
+        self.max_batch_size = max(1, max_batch_size)
+        self.stats = OutputHandlerStats(handler=type(handler).__name__)
+        self._queue: Deque[Tuple[str, Tuple[Any, ...]]] = deque()
+        self._live_count = 0
+        self._in_flight = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_async(self) -> bool:
+        return self.max_queue_size > 0
+
+    def put(self, kind: str, args: Tuple[Any, ...]) -> None:
+        if self._closed:
+            self._drop_closed(kind)
+            return
+        if not self.is_async:
+            self._deliver(kind, [args])
+            return
+        with self._cond:
+            if kind == LIVE_OUT and self._live_count >= self.max_queue_size:
+                if self.drop_policy == DROP_NEWEST:
+                    self.stats.dropped += 1
+                    return
+                if self.drop_policy == DROP_OLDEST:
+                    self._drop_oldest_live()
+                else:
+                    while self._live_count >= self.max_queue_size and not self._closed:
+                        self._cond.wait()
+            if self._closed:
+                self._drop_closed(kind)
+                return
+            self._queue.append((kind, args))
+            if kind == LIVE_OUT:
+                self._live_count += 1
+            self.stats.queue_depth = len(self._queue)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def _drop_closed(self, kind: str) -> None:
+        self.stats.dropped += 1
+        logger.warning(
+            f"Output handler {self.stats.handler} is closed, {kind} event dropped."
+        )
+
+    def _drop_oldest_live(self) -> None:
+        for index, (kind, _) in enumerate(self._queue):
+            if kind == LIVE_OUT:
+                del self._queue[index]
+                self._live_count -= 1
+                self.stats.dropped += 1
+                return
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"codecarbon-output-{self.stats.handler}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _take_batch(self) -> Tuple[str, List[Tuple[Any, ...]]]:
+        kind, args = self._queue.popleft()
+        batch = [args]
+        if kind == LIVE_OUT:
+            while (
+                self._queue
+                and self._queue[0][0] == LIVE_OUT
+                and len(batch) < self.max_batch_size
+            ):
+                batch.append(self._queue.popleft()[1])
+            self._live_count -= len(batch)
+        self.stats.queue_depth = len(self._queue)
+        return kind, batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    # Closed: open() starts a new thread on the next event
+                    self._thread = None
+                    return
+                kind, batch = self._take_batch()
+                self._in_flight = True
+                self._cond.notify_all()
+            try:
+                self._deliver(kind, batch)
+            finally:
+                with self._cond:
+                    self._in_flight = False
+                    self._cond.notify_all()
+
+    def _deliver(self, kind: str, batch: List[Tuple[Any, ...]]) -> None:
+        start = time.perf_counter()
+        try:
+            if kind == LIVE_OUT:
+                self.handler.live_out_batch(batch)
+            elif kind == OUT:
+                self.handler.out(*batch[0])
+            else:
+                self.handler.task_out(*batch[0])
+            self.stats.delivered += len(batch)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(
+                f"Output handler {self.stats.handler} failed on {kind}: {e}",
+                exc_info=True,
+            )
+        latency = time.perf_counter() - start
+        self.stats.calls += 1
+        self.stats.last_latency = latency
+        self.stats.total_latency += latency
+        self.stats.max_latency = max(self.stats.max_latency, latency)
+
+    def flush(self, deadline: Optional[float]) -> bool:
+        with self._cond:
+            while self._queue or self._in_flight:
+                if self._thread is None:
+                    # Nothing will ever drain the queue
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, deadline: Optional[float]) -> bool:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is None:
+            return True
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        thread.join(remaining)
+        return not thread.is_alive()
+
+    def open(self) -> None:
+        with self._cond:
+            self._closed = False
+
+
+class OutputDispatcher:
+    """
+    Fan out emissions data to the output handlers without blocking the caller.
+
+    Args:
+        handlers: output handlers to feed.
+        max_queue_size: maximum number of pending live measurements per handler.
+            0 disables the worker threads: handlers are then called synchronously.
+        drop_policy: what to do when a handler queue is full, one of
+            "drop_oldest", "drop_newest" or "block".
+        max_batch_size: maximum number of live measurements given to a handler
+            in a single `live_out_batch` call.
+    """
+
+    def __init__(
+        self,
+        handlers: List[BaseOutput],
+        max_queue_size: int = 100,
+        drop_policy: str = DROP_OLDEST,
+        max_batch_size: int = 50,
+    ):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                f"Unknown `drop_policy` value: {drop_policy}"
+                + f" (should be one of {', '.join(DROP_POLICIES)})"
+            )
+        self._workers = [
+            _HandlerWorker(handler, max(0, max_queue_size), drop_policy, max_batch_size)
+            for handler in handlers
+        ]
+
+    def live_out(self, total: EmissionsData, delta: EmissionsData) -> None:
+        for worker in self._workers:
+            worker.put(LIVE_OUT, (total, delta))
+
+    def out(self, total: EmissionsData, delta: EmissionsData) -> None:
+        for worker in self._workers:
+            worker.put(OUT, (total, delta))
+
+    def task_out(self, data: List[TaskEmissionsData], experiment_name: str) -> None:
+        for worker in self._workers:
+            worker.put(TASK_OUT, (data, experiment_name))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued event has been handed to its handler.
+        :return: False if the timeout expired before all queues were drained.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return all([worker.flush(deadline) for worker in self._workers])
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Drain the queues and stop the worker threads. Events dispatched after
+        closing are dropped, with a warning, until `open()` is called.
+        :return: False if some worker was still busy when the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        return all([worker.close(deadline) for worker in self._workers])
+
+    def open(self) -> None:
+        """
+        Accept events again after `close()`, the worker threads are started
+        again on the next event.
+        """
+        for worker in self._workers:
+            worker.open()
+
+    def stats(self) -> List[OutputHandlerStats]:
+        return [dataclasses.replace(worker.stats) for worker in self._workers]
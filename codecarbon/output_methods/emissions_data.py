@@ -47,6 +47,15 @@ class EmissionsData:
     on_cloud: str = "N"
     pue: float = 1
     wue: float = 0
+    cpu_utilization_p50: float = 0.0
+    cpu_utilization_p95: float = 0.0
+    cpu_utilization_max: float = 0.0
+    gpu_utilization_p50: float = 0.0
+    gpu_utilization_p95: float = 0.0
+    gpu_utilization_max: float = 0.0
+    ram_utilization_p50: float = 0.0
+    ram_utilization_p95: float = 0.0
+    ram_utilization_max: float = 0.0
 
     @property
     def values(self) -> OrderedDict:
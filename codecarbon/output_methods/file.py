@@ -1,8 +1,7 @@
 import csv
+import io
 import os
-from typing import List
-
-import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from codecarbon.core.util import backup
 from codecarbon.external.logger import logger
@@ -19,6 +18,11 @@ class FileOutput(BaseOutput):
         output_dir: str, path to directory to write to.
         save_file_path: str, path to file to write to.
         on_csv_write: str, "append" or "update", whether or not to append or overwrite a file if it exists.
+
+    In "update" mode, the byte range of the row of each run_id is kept in
+    memory, so updating a run only rewrites its row and the rows after it
+    instead of the whole file. The index is rebuilt if the file is modified
+    by someone else.
     """
 
     def __init__(
@@ -47,6 +51,10 @@ class FileOutput(BaseOutput):
         self.output_dir: str = output_dir
         self.on_csv_write: str = on_csv_write
         self.save_file_path = os.path.join(self.output_dir, self.output_file_name)
+        # run_id -> byte ranges (start, end) of its rows, used in "update" mode
+        self._row_index: Dict[str, List[Tuple[int, int]]] = {}
+        # (inode, size, mtime) of the file when the index was last updated
+        self._index_stat: Optional[Tuple[int, int, int]] = None
         logger.info(
             f"Emissions data (if any) will be saved to file {os.path.abspath(self.save_file_path)}"
         )
@@ -61,13 +69,15 @@ class FileOutput(BaseOutput):
         Returns:
             True if the file has valid headers, False otherwise.
         """
-        with open(self.save_file_path) as csv_file:
+        headers = self._read_headers()
+        if not headers:
+            return True
+        return sorted(headers) == sorted(data.values.keys())
+
+    def _read_headers(self) -> List[str]:
+        with open(self.save_file_path, newline="") as csv_file:
             reader = csv.reader(csv_file)
-            try:
-                headers = next(reader)
-            except StopIteration:
-                return True
-            return sorted(headers) == sorted(data.values.keys())
+            return next(reader, [])
 
     def out(self, total: EmissionsData, _):
         """
@@ -97,33 +107,123 @@ class FileOutput(BaseOutput):
             backup(self.save_file_path)
             file_exists = False
 
-        new_df = pd.DataFrame.from_records([dict(total.values)])
-
+        row = dict(total.values)
         if not file_exists:
-            new_df.to_csv(self.save_file_path, index=False)
+            self._write_new_file(row)
         elif self.on_csv_write == "append":
-            new_df = new_df.dropna(axis=1, how="all")
-            new_df.to_csv(self.save_file_path, mode="a", header=False, index=False)
+            self._append_line(self._format_row(row, self._read_headers()))
         else:
-            df = pd.read_csv(self.save_file_path)
-            df_run = df.loc[df.run_id == total.run_id]
-            if len(df_run) < 1:
-                df = pd.concat([df, new_df])
-            elif len(df_run) > 1:
-                logger.warning(
-                    f"CSV contains more than 1 ({len(df_run)})"
-                    + f" rows with current run ID ({total.run_id})."
-                    + "Appending instead of updating."
-                )
-                df = pd.concat([df, new_df])
-            else:
-                update_values = {}
-                for col, val in dict(total.values).items():
-                    update_values[col] = df[col].dtype.type(val)
-                df.loc[df.run_id == total.run_id, update_values.keys()] = (
-                    update_values.values()
-                )
-            df.to_csv(self.save_file_path, index=False)
+            self._update_row(row)
+
+    @staticmethod
+    def _format_row(row: dict, headers: List[str]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(
+            [row.get(header) for header in headers]
+        )
+        return buffer.getvalue().encode("utf-8")
+
+    def _write_new_file(self, row: dict) -> None:
+        headers = list(row.keys())
+        with open(self.save_file_path, "wb") as csv_file:
+            csv_file.write(self._format_row(dict(zip(headers, headers)), headers))
+            start = csv_file.tell()
+            csv_file.write(self._format_row(row, headers))
+            self._row_index = {str(row["run_id"]): [(start, csv_file.tell())]}
+        self._save_index_stat()
+
+    def _append_line(self, line: bytes) -> Tuple[int, int]:
+        with open(self.save_file_path, "r+b") as csv_file:
+            if csv_file.seek(0, os.SEEK_END) > 0:
+                # Files edited by hand may lack the final newline
+                csv_file.seek(-1, os.SEEK_END)
+                if csv_file.read(1) != b"\n":
+                    csv_file.write(b"\n")
+            start = csv_file.tell()
+            csv_file.write(line)
+            return start, csv_file.tell()
+
+    def _update_row(self, row: dict) -> None:
+        """
+        Replace the row of the current run, or append it if there is none.
+        """
+        headers = self._read_headers()
+        self._refresh_index(headers)
+        run_id = str(row["run_id"])
+        line = self._format_row(row, headers)
+        ranges = self._row_index.setdefault(run_id, [])
+        if len(ranges) > 1:
+            logger.warning(
+                f"CSV contains more than 1 ({len(ranges)})"
+                + f" rows with current run ID ({run_id})."
+                + "Appending instead of updating."
+            )
+        if len(ranges) == 1:
+            self._replace_row(ranges, line)
+        else:
+            ranges.append(self._append_line(line))
+        self._save_index_stat()
+
+    def _replace_row(self, ranges: List[Tuple[int, int]], line: bytes) -> None:
+        start, end = ranges[0]
+        with open(self.save_file_path, "r+b") as csv_file:
+            # Usually empty: the current run is the last row of the file
+            csv_file.seek(end)
+            tail = csv_file.read()
+            csv_file.seek(start)
+            csv_file.write(line)
+            csv_file.write(tail)
+            csv_file.truncate()
+        ranges[0] = (start, start + len(line))
+        shift = len(line) - (end - start)
+        if tail and shift:
+            for other_ranges in self._row_index.values():
+                for i, (other_start, other_end) in enumerate(other_ranges):
+                    if other_start >= end:
+                        other_ranges[i] = (other_start + shift, other_end + shift)
+
+    def _save_index_stat(self) -> None:
+        stat = os.stat(self.save_file_path)
+        self._index_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _refresh_index(self, headers: List[str]) -> None:
+        """
+        Scan the file to rebuild the run_id index, unless the file is still
+        the one we last wrote.
+        """
+        stat = os.stat(self.save_file_path)
+        if self._index_stat == (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+            return
+        self._row_index = {}
+        if "run_id" not in headers:
+            return
+        run_id_column = headers.index("run_id")
+        with open(self.save_file_path, "rb") as csv_file:
+            for start, record in self._iter_records(csv_file):
+                fields = next(csv.reader(io.StringIO(record.decode("utf-8"))), [])
+                if len(fields) > run_id_column:
+                    self._row_index.setdefault(fields[run_id_column], []).append(
+                        (start, start + len(record))
+                    )
+
+    @staticmethod
+    def _iter_records(csv_file) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield the offset and raw bytes of each CSV record after the headers.
+        A record spans several lines when a quoted field contains a newline.
+        """
+        csv_file.readline()
+        start = csv_file.tell()
+        record = b""
+        for line in csv_file:
+            record += line
+            if record.count(b'"') % 2:
+                continue
+            yield start, record
+            start += len(record)
+            record = b""
+        if record:
+            yield start, record
 
     def task_out(self, data: List[TaskEmissionsData], experiment_name: str):
         """
@@ -135,11 +235,16 @@ class FileOutput(BaseOutput):
         save_task_file_path = os.path.join(
             self.output_dir, "emissions_" + experiment_name + "_" + run_id + ".csv"
         )
-        new_df = pd.DataFrame.from_records(
-            [dict(data_point.values) for data_point in data]
-        )
-        # Filter out empty or all-NA columns only from new_df, to avoid warnings from Pandas
-        # see https://github.com/pandas-dev/pandas/issues/55928
-        new_df = new_df.dropna(axis=1, how="all")
-        df = new_df
-        df.to_csv(save_task_file_path, index=False)
+        rows = [dict(data_point.values) for data_point in data]
+        # Leave out the columns without any value
+        headers = [
+            header
+            for header in rows[0].keys()
+            if any(row.get(header) is not None for row in rows)
+        ]
+        with open(save_task_file_path, "w", newline="") as csv_file:
+            writer = csv.DictWriter(
+                csv_file, fieldnames=headers, extrasaction="ignore", lineterminator="\n"
+            )
+            writer.writeheader()
+            writer.writerows(rows)
@@ -1,9 +1,13 @@
 import dataclasses
 import getpass
+import threading
+from typing import List, Optional, Tuple
 
 import requests
 
 from codecarbon.core.api_client import ApiClient
+from codecarbon.core.emissions_spool import EmissionsSpool, SpoolReplayer
+from codecarbon.core.http_client import encode_json_body, get_session
 from codecarbon.external.logger import logger
 from codecarbon.output_methods.base_output import BaseOutput
 from codecarbon.output_methods.emissions_data import EmissionsData
@@ -16,14 +20,28 @@ class HTTPOutput(BaseOutput):
     We do not provide a server.
     """
 
-    def __init__(self, endpoint_url: str):
+    def __init__(
+        self,
+        endpoint_url: str,
+        session: Optional[requests.Session] = None,
+        compress: bool = False,
+    ):
+        """
+        :session: HTTP session to use, defaults to the one shared by the process.
+        :compress: Compress the large request bodies with gzip.
+        """
         self.endpoint_url: str = endpoint_url
+        self._session = session or get_session()
+        self.compress = compress
 
     def out(self, total: EmissionsData, _: EmissionsData):
         try:
             payload = dataclasses.asdict(total)
             payload["user"] = getpass.getuser()
-            resp = requests.post(self.endpoint_url, json=payload, timeout=10)
+            body, headers = encode_json_body(payload, self.compress)
+            resp = self._session.post(
+                self.endpoint_url, data=body, headers=headers, timeout=10
+            )
             if resp.status_code != 201:
                 logger.warning(
                     "HTTP Output returned an unexpected status code: ",
@@ -46,7 +64,18 @@ class CodeCarbonAPIOutput(BaseOutput):
         experiment_id: str,
         api_key: str,
         conf,
+        batch_size: int = 1,
+        batch_max_delay: Optional[float] = 60,
+        spool: Optional[EmissionsSpool] = None,
     ):
+        """
+        :batch_size: Number of emissions to gather before sending them in a single
+            API call. Emissions are always sent on flush() and stop().
+        :batch_max_delay: Maximum time in seconds an emission waits to be sent,
+            a timer sends it when no other emission arrives in the meantime.
+        :spool: Where to keep the emissions while the API cannot be reached, a
+            background thread sends them once it answers again.
+        """
         self.endpoint_url: str = endpoint_url
         self.api = ApiClient(
             endpoint_url=endpoint_url,
@@ -54,23 +83,87 @@ class CodeCarbonAPIOutput(BaseOutput):
             api_key=api_key,
             conf=conf,
             create_run_automatically=False,
+            emissions_batch_size=batch_size,
+            emissions_batch_max_delay=batch_max_delay,
+            spool=spool,
         )
         self.run_id = self.api.run_id
+        # Serializes the uploads of the output thread and of the flush timer
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._replayer: Optional[SpoolReplayer] = None
+        if spool is not None:
+            self._replayer = SpoolReplayer(self.api)
+            self._replayer.start()
 
     def _ensure_api_run(self) -> None:
         if self.api.run_id is None and self.api.experiment_id is not None:
             self.api._create_run(self.api.experiment_id)
             self.run_id = self.api.run_id
 
-    def _emit(self, delta: EmissionsData) -> None:
-        try:
-            self._ensure_api_run()
-            self.api.add_emission(dataclasses.asdict(delta))
-        except Exception as e:
-            logger.error(e, exc_info=True)
+    def _emit(self, deltas: List[EmissionsData], flush: bool = False) -> None:
+        with self._lock:
+            try:
+                self._ensure_api_run()
+                if len(deltas) == 1 and self.api.emissions_batch_size <= 1:
+                    self.api.add_emission(dataclasses.asdict(deltas[0]))
+                    return
+                for delta in deltas:
+                    self.api.queue_emission(dataclasses.asdict(delta))
+                if flush or self.api.emissions_batch_due():
+                    self.api.flush_emissions()
+            except Exception as e:
+                logger.error(e, exc_info=True)
+            finally:
+                self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """
+        Start the timer sending the queued emissions once the oldest one is
+        batch_max_delay seconds old, if it is not already running.
+        """
+        if self._flush_timer is not None:
+            return
+        delay = self.api.emissions_batch_delay()
+        if delay is None:
+            return
+        self._flush_timer = threading.Timer(delay, self._flush_on_delay)
+        self._flush_timer.name = "codecarbon-api-flush"
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_on_delay(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            try:
+                if self.api.emissions_batch_due():
+                    self.api.flush_emissions()
+            except Exception as e:
+                logger.error(e, exc_info=True)
+            finally:
+                self._schedule_flush()
+
+    def _cancel_flush(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
 
     def live_out(self, _, delta: EmissionsData):
-        self._emit(delta)
+        self._emit([delta])
+
+    def live_out_batch(self, batch: List[Tuple[EmissionsData, EmissionsData]]):
+        self._emit([delta for _, delta in batch])
 
     def out(self, _, delta: EmissionsData):
-        self._emit(delta)
+        self._emit([delta], flush=True)
+
+    def exit(self):
+        self._cancel_flush()
+        try:
+            with self._lock:
+                self.api.flush_emissions()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        if self._replayer is not None:
+            self._replayer.stop(timeout=5)
@@ -0,0 +1,94 @@
+"""
+Benchmark of the cloud metadata lookup done when an online tracker starts.
+
+Off cloud, none of the metadata endpoints answers and each probe waits for its
+timeout. Compares probing the providers one after the other, as codecarbon
+used to, with the concurrent probe and with the provider persisted in the
+cache. A local HTTP server stands for the metadata endpoints.
+
+    python tests/benchmarks/bench_cloud_metadata.py --timeout 0.5 --runs 5
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from codecarbon.core import cloud
+from codecarbon.external.geography import CloudMetadata
+
+
+def make_handler(timeout: float):
+    class UnresponsiveMetadataHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # Longer than the client timeout, like an unreachable endpoint
+            time.sleep(timeout * 1.5)
+            self.send_response(404)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    return UnresponsiveMetadataHandler
+
+
+def sequential_cloud_details(timeout: float):
+    """Former implementation: one provider after the other"""
+    for provider in cloud.CLOUD_METADATA_MAPPING:
+        try:
+            return cloud._get_provider_cloud_details(provider, timeout)
+        except requests.exceptions.RequestException:
+            continue
+    return None
+
+
+def measure(function, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.timeout))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    mapping = {
+        provider: {**params, "url": f"{base_url}/{provider}"}
+        for provider, params in cloud.CLOUD_METADATA_MAPPING.items()
+    }
+
+    with (
+        mock.patch.dict(cloud.CLOUD_METADATA_MAPPING, mapping),
+        mock.patch(
+            "codecarbon.external.geography.get_env_cloud_details",
+            lambda: cloud.get_env_cloud_details(args.timeout),
+        ),
+        tempfile.TemporaryDirectory() as cache_dir,
+    ):
+        sequential = measure(lambda: sequential_cloud_details(args.timeout), args.runs)
+        concurrent = measure(
+            lambda: cloud.get_env_cloud_details(args.timeout), args.runs
+        )
+        CloudMetadata.from_utils(cache_dir=cache_dir)
+        cached = measure(lambda: CloudMetadata.from_utils(cache_dir=cache_dir), 1000)
+
+    server.shutdown()
+    print(f"{len(mapping)} providers, {args.timeout} s timeout, off cloud")
+    print(f"sequential probes: {sequential * 1e3:.0f} ms")
+    print(f"concurrent probes: {concurrent * 1e3:.0f} ms")
+    print(f"persisted result:  {cached * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark of the emissions upload to the CodeCarbon API.
+
+Compares one `requests.post` call per emission, each opening its own
+connection, as codecarbon used to, with the shared pooled session of
+`ApiClient`. The API is a local FastAPI stand-in served by uvicorn, or a
+standard library HTTP server with --server stdlib.
+
+    python tests/benchmarks/bench_http_session.py --calls 500
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from codecarbon.core.api_client import ApiClient
+from codecarbon.core.http_client import create_session
+
+EMISSION = {
+    "timestamp": "2026-10-18T10:00:00+00:00",
+    "run_id": "f52fe339-164d-4c2b-a8c0-f562dfce066d",
+    "duration": 15,
+    "emissions_sum": 0.0001,
+    "emissions_rate": 0.00001,
+    "cpu_power": 42.5,
+    "gpu_power": 0.0,
+    "ram_power": 3.0,
+    "cpu_energy": 0.0002,
+    "gpu_energy": 0.0,
+    "ram_energy": 0.00001,
+    "energy_consumed": 0.00021,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fastapi_server(port: int):
+    import uvicorn
+    from fastapi import FastAPI, Request
+
+    app = FastAPI()
+
+    @app.post("/emissions", status_code=201)
+    async def add_emission(request: Request):
+        await request.json()
+        return "f52fe339-164d-4c2b-a8c0-f562dfce066d"
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop():
+        server.should_exit = True
+
+    return stop
+
+
+def start_stdlib_server(port: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Like uvicorn, avoid delaying the body of the kept-alive responses
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            body = b'"f52fe339-164d-4c2b-a8c0-f562dfce066d"'
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def measure(send, calls: int):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        call_start = time.perf_counter()
+        send()
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    return calls / elapsed, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--server", choices=("fastapi", "stdlib"), default="fastapi")
+    args = parser.parse_args()
+
+    port = free_port()
+    start_server = (
+        start_fastapi_server if args.server == "fastapi" else start_stdlib_server
+    )
+    stop_server = start_server(port)
+    url = f"http://127.0.0.1:{port}"
+    api = ApiClient(
+        endpoint_url=url, create_run_automatically=False, session=create_session()
+    )
+
+    def post_without_session():
+        """Former implementation: a new connection for every call"""
+        response = requests.post(
+            url=url + "/emissions",
+            json=EMISSION,
+            timeout=2,
+            headers=api._get_headers(),
+        )
+        assert response.status_code == 201
+
+    def post_with_session():
+        api._request("POST", url + "/emissions", EMISSION, expected_status=201)
+
+    results = {
+        "requests.post per call": measure(post_without_session, args.calls),
+        "shared pooled session": measure(post_with_session, args.calls),
+    }
+    stop_server()
+
+    print(f"{args.calls} emissions posted to a local {args.server} server")
+    for name, (throughput, latency) in results.items():
+        print(f"{name:<24} {throughput:8.0f} req/s  {latency * 1e3:6.2f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
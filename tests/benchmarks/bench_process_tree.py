@@ -0,0 +1,64 @@
+"""
+Benchmark of a tick of tracking_mode="process" with many child processes.
+
+Compares the former reads, a recursive psutil walk with the CPU times of each
+process for the CPU load and another walk with the memory of each process for
+the RAM, with one snapshot of the shared `ProcessTree`. Linux only, the tree is
+made of sleeping Python processes.
+
+    python tests/benchmarks/bench_process_tree.py --children 200 --ticks 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+
+from codecarbon.core.process_tree import ProcessTree
+
+
+def psutil_tick(process: psutil.Process) -> None:
+    for proc in [process] + process.children(recursive=True):
+        proc.cpu_times()
+    for child in process.children(recursive=True):
+        child.memory_info()
+    process.memory_info()
+
+
+def timed(label: str, tick, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick()
+    elapsed = (time.perf_counter() - start) / ticks
+    print(f"{label:<14} {elapsed * 1000:8.2f} ms per tick")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--children", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+
+    children = [
+        subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+        for _ in range(args.children)
+    ]
+    try:
+        process = psutil.Process(os.getpid())
+        tree = ProcessTree(os.getpid())
+        assert len(tree.snapshot(max_age=0).rss) == args.children + 1
+        before = timed("psutil walks", lambda: psutil_tick(process), args.ticks)
+        after = timed("process tree", lambda: tree.snapshot(max_age=0), args.ticks)
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+    print(f"speedup: x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark of the per-sample cost of the RAPL CPU measurement.
+
+Compares reading the energy counters by opening each `energy_uj` file at every
+sample, as codecarbon used to, with the persistent file descriptors read by
+`IntelRAPL`. Runs on a fake powercap tree, or on the real one with --rapl-dir.
+
+    python tests/benchmarks/bench_rapl.py --sockets 4 --samples 20000
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import timeit
+
+from codecarbon.core.units import Time
+from codecarbon.external.hardware import CPU
+
+
+def make_fake_rapl_dir(root: str, sockets: int) -> str:
+    provider = os.path.join(root, "intel-rapl")
+    for socket in range(sockets):
+        domain = os.path.join(provider, f"intel-rapl:{socket}")
+        os.makedirs(domain)
+        for name, value in (
+            ("name", f"package-{socket}"),
+            ("energy_uj", "52649883221"),
+            ("max_energy_range_uj", "262143328850"),
+        ):
+            with open(os.path.join(domain, name), "w") as f:
+                f.write(value)
+    return root
+
+
+def open_read_close_sample(paths):
+    """Former implementation: one open() per domain, then a regex on the names"""
+    details = {}
+    for index, path in enumerate(paths):
+        with open(path, "r") as f:
+            details[f"Processor Energy Delta_{index}(kWh)"] = float(f.read())
+    return sum(
+        value
+        for metric, value in details.items()
+        if re.match(r"^Processor Energy Delta_\d", metric)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--rapl-dir", help="Real powercap directory to read")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        rapl_dir = args.rapl_dir or make_fake_rapl_dir(root, args.sockets)
+        cpu = CPU("", "intel_rapl", "Benchmark CPU", None, rapl_dir=rapl_dir)
+        rapl_files = cpu._intel_interface._rapl_files
+        paths = [rapl_file.path for rapl_file in rapl_files]
+        delay = Time(seconds=1)
+
+        before = timeit.timeit(
+            lambda: open_read_close_sample(paths), number=args.samples
+        )
+        after = timeit.timeit(
+            lambda: cpu._get_energy_from_cpus(delay), number=args.samples
+        )
+
+    print(f"{len(paths)} RAPL domain(s), {args.samples} samples")
+    print(f"open/read/close per sample: {before / args.samples * 1e6:.1f} us")
+    print(f"pread on open descriptors:  {after / args.samples * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of the codecarbon import time and of a short tracker run.
+
+Each measure runs in a fresh interpreter, so that module and data caches are
+cold, as for a `codecarbon monitor -- cmd` invocation or a short-lived job.
+
+    python tests/benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+
+TRACKER_RUN = """
+import json, sys, time
+start = time.perf_counter()
+from codecarbon import OfflineEmissionsTracker
+imported = time.perf_counter()
+tracker = OfflineEmissionsTracker(
+    country_iso_code="FRA", save_to_file=False, log_level="error"
+)
+tracker.start()
+tracker.stop()
+stopped = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "start_stop": stopped - imported,
+    "pandas": "pandas" in sys.modules,
+}))
+"""
+
+
+def import_time() -> float:
+    """Cumulative import time of the codecarbon package, in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import codecarbon"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(r"\|\s*(\d+) \| codecarbon$", result.stderr, re.MULTILINE)
+    return int(match.group(1)) / 1e6
+
+
+def tracker_run() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", TRACKER_RUN],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [import_time() for _ in range(args.runs)]
+    runs = [tracker_run() for _ in range(args.runs)]
+    print(f"import codecarbon (-X importtime): {statistics.median(imports):.3f} s")
+    print(
+        "import in tracker run:            "
+        f" {statistics.median(run['import'] for run in runs):.3f} s"
+    )
+    print(
+        "tracker start() -> stop():        "
+        f" {statistics.median(run['start_stop'] for run in runs):.3f} s"
+    )
+    print(f"pandas imported: {any(run['pandas'] for run in runs)}")
+
+
+if __name__ == "__main__":
+    main()
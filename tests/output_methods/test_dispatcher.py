@@ -0,0 +1,183 @@
+import threading
+import unittest
+
+from codecarbon.output_methods.base_output import BaseOutput
+from codecarbon.output_methods.dispatcher import OutputDispatcher
+from codecarbon.output_methods.emissions_data import EmissionsData
+
+
+def make_emissions_data(duration: float = 10) -> EmissionsData:
+    return EmissionsData(
+        timestamp="2023-01-01T00:00:00",
+        project_name="test_project",
+        run_id="test_run_id",
+        experiment_id="test_experiment_id",
+        duration=duration,
+        emissions=0.5,
+        emissions_rate=0.05,
+        cpu_power=20,
+        gpu_power=30,
+        ram_power=5,
+        cpu_energy=200,
+        gpu_energy=300,
+        ram_energy=50,
+        energy_consumed=550,
+        water_consumed=0.1,
+        country_name="Testland",
+        country_iso_code="TS",
+        region="Test Region",
+        cloud_provider="Test Cloud",
+        cloud_region="test-cloud-1",
+        os="TestOS",
+        python_version="3.8",
+        codecarbon_version="2.0",
+        cpu_count=4,
+        cpu_model="Test CPU",
+        gpu_count=1,
+        gpu_model="Test GPU",
+        longitude=0,
+        latitude=0,
+        ram_total_size=16,
+        tracking_mode="machine",
+    )
+
+
+class RecordingOutput(BaseOutput):
+    """Records calls, optionally blocking until `release` is set."""
+
+    def __init__(self, blocking: bool = False):
+        self.calls = []
+        self.batches = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+
+    def live_out_batch(self, batch):
+        self.entered.set()
+        self.release.wait(5)
+        self.batches.append(len(batch))
+        super().live_out_batch(batch)
+
+    def live_out(self, total, delta):
+        self.calls.append(("live_out", total.duration))
+
+    def out(self, total, delta):
+        self.calls.append(("out", total.duration))
+
+
+class FailingOutput(BaseOutput):
+    def live_out(self, total, delta):
+        raise RuntimeError("boom")
+
+
+class TestOutputDispatcher(unittest.TestCase):
+    def test_live_out_does_not_wait_for_handler(self):
+        handler = RecordingOutput(blocking=True)
+        dispatcher = OutputDispatcher([handler])
+
+        dispatcher.live_out(make_emissions_data(1), make_emissions_data(1))
+
+        self.assertTrue(handler.entered.wait(5))
+        self.assertEqual(handler.calls, [])
+        handler.release.set()
+        self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(handler.calls, [("live_out", 1)])
+        dispatcher.close(timeout=5)
+
+    def test_pending_live_events_are_batched(self):
+        handler = RecordingOutput(blocking=True)
+        dispatcher = OutputDispatcher([handler])
+        dispatcher.live_out(make_emissions_data(0), make_emissions_data(0))
+        self.assertTrue(handler.entered.wait(5))
+        for duration in range(1, 4):
+            data = make_emissions_data(duration)
+            dispatcher.live_out(data, data)
+        self.assertEqual(dispatcher.stats()[0].queue_depth, 3)
+
+        handler.release.set()
+        dispatcher.close(timeout=5)
+
+        self.assertEqual(handler.batches, [1, 3])
+        self.assertEqual([call[1] for call in handler.calls], [0, 1, 2, 3])
+        self.assertEqual(dispatcher.stats()[0].delivered, 4)
+        self.assertEqual(dispatcher.stats()[0].queue_depth, 0)
+
+    def test_drop_oldest_keeps_out_events(self):
+        handler = RecordingOutput(blocking=True)
+        dispatcher = OutputDispatcher([handler], max_queue_size=2)
+        dispatcher.live_out(make_emissions_data(0), make_emissions_data(0))
+        self.assertTrue(handler.entered.wait(5))
+        for duration in range(1, 4):
+            data = make_emissions_data(duration)
+            dispatcher.live_out(data, data)
+        dispatcher.out(make_emissions_data(10), make_emissions_data(10))
+
+        handler.release.set()
+        dispatcher.close(timeout=5)
+
+        self.assertEqual(
+            handler.calls,
+            [("live_out", 0), ("live_out", 2), ("live_out", 3), ("out", 10)],
+        )
+        self.assertEqual(dispatcher.stats()[0].dropped, 1)
+
+    def test_drop_newest(self):
+        handler = RecordingOutput(blocking=True)
+        dispatcher = OutputDispatcher(
+            [handler], max_queue_size=1, drop_policy="drop_newest"
+        )
+        dispatcher.live_out(make_emissions_data(0), make_emissions_data(0))
+        self.assertTrue(handler.entered.wait(5))
+        for duration in range(1, 3):
+            data = make_emissions_data(duration)
+            dispatcher.live_out(data, data)
+
+        handler.release.set()
+        dispatcher.close(timeout=5)
+
+        self.assertEqual([call[1] for call in handler.calls], [0, 1])
+        self.assertEqual(dispatcher.stats()[0].dropped, 1)
+
+    def test_failing_handler_does_not_affect_others(self):
+        handler = RecordingOutput()
+        dispatcher = OutputDispatcher([FailingOutput(), handler])
+        data = make_emissions_data()
+
+        dispatcher.live_out(data, data)
+        dispatcher.close(timeout=5)
+
+        failing_stats, recording_stats = dispatcher.stats()
+        self.assertEqual(failing_stats.errors, 1)
+        self.assertEqual(failing_stats.delivered, 0)
+        self.assertEqual(recording_stats.delivered, 1)
+        self.assertEqual(handler.calls, [("live_out", 10)])
+
+    def test_synchronous_mode(self):
+        handler = RecordingOutput()
+        dispatcher = OutputDispatcher([handler], max_queue_size=0)
+        data = make_emissions_data()
+
+        dispatcher.out(data, data)
+        self.assertEqual(handler.calls, [("out", 10)])
+
+    def test_events_after_close_are_dropped_until_open(self):
+        handler = RecordingOutput()
+        dispatcher = OutputDispatcher([handler])
+        data = make_emissions_data()
+        dispatcher.live_out(data, data)
+        self.assertTrue(dispatcher.close(timeout=5))
+
+        dispatcher.live_out(data, data)
+        self.assertEqual(handler.calls, [("live_out", 10)])
+        self.assertEqual(dispatcher.stats()[0].dropped, 1)
+
+        dispatcher.open()
+        dispatcher.out(data, data)
+        self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(handler.calls, [("live_out", 10), ("out", 10)])
+        self.assertTrue(dispatcher.close(timeout=5))
+
+    def test_unknown_drop_policy(self):
+        with self.assertRaises(ValueError):
+            OutputDispatcher([], drop_policy="whatever")
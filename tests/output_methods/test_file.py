@@ -169,6 +169,73 @@ class TestFileOutput(unittest.TestCase):
         df = pd.read_csv(os.path.join(self.temp_dir, "test.csv"))
         self.assertEqual(df["cpu_power"].iloc[0], 2)
 
+    def test_file_output_out_update_rewrites_row_followed_by_other_runs(self):
+        file_output = FileOutput("test.csv", self.temp_dir, on_csv_write="update")
+        for run_id in ["run_1", "run_2", "run_3"]:
+            self.emissions_data.run_id = run_id
+            file_output.out(self.emissions_data, None)
+
+        self.emissions_data.run_id = "run_2"
+        self.emissions_data.cpu_model = "Longer CPU model name"
+        file_output.out(self.emissions_data, None)
+        self.emissions_data.run_id = "run_3"
+        self.emissions_data.duration = 123
+        file_output.out(self.emissions_data, None)
+
+        df = pd.read_csv(os.path.join(self.temp_dir, "test.csv"))
+        self.assertEqual(list(df["run_id"]), ["run_1", "run_2", "run_3"])
+        self.assertEqual(
+            list(df["cpu_model"]),
+            ["Test CPU", "Longer CPU model name", "Longer CPU model name"],
+        )
+        self.assertEqual(list(df["duration"]), [10, 10, 123])
+
+    def test_file_output_out_update_does_not_reread_own_file(self):
+        file_output = FileOutput("test.csv", self.temp_dir, on_csv_write="update")
+        file_output.out(self.emissions_data, None)
+
+        with patch.object(
+            FileOutput, "_iter_records", side_effect=AssertionError
+        ) as iter_records:
+            for duration in range(20, 25):
+                self.emissions_data.duration = duration
+                file_output.out(self.emissions_data, None)
+        iter_records.assert_not_called()
+
+        df = pd.read_csv(os.path.join(self.temp_dir, "test.csv"))
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df["duration"].iloc[0], 24)
+
+    def test_file_output_out_append_file_without_final_newline(self):
+        file_output = FileOutput("test.csv", self.temp_dir, on_csv_write="append")
+        file_output.out(self.emissions_data, None)
+        with open(file_output.save_file_path, "rb+") as csv_file:
+            csv_file.seek(-1, os.SEEK_END)
+            csv_file.truncate()
+
+        file_output.out(self.emissions_data, None)
+
+        df = pd.read_csv(os.path.join(self.temp_dir, "test.csv"))
+        self.assertEqual(len(df), 2)
+
+    def test_file_output_out_update_file_modified_by_another_writer(self):
+        file_output = FileOutput("test.csv", self.temp_dir, on_csv_write="update")
+        file_output.out(self.emissions_data, None)
+
+        other_output = FileOutput("test.csv", self.temp_dir, on_csv_write="update")
+        other_data = EmissionsData(**dict(self.emissions_data.values))
+        other_data.run_id = "other_run_id"
+        other_data.cpu_model = 'CPU, "quoted"\nmodel'
+        other_output.out(other_data, None)
+
+        self.emissions_data.duration = 42
+        file_output.out(self.emissions_data, None)
+
+        df = pd.read_csv(os.path.join(self.temp_dir, "test.csv"))
+        self.assertEqual(list(df["run_id"]), ["test_run_id", "other_run_id"])
+        self.assertEqual(list(df["duration"]), [42, 10])
+        self.assertEqual(df["cpu_model"].iloc[1], 'CPU, "quoted"\nmodel')
+
     # def test_file_output_out_consistent_column_ordering(self):
     #     file_output = FileOutput("test.csv", self.temp_dir, on_csv_write="append")
     #     file_output.out(self.emissions_data, None)
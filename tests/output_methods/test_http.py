@@ -47,7 +47,7 @@ class TestHTTPOutput(unittest.TestCase):
         self.http_output = HTTPOutput(endpoint_url=self.url)
 
     @patch(
-        "codecarbon.output_methods.http.requests.post",
+        "requests.Session.post",
         return_value=MagicMock(status_code=201),
     )
     def test_http_output_post_success(self, mock_post):
@@ -58,7 +58,7 @@ class TestHTTPOutput(unittest.TestCase):
 
     @patch("codecarbon.output_methods.http.logger.warning")
     @patch(
-        "codecarbon.output_methods.http.requests.post",
+        "requests.Session.post",
         return_value=MagicMock(status_code=418),
     )
     def test_http_output_post_unexpected_status(self, mock_post, mock_logger):
@@ -69,7 +69,7 @@ class TestHTTPOutput(unittest.TestCase):
 
     @patch("codecarbon.output_methods.http.logger.error")
     @patch(
-        "codecarbon.output_methods.http.requests.post",
+        "requests.Session.post",
         side_effect=Exception("Test exception"),
     )
     def test_http_output_post_exception(self, mock_post, mock_logger):
@@ -220,3 +220,23 @@ class TestCodeCarbonAPIOutput(unittest.TestCase):
         )
         api_output.out(None, self.emissions_data)
         mock_logger.assert_called_once()
+
+    @patch("codecarbon.output_methods.http.ApiClient.flush_emissions")
+    @patch("codecarbon.output_methods.http.ApiClient.queue_emission")
+    def test_codecarbon_api_batches_live_out(self, mock_queue, mock_flush):
+        api_output = CodeCarbonAPIOutput(
+            endpoint_url=self.url,
+            experiment_id=self.experiment_id,
+            api_key=self.api_key,
+            conf=None,
+            batch_size=10,
+        )
+
+        api_output.live_out_batch([(None, self.emissions_data)] * 3)
+        self.assertEqual(mock_queue.call_count, 3)
+        mock_flush.assert_not_called()
+
+        api_output.out(None, self.emissions_data)
+        self.assertEqual(mock_queue.call_count, 4)
+        mock_flush.assert_called_once()
+        self.mock_add_emission.assert_not_called()
@@ -1,4 +1,5 @@
 import dataclasses
+import threading
 import unittest
 from uuid import uuid4
 
@@ -7,7 +8,7 @@ import requests_mock
 
 from codecarbon.core.api_client import ApiClient
 from codecarbon.core.schemas import ExperimentCreate, OrganizationCreate, ProjectCreate
-from codecarbon.output import EmissionsData
+from codecarbon.output import CodeCarbonAPIOutput, EmissionsData
 
 conf = {
     "os": "macOS-10.15.7-x86_64-i386-64bit",
@@ -501,3 +502,176 @@ class TestApi(unittest.TestCase):
 
             with self.assertRaises(requests.exceptions.HTTPError):
                 api.get_project("proj-1")
+
+
+EMISSION = {
+    "duration": 2,
+    "emissions": 1.0,
+    "emissions_rate": 1.0,
+    "cpu_power": 1.0,
+    "gpu_power": 0.0,
+    "ram_power": 0.5,
+    "cpu_energy": 0.1,
+    "gpu_energy": 0.0,
+    "ram_energy": 0.1,
+    "energy_consumed": 0.2,
+}
+
+
+class TestApiBatchUpload(unittest.TestCase):
+    def setUp(self):
+        self.api = ApiClient(
+            endpoint_url="http://test.com",
+            experiment_id="exp-1",
+            conf=conf,
+            create_run_automatically=False,
+            emissions_batch_size=3,
+        )
+        self.api.run_id = "run-1"
+
+    def test_queued_emissions_are_sent_in_one_call(self):
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", json=[], status_code=201)
+            self.assertTrue(self.api.queue_emission(EMISSION))
+            self.assertTrue(self.api.queue_emission(EMISSION))
+            self.assertFalse(self.api.emissions_batch_due())
+            self.assertTrue(self.api.queue_emission(EMISSION))
+            self.assertTrue(self.api.emissions_batch_due())
+
+            self.assertTrue(self.api.flush_emissions())
+
+            self.assertEqual(m.call_count, 1)
+            emissions = m.last_request.json()["emissions"]
+            self.assertEqual(len(emissions), 3)
+            self.assertEqual({e["run_id"] for e in emissions}, {"run-1"})
+        self.assertFalse(self.api.flush_emissions())
+
+    def test_batch_is_due_after_max_delay(self):
+        self.api.emissions_batch_max_delay = 0
+        self.api.queue_emission(EMISSION)
+        self.assertTrue(self.api.emissions_batch_due())
+
+    def test_falls_back_to_single_uploads_without_batch_endpoint(self):
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", status_code=404)
+            m.post("http://test.com/emissions", status_code=201)
+            self.api.queue_emission(EMISSION)
+            self.api.queue_emission(EMISSION)
+            self.api.flush_emissions()
+            self.api.queue_emission(EMISSION)
+            self.api.queue_emission(EMISSION)
+            self.api.flush_emissions()
+
+            urls = [request.url for request in m.request_history]
+        self.assertEqual(
+            urls,
+            ["http://test.com/emissions/batch"] + ["http://test.com/emissions"] * 4,
+        )
+
+    def test_unknown_resource_does_not_disable_batch_endpoint(self):
+        with requests_mock.Mocker() as m:
+            m.post(
+                "http://test.com/emissions/batch",
+                json={"detail": "Run not found"},
+                status_code=404,
+            )
+            self.api.queue_emission(EMISSION)
+            self.api.queue_emission(EMISSION)
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.api.flush_emissions()
+
+            m.post("http://test.com/emissions/batch", json=[], status_code=201)
+            self.api.queue_emission(EMISSION)
+            self.api.queue_emission(EMISSION)
+            self.api.flush_emissions()
+
+            urls = [request.url for request in m.request_history]
+        self.assertEqual(urls, ["http://test.com/emissions/batch"] * 2)
+
+    def test_missing_route_disables_batch_endpoint(self):
+        with requests_mock.Mocker() as m:
+            m.post(
+                "http://test.com/emissions/batch",
+                json={"detail": "Not Found"},
+                status_code=404,
+            )
+            m.post("http://test.com/emissions", status_code=201)
+            self.api.queue_emission(EMISSION)
+            self.api.queue_emission(EMISSION)
+            self.api.flush_emissions()
+
+        self.assertFalse(self.api._batch_endpoint_available)
+
+    def test_batch_upload_raises_on_server_error(self):
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", text="bad", status_code=500)
+            self.api.queue_emission(EMISSION)
+            self.api.queue_emission(EMISSION)
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.api.flush_emissions()
+        self.assertFalse(self.api.emissions_batch_due())
+
+
+class TestCodeCarbonAPIOutputBatch(unittest.TestCase):
+    def test_queued_emissions_are_sent_after_max_delay(self):
+        emissions_data = EmissionsData(
+            timestamp="222",
+            project_name="",
+            run_id="run-1",
+            experiment_id="exp-1",
+            duration=2,
+            emissions=1.0,
+            emissions_rate=0.5,
+            cpu_power=1.0,
+            gpu_power=0.0,
+            ram_power=0.5,
+            cpu_energy=0.1,
+            gpu_energy=0.0,
+            ram_energy=0.1,
+            energy_consumed=0.2,
+            water_consumed=0.0,
+            country_name="Groland",
+            country_iso_code="GRD",
+            region="EU",
+            on_cloud="N",
+            cloud_provider="",
+            cloud_region="",
+            os="Linux",
+            python_version="3.8.0",
+            codecarbon_version="2.1.3",
+            gpu_count=0,
+            gpu_model="",
+            cpu_count=12,
+            cpu_model="Intel",
+            longitude=-7.6174,
+            latitude=33.5822,
+            ram_total_size=16.0,
+            tracking_mode="machine",
+        )
+        output = CodeCarbonAPIOutput(
+            endpoint_url="http://test.com",
+            experiment_id="exp-1",
+            api_key="key",
+            conf=conf,
+            batch_size=10,
+            batch_max_delay=0.05,
+        )
+        output.api.run_id = "run-1"
+        sent = threading.Event()
+        with requests_mock.Mocker() as m:
+            m.post(
+                "http://test.com/emissions/batch",
+                json=[],
+                status_code=201,
+                additional_matcher=lambda request: sent.set() or True,
+            )
+            output.live_out(None, emissions_data)
+            output.live_out(None, emissions_data)
+            self.assertEqual(0, m.call_count)
+
+            # No other emission arrives, the timer sends them
+            self.assertTrue(sent.wait(5))
+            output.exit()
+
+            self.assertEqual(1, m.call_count)
+            self.assertEqual(2, len(m.last_request.json()["emissions"]))
@@ -0,0 +1,201 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+import responses
+
+from codecarbon.core import electricitymaps_api
+from codecarbon.core.carbon_intensity_series import (
+    CarbonIntensitySeries,
+    EnergySeries,
+    parse_timestamp,
+)
+from codecarbon.core.units import Energy, Power
+from codecarbon.emissions_tracker import OfflineEmissionsTracker
+from codecarbon.external.geography import GeoMetadata
+from codecarbon.external.hardware import CPU
+
+
+def make_energy_series(start, samples) -> EnergySeries:
+    energy_series = EnergySeries()
+    energy_series.clear(start=start)
+    for timestamp, kWh in samples:
+        energy_series.add(timestamp, kWh)
+    return energy_series
+
+
+class TestCarbonIntensitySeries(unittest.TestCase):
+    def test_each_interval_gets_the_intensity_at_its_middle(self):
+        series = CarbonIntensitySeries([(3600, 200), (0, 100)])
+        energy_series = make_energy_series(0, [(1800, 1.0), (3600, 1.0)])
+
+        # 1 kWh at 125 g/kWh, then 1 kWh at 175 g/kWh
+        self.assertAlmostEqual(0.3, series.get_emissions(energy_series))
+
+    def test_intensity_is_constant_outside_the_series(self):
+        series = CarbonIntensitySeries([(1000, 100), (2000, 300)])
+        energy_series = make_energy_series(0, [(10, 1.0), (5000, 2.0)])
+
+        self.assertAlmostEqual(0.7, series.get_emissions(energy_series))
+
+    def test_empty_energy_series(self):
+        series = CarbonIntensitySeries([(0, 100)])
+
+        self.assertEqual(0.0, series.get_emissions(EnergySeries()))
+
+    def test_empty_series_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CarbonIntensitySeries([])
+
+    def test_parse_timestamp(self):
+        self.assertEqual(0.0, parse_timestamp("1970-01-01T00:00:00.000Z"))
+        self.assertEqual(3600.0, parse_timestamp("1970-01-01 01:00:00"))
+        self.assertEqual(0.0, parse_timestamp("1970-01-01T01:00:00+01:00"))
+        self.assertEqual(42.0, parse_timestamp("42"))
+
+    def test_from_csv_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "intensity.csv"
+            path.write_text(
+                "datetime,carbonIntensity,zone\n"
+                "1970-01-01T01:00:00Z,200,FR\n"
+                "1970-01-01T00:00:00Z,100,FR\n"
+            )
+            series = CarbonIntensitySeries.from_file(path)
+
+        self.assertEqual([0.0, 3600.0], list(series.timestamps))
+        self.assertEqual([100.0, 200.0], list(series.carbon_intensities))
+
+    def test_from_file_without_intensity_column(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "intensity.csv"
+            path.write_text("timestamp,value\n0,100\n")
+            with self.assertRaisesRegex(ValueError, "carbon_intensity"):
+                CarbonIntensitySeries.from_file(path)
+
+    def test_from_parquet_file(self):
+        pytest.importorskip("pyarrow")
+        import pandas as pd
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "intensity.parquet"
+            pd.DataFrame(
+                {
+                    "timestamp": pd.to_datetime(
+                        ["1970-01-01 00:00", "1970-01-01 01:00"]
+                    ),
+                    "carbon_intensity": [100.0, 200.0],
+                }
+            ).to_parquet(path)
+            series = CarbonIntensitySeries.from_file(path)
+
+        self.assertEqual([0.0, 3600.0], list(series.timestamps))
+
+    @responses.activate
+    def test_from_electricitymaps_history(self):
+        responses.add(
+            responses.GET,
+            electricitymaps_api.HISTORY_URL,
+            json={
+                "zone": "FR",
+                "history": [
+                    {"carbonIntensity": 60, "datetime": "1970-01-01T00:00:00.000Z"},
+                    {"carbonIntensity": None, "datetime": "1970-01-01T01:00:00.000Z"},
+                    {"carbonIntensity": 80, "datetime": "1970-01-01T02:00:00.000Z"},
+                ],
+            },
+            status=200,
+        )
+        geo = GeoMetadata(country_iso_code="FRA", country_2letter_iso_code="FR")
+
+        series = electricitymaps_api.get_carbon_intensity_history(geo, "token")
+
+        self.assertEqual([0.0, 7200.0], list(series.timestamps))
+        self.assertEqual([60.0, 80.0], list(series.carbon_intensities))
+        self.assertIn("countryCode=FR", responses.calls[0].request.url)
+
+
+@mock.patch("codecarbon.emissions_tracker.PeriodicScheduler")
+@mock.patch("codecarbon.core.resource_tracker.ResourceTracker")
+@mock.patch("codecarbon.emissions_tracker.BaseEmissionsTracker.get_detected_hardware")
+def test_tracker_uses_carbon_intensity_file(
+    mock_get_hw, mock_resource_tracker, mock_scheduler, tmp_path
+):
+    mock_get_hw.return_value = {
+        "ram_total_size": 16.0,
+        "cpu_count": 8,
+        "cpu_physical_count": 4,
+        "cpu_model": "Mock CPU",
+        "gpu_count": 0,
+        "gpu_model": "None",
+        "gpu_ids": None,
+    }
+    intensity_file = tmp_path / "intensity.csv"
+    intensity_file.write_text(
+        "datetime,carbon_intensity\n2000-01-01T00:00:00Z,500\n2100-01-01T00:00:00Z,500\n"
+    )
+    tracker = OfflineEmissionsTracker(
+        country_iso_code="USA",
+        carbon_intensity_file=str(intensity_file),
+        save_to_file=False,
+        allow_multiple_runs=True,
+    )
+    mock_cpu = mock.MagicMock()
+    mock_cpu.__class__ = CPU
+    mock_cpu.measure_power_and_energy.return_value = (
+        Power.from_watts(100),
+        Energy.from_energy(kWh=1.0),
+    )
+    tracker._hardware = [mock_cpu]
+
+    tracker.start()
+    tracker._measure_power_and_energy()
+    emissions = tracker.stop()
+
+    assert len(tracker._energy_series) >= 2
+    assert emissions == pytest.approx(0.5 * tracker._total_energy.kWh)
+
+
+@mock.patch("codecarbon.emissions_tracker.PeriodicScheduler")
+@mock.patch("codecarbon.core.resource_tracker.ResourceTracker")
+@mock.patch("codecarbon.emissions_tracker.BaseEmissionsTracker.get_detected_hardware")
+def test_history_does_not_take_back_reported_emissions(
+    mock_get_hw, mock_resource_tracker, mock_scheduler, tmp_path
+):
+    mock_get_hw.return_value = {
+        "ram_total_size": 16.0,
+        "cpu_count": 8,
+        "cpu_physical_count": 4,
+        "cpu_model": "Mock CPU",
+        "gpu_count": 0,
+        "gpu_model": "None",
+        "gpu_ids": None,
+    }
+    intensity_file = tmp_path / "intensity.csv"
+    intensity_file.write_text("datetime,carbon_intensity\n2000-01-01T00:00:00Z,1\n")
+    tracker = OfflineEmissionsTracker(
+        country_iso_code="USA",
+        carbon_intensity_file=str(intensity_file),
+        save_to_file=False,
+        allow_multiple_runs=True,
+    )
+    mock_cpu = mock.MagicMock()
+    mock_cpu.__class__ = CPU
+    mock_cpu.measure_power_and_energy.return_value = (
+        Power.from_watts(100),
+        Energy.from_energy(kWh=1.0),
+    )
+    tracker._hardware = [mock_cpu]
+
+    tracker.start()
+    # A live update reports the emissions at the country carbon intensity
+    tracker._compute_emissions_delta(tracker._prepare_emissions_data())
+    reported = tracker._previous_emissions.emissions
+    with mock.patch.object(tracker, "_persist_data") as persist_data:
+        emissions = tracker.stop()
+
+    assert reported > 0
+    assert emissions == pytest.approx(reported)
+    assert persist_data.call_args.kwargs["delta_emissions"].emissions >= 0
@@ -19,9 +19,18 @@
 # OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
+import threading
+from unittest import mock
+
+import requests
 import responses
 
-from codecarbon.core.cloud import CLOUD_METADATA_MAPPING, get_env_cloud_details
+from codecarbon.core.cloud import (
+    CLOUD_METADATA_MAPPING,
+    get_env_cloud_details,
+    read_cached_cloud,
+    write_cached_cloud,
+)
 
 
 def setup_cloud_details_responses(tested_provider, provider_metadata):
@@ -79,3 +88,60 @@ def test_get_env_cloud_details_mapping_nothing():
     setup_cloud_details_responses("localhost", metadata)
 
     assert get_env_cloud_details() is None
+
+
+def test_get_env_cloud_details_probes_providers_concurrently():
+    started = threading.Barrier(len(CLOUD_METADATA_MAPPING), timeout=5)
+
+    def fake_get(url, headers, timeout):
+        # Fails with BrokenBarrierError if the providers are probed one by one
+        started.wait()
+        raise requests.exceptions.ConnectTimeout()
+
+    with mock.patch("codecarbon.core.cloud.requests.get", side_effect=fake_get):
+        assert get_env_cloud_details() is None
+
+
+def test_get_env_cloud_details_returns_first_positive_answer():
+    release = threading.Event()
+    gcp_url = CLOUD_METADATA_MAPPING["GCP"]["url"]
+
+    def fake_get(url, headers, timeout):
+        if url == gcp_url:
+            response = mock.Mock()
+            response.json.return_value = {"zone": "projects/1/zones/europe-west1-b"}
+            return response
+        # The other providers do not answer until the end of the test
+        release.wait(5)
+        raise requests.exceptions.ConnectTimeout()
+
+    try:
+        with mock.patch("codecarbon.core.cloud.requests.get", side_effect=fake_get):
+            details = get_env_cloud_details()
+    finally:
+        release.set()
+
+    assert details == {
+        "provider": "GCP",
+        "metadata": {"zone": "projects/1/zones/europe-west1-b"},
+    }
+
+
+def test_cached_cloud_round_trip_and_expiry(tmp_path):
+    assert read_cached_cloud(tmp_path) is None
+
+    write_cached_cloud(tmp_path, "gcp", "europe-west1")
+    assert read_cached_cloud(tmp_path) == ("gcp", "europe-west1")
+
+    write_cached_cloud(tmp_path, None, None)
+    assert read_cached_cloud(tmp_path) == (None, None)
+
+    write_cached_cloud(tmp_path, "gcp", "europe-west1", ttl=-1)
+    assert read_cached_cloud(tmp_path) is None
+
+
+def test_cached_cloud_is_ignored_on_another_host(tmp_path):
+    write_cached_cloud(tmp_path, "gcp", "europe-west1")
+
+    with mock.patch("codecarbon.core.cloud.platform.node", return_value="other"):
+        assert read_cached_cloud(tmp_path) is None
@@ -23,6 +23,7 @@ from codecarbon.core.cpu import (
     is_psutil_available,
     is_rapl_available,
 )
+from codecarbon.core.rapl import RAPLReading
 from codecarbon.core.resource_tracker import ResourceTracker
 from codecarbon.core.units import Energy, Power, Time
 from codecarbon.core.util import count_physical_cpus
@@ -377,6 +378,42 @@ class TestIntelRAPL(unittest.TestCase):
             last_duration=0.01
         )
 
+    @unittest.skipUnless(sys.platform.lower().startswith("lin"), "requires Linux")
+    def test_intel_rapl_readings(self):
+        rapl = IntelRAPL(rapl_dir=self.rapl_dir)
+        package_file = os.path.join(
+            self.rapl_dir, "intel-rapl", "intel-rapl:0", "energy_uj"
+        )
+        with open(package_file, "w") as f:
+            f.write(str(52649883221 + 3_600_000_000))
+
+        readings = rapl.get_cpu_readings(duration=Time(seconds=2))
+
+        self.assertEqual(len(readings), 1)
+        self.assertEqual(readings[0].name, "Processor Energy Delta_0(kWh)")
+        self.assertTrue(readings[0].processor)
+        self.assertAlmostEqual(readings[0].energy.kWh, 0.001)
+        self.assertAlmostEqual(readings[0].power.W, 1800, places=2)
+        self.assertIs(rapl.get_static_cpu_readings(), readings)
+
+    def test_cpu_energy_only_sums_processor_readings(self):
+        cpu = CPU.from_utils("", "cpu_load", "Test CPU", 100)
+        cpu._mode = "intel_rapl"
+        cpu._intel_interface = mock.Mock()
+        cpu._intel_interface.get_cpu_readings.return_value = [
+            RAPLReading("Processor Energy Delta_0(kWh)", Energy(0.5), Power(0.1)),
+            RAPLReading("Processor Energy Delta_1(kWh)", Energy(0.25), Power(0.05)),
+            RAPLReading("dram", Energy(0.125), Power(0.02), processor=False),
+        ]
+        cpu._intel_interface.get_static_cpu_readings.return_value = (
+            cpu._intel_interface.get_cpu_readings.return_value
+        )
+
+        power, energy = cpu.measure_power_and_energy(last_duration=1)
+
+        self.assertAlmostEqual(energy.kWh, 0.75)
+        self.assertAlmostEqual(power.W, 150)
+
 
 class TestTDP(unittest.TestCase):
     def test_get_cpu_power_from_registry(self):
@@ -394,15 +431,13 @@ class TestTDP(unittest.TestCase):
             mock.patch("codecarbon.input.DataSource") as mock_data_source,
             mock.patch.object(tdp, "_get_matching_cpu", return_value=None),
         ):
-            mock_data_source.return_value.get_cpu_power_data.return_value = (
-                mock.sentinel.cpu_power_df
-            )
+            mock_data_source.return_value.get_cpu_power_table.return_value = {}
 
             self.assertIsNone(tdp._get_cpu_power_from_registry("Mystery CPU"))
 
     def test_get_matching_cpu(self):
         tdp = TDP()
-        cpu_data = DataSource().get_cpu_power_data()
+        cpu_data = list(DataSource().get_cpu_power_table())
 
         # ======= WORKING AS EXPECTED ========
 
@@ -22,6 +22,12 @@ class CustomOutput(BaseOutput):
         self.log.append(total)
 
 
+class SlowOutput(CustomOutput):
+    def live_out(self, total: EmissionsData, delta: EmissionsData):
+        time.sleep(1)
+        super().live_out(total, delta)
+
+
 class TestCarbonCustomHandler(unittest.TestCase):
     def setUp(self) -> None:
         self.project_name = "project_TestCarbonCustomHandler"
@@ -45,6 +51,26 @@ class TestCarbonCustomHandler(unittest.TestCase):
         self.verify_custom_handler_state(handler_0)
         self.verify_custom_handler_state(handler_1)
 
+    def test_slow_handler_does_not_delay_measurements(self):
+        handler = SlowOutput()
+        tracker = EmissionsTracker(
+            project_name=self.project_name,
+            output_handlers=[handler],
+            api_call_interval=1,
+            measure_power_secs=999,
+        )
+        tracker.start()
+        start = time.perf_counter()
+        tracker._measure_power_and_energy()
+        self.assertLess(time.perf_counter() - start, 1)
+        tracker.stop()
+
+        # stop() waits for the queued measurements to be written
+        self.assertEqual(len(handler.log), 2)
+        stats = tracker.get_output_stats()
+        self.assertEqual(stats[0].handler, "SlowOutput")
+        self.assertGreaterEqual(stats[0].max_latency, 1)
+
     def test_decorator_flush(self):
         handler_0 = CustomOutput()
         handler_1 = CustomOutput()
@@ -1,9 +1,19 @@
+import json
+import tempfile
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
 import pytest
 import responses
 
 from codecarbon.core import electricitymaps_api
+from codecarbon.core.carbon_intensity_series import CarbonIntensitySeries
+from codecarbon.core.electricitymaps_api import (
+    CarbonIntensityCache,
+    ElectricityMapsAPIError,
+)
 from codecarbon.core.units import Energy
 from codecarbon.external.geography import GeoMetadata
 
@@ -43,3 +53,196 @@ class TestElectricityMapsAPI(unittest.TestCase):
         result = electricitymaps_api.get_emissions(self._energy, self._geo, api_key)
         # Should return a positive emissions value
         assert result > 0
+
+
+class StubElectricityMapsServer:
+    """Local Electricity Maps API answering the queued carbon intensities"""
+
+    def __init__(self):
+        self.intensities = []
+        self.requests = []
+        self.client_ports = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests.append(self.path)
+                stub.client_ports.add(self.client_address[1])
+                intensity = stub.intensities.pop(0)
+                status = 200 if intensity is not None else 500
+                body = json.dumps(
+                    {"carbonIntensity": intensity}
+                    if intensity is not None
+                    else {"error": "Server error"}
+                ).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/latest"
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def wait_for_refreshes():
+    for thread in threading.enumerate():
+        if thread.name == "codecarbon-carbon-intensity":
+            thread.join(5)
+
+
+class TestCarbonIntensityCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._stub = StubElectricityMapsServer()
+        self.addCleanup(self._stub.close)
+        self._geo = GeoMetadata(
+            country_iso_code="FRA",
+            country_name="France",
+            latitude=48.8566,
+            longitude=2.3522,
+        )
+        self._time = mock.patch(
+            "codecarbon.core.electricitymaps_api.time.time", return_value=1000.0
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def make_cache(self, **kwargs) -> CarbonIntensityCache:
+        return CarbonIntensityCache(
+            "token",
+            bucket_seconds=900,
+            stale_seconds=3600,
+            url=self._stub.url,
+            **kwargs,
+        )
+
+    def test_intensity_is_reused_within_bucket(self):
+        self._stub.intensities = [50]
+        cache = self.make_cache()
+
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+        self._time.return_value = 1799.0
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+        self.assertAlmostEqual(
+            0.5, cache.get_emissions(Energy.from_energy(kWh=10), self._geo)
+        )
+
+        self.assertEqual(1, len(self._stub.requests))
+        self.assertIn("lat=48.8566", self._stub.requests[0])
+
+    def test_stale_intensity_is_served_while_refreshed(self):
+        self._stub.intensities = [50, 80, 90]
+        cache = self.make_cache()
+        cache.get_carbon_intensity(self._geo)
+
+        # Next bucket: the previous value is returned without waiting
+        self._time.return_value = 1900.0
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+        wait_for_refreshes()
+        self.assertEqual(80, cache.get_carbon_intensity(self._geo))
+
+        # Past the stale window: the caller waits for a fresh value
+        self._time.return_value = 10000.0
+        self.assertEqual(90, cache.get_carbon_intensity(self._geo))
+        self.assertEqual(3, len(self._stub.requests))
+        # The pooled session reuses its connection
+        self.assertEqual(1, len(self._stub.client_ports))
+
+    def test_failed_refresh_keeps_stale_intensity(self):
+        self._stub.intensities = [50, None]
+        cache = self.make_cache()
+        cache.get_carbon_intensity(self._geo)
+
+        self._time.return_value = 1900.0
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+        wait_for_refreshes()
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+
+    def test_failed_refresh_is_not_retried_before_backoff(self):
+        self._stub.intensities = [50, None, 80]
+        cache = self.make_cache(retry_seconds=300)
+        cache.get_carbon_intensity(self._geo)
+
+        self._time.return_value = 1900.0
+        cache.get_carbon_intensity(self._geo)
+        wait_for_refreshes()
+        self._time.return_value = 2100.0
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+        wait_for_refreshes()
+        self.assertEqual(2, len(self._stub.requests))
+
+        self._time.return_value = 2200.0
+        self.assertEqual(50, cache.get_carbon_intensity(self._geo))
+        wait_for_refreshes()
+        self.assertEqual(80, cache.get_carbon_intensity(self._geo))
+        self.assertEqual(3, len(self._stub.requests))
+
+    def test_failure_without_cached_intensity_raises(self):
+        self._stub.intensities = [None]
+        with self.assertRaises(ElectricityMapsAPIError):
+            self.make_cache().get_carbon_intensity(self._geo)
+
+    def test_intensity_is_shared_between_processes(self):
+        self._stub.intensities = [50]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.make_cache(cache_dir=cache_dir).get_carbon_intensity(self._geo)
+            other_process_cache = self.make_cache(cache_dir=cache_dir)
+            self.assertEqual(50, other_process_cache.get_carbon_intensity(self._geo))
+
+        self.assertEqual(1, len(self._stub.requests))
+
+    @mock.patch("codecarbon.core.electricitymaps_api.get_carbon_intensity_history")
+    def test_histories_are_merged(self, mock_history):
+        mock_history.side_effect = [
+            CarbonIntensitySeries([(0, 100), (900, 200)]),
+            CarbonIntensitySeries([(90000, 300)]),
+        ]
+        cache = self.make_cache()
+
+        cache.get_carbon_intensity_history(self._geo)
+        self._time.return_value = 1500.0
+        cache.get_carbon_intensity_history(self._geo)
+        self.assertEqual(1, mock_history.call_count)
+
+        self._time.return_value = 91000.0
+        history = cache.get_carbon_intensity_history(self._geo)
+        self.assertEqual([0.0, 900.0, 90000.0], list(history.timestamps))
+        self.assertEqual([100.0, 200.0, 300.0], list(history.carbon_intensities))
+
+    @mock.patch("codecarbon.core.electricitymaps_api.get_carbon_intensity_history")
+    def test_history_is_refreshed_in_background(self, mock_history):
+        mock_history.side_effect = [
+            CarbonIntensitySeries([(0, 100)]),
+            CarbonIntensitySeries([(40000, 300)]),
+        ]
+        cache = self.make_cache(history_refresh_seconds=43200)
+
+        # A run started at 0 is still covered by the history fetched at stop
+        self._time.return_value = 40000.0
+        cache.refresh_carbon_intensity_history(self._geo, since=0)
+        wait_for_refreshes()
+        self.assertEqual(0, mock_history.call_count)
+
+        self._time.return_value = 45000.0
+        cache.refresh_carbon_intensity_history(self._geo, since=0)
+        wait_for_refreshes()
+        self._time.return_value = 80000.0
+        cache.refresh_carbon_intensity_history(self._geo, since=0)
+        wait_for_refreshes()
+        self.assertEqual(1, mock_history.call_count)
+
+        self._time.return_value = 90000.0
+        history = cache.get_carbon_intensity_history(self._geo)
+        self.assertEqual([0.0, 40000.0], list(history.timestamps))
+        self.assertEqual(2, mock_history.call_count)
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch
 
+from codecarbon.core import emissions as emissions_module
 from codecarbon.core.emissions import Emissions
 from codecarbon.core.units import Energy
 from codecarbon.external.geography import CloudMetadata, GeoMetadata
@@ -47,6 +48,14 @@ class TestEmissions(unittest.TestCase):
         assert isinstance(emissions, float)
         self.assertAlmostEqual(emissions, 0.0010, places=2)
 
+    def test_get_cloud_geo_metadata(self):
+        cloud = CloudMetadata(provider="gcp", region="asia-east1")
+
+        self.assertEqual(self._emissions.get_cloud_country_name(cloud), "Taiwan")
+        self.assertEqual(self._emissions.get_cloud_country_iso_code(cloud), "TWN")
+        # No state in the data, the city is used instead
+        self.assertEqual(self._emissions.get_cloud_geo_region(cloud), "Changhua County")
+
     def test_get_carbon_intensity_per_source_data(self):
         # pytest tests/test_emissions.py::TestEmissions::test_get_carbon_intensity_per_source_data
         carbon_intensity = DataSource().get_carbon_intensity_per_source_data()
@@ -373,3 +382,31 @@ class TestEmissions(unittest.TestCase):
 
         # THEN
         self.assertIsNone(emissions)
+
+    def test_emission_factors_are_computed_once(self):
+        energy = Energy.from_energy(kWh=2.0)
+        france = GeoMetadata(country_iso_code="FRA", country_name="France")
+        ontario = GeoMetadata(
+            country_iso_code="CAN", country_name="Canada", region="ontario"
+        )
+        emissions_module._country_emission_factors.clear()
+        emissions_module._region_emission_factors.clear()
+        expected = (
+            self._emissions.get_private_infra_emissions(energy, france),
+            self._emissions.get_private_infra_emissions(energy, ontario),
+        )
+
+        with (
+            patch.object(Emissions, "_global_energy_mix_to_emissions_rate") as country,
+            patch.object(Emissions, "_region_energy_mix_to_emissions_rate") as region,
+        ):
+            emissions = (
+                Emissions(self._data_source).get_private_infra_emissions(
+                    energy, france
+                ),
+                self._emissions.get_private_infra_emissions(energy, ontario),
+            )
+
+        self.assertEqual(expected, emissions)
+        country.assert_not_called()
+        region.assert_not_called()
@@ -0,0 +1,190 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+import requests_mock
+
+from codecarbon.core.api_client import ApiClient
+from codecarbon.core.emissions_spool import (
+    EmissionsSpool,
+    SpoolReplayer,
+    spool_file,
+)
+
+EMISSION = {
+    "duration": 2,
+    "emissions": 1.0,
+    "emissions_rate": 1.0,
+    "cpu_power": 1.0,
+    "gpu_power": 0.0,
+    "ram_power": 0.5,
+    "cpu_energy": 0.1,
+    "gpu_energy": 0.0,
+    "ram_energy": 0.1,
+    "energy_consumed": 0.2,
+}
+
+
+class TestEmissionsSpool(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = Path(tmp_dir.name) / "spool" / "api_spool.sqlite"
+        self.spool = EmissionsSpool(self.path)
+        self.addCleanup(self.spool.close)
+
+    def test_database_is_created_on_first_append(self):
+        self.assertEqual(0, len(self.spool))
+        self.assertEqual([], self.spool.peek(10))
+        self.assertFalse(self.path.exists())
+
+        self.spool.append([{"id": "a"}])
+
+        self.assertTrue(self.path.exists())
+        self.assertEqual(1, len(EmissionsSpool(self.path)))
+
+    def test_emissions_are_read_in_order_and_removed_once_sent(self):
+        self.spool.append([{"id": "a", "value": 1}, {"id": "b", "value": 2}])
+        self.spool.append([{"id": "c", "value": 3}, {"id": "a", "value": 1}])
+
+        batch = self.spool.peek(2)
+
+        self.assertEqual(
+            [{"id": "a", "value": 1}, {"id": "b", "value": 2}],
+            [payload for _, payload in batch],
+        )
+        self.spool.remove(batch[-1][0])
+        self.assertEqual([{"id": "c", "value": 3}], [p for _, p in self.spool.peek(2)])
+
+    def test_oldest_emissions_are_dropped_beyond_max_size(self):
+        payloads = [{"id": str(i), "padding": "x" * 20} for i in range(5)]
+        spool = EmissionsSpool(self.path, max_size=3 * len(json.dumps(payloads[0])))
+        self.addCleanup(spool.close)
+
+        dropped = spool.append(payloads)
+
+        self.assertEqual(2, dropped)
+        self.assertEqual(["2", "3", "4"], [p["id"] for _, p in spool.peek(10)])
+
+    def test_spool_file_depends_on_endpoint_and_key(self):
+        name = spool_file("https://api.codecarbon.io", "key-1")
+
+        self.assertEqual(name, spool_file("https://api.codecarbon.io", "key-1"))
+        self.assertNotEqual(name, spool_file("https://api.codecarbon.io", "key-2"))
+        self.assertNotEqual(name, spool_file("http://localhost:8008", "key-1"))
+        self.assertNotIn("key-1", name)
+
+
+class TestApiClientSpool(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.spool = EmissionsSpool(Path(tmp_dir.name) / "api_spool.sqlite")
+        self.addCleanup(self.spool.close)
+        self.api = ApiClient(
+            endpoint_url="http://test.com",
+            experiment_id="exp-1",
+            create_run_automatically=False,
+            spool=self.spool,
+            spool_batch_size=2,
+        )
+        self.api.run_id = "run-1"
+
+    def test_emissions_are_spooled_then_replayed_in_order(self):
+        with requests_mock.Mocker() as m:
+            for url in ("http://test.com/emissions", "http://test.com/emissions/batch"):
+                m.post(url, exc=requests.exceptions.ConnectionError)
+            self.assertTrue(self.api.add_emission(EMISSION))
+            self.assertTrue(self.api.add_emission(EMISSION))
+            self.assertEqual(2, len(self.spool))
+            spooled_ids = [payload["id"] for _, payload in self.spool.peek(2)]
+
+            m.post("http://test.com/emissions/batch", status_code=201)
+            m.post("http://test.com/emissions", status_code=201)
+            self.api.add_emission(EMISSION)
+
+            sent = [request.json() for request in m.request_history[2:]]
+        self.assertEqual(0, len(self.spool))
+        self.assertEqual(spooled_ids, [e["id"] for e in sent[0]["emissions"]])
+        self.assertEqual(2, len(sent))
+        self.assertNotIn(sent[1]["id"], spooled_ids)
+
+    def test_server_errors_are_spooled(self):
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions", status_code=503)
+            self.api.add_emission(EMISSION)
+
+            self.assertEqual(1, len(self.spool))
+            self.assertFalse(self.api.replay_spool())
+
+    def test_rejected_emissions_are_not_spooled(self):
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions", status_code=422)
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.api.add_emission(EMISSION)
+
+        self.assertEqual(0, len(self.spool))
+
+    def test_rejected_spooled_emissions_are_dropped(self):
+        self.spool.append([{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", status_code=422)
+            m.post("http://test.com/emissions", status_code=201)
+
+            self.assertTrue(self.api.replay_spool())
+
+        self.assertEqual(0, len(self.spool))
+
+    def test_only_emissions_rejected_on_their_own_are_dropped(self):
+        self.spool.append([{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", status_code=403)
+            m.post(
+                "http://test.com/emissions",
+                additional_matcher=lambda request: request.json()["id"] == "b",
+                status_code=403,
+            )
+            m.post(
+                "http://test.com/emissions",
+                additional_matcher=lambda request: request.json()["id"] != "b",
+                status_code=201,
+            )
+
+            self.assertTrue(self.api.replay_spool())
+
+            sent = [
+                request.json()["id"]
+                for request in m.request_history
+                if request.url == "http://test.com/emissions"
+            ]
+        self.assertEqual(["a", "b", "c"], sent)
+        self.assertEqual(0, len(self.spool))
+
+    def test_emissions_are_kept_while_the_key_is_refused(self):
+        self.spool.append([{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", status_code=401)
+            m.post("http://test.com/emissions", status_code=401)
+
+            self.assertFalse(self.api.replay_spool())
+
+        self.assertEqual(3, len(self.spool))
+
+
+class TestSpoolReplayer(unittest.TestCase):
+    def test_replays_until_stopped(self):
+        replayed = threading.Event()
+        api = mock.Mock()
+        api.replay_spool.side_effect = lambda: replayed.set() or False
+        replayer = SpoolReplayer(api, interval=0.01)
+
+        replayer.start()
+        self.assertTrue(replayed.wait(5))
+        replayer.stop(timeout=5)
+
+        calls = api.replay_spool.call_count
+        self.assertFalse(replayed.wait(0.05) and api.replay_spool.call_count > calls)
@@ -2,6 +2,7 @@ import os
 import shutil
 import sys
 import tempfile
+import threading
 import time
 import unittest
 from pathlib import Path
@@ -150,7 +151,7 @@ class TestCarbonTracker(unittest.TestCase):
 
         tracker._monitor_power()
 
-        self.assertEqual([10, 25], tracker._gpu_utilization_history)
+        self.assertEqual([10, 25], tracker._gpu_utilization_history.recent())
 
     def test_monitor_power_skips_gpu_when_index_is_none(
         self,
@@ -178,7 +179,7 @@ class TestCarbonTracker(unittest.TestCase):
 
         tracker._monitor_power()
 
-        self.assertEqual([25], tracker._gpu_utilization_history)
+        self.assertEqual([25], tracker._gpu_utilization_history.recent())
 
     def test_monitor_power_skips_gpu_not_in_monitored_ids(
         self,
@@ -207,7 +208,7 @@ class TestCarbonTracker(unittest.TestCase):
 
         tracker._monitor_power()
 
-        self.assertEqual([10], tracker._gpu_utilization_history)
+        self.assertEqual([10], tracker._gpu_utilization_history.recent())
 
     def test_monitor_power_skips_gpu_when_utilization_key_missing(
         self,
@@ -235,7 +236,7 @@ class TestCarbonTracker(unittest.TestCase):
 
         tracker._monitor_power()
 
-        self.assertEqual([10], tracker._gpu_utilization_history)
+        self.assertEqual([10], tracker._gpu_utilization_history.recent())
 
     def test_monitor_power_handles_empty_gpu_utilization_list(
         self,
@@ -260,7 +261,7 @@ class TestCarbonTracker(unittest.TestCase):
 
         tracker._monitor_power()
 
-        self.assertEqual([], tracker._gpu_utilization_history)
+        self.assertEqual([], tracker._gpu_utilization_history.recent())
 
     @mock.patch("codecarbon.external.geography.requests.get")
     def test_carbon_tracker_timeout(
@@ -1015,18 +1016,26 @@ class TestCarbonTracker(unittest.TestCase):
 
     @mock.patch("codecarbon.emissions_tracker.EmissionsTracker._get_geo_metadata")
     @mock.patch("codecarbon.emissions_tracker.EmissionsTracker._get_cloud_metadata")
-    @mock.patch("codecarbon.core.electricitymaps_api.requests.get")
+    @mock.patch("codecarbon.core.electricitymaps_api.time.time")
+    @mock.patch("codecarbon.core.electricitymaps_api.requests.Session.get")
     @mock.patch("codecarbon.core.resource_tracker.ResourceTracker")
     @mock.patch(
         "codecarbon.emissions_tracker.BaseEmissionsTracker.get_detected_hardware"
     )
     @mock.patch("codecarbon.emissions_tracker.PeriodicScheduler")
+    # The steps span days: do not fetch the history in the background
+    @mock.patch(
+        "codecarbon.core.electricitymaps_api.CarbonIntensityCache"
+        ".refresh_carbon_intensity_history"
+    )
     def test_cumulative_emissions_with_varying_intensity(
         self,
+        mock_refresh_history,
         mock_scheduler,
         mock_get_hw,
         mock_resource_tracker,
         mock_get,
+        mock_time,
         mock_cloud,
         mock_geo,
         mock_cli_setup,
@@ -1065,6 +1074,8 @@ class TestCarbonTracker(unittest.TestCase):
             mock.MagicMock(status_code=200, json=lambda: {"carbonIntensity": 300}),
         ]
         mock_get.side_effect = responses
+        # Each step is a day apart, past the reuse of the cached intensity
+        mock_time.return_value = 0
 
         tracker = EmissionsTracker(
             electricitymaps_api_token="test-token",
@@ -1093,6 +1104,7 @@ class TestCarbonTracker(unittest.TestCase):
         self.assertAlmostEqual(data1.emissions, 0.1)
 
         # Step 2
+        mock_time.return_value += 24 * 3600
         tracker._measure_power_and_energy()
         # total_energy = 2.0, delta_energy = 1.0, intensity = 200 => delta_emissions = 0.2 kg
         # total_emissions = 0.3 kg
@@ -1100,6 +1112,7 @@ class TestCarbonTracker(unittest.TestCase):
         self.assertAlmostEqual(data2.emissions, 0.3)
 
         # Step 3
+        mock_time.return_value += 24 * 3600
         tracker._measure_power_and_energy()
         # total_energy = 3.0, delta_energy = 1.0, intensity = 300 => delta_emissions = 0.3 kg
         # total_emissions = 0.6 kg
@@ -1108,3 +1121,137 @@ class TestCarbonTracker(unittest.TestCase):
 
         # Verification: If it wasn't cumulative, it would be 3.0 kWh * 300 g/kWh = 0.9 kg
         self.assertLess(data3.emissions, 0.8)
+
+    @mock.patch("codecarbon.emissions_tracker.EmissionsTracker._get_geo_metadata")
+    @mock.patch("codecarbon.core.resource_tracker.ResourceTracker")
+    @mock.patch(
+        "codecarbon.emissions_tracker.BaseEmissionsTracker.get_detected_hardware"
+    )
+    @mock.patch("codecarbon.emissions_tracker.PeriodicScheduler")
+    def test_start_does_not_wait_for_geolocation(
+        self,
+        mock_scheduler,
+        mock_get_hw,
+        mock_resource_tracker,
+        mock_geo,
+        mock_cli_setup,
+        mock_log_values,
+        mocked_get_cloud_metadata_class,
+        mocked_get_gpu_details,
+        mocked_get_gpu_utilization_list,
+        mocked_is_gpu_details_available,
+        mocked_is_nvidia_system,
+    ):
+        geo_released = threading.Event()
+
+        def slow_geo_metadata():
+            geo_released.wait(10)
+            return mock.MagicMock(latitude=1.0, longitude=1.0, country_iso_code="USA")
+
+        mock_geo.side_effect = slow_geo_metadata
+        mock_get_hw.return_value = {
+            "ram_total_size": 16.0,
+            "cpu_count": 8,
+            "cpu_physical_count": 4,
+            "cpu_model": "Mock CPU",
+            "gpu_count": 0,
+            "gpu_model": "None",
+            "gpu_ids": None,
+        }
+        tracker = EmissionsTracker(
+            force_carbon_intensity_g_co2e_kwh=100,
+            output_handlers=[mock.MagicMock(spec=BoAmpsOutput)],
+            output_methods=[],
+            api_call_interval=1,
+            allow_multiple_runs=True,
+        )
+        mock_cpu = mock.MagicMock()
+        from codecarbon.external.hardware import CPU
+
+        mock_cpu.__class__ = CPU
+        mock_cpu.measure_power_and_energy.return_value = (
+            Power.from_watts(100),
+            Energy.from_energy(kWh=1.0),
+        )
+        tracker._hardware = [mock_cpu]
+
+        with mock.patch.object(tracker._output_dispatcher, "live_out") as live_out:
+            # The first samples are measured while the location is unknown
+            tracker.start()
+            tracker._measure_power_and_energy()
+            live_out.assert_not_called()
+
+            geo_released.set()
+            tracker._location_thread.join(10)
+            tracker._measure_power_and_energy()
+            live_out.assert_called_once()
+
+        # The energy measured before the location was known is accounted for
+        self.assertAlmostEqual(tracker._total_emissions, 0.3)
+
+    @mock.patch("codecarbon.emissions_tracker.EmissionsTracker._get_geo_metadata")
+    @mock.patch("codecarbon.core.resource_tracker.ResourceTracker")
+    @mock.patch(
+        "codecarbon.emissions_tracker.BaseEmissionsTracker.get_detected_hardware"
+    )
+    @mock.patch("codecarbon.emissions_tracker.PeriodicScheduler")
+    def test_start_task_does_not_wait_for_geolocation(
+        self,
+        mock_scheduler,
+        mock_get_hw,
+        mock_resource_tracker,
+        mock_geo,
+        mock_cli_setup,
+        mock_log_values,
+        mocked_get_cloud_metadata_class,
+        mocked_get_gpu_details,
+        mocked_get_gpu_utilization_list,
+        mocked_is_gpu_details_available,
+        mocked_is_nvidia_system,
+    ):
+        geo_released = threading.Event()
+
+        def slow_geo_metadata():
+            geo_released.wait(10)
+            return mock.MagicMock(latitude=1.0, longitude=1.0, country_iso_code="USA")
+
+        mock_geo.side_effect = slow_geo_metadata
+        mock_get_hw.return_value = {
+            "ram_total_size": 16.0,
+            "cpu_count": 8,
+            "cpu_physical_count": 4,
+            "cpu_model": "Mock CPU",
+            "gpu_count": 0,
+            "gpu_model": "None",
+            "gpu_ids": None,
+        }
+        tracker = EmissionsTracker(
+            force_carbon_intensity_g_co2e_kwh=100,
+            output_handlers=[],
+            output_methods=[],
+            allow_multiple_runs=True,
+        )
+        mock_cpu = mock.MagicMock()
+        from codecarbon.external.hardware import CPU
+
+        mock_cpu.__class__ = CPU
+        mock_cpu.measure_power_and_energy.return_value = (
+            Power.from_watts(100),
+            Energy.from_energy(kWh=1.0),
+        )
+        tracker._hardware = [mock_cpu]
+
+        tracker.start()
+        tracker._measure_power_and_energy()
+        started = time.perf_counter()
+        tracker.start_task("task")
+        self.assertLess(time.perf_counter() - started, 5)
+        self.assertFalse(geo_released.is_set())
+
+        geo_released.set()
+        task_data = tracker.stop_task()
+
+        # 2 kWh before the task, 1 kWh measured by stop_task
+        self.assertAlmostEqual(task_data.energy_consumed, 1.0)
+        self.assertAlmostEqual(task_data.emissions, 0.1)
+        self.assertAlmostEqual(tracker._total_emissions, 0.3)
@@ -1,9 +1,10 @@
 import os.path
 import unittest
 from os import path
+from unittest import mock
 
-from codecarbon.core.rapl import RAPLFile
-from codecarbon.core.units import Energy, Time
+from codecarbon.core.rapl import RAPLFile, RAPLReading, readings_to_details
+from codecarbon.core.units import Energy, Power, Time
 
 
 class TestEnergy(unittest.TestCase):
@@ -40,3 +41,48 @@ class TestEnergy(unittest.TestCase):
         self.assertAlmostEqual(
             Energy.from_ujoules(15).kWh, first_rapl_measure.energy_delta.kWh
         )
+
+    def test_energy_file_is_opened_once(self):
+        with mock.patch("os.open", wraps=os.open) as os_open:
+            rapl_file = RAPLFile(
+                name=self.mock_energy_data_filename,
+                path=self.path,
+                max_path=self.max_path,
+            )
+            rapl_file.start()
+            for value in ("101", "103"):
+                with open(self.path, "w") as f:
+                    f.write(value)
+                rapl_file.delta(Time(seconds=1))
+
+        self.assertLessEqual(os_open.call_count, 1)
+        self.assertAlmostEqual(Energy.from_ujoules(2).kWh, rapl_file.energy_delta.kWh)
+        rapl_file.close()
+        self.assertIsNone(rapl_file._fd)
+
+    def test_unreadable_energy_file_is_reopened(self):
+        rapl_file = RAPLFile(
+            name=self.mock_energy_data_filename, path=self.path, max_path=self.max_path
+        )
+        missing_path = self.path + ".missing"
+        rapl_file.close()
+        rapl_file.path = missing_path
+        self.assertEqual(rapl_file._get_value().kWh, 0)
+        self.assertIsNone(rapl_file._fd)
+
+        rapl_file.path = self.path
+        self.assertAlmostEqual(rapl_file._get_value().kWh, Energy.from_ujoules(100).kWh)
+
+    def test_readings_to_details(self):
+        readings = [
+            RAPLReading("Processor Energy Delta_0(kWh)", Energy(2), Power(0.01)),
+            RAPLReading("dram", Energy(1), Power(0.005), processor=False),
+        ]
+        self.assertEqual(
+            readings_to_details(readings),
+            {
+                "Processor Energy Delta_0(kWh)": 2,
+                "Processor Power Delta_0(kWh)": 10,
+                "dram": 1,
+            },
+        )
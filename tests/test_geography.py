@@ -1,9 +1,15 @@
+import tempfile
 import unittest
 from unittest import mock
 
 import responses
 
-from codecarbon.external.geography import CloudMetadata, GeoMetadata
+from codecarbon.external.geography import (
+    CloudMetadata,
+    GeoMetadata,
+    read_cached_geo,
+    write_cached_geo,
+)
 from tests.testdata import (
     CLOUD_METADATA_AWS,
     CLOUD_METADATA_AZURE,
@@ -70,6 +76,34 @@ class TestCloudMetadata(unittest.TestCase):
         self.assertIsNone(cloud.provider)
         self.assertIsNone(cloud.region)
 
+    @mock.patch(
+        "codecarbon.external.geography.get_env_cloud_details",
+        return_value=CLOUD_METADATA_GCP,
+    )
+    def test_cloud_metadata_is_cached(self, mock_get_env_cloud_details):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # WHEN
+            CloudMetadata.from_utils(cache_dir=cache_dir)
+            cloud = CloudMetadata.from_utils(cache_dir=cache_dir)
+
+        # THEN
+        mock_get_env_cloud_details.assert_called_once()
+        self.assertEqual("gcp", cloud.provider)
+        self.assertEqual("us-central1", cloud.region)
+
+    @mock.patch(
+        "codecarbon.external.geography.get_env_cloud_details", return_value=None
+    )
+    def test_on_premise_is_cached(self, mock_get_env_cloud_details):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # WHEN
+            CloudMetadata.from_utils(cache_dir=cache_dir)
+            cloud = CloudMetadata.from_utils(cache_dir=cache_dir)
+
+        # THEN
+        mock_get_env_cloud_details.assert_called_once()
+        self.assertTrue(cloud.is_on_private_infra)
+
 
 class TestGeoMetadata(unittest.TestCase):
     def setUp(self) -> None:
@@ -127,3 +161,39 @@ class TestGeoMetadata(unittest.TestCase):
         self.assertEqual("CAN", geo.country_iso_code)
         self.assertEqual("Canada", geo.country_name)
         self.assertEqual("ontario", geo.region)
+
+    @responses.activate
+    def test_geo_metadata_is_cached_per_network(self):
+        responses.add(responses.GET, self.geo_js_url, json=GEO_METADATA_USA, status=200)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            GeoMetadata.from_geo_js(self.geo_js_url, cache_dir=cache_dir)
+            geo = GeoMetadata.from_geo_js(self.geo_js_url, cache_dir=cache_dir)
+            self.assertEqual(1, len(responses.calls))
+            self.assertEqual("USA", geo.country_iso_code)
+            self.assertEqual("illinois", geo.region)
+            self.assertEqual(float(GEO_METADATA_USA["latitude"]), geo.latitude)
+
+            # Another network has another public IP address
+            with mock.patch(
+                "codecarbon.external.geography.network_fingerprint",
+                return_value="other",
+            ):
+                GeoMetadata.from_geo_js(self.geo_js_url, cache_dir=cache_dir)
+            self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_geo_metadata_default_is_not_cached(self):
+        responses.add(responses.GET, self.geo_js_url, status=500)
+        responses.add(responses.GET, "https://ipinfo.io/json", status=500)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            geo = GeoMetadata.from_geo_js(self.geo_js_url, cache_dir=cache_dir)
+            self.assertEqual("CAN", geo.country_iso_code)
+            self.assertIsNone(read_cached_geo(cache_dir))
+
+    def test_cached_geo_expires(self):
+        geo = GeoMetadata(country_iso_code="FRA", country_name="France")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            write_cached_geo(cache_dir, geo, ttl=-1)
+            self.assertIsNone(read_cached_geo(cache_dir))
+            write_cached_geo(cache_dir, geo)
+            self.assertEqual("France", read_cached_geo(cache_dir).country_name)
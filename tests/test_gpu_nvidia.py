@@ -402,6 +402,109 @@ class TestGpu(FakeGPUEnv):
             assert result == expected_ids
 
 
+class TestGpuSampler(FakeGPUEnv):
+    def _count_calls(self, *names):
+        import pynvml
+
+        return [
+            mock.patch.object(pynvml, name, side_effect=getattr(pynvml, name))
+            for name in names
+        ]
+
+    def test_measurement_pass_is_reused_by_monitoring(self):
+        from codecarbon.core.gpu import AllGPUDevices
+        from codecarbon.core.units import Time
+
+        alldevices = AllGPUDevices()
+        energy_patch, utilization_patch = self._count_calls(
+            "nvmlDeviceGetTotalEnergyConsumption", "nvmlDeviceGetUtilizationRates"
+        )
+        with energy_patch as energy_mock, utilization_patch as utilization_mock:
+            deltas = alldevices.get_delta(Time(1))
+            utilization = alldevices.get_gpu_utilization_list()
+
+        assert [d["gpu_index"] for d in deltas] == [0, 1]
+        assert utilization == [
+            {"gpu_index": 0, "gpu_utilization": 96},
+            {"gpu_index": 1, "gpu_utilization": 0},
+        ]
+        # One pass over the two devices
+        assert energy_mock.call_count == 2
+        assert utilization_mock.call_count == 2
+        assert alldevices.sampler.samples == 1
+
+    def test_monitoring_does_not_read_energy_counters(self):
+        from codecarbon.core.gpu import AllGPUDevices
+        from codecarbon.core.units import Time
+
+        alldevices = AllGPUDevices()
+        (energy_patch,) = self._count_calls("nvmlDeviceGetTotalEnergyConsumption")
+        with energy_patch as energy_mock:
+            alldevices.get_gpu_utilization_list()
+            alldevices.get_gpu_utilization_list()
+            assert energy_mock.call_count == 0
+            assert alldevices.sampler.samples == 1
+
+            # A pass without the counters is not reused by the measurement
+            alldevices.get_delta(Time(1))
+            assert energy_mock.call_count == 2
+            assert alldevices.sampler.samples == 2
+
+    def test_measurement_always_reads_the_counters(self):
+        from codecarbon.core.gpu import AllGPUDevices
+        from codecarbon.core.units import Energy, Time
+
+        alldevices = AllGPUDevices()
+        self.DETAILS["handle_0"]["total_energy_consumption"] = 4600
+        first = alldevices.get_delta(Time(1))
+        self.DETAILS["handle_0"]["total_energy_consumption"] = 8200
+        second = alldevices.get_delta(Time(1))
+
+        # The counter read when the device was set up was 1000 mJ
+        tc.assertAlmostEqual(
+            first[0]["delta_energy_consumption"].kWh,
+            Energy.from_millijoules(3600).kWh,
+        )
+        tc.assertAlmostEqual(
+            second[0]["delta_energy_consumption"].kWh,
+            Energy.from_millijoules(3600).kWh,
+        )
+        assert second[1]["delta_energy_consumption"].kWh == 0
+
+    def test_unreadable_utilization_leaves_device_out(self):
+        import pynvml
+
+        from codecarbon.core.gpu import AllGPUDevices
+        from codecarbon.core.units import Time
+
+        original = pynvml.nvmlDeviceGetUtilizationRates
+
+        def fail_on_second_gpu(handle):
+            if handle == "handle_1":
+                raise pynvml.NVMLError("Simulated NVML error")
+            return original(handle)
+
+        alldevices = AllGPUDevices()
+        with mock.patch.object(
+            pynvml, "nvmlDeviceGetUtilizationRates", side_effect=fail_on_second_gpu
+        ):
+            deltas = alldevices.get_delta(Time(1))
+            utilization = alldevices.get_gpu_utilization_list()
+
+        assert len(deltas) == 2
+        assert utilization == [{"gpu_index": 0, "gpu_utilization": 96}]
+
+    def test_start_discards_the_last_pass(self):
+        from codecarbon.core.gpu import AllGPUDevices
+
+        alldevices = AllGPUDevices()
+        alldevices.get_gpu_utilization_list()
+        alldevices.start()
+        alldevices.get_gpu_utilization_list()
+
+        assert alldevices.sampler.samples == 2
+
+
 class TestGpuNotAvailable:
     def setup_method(self):
         self.old_sys_path = copy(sys.path)
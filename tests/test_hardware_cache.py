@@ -1,3 +1,5 @@
+import json
+import sys
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -304,3 +306,93 @@ def test_spec_and_rebuild_roundtrip_for_ram():
     assert type(rebuilt).__name__ == "RAM"
     assert rebuilt._tracking_mode == "machine"
     assert rebuilt._force_ram_power == 12.5
+
+
+def _persistent_setup(tmp_path, **overrides):
+    tracker = make_tracker(_hardware_cache=True, _cache_dir=str(tmp_path), **overrides)
+    resource_tracker = SimpleNamespace(
+        tracker=tracker,
+        ram_tracker="Unspecified",
+        cpu_tracker="Unspecified",
+        gpu_tracker="Unspecified",
+    )
+    calls = {"count": 0}
+
+    def setup_fn():
+        calls["count"] += 1
+        resource_tracker.ram_tracker = "detected"
+        tracker._conf["cpu_model"] = "Detected CPU"
+        tracker._hardware = [RAM(tracking_mode="machine")]
+
+    return resource_tracker, setup_fn, calls
+
+
+def test_persistent_cache_skips_detection_in_new_process(tmp_path):
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+    assert (tmp_path / hardware_cache.PERSISTENT_CACHE_FILE).exists()
+
+    # A new process starts with an empty in-memory cache
+    hardware_cache.clear_cache()
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+
+    assert calls["count"] == 0
+    assert resource_tracker.ram_tracker == "detected"
+    assert resource_tracker.tracker._conf["cpu_model"] == "Detected CPU"
+    assert type(resource_tracker.tracker._hardware[0]).__name__ == "RAM"
+
+
+def test_persistent_cache_is_invalidated_by_fingerprint(tmp_path):
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+    hardware_cache.clear_cache()
+
+    fingerprint = dict(hardware_cache.machine_fingerprint(), cpu_count=1024)
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+    with patch.object(hardware_cache, "machine_fingerprint", return_value=fingerprint):
+        hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+
+    assert calls["count"] == 1
+
+
+def test_persistent_cache_is_keyed_by_configuration(tmp_path):
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+    hardware_cache.clear_cache()
+
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path, _force_cpu_power=42)
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+
+    assert calls["count"] == 1
+    with open(tmp_path / hardware_cache.PERSISTENT_CACHE_FILE) as f:
+        assert len(json.load(f)["plans"]) == 2
+
+
+def test_persistent_cache_ignores_corrupted_file(tmp_path):
+    (tmp_path / hardware_cache.PERSISTENT_CACHE_FILE).write_text("{not json")
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+
+    assert calls["count"] == 1
+    with open(tmp_path / hardware_cache.PERSISTENT_CACHE_FILE) as f:
+        assert len(json.load(f)["plans"]) == 1
+
+
+def test_persistent_cache_is_opt_in(tmp_path):
+    resource_tracker, setup_fn, calls = _persistent_setup(tmp_path)
+    resource_tracker.tracker._hardware_cache = False
+
+    hardware_cache.get_or_run_setup(resource_tracker, setup_fn)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_persistent_cache_dir_defaults_to_xdg(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    tracker = make_tracker(_hardware_cache=True, _cache_dir=None)
+
+    assert hardware_cache.persistent_cache_dir(tracker) == tmp_path / "codecarbon"
+    assert hardware_cache.persistent_cache_dir(make_tracker()) is None
@@ -0,0 +1,139 @@
+import gzip
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests_mock
+
+from codecarbon.core.api_client import ApiClient
+from codecarbon.core.http_client import (
+    GZIP_MIN_SIZE,
+    create_session,
+    encode_json_body,
+    get_session,
+)
+
+
+class StubAPIServer:
+    """Local API answering the queued status codes, then 200 or 201 on POST"""
+
+    def __init__(self):
+        self.statuses = []
+        self.methods = []
+        self.client_ports = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                stub.methods.append(self.command)
+                stub.client_ports.add(self.client_address[1])
+                if stub.statuses:
+                    status = stub.statuses.pop(0)
+                else:
+                    status = 201 if self.command == "POST" else 200
+                body = json.dumps({"id": "run-1"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _answer
+            do_POST = _answer
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubAPIServer()
+        self.addCleanup(self.stub.close)
+
+    def test_shared_session(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_connections_are_reused(self):
+        api = ApiClient(
+            endpoint_url=self.stub.url,
+            experiment_id="experiment-1",
+            conf={"longitude": 0, "latitude": 0},
+            session=create_session(),
+        )
+
+        for _ in range(5):
+            api.get_experiment("experiment-1")
+
+        self.assertEqual(6, len(self.stub.methods))
+        self.assertEqual(1, len(self.stub.client_ports))
+
+    def test_idempotent_requests_are_retried(self):
+        self.stub.statuses = [503, 502]
+        session = create_session(retries=3, backoff_factor=0)
+
+        response = session.get(self.stub.url + "/experiments/1", timeout=2)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(["GET"] * 3, self.stub.methods)
+
+    def test_post_is_not_sent_twice(self):
+        self.stub.statuses = [503]
+        session = create_session(retries=3, backoff_factor=0)
+
+        response = session.post(self.stub.url + "/emissions", json={}, timeout=2)
+
+        self.assertEqual(503, response.status_code)
+        self.assertEqual(["POST"], self.stub.methods)
+
+
+class TestEncodeJsonBody(unittest.TestCase):
+    def test_small_body_is_not_compressed(self):
+        body, headers = encode_json_body({"a": 1}, compress=True)
+
+        self.assertEqual(b'{"a": 1}', body)
+        self.assertNotIn("Content-Encoding", headers)
+
+    def test_large_body_is_compressed(self):
+        payload = {"emissions": [{"cpu_power": 42.0}] * GZIP_MIN_SIZE}
+
+        body, headers = encode_json_body(payload, compress=True)
+
+        self.assertEqual("gzip", headers["Content-Encoding"])
+        self.assertEqual(payload, json.loads(gzip.decompress(body)))
+        self.assertEqual(
+            payload, json.loads(encode_json_body(payload, compress=False)[0])
+        )
+
+    def test_api_client_sends_compressed_batches(self):
+        api = ApiClient(
+            endpoint_url="http://test.com",
+            experiment_id="experiment-1",
+            create_run_automatically=False,
+            compress=True,
+        )
+        payload = {"emissions": [{"cpu_power": 42.0}] * GZIP_MIN_SIZE}
+
+        with requests_mock.Mocker() as m:
+            m.post("http://test.com/emissions/batch", status_code=201)
+            api._request(
+                "POST", "http://test.com/emissions/batch", payload, expected_status=201
+            )
+
+            self.assertEqual("gzip", m.last_request.headers["Content-Encoding"])
+            self.assertEqual(payload, json.loads(gzip.decompress(m.last_request.body)))
@@ -20,15 +20,15 @@ class TestDataSourceCaching(unittest.TestCase):
 
         # Static data should be loaded after first access
         self.assertIn("global_energy_mix", _CACHE)
-        self.assertIn("cloud_emissions", _CACHE)
+        self.assertIn("cloud_emissions_index", _CACHE)
         self.assertIn("carbon_intensity_per_source", _CACHE)
-        self.assertIn("cpu_power", _CACHE)
+        self.assertIn("cpu_power_table", _CACHE)
 
         # Verify data is non-empty
         self.assertGreater(len(_CACHE["global_energy_mix"]), 0)
-        self.assertGreater(len(_CACHE["cloud_emissions"]), 0)
+        self.assertGreater(len(_CACHE["cloud_emissions_index"]), 0)
         self.assertGreater(len(_CACHE["carbon_intensity_per_source"]), 0)
-        self.assertGreater(len(_CACHE["cpu_power"]), 0)
+        self.assertGreater(len(_CACHE["cpu_power_table"]), 0)
 
     def test_get_global_energy_mix_returns_cached_data(self):
         """Verify get_global_energy_mix_data() returns cached object."""
@@ -50,6 +50,19 @@ class TestDataSourceCaching(unittest.TestCase):
         # Should return the exact same object from cache
         self.assertIs(data, _CACHE["cloud_emissions"])
 
+    def test_get_cloud_emissions_index(self):
+        """Verify the cloud data is indexed by (provider, region) once."""
+        from codecarbon.input import DataSource
+
+        ds = DataSource()
+        index = ds.get_cloud_emissions_index()
+
+        self.assertIs(index, ds.get_cloud_emissions_index())
+        self.assertEqual(len(index), len(ds.get_cloud_emissions_data()))
+        region = index[("gcp", "asia-east1")]
+        self.assertEqual(region["countryIsoCode"], "TWN")
+        self.assertIsNone(region["state"])
+
     def test_get_carbon_intensity_returns_cached_data(self):
         """Verify get_carbon_intensity_per_source_data() returns cached object."""
         from codecarbon.input import _CACHE, DataSource
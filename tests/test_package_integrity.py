@@ -3,6 +3,8 @@ Test that verifies the package includes all necessary data files.
 This test should be run against the installed package, not the source.
 """
 
+import subprocess
+import sys
 from importlib import resources as importlib_resources
 
 import pandas as pd
@@ -120,6 +122,24 @@ def test_basic_functionality():
     assert hasattr(tracker._data_source, "get_cloud_emissions_data")
 
 
+def test_tracker_run_does_not_import_pandas():
+    """pandas is slow to import, only the viz and reporting code may use it."""
+    code = (
+        "import sys\n"
+        "from codecarbon import OfflineEmissionsTracker\n"
+        "tracker = OfflineEmissionsTracker(\n"
+        "    country_iso_code='FRA', save_to_file=False, log_level='error'\n"
+        ")\n"
+        "tracker.start()\n"
+        "tracker.stop()\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False"
+
+
 def test_cli_import():
     """Test that CLI can be imported (basic smoke test)."""
     try:
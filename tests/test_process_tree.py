@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from codecarbon.core.process_tree import ProcessTree
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reads /proc"
+)
+
+
+class FakeProc:
+    """A /proc directory with only the stat files"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def add(self, pid, ppid, utime=0, stime=0, rss_pages=0, start=1, comm="worker"):
+        # Fields 3 to 24 of /proc/<pid>/stat, the others are zeros
+        fields = ["S", ppid] + [0] * 9 + [utime, stime] + [0] * 6 + [start, 0]
+        fields.append(rss_pages)
+        os.makedirs(self.path / str(pid), exist_ok=True)
+        (self.path / str(pid) / "stat").write_text(
+            f"{pid} ({comm}) " + " ".join(map(str, fields)) + " 0 0 0\n"
+        )
+
+    def remove(self, pid):
+        (self.path / str(pid) / "stat").unlink()
+        (self.path / str(pid)).rmdir()
+
+
+@pytest.fixture
+def proc(tmp_path):
+    fake = FakeProc(tmp_path)
+    fake.add(1, 0)
+    fake.add(100, 1, utime=200, stime=100, rss_pages=10, comm="python (main) x")
+    fake.add(101, 100, utime=50, rss_pages=5)
+    fake.add(102, 101, stime=25, rss_pages=1)
+    fake.add(200, 1, utime=1000, rss_pages=100)
+    return fake
+
+
+@linux_only
+class TestProcessTree:
+    def test_snapshot_reads_descendants(self, proc):
+        tree = ProcessTree(100, proc_dir=str(proc.path))
+        ticks, page = tree._clock_ticks, tree._page_size
+
+        snapshot = tree.snapshot()
+
+        assert snapshot.cpu_times == {
+            100: 300 / ticks,
+            101: 50 / ticks,
+            102: 25 / ticks,
+        }
+        assert snapshot.rss == {100: 10 * page, 101: 5 * page, 102: 1 * page}
+
+    def test_only_new_processes_are_scanned(self, proc):
+        tree = ProcessTree(100, proc_dir=str(proc.path))
+        tree.snapshot(max_age=0)
+        assert tree.scanned == 5
+
+        proc.add(103, 100)
+        proc.remove(102)
+        snapshot = tree.snapshot(max_age=0)
+
+        assert tree.scanned == 6
+        assert set(snapshot.cpu_times) == {100, 101, 103}
+
+    def test_reparented_process_leaves_the_tree(self, proc):
+        tree = ProcessTree(100, proc_dir=str(proc.path))
+        tree.snapshot(max_age=0)
+
+        # 101 exits, 102 is adopted by init
+        proc.remove(101)
+        proc.add(102, 1, stime=25)
+        snapshot = tree.snapshot(max_age=0)
+
+        assert set(snapshot.cpu_times) == {100}
+
+    def test_reused_pid_of_a_member_is_read_again(self, proc):
+        tree = ProcessTree(100, proc_dir=str(proc.path))
+        tree.snapshot(max_age=0)
+
+        # Between two listings, 102 exits and an unrelated process gets its pid
+        proc.add(102, 200, utime=7, start=2)
+        snapshot = tree.snapshot(max_age=0)
+
+        assert set(snapshot.cpu_times) == {100, 101}
+        assert tree._parents[102] == (200, 2)
+
+    def test_recent_snapshot_is_reused(self, proc):
+        tree = ProcessTree(100, proc_dir=str(proc.path))
+        first = tree.snapshot()
+
+        assert tree.snapshot() is first
+        assert tree.snapshot(max_age=0) is not first
+
+    def test_exited_root_gives_empty_snapshot(self, proc):
+        tree = ProcessTree(100, proc_dir=str(proc.path))
+        proc.remove(100)
+
+        snapshot = tree.snapshot()
+
+        assert snapshot.cpu_times == {}
+        assert snapshot.rss == {}
+
+    def test_real_children_are_found(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        try:
+            tree = ProcessTree(os.getpid())
+            deadline = time.monotonic() + 5
+            while child.pid not in tree.snapshot(max_age=0).rss:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            snapshot = tree.snapshot(max_age=0)
+        finally:
+            child.kill()
+            child.wait()
+
+        assert snapshot.rss[os.getpid()] > 0
+        assert snapshot.cpu_times[os.getpid()] > 0
+
+
+def test_cpu_and_ram_share_the_tree():
+    assert ProcessTree.for_pid(os.getpid()) is ProcessTree.for_pid(os.getpid())
+
+
+def test_psutil_fallback_reads_current_process():
+    tree = ProcessTree(os.getpid())
+    tree._use_proc = False
+
+    snapshot = tree.snapshot()
+
+    assert snapshot.rss[os.getpid()] > 0
+    assert os.getpid() in snapshot.cpu_times
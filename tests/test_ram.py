@@ -5,6 +5,7 @@ from unittest import mock
 
 import numpy as np
 
+from codecarbon.core.process_tree import ProcessTreeSnapshot
 from codecarbon.external.ram import RAM, RAM_SLOT_POWER_X86
 
 # TODO: need help: test multiprocess case
@@ -187,33 +188,29 @@ class TestRAM(unittest.TestCase):
         self.assertEqual(second, 128)
         mock_read.assert_called_once()
 
-    @mock.patch("codecarbon.external.ram.psutil.Process")
-    def test_get_children_memories_reads_recursive_children(self, mock_process):
-        child1 = mock.Mock()
-        child1.memory_info.return_value = mock.Mock(rss=100)
-        child2 = mock.Mock()
-        child2.memory_info.return_value = mock.Mock(rss=200)
-        mock_process.return_value.children.return_value = [child1, child2]
+    @mock.patch("codecarbon.external.ram.ProcessTree.for_pid")
+    def test_process_memory_gb_includes_children(self, mock_for_pid):
+        mock_for_pid.return_value.snapshot.return_value = ProcessTreeSnapshot(
+            timestamp=0.0, rss={123: 3 * 1024**3, 124: 1024**3, 125: 0}
+        )
         ram = RAM(pid=123, tracking_mode="process")
 
-        result = ram._get_children_memories()
+        result = ram.process_memory_GB
 
-        self.assertEqual(result, [100, 200])
-        mock_process.assert_called_with(123)
+        self.assertEqual(result, 4.0)
+        mock_for_pid.assert_called_with(123)
 
+    @mock.patch("codecarbon.external.ram.ProcessTree.for_pid")
     @mock.patch("codecarbon.external.ram.psutil.Process")
-    def test_process_memory_gb_includes_children(self, mock_process):
-        process = mock.Mock()
-        process.memory_info.return_value = mock.Mock(rss=3 * 1024**3)
-        mock_process.return_value = process
-        ram = RAM(pid=123, tracking_mode="process")
+    def test_process_memory_gb_without_children(self, mock_process, mock_for_pid):
+        mock_process.return_value.memory_info.return_value = mock.Mock(rss=2 * 1024**3)
+        ram = RAM(pid=123, children=False, tracking_mode="process")
 
-        with mock.patch.object(
-            ram, "_get_children_memories", return_value=[1024**3, 0]
-        ):
-            result = ram.process_memory_GB
+        result = ram.process_memory_GB
 
-        self.assertEqual(result, 4.0)
+        self.assertEqual(result, 2.0)
+        mock_process.assert_called_with(123)
+        mock_for_pid.assert_not_called()
 
     @mock.patch("codecarbon.external.ram.psutil.virtual_memory")
     def test_machine_memory_gb_uses_system_total_when_not_on_slurm(
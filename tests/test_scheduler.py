@@ -0,0 +1,146 @@
+import threading
+import time
+
+from codecarbon.external import scheduler as scheduler_module
+from codecarbon.external.scheduler import PeriodicScheduler
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+class TestPeriodicScheduler:
+    def test_runs_periodically_until_stopped(self):
+        calls = []
+        scheduler = PeriodicScheduler(0.02, calls.append, "tick")
+        scheduler.start()
+        wait_for(lambda: len(calls) >= 3)
+        scheduler.stop()
+        count = len(calls)
+        time.sleep(0.08)
+
+        assert calls[:3] == ["tick"] * 3
+        # At most the run in progress when stop was called
+        assert len(calls) <= count + 1
+        assert scheduler._stopped
+
+    def test_first_run_waits_one_interval(self):
+        calls = []
+        scheduler = PeriodicScheduler(10, calls.append, 1)
+        scheduler.start()
+        time.sleep(0.05)
+        scheduler.stop()
+
+        assert calls == []
+
+    def test_start_twice_does_not_schedule_twice(self):
+        calls = []
+        scheduler = PeriodicScheduler(0.05, calls.append, 1)
+        scheduler.start()
+        scheduler.start()
+        time.sleep(0.12)
+        scheduler.stop()
+
+        assert 1 <= len(calls) <= 3
+
+    def test_restart_after_stop(self):
+        calls = []
+        scheduler = PeriodicScheduler(0.02, calls.append, 1)
+        scheduler.start()
+        scheduler.stop()
+        scheduler.start()
+        wait_for(lambda: len(calls) >= 2)
+        scheduler.stop()
+
+    def test_schedulers_share_the_workers(self):
+        threads = set()
+
+        def record():
+            threads.add(threading.current_thread())
+
+        schedulers = [PeriodicScheduler(0.01, record) for _ in range(3)]
+        for scheduler in schedulers:
+            scheduler.start()
+        wait_for(lambda: all(s.runs >= 5 for s in schedulers))
+        for scheduler in schedulers:
+            scheduler.stop()
+
+        # Workers are reused, at most one per scheduler running at once
+        assert len(threads) <= 3
+        assert all(t.name == "codecarbon-scheduler-worker" for t in threads)
+        assert scheduler_module._scheduler_thread._thread not in threads
+
+    def test_blocking_job_does_not_delay_other_schedulers(self):
+        release = threading.Event()
+        calls = []
+        blocking = PeriodicScheduler(0.01, release.wait, 5)
+        other = PeriodicScheduler(0.02, calls.append, 1)
+        blocking.start()
+        other.start()
+        try:
+            wait_for(lambda: blocking.runs == 0 and len(calls) >= 3, timeout=2)
+        finally:
+            blocking.stop()
+            other.stop()
+            release.set()
+
+        assert other.stats()["max_jitter"] < 0.5
+
+    def test_deadlines_do_not_drift_with_run_time(self):
+        started = []
+
+        def slow_job():
+            started.append(time.monotonic())
+            time.sleep(0.02)
+
+        scheduler = PeriodicScheduler(0.05, slow_job)
+        scheduler.start()
+        wait_for(lambda: len(started) >= 5)
+        scheduler.stop()
+
+        # Chained timers would start every interval + run time (0.07 s)
+        elapsed = started[4] - started[0]
+        assert elapsed < 4 * 0.065
+
+    def test_overrun_skips_missed_ticks(self):
+        def slow_job():
+            time.sleep(0.05)
+
+        scheduler = PeriodicScheduler(0.02, slow_job)
+        scheduler.start()
+        wait_for(lambda: scheduler.runs >= 3)
+        scheduler.stop()
+        stats = scheduler.stats()
+
+        assert stats["overruns"] >= 4
+        assert stats["max_run_time"] >= 0.05
+        assert stats["mean_jitter"] < 0.02
+
+    def test_failing_job_keeps_its_schedule(self):
+        calls = []
+
+        def failing_job():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        scheduler = PeriodicScheduler(0.01, failing_job)
+        scheduler.start()
+        wait_for(lambda: len(calls) >= 2)
+        scheduler.stop()
+
+    def test_job_can_stop_its_scheduler(self):
+        calls = []
+
+        def run_once():
+            calls.append(1)
+            scheduler.stop()
+
+        scheduler = PeriodicScheduler(0.01, run_once)
+        scheduler.start()
+        wait_for(lambda: calls)
+        time.sleep(0.05)
+
+        assert calls == [1]
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from codecarbon.core.streaming_stats import StreamingStats
+
+
+class TestStreamingStats(unittest.TestCase):
+    def test_empty(self):
+        stats = StreamingStats()
+        self.assertEqual(len(stats), 0)
+        self.assertEqual(stats.mean, 0.0)
+        self.assertEqual(stats.percentile(95), 0.0)
+        self.assertIsNone(stats.max)
+        self.assertEqual(stats.recent(), [])
+
+    def test_aggregates(self):
+        stats = StreamingStats()
+        for value in [10, 0, 25, 5]:
+            stats.add(value)
+        self.assertEqual(len(stats), 4)
+        self.assertEqual(stats.mean, 10)
+        self.assertEqual(stats.min, 0)
+        self.assertEqual(stats.max, 25)
+        self.assertEqual(stats.percentile(0), 0)
+        self.assertEqual(stats.percentile(100), 25)
+
+    def test_percentiles_within_relative_accuracy(self):
+        rng = random.Random(42)
+        values = [rng.uniform(0.5, 100) for _ in range(10000)]
+        stats = StreamingStats(relative_accuracy=0.01)
+        for value in values:
+            stats.add(value)
+        values.sort()
+        for q in (5, 50, 95, 99):
+            expected = values[round(q / 100 * (len(values) - 1))]
+            self.assertAlmostEqual(
+                stats.percentile(q), expected, delta=expected * 0.011
+            )
+
+    def test_memory_is_bounded(self):
+        stats = StreamingStats(window=10)
+        for i in range(100000):
+            stats.add(i % 101)
+        self.assertEqual(len(stats), 100000)
+        self.assertLess(len(stats._buckets), 500)
+        self.assertEqual(stats.recent(), [float(i % 101) for i in range(99990, 100000)])
+
+    def test_clear(self):
+        stats = StreamingStats(window=3)
+        stats.add(3)
+        stats.clear()
+        self.assertEqual(len(stats), 0)
+        self.assertEqual(stats.recent(), [])
+        stats.add(7)
+        self.assertEqual(stats.recent(), [7.0])
+        self.assertEqual(stats.percentile(50), 7)
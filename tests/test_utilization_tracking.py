@@ -65,6 +65,13 @@ class TestUtilizationTracking(unittest.TestCase):
         self.assertGreaterEqual(emissions_data.ram_utilization_percent, 0)
         self.assertLessEqual(emissions_data.ram_utilization_percent, 100)
         self.assertGreaterEqual(emissions_data.ram_used_gb, 0)
+        self.assertLessEqual(
+            emissions_data.cpu_utilization_p50, emissions_data.cpu_utilization_p95
+        )
+        self.assertLessEqual(
+            emissions_data.cpu_utilization_p95, emissions_data.cpu_utilization_max
+        )
+        self.assertLessEqual(emissions_data.ram_utilization_max, 100)
 
     def test_utilization_fields_in_csv_output(self):
         """Test that utilization metrics are saved to CSV file."""